@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+管理后台打开耗时测试
+
+在临时数据库中分别生成 1千 / 1万 / 10万 个用户、商品和订单，测量 AdminView：
+1. 构建界面并加载各标签页（load_data，含数据看板）
+2. 依次切换到每个标签页并绘制
+3. 点击表头按积分倒序排序、按用户名前缀搜索
+4. 滚动到底部触发增量加载一页
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_admin_view.py [行数 ...]
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, qInstallMessageHandler
+from database.db_init import Base, create_db_engine
+from database.session import SessionFactory
+from models.user import User
+from models.product import Product
+from models.order import Order
+from models.order_item import OrderItem
+from models.invite_code import PrivilegeType
+from utils.workers import TaskRunner
+from views.admin_view import AdminView
+
+class StubMainWindow:
+    """AdminView 只需要这些属性和方法"""
+    current_user = None
+
+    def show_home(self): pass
+
+def seed(engine, rows):
+    start = datetime(2024, 1, 1)
+    batch = 20_000
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch):
+            chunk = range(offset, min(offset + batch, rows))
+            conn.execute(User.__table__.insert(), [
+                {"username": f"user{i:07d}", "email": f"user{i}@example.com",
+                 "password_hash": "x", "password_salt": "x", "points": i % 5000,
+                 "user_type": PrivilegeType.NORMAL, "is_admin": False, "is_banned": False,
+                 "created_at": start + timedelta(seconds=i)}
+                for i in chunk
+            ])
+            conn.execute(Product.__table__.insert(), [
+                {"name": f"商品 {i}", "description": "测试商品", "price": 10 + i % 100,
+                 "stock": 100, "category": "皮肤", "is_active": True}
+                for i in chunk
+            ])
+            conn.execute(Order.__table__.insert(), [
+                {"id": i + 1, "user_id": i % rows + 1, "total_points": 10.0, "status": "completed",
+                 "created_at": start + timedelta(seconds=i)}
+                for i in chunk
+            ])
+            conn.execute(OrderItem.__table__.insert(), [
+                {"order_id": i + 1, "product_id": 1, "name": "商品 0", "unit_price": 10,
+                 "quantity": 1, "subtotal": 10}
+                for i in chunk
+            ])
+
+def ms(start):
+    return (time.perf_counter() - start) * 1000
+
+def bench(app, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'admin.db')}", echo=False)
+        Base.metadata.create_all(bind=engine)
+        SessionFactory.configure(bind=engine)
+        seed(engine, rows)
+
+        start = time.perf_counter()
+        view = AdminView(StubMainWindow())
+        view.resize(1400, 900)
+        view.show()
+        app.processEvents()
+        open_time = ms(start)
+
+        start = time.perf_counter()
+        for tab in range(view.tab_widget.count()):
+            view.tab_widget.setCurrentIndex(tab)
+            app.processEvents()
+            view.tab_widget.currentWidget().grab()
+        tabs_time = ms(start)
+
+        view.tab_widget.setCurrentWidget(view.users_tab)
+        start = time.perf_counter()
+        view.users_table.sortByColumn(5, Qt.DescendingOrder)
+        app.processEvents()
+        sort_time = ms(start)
+
+        start = time.perf_counter()
+        view.user_search_input.setText("user00001")
+        app.processEvents()
+        search_time = ms(start)
+        view.user_search_input.setText("")
+
+        start = time.perf_counter()
+        view.users_table.scrollToBottom()
+        app.processEvents()
+        fetch_time = ms(start)
+        loaded = view.users_model.rowCount()
+
+        view.session.close()
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+        engine.dispose()
+        return open_time, tabs_time, sort_time, search_time, fetch_time, loaded
+
+def main():
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication(sys.argv)
+    # 在当前线程完成查询，计时包含查询和渲染的全部耗时
+    TaskRunner.synchronous = True
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    original_bind = SessionFactory.kw.get("bind")
+
+    print("管理后台打开耗时（单位 ms）")
+    print("=" * 92)
+    print(f"{'行数':>8}{'打开并加载':>12}{'切换全部标签':>14}{'表头排序':>10}"
+          f"{'前缀搜索':>10}{'滚动加载':>10}{'已加载用户':>12}")
+    for rows in sizes:
+        open_time, tabs_time, sort_time, search_time, fetch_time, loaded = bench(app, rows)
+        print(f"{rows:>8}{open_time:>12.1f}{tabs_time:>14.1f}{sort_time:>10.1f}"
+              f"{search_time:>10.1f}{fetch_time:>10.1f}{loaded:>12}")
+    print("=" * 92)
+
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+头像加载和保存性能测试
+
+在临时目录中为一批用户保存头像，测量：
+1. 打开个人中心时加载头像：改造前（每次读文件、解码并缩放）、冷缓存、热缓存
+2. 上传头像：改造前（压缩两次、完整解码大图）、draft 解码生成缩略图、重复上传同一张图片
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_avatar_cache.py [用户数]
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PIL import Image
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage
+from utils.image_utils import AvatarStore, qimage_to_pixmap
+
+ROUNDS = 20
+UPLOAD_SIZE = (4000, 3000)
+
+def make_jpeg(width, height, seed):
+    img = Image.effect_noise((width, height), 40 + seed % 20).convert("RGB")
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+def legacy_open(directory, filename):
+    """改造前的 ProfileView.load_avatar：读 200px 头像文件、QImage.fromData、缩放"""
+    with open(os.path.join(directory, filename), "rb") as f:
+        data = f.read()
+    return qimage_to_pixmap(QImage.fromData(data), (200, 200))
+
+def legacy_compress(image_data, max_size=(200, 200), quality=85):
+    """改造前的 compress_image：完整解码后再缩小"""
+    img = Image.open(io.BytesIO(image_data))
+    if img.mode == 'RGBA':
+        img = img.convert('RGB')
+    img.thumbnail(max_size, Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=quality, optimize=True)
+    return output.getvalue()
+
+def legacy_save(directory, image_data, user_id):
+    """改造前的 User.set_avatar：先压缩一次，save_avatar 里再压缩一次"""
+    with open(os.path.join(directory, f"legacy_{user_id}.jpg"), "wb") as f:
+        f.write(legacy_compress(legacy_compress(image_data)))
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AvatarStore(tmp, cache_size=users * 2)
+        upload = make_jpeg(*UPLOAD_SIZE, 0)
+        names = [store.save(make_jpeg(800, 600, i), i) for i in range(users)]
+
+        def open_all(fn):
+            return lambda: [fn(name) for name in names]
+
+        legacy = timed(open_all(lambda name: legacy_open(tmp, name)), ROUNDS)
+
+        def cold():
+            store.invalidate()
+            for name in names:
+                store.pixmap(name, 200)
+
+        cold_ms = timed(cold, ROUNDS)
+        store.pixmap(names[0], 200)
+        warm_ms = timed(open_all(lambda name: store.pixmap(name, 200)), ROUNDS)
+
+        print(f"打开个人中心加载头像（{users} 个用户，{ROUNDS} 轮平均）")
+        print("=" * 60)
+        print(f"{'方式':<16}{'总耗时(ms)':>14}{'每个头像(ms)':>16}")
+        for label, ms in (("改造前", legacy), ("冷缓存", cold_ms), ("热缓存", warm_ms)):
+            print(f"{label:<16}{ms:>14.2f}{ms / users:>16.4f}")
+        print("=" * 60)
+
+        legacy_upload = timed(lambda: legacy_save(tmp, upload, "upload"), 5)
+        hash_path = store._hash_path("avatar_upload.jpg")
+
+        def fresh_upload():
+            # 删除内容哈希，强制重新生成缩略图
+            if os.path.exists(hash_path):
+                os.remove(hash_path)
+            store.save(upload, "upload")
+
+        new_upload = timed(fresh_upload, 5)
+        repeat_upload = timed(lambda: store.save(upload, "upload"), 5)
+
+        print(f"上传 {UPLOAD_SIZE[0]}x{UPLOAD_SIZE[1]} JPEG 头像（{len(upload) // 1024}KB，5 次平均）")
+        print("=" * 60)
+        print(f"{'方式':<24}{'耗时(ms)':>14}")
+        print(f"{'改造前（压缩两次）':<24}{legacy_upload:>14.1f}")
+        print(f"{'draft 解码 + 3 档缩略图':<24}{new_upload:>14.1f}")
+        print(f"{'重复上传同一张图片':<24}{repeat_upload:>14.1f}")
+        print("=" * 60)
+
+if __name__ == "__main__":
+    main()
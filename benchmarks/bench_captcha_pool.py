@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证码生成性能测试
+
+测量：
+1. 吞吐量（个/秒）：改造前（每次重新加载字体、默认 PNG 压缩）与改造后的 CaptchaGenerator.render
+2. 注册页点击刷新时 GUI 线程的耗时：改造前同步生成，与从 CaptchaPool 取出现成验证码
+   （每次刷新之间处理事件，让后台补充有机会完成）
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_captcha_pool.py [验证码个数]
+"""
+
+import sys
+import os
+import io
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from utils import captcha_generator
+from utils.captcha_generator import CaptchaGenerator, CaptchaPool
+
+class LegacyCaptchaGenerator(CaptchaGenerator):
+    """改造前的做法：每次生成都重新加载字体，PNG 使用默认压缩级别"""
+
+    def create_image(self, code):
+        captcha_generator.load_font.cache_clear()
+        return super().create_image(code)
+
+    def image_to_bytes(self, image):
+        byte_array = io.BytesIO()
+        image.save(byte_array, format='PNG')
+        return byte_array.getvalue()
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def refresh_latencies(app, take, count):
+    """模拟用户反复点击刷新，记录每次 GUI 线程内的耗时"""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        take()
+        latencies.append((time.perf_counter() - start) * 1000)
+        # 两次点击之间 GUI 线程处理事件
+        end = time.perf_counter() + 0.02
+        while time.perf_counter() < end:
+            app.processEvents()
+            time.sleep(0.001)
+    return latencies
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"验证码吞吐量（{count} 个）")
+    print("=" * 50)
+    for label, generator in (("改造前", LegacyCaptchaGenerator()), ("改造后", CaptchaGenerator())):
+        generator.render()
+        start = time.perf_counter()
+        generator.render(count)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10}{count / elapsed:>12.0f} 个/秒{elapsed * 1000 / count:>12.3f} ms/个")
+    print("=" * 50)
+
+    clicks = 100
+    legacy = LegacyCaptchaGenerator()
+    pool = CaptchaPool()
+    pool.fill()
+    pool.tasks.wait()
+    app.processEvents()
+
+    print(f"点击刷新时 GUI 线程耗时（{clicks} 次）")
+    print("=" * 50)
+    print(f"{'方式':<12}{'平均(ms)':>10}{'p95(ms)':>10}{'最长(ms)':>10}")
+    for label, take in (("同步生成", legacy.generate_captcha), ("验证码池", pool.take)):
+        latencies = refresh_latencies(app, take, clicks)
+        print(f"{label:<12}{sum(latencies) / clicks:>10.3f}"
+              f"{percentile(latencies, 95):>10.3f}{max(latencies):>10.3f}")
+    print(f"验证码池未命中次数: {pool.misses}")
+    print("=" * 50)
+    pool.tasks.wait()
+
+if __name__ == "__main__":
+    main()
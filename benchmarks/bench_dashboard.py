@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+管理后台看板基准测试
+
+在临时数据库中生成 1万 / 10万 个订单（每单 2 件商品、一笔扣积分记录），比较看板数据的三种算法：
+1. 旧方式：get_all_orders() 加载全部订单和明细、读取全部积分记录，在 Python 中汇总
+2. 按需聚合：每次打开看板时在订单、积分记录上执行 GROUP BY
+3. get_dashboard()：只读取聚合表
+以及 rebuild_dashboard() 回填全部聚合表的耗时。
+
+用法: python benchmarks/bench_dashboard.py [订单数 ...]
+"""
+
+import sys
+import os
+import time
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from database.db_init import create_db_engine
+from database.session import SessionFactory, session_scope
+from database.db_operations import get_all_orders, get_dashboard, rebuild_dashboard
+from models.user import User
+from models.product import Product
+from models.order import Order
+from models.order_item import OrderItem
+from models.points import PointsTransaction
+import database.schema as schema
+
+PRODUCTS = 500
+CATEGORIES = ["步枪", "手枪", "刀", "手套", "贴纸"]
+
+def seed(engine, orders):
+    start = datetime.utcnow() - timedelta(days=365)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": 1, "username": "buyer", "email": "buyer@example.com",
+                                                "password_hash": "x", "password_salt": "x", "points": 0,
+                                                "user_type": "NORMAL"}])
+        conn.execute(Product.__table__.insert(), [
+            {"id": i, "name": f"商品 {i}", "price": 10 + i % 50, "stock": 100,
+             "category": CATEGORIES[i % len(CATEGORIES)], "is_active": True} for i in range(1, PRODUCTS + 1)])
+        conn.execute(Order.__table__.insert(), [
+            {"id": i, "user_id": 1, "total_points": 40, "status": "completed",
+             "created_at": start + timedelta(seconds=i * 365 * 86400 // orders)} for i in range(1, orders + 1)])
+        conn.execute(OrderItem.__table__.insert(), [
+            {"order_id": i, "product_id": (i * 7 + k) % PRODUCTS + 1, "name": "商品", "unit_price": 20,
+             "quantity": 1, "subtotal": 20} for i in range(1, orders + 1) for k in range(2)])
+        conn.execute(PointsTransaction.__table__.insert(), [
+            {"user_id": 1, "amount": -40, "type": "purchase",
+             "created_at": start + timedelta(seconds=i * 365 * 86400 // orders)} for i in range(1, orders + 1)])
+
+def legacy_dashboard(days=30):
+    """旧方式：加载全部订单和积分记录后在内存中汇总"""
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    daily = defaultdict(lambda: [0, 0, 0])
+    products = defaultdict(int)
+    with session_scope() as db:
+        products_by_id = {p.id: p for p in db.query(Product)}
+        for order in get_all_orders():
+            if order.status == "cancelled":
+                continue
+            for item in order.order_items:
+                products[item.product_id] += item.quantity
+            if order.created_at.date() >= since:
+                day = daily[order.created_at.date()]
+                day[0] += 1
+                day[1] += sum(item.quantity for item in order.order_items)
+                day[2] += order.total_points
+        points = defaultdict(lambda: [0, 0])
+        for transaction in db.query(PointsTransaction):
+            if transaction.created_at.date() >= since:
+                points[transaction.created_at.date()][transaction.amount < 0] += abs(transaction.amount)
+        top = sorted(products.items(), key=lambda item: item[1], reverse=True)[:10]
+        return daily, points, [(products_by_id[pid].name, units) for pid, units in top]
+
+def grouped_dashboard(engine, days=30):
+    """按需聚合：每次在原始表上 GROUP BY"""
+    since = str(datetime.utcnow().date() - timedelta(days=days - 1))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT date(created_at) d, COUNT(*), SUM(total_points) FROM orders "
+                          "WHERE status != 'cancelled' AND created_at >= :since GROUP BY d"), {"since": since}).all()
+        conn.execute(text("SELECT oi.product_id, SUM(oi.quantity) q FROM order_items oi JOIN orders o "
+                          "ON o.id = oi.order_id WHERE o.status != 'cancelled' "
+                          "GROUP BY oi.product_id ORDER BY q DESC LIMIT 10")).all()
+        conn.execute(text("SELECT p.category, SUM(oi.subtotal) FROM order_items oi JOIN orders o "
+                          "ON o.id = oi.order_id LEFT JOIN products p ON p.id = oi.product_id "
+                          "WHERE o.status != 'cancelled' GROUP BY p.category")).all()
+        conn.execute(text("SELECT date(created_at) d, SUM(amount) FROM points_transactions "
+                          "WHERE created_at >= :since GROUP BY d"), {"since": since}).all()
+
+def ms(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench(orders):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'dashboard.db')}", echo=False)
+        schema.upgrade(engine)
+        SessionFactory.configure(bind=engine)
+        seed(engine, orders)
+        result = {"orders": orders}
+        result["rebuild"] = ms(rebuild_dashboard, repeat=1)
+        result["legacy"] = ms(legacy_dashboard, repeat=1)
+        result["grouped"] = ms(lambda: grouped_dashboard(engine))
+        result["aggregates"] = ms(get_dashboard, repeat=20)
+        engine.dispose()
+        return result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    original_bind = SessionFactory.kw.get("bind")
+    results = [bench(size) for size in sizes]
+    SessionFactory.configure(bind=original_bind)
+
+    print("管理后台看板（单位 ms，最近 30 天 + 热销商品 + 分类）")
+    print("=" * 70)
+    print(f"{'订单数':>10}{'旧:全部加载':>14}{'按需聚合':>12}{'聚合表':>10}{'回填':>10}")
+    for r in results:
+        print(f"{r['orders']:>13}{r['legacy']:>16.1f}{r['grouped']:>14.1f}{r['aggregates']:>12.2f}{r['rebuild']:>12.1f}")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商城首页商品列表基准测试
+
+在临时数据库中生成 1千 / 1万 / 5万 件商品，测量 HomeView：
+1. 首次加载（load_products）
+2. 再次进入首页的刷新（只同步已加载行的库存）
+3. 绘制一屏卡片
+4. 界面子控件数量（与商品数量无关）
+并与改造前"每个商品一个 QFrame + 4个QLabel + 1个QPushButton"的构建耗时对比。
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_home_view.py [商品数 ...]
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import (QApplication, QWidget, QFrame, QLabel, QPushButton,
+                             QVBoxLayout, QHBoxLayout)
+from PyQt5.QtCore import qInstallMessageHandler
+from database.db_init import Base, create_db_engine
+from database.session import SessionFactory
+from database.db_operations import get_products
+import models.user  # noqa: F401  注册所有表
+from models.product import Product
+from views.home_view import HomeView
+
+LEGACY_LIMIT = 10_000
+
+class StubMainWindow:
+    """HomeView 只需要这些属性和方法"""
+    current_user = None
+
+    def show_cart(self): pass
+    def show_profile(self): pass
+    def show_csgo_server(self): pass
+    def show_admin(self): pass
+    def logout(self): pass
+
+def seed_products(engine, count):
+    with engine.begin() as conn:
+        conn.execute(Product.__table__.insert(), [
+            {"name": f"AK-47 | 皮肤 {i}", "description": f"第 {i} 件测试商品的描述",
+             "price": 100 + i % 50, "stock": 10, "category": "皮肤", "is_active": True}
+            for i in range(count)
+        ])
+
+def legacy_build(products):
+    """改造前的方式：为每个商品创建完整的控件树"""
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    for product in products:
+        frame = QFrame()
+        row = QHBoxLayout(frame)
+        info = QVBoxLayout()
+        for text in (product.name, product.description, f"价格: {product.price} 积分",
+                     f"库存: {product.stock}"):
+            info.addWidget(QLabel(text))
+        row.addLayout(info)
+        row.addWidget(QPushButton("加入购物车"))
+        layout.addWidget(frame)
+    return container
+
+def ms(start):
+    return (time.perf_counter() - start) * 1000
+
+def bench(app, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'shop.db')}", echo=False)
+        Base.metadata.create_all(bind=engine)
+        SessionFactory.configure(bind=engine)
+        seed_products(engine, count)
+
+        view = HomeView(StubMainWindow())
+        view.resize(1400, 900)
+        view.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        view.load_products()
+        app.processEvents()
+        first_load = ms(start)
+
+        start = time.perf_counter()
+        view.load_products()
+        app.processEvents()
+        refresh = ms(start)
+
+        start = time.perf_counter()
+        view.product_list.viewport().grab()
+        paint = ms(start)
+
+        widgets = len(view.findChildren(QWidget))
+        loaded = view.product_model.rowCount()
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+
+        legacy = None
+        if count <= LEGACY_LIMIT:
+            products = get_products()
+            start = time.perf_counter()
+            container = legacy_build(products)
+            container.layout().activate()
+            legacy = ms(start)
+            container.deleteLater()
+            app.processEvents()
+
+        engine.dispose()
+        return first_load, refresh, paint, widgets, loaded, legacy
+
+def main():
+    # 屏蔽样式表不支持 box-shadow 等 Qt 警告，避免淹没结果
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication(sys.argv)
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    original_bind = SessionFactory.kw.get("bind")
+
+    print("商城首页商品列表基准测试（单位 ms）")
+    print("=" * 92)
+    print(f"{'商品数':>8}{'首次加载':>12}{'再次刷新':>12}{'绘制一屏':>12}{'子控件数':>10}"
+          f"{'已加载行':>10}{'改造前构建':>14}")
+    for count in sizes:
+        first_load, refresh, paint, widgets, loaded, legacy = bench(app, count)
+        legacy_text = f"{legacy:.1f}" if legacy is not None else "跳过"
+        print(f"{count:>8}{first_load:>12.2f}{refresh:>12.2f}{paint:>12.2f}{widgets:>10}"
+              f"{loaded:>10}{legacy_text:>14}")
+    print("=" * 92)
+
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+语言切换性能测试
+
+测量：
+1. 导入 utils.language_manager 的耗时（子进程中冷启动导入，多次取中位数）
+2. 主窗口切换语言的耗时：toggle_language() 在 GUI 线程中的耗时，
+   以及到后台任务全部结束、界面更新完成的总耗时
+   （已登录用户停留在购物车页面，临时数据库中有购物车商品和交易记录）
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_language_toggle.py [切换次数]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import subprocess
+import statistics
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+IMPORT_RUNS = 15
+# 应用启动时 PyQt5、json（requests / SQLAlchemy 会导入）已经加载，不计入
+IMPORT_SNIPPET = (
+    "import time, sys, json; sys.path.insert(0, '.'); import PyQt5.QtCore;"
+    "start = time.perf_counter();"
+    "from utils.language_manager import language_manager;"
+    "language_manager.get_text('app_title');"
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+def import_time(compile_source=False):
+    """在子进程中测量导入耗时；compile_source 为 True 时不使用 .pyc，模拟首次启动时编译源码"""
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        if compile_source:
+            env["PYTHONDONTWRITEBYTECODE"] = "1"
+        command = [sys.executable, "-X", f"pycache_prefix={cache}", "-c", IMPORT_SNIPPET]
+
+        def run():
+            return float(subprocess.run(command, cwd=ROOT, env=env, check=True,
+                                        capture_output=True, text=True).stdout)
+
+        # 先运行一次生成 .pyc（compile_source 时不会写入）
+        run()
+        return statistics.median(run() for _ in range(IMPORT_RUNS))
+
+def main():
+    print(f"导入 utils.language_manager 并取第一条文本（{IMPORT_RUNS} 次中位数）")
+    print(f"  有 .pyc: {import_time():.2f} ms    无 .pyc: {import_time(compile_source=True):.2f} ms")
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import qInstallMessageHandler
+    from database.db_init import Base, create_db_engine
+    from database.session import SessionFactory
+    from database.db_operations import get_user_by_id
+    from models.user import User
+    from models.product import Product
+    from models.cart import CartItem
+    from models.points import PointsTransaction
+    from models.invite_code import PrivilegeType
+    from utils.workers import task_pool
+    from views.main_window import MainWindow
+
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication.instance() or QApplication(sys.argv)
+    toggles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    original_bind = SessionFactory.kw.get("bind")
+
+    def settle():
+        pool = task_pool()
+        while pool.activeThreadCount():
+            app.processEvents()
+            time.sleep(0.001)
+        app.processEvents()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'lang.db')}", echo=False)
+        Base.metadata.create_all(bind=engine)
+        SessionFactory.configure(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(User.__table__.insert(), [{
+                "username": "user", "email": "user@example.com", "password_hash": "x",
+                "password_salt": "x", "points": 1000, "user_type": PrivilegeType.NORMAL,
+                "is_admin": True, "is_banned": False}])
+            conn.execute(Product.__table__.insert(), [
+                {"name": f"商品 {i}", "description": "测试商品", "price": 10, "stock": 100,
+                 "category": "皮肤", "is_active": True} for i in range(50)])
+            conn.execute(CartItem.__table__.insert(), [
+                {"user_id": 1, "product_id": i + 1, "quantity": 1} for i in range(50)])
+            conn.execute(PointsTransaction.__table__.insert(), [
+                {"user_id": 1, "amount": 10.0, "type": "recharge", "description": f"充值 {i}"}
+                for i in range(2000)])
+
+        window = MainWindow()
+        window.current_user = get_user_by_id(1)
+        window.show()
+        window.show_cart()
+        settle()
+        window.toggle_language()
+        settle()
+
+        sync_ms, total_ms = [], []
+        for _ in range(toggles):
+            start = time.perf_counter()
+            window.toggle_language()
+            sync_ms.append((time.perf_counter() - start) * 1000)
+            settle()
+            total_ms.append((time.perf_counter() - start) * 1000)
+
+        print(f"切换语言（购物车页面，{toggles} 次）")
+        print("=" * 50)
+        print(f"{'':<16}{'中位数(ms)':>12}{'最长(ms)':>12}")
+        print(f"{'GUI线程耗时':<16}{statistics.median(sync_ms):>12.2f}{max(sync_ms):>12.2f}")
+        print(f"{'界面更新完成':<16}{statistics.median(total_ms):>12.2f}{max(total_ms):>12.2f}")
+        print("=" * 50)
+
+        window.hide()
+        task_pool().waitForDone()
+        engine.dispose()
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
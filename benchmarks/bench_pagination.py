@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+键集分页基准测试
+
+在临时数据库中生成 1万 / 10万 / 100万 条订单，比较：
+1. get_all_orders() 一次加载全部订单（100万行时跳过）
+2. paginate_orders() 第一页与深翻页（键集游标）
+3. 同样深度使用 OFFSET 分页
+4. count_orders() 不加载行的计数
+
+用法: python benchmarks/bench_pagination.py [行数 ...]
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_init import Base, create_db_engine
+from database.session import SessionFactory, session_scope
+from database.db_operations import (get_all_orders, paginate_orders, count_orders,
+                                    encode_cursor)
+import models.user  # noqa: F401  注册所有表
+from models.order import Order
+
+PAGE_SIZE = 50
+ALL_ROWS_LIMIT = 100_000
+
+def seed_orders(engine, rows):
+    start = datetime(2024, 1, 1)
+    batch = 50_000
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch):
+            conn.execute(Order.__table__.insert(), [
+                {"user_id": i % 1000 + 1, "total_points": 10.0, "status": "completed",
+                 "created_at": start + timedelta(seconds=i)}
+                for i in range(offset, min(offset + batch, rows))
+            ])
+
+def timed(func, repeat=5):
+    """返回多次执行中最快的一次（毫秒）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def deep_offset_page(offset):
+    with session_scope() as db:
+        return db.query(Order).order_by(Order.created_at.desc(), Order.id.desc()) \
+            .offset(offset).limit(PAGE_SIZE).all()
+
+def bench(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'orders.db')}", echo=False)
+        Base.metadata.create_all(bind=engine)
+        SessionFactory.configure(bind=engine)
+        seed_orders(engine, rows)
+
+        # 90% 深度的位置：按 created_at 倒序时，第 depth 行之后
+        depth = int(rows * 0.9)
+        with session_scope() as db:
+            anchor = db.query(Order).order_by(Order.created_at.desc(), Order.id.desc()) \
+                .offset(depth - 1).first()
+        deep_cursor = encode_cursor(anchor.created_at, anchor.id)
+
+        result = {
+            "first": timed(lambda: paginate_orders(page_size=PAGE_SIZE)),
+            "first_id": timed(lambda: paginate_orders(page_size=PAGE_SIZE, sort="id")),
+            "deep": timed(lambda: paginate_orders(cursor=deep_cursor, page_size=PAGE_SIZE)),
+            "offset": timed(lambda: deep_offset_page(depth)),
+            "count": timed(count_orders),
+            "all": timed(get_all_orders, repeat=1) if rows <= ALL_ROWS_LIMIT else None,
+        }
+        engine.dispose()
+        return result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    original_bind = SessionFactory.kw.get("bind")
+
+    print(f"键集分页基准测试（每页 {PAGE_SIZE} 条，单位 ms）")
+    print("=" * 96)
+    print(f"{'行数':>10}{'全部加载':>12}{'首页(时间)':>14}{'首页(id)':>12}"
+          f"{'深页(键集)':>14}{'深页(OFFSET)':>16}{'计数':>10}")
+    for rows in sizes:
+        r = bench(rows)
+        all_rows = f"{r['all']:.1f}" if r["all"] is not None else "跳过"
+        print(f"{rows:>10}{all_rows:>12}{r['first']:>14.2f}{r['first_id']:>12.2f}"
+              f"{r['deep']:>14.2f}{r['offset']:>16.2f}{r['count']:>10.2f}")
+    print("=" * 96)
+    print("注: 按时间排序走 ix_orders_created_at 索引，按 id 排序走主键。")
+
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
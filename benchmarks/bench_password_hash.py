@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+密码哈希强度与登录吞吐基准测试
+
+对 PBKDF2-SHA256 和 scrypt 的不同强度分别测量：
+1. 单次验证耗时（即一次登录的额外延迟）
+2. 单线程每秒可验证的登录数
+3. 后台线程池（utils.workers.MAX_THREADS 个线程）每秒可验证的登录数
+最后用 calibrate() 给出本机单次约 100ms 的推荐强度，与 utils/password.py 的默认值对比。
+改造前的单轮 SHA-256 作为参照。
+
+用法: python benchmarks/bench_password_hash.py [每个强度的验证次数]
+"""
+
+import sys
+import os
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.password import hash_password, verify_password, calibrate, DEFAULT_COSTS, PBKDF2, SCRYPT
+from utils.workers import MAX_THREADS
+
+LEVELS = [
+    (PBKDF2, 100000),
+    (PBKDF2, 320000),
+    (PBKDF2, 600000),
+    (SCRYPT, 2 ** 14),
+    (SCRYPT, 2 ** 15),
+    (SCRYPT, 2 ** 16),
+]
+
+def throughput(verify, count, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(count):
+            verify()
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            for future in [pool.submit(verify) for _ in range(count)]:
+                future.result()
+    return count / (time.perf_counter() - start)
+
+def measure(label, verify, count):
+    start = time.perf_counter()
+    assert verify()
+    single = (time.perf_counter() - start) * 1000
+    serial = throughput(verify, count, 1)
+    pooled = throughput(verify, count, MAX_THREADS)
+    print(f"{label:<26}{single:>12.1f}{serial:>14.1f}{pooled:>16.1f}")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print(f"密码哈希登录吞吐（每个强度验证 {count} 次，线程池 {MAX_THREADS} 线程）")
+    print("=" * 68)
+    print(f"{'算法/强度':<26}{'单次(ms)':>12}{'单线程(次/s)':>14}{'线程池(次/s)':>16}")
+    legacy = hashlib.sha256(b"passwordsalt").hexdigest()
+    measure("sha256 x1（改造前）", lambda: verify_password("password", legacy, "salt"), count * 1000)
+    for scheme, cost in LEVELS:
+        hashed, _ = hash_password("password", scheme=scheme, cost=cost)
+        marker = " *" if DEFAULT_COSTS[scheme] == cost else ""
+        measure(f"{scheme} {cost}{marker}", lambda: verify_password("password", hashed), count)
+    print("=" * 68)
+    print("* 为 utils/password.py 中的默认强度")
+    print(f"本机单次约 100ms 的推荐强度: {PBKDF2} {calibrate(PBKDF2)}，{SCRYPT} n={calibrate(SCRYPT)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+积分账本基准测试
+
+在临时数据库中为一个用户生成 N 笔分录（以及相应的快照），比较：
+1. 历史余额：对该用户截至某一时刻的全部分录求和 vs get_points_balance(at=...)（快照 + 少量分录）
+2. 记一笔交易 create_points_transaction 的耗时（更新余额 + 交易记录 + 两条分录）
+3. reconcile_points() 对 1万 个用户、每人 20 笔分录的对账耗时
+
+用法: python benchmarks/bench_points_ledger.py [分录数 ...]
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, bindparam, DateTime
+from database.db_init import create_db_engine
+from database.session import SessionFactory
+from database.db_operations import create_points_transaction, get_points_balance, reconcile_points
+from models.points import PointsTransaction, PointsLedgerEntry, PointsSnapshot, SNAPSHOT_INTERVAL
+import database.schema as schema
+
+START = datetime(2024, 1, 1)
+RECONCILE_USERS = 10_000
+RECONCILE_ENTRIES = 20
+
+def seed_user(engine, user_id, postings):
+    """直接批量写入一个用户的交易、分录和快照（每笔 +1，第 i 笔在 START 之后 i 秒）"""
+    transactions, entries, snapshots = [], [], []
+    for seq in range(1, postings + 1):
+        created = START + timedelta(seconds=seq)
+        transaction_id = (user_id - 1) * postings + seq
+        transactions.append({"id": transaction_id, "user_id": user_id, "amount": 1, "type": "recharge",
+                             "created_at": created})
+        entries.append({"transaction_id": transaction_id, "account": "user", "user_id": user_id,
+                        "seq": seq, "amount": 1, "created_at": created})
+        entries.append({"transaction_id": transaction_id, "account": "system:recharge", "user_id": None,
+                        "seq": None, "amount": -1, "created_at": created})
+        if seq % SNAPSHOT_INTERVAL == 0:
+            snapshots.append({"user_id": user_id, "seq": seq, "balance": seq, "created_at": created})
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, username, email, password_hash, password_salt, user_type, points) "
+                          "VALUES (:id, :name, :email, 'x', 'x', 'NORMAL', :points)"),
+                     {"id": user_id, "name": f"user{user_id}", "email": f"user{user_id}@example.com",
+                      "points": postings})
+        conn.execute(PointsTransaction.__table__.insert(), transactions)
+        conn.execute(PointsLedgerEntry.__table__.insert(), entries)
+        if snapshots:
+            conn.execute(PointsSnapshot.__table__.insert(), snapshots)
+
+def full_sum(engine, user_id, at):
+    with engine.connect() as conn:
+        query = text("SELECT COALESCE(SUM(amount), 0) FROM points_ledger "
+                     "WHERE user_id = :user_id AND created_at <= :at").bindparams(bindparam("at", type_=DateTime))
+        return conn.execute(query, {"user_id": user_id, "at": at}).scalar()
+
+def ms(fn, repeat=20):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def temp_engine(tmp, name):
+    engine = create_db_engine(f"sqlite:///{os.path.join(tmp, name)}", echo=False)
+    schema.upgrade(engine)
+    SessionFactory.configure(bind=engine)
+    return engine
+
+def bench_history(postings):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = temp_engine(tmp, "history.db")
+        seed_user(engine, 1, postings)
+        at = START + timedelta(seconds=postings - SNAPSHOT_INTERVAL // 2)
+        assert full_sum(engine, 1, at) == get_points_balance(1, at=at)
+        result = {
+            "postings": postings,
+            "full_sum": ms(lambda: full_sum(engine, 1, at)),
+            "snapshot": ms(lambda: get_points_balance(1, at=at)),
+            "post": ms(lambda: create_points_transaction(1, 1, "recharge", "测试")),
+        }
+        engine.dispose()
+        return result
+
+def bench_reconcile():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = temp_engine(tmp, "reconcile.db")
+        for user_id in range(1, RECONCILE_USERS + 1):
+            seed_user(engine, user_id, RECONCILE_ENTRIES)
+        start = time.perf_counter()
+        report = reconcile_points()
+        elapsed = (time.perf_counter() - start) * 1000
+        assert not report["mismatches"] and not report["unbalanced"]
+        engine.dispose()
+        return report["entries"], elapsed
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 100_000]
+    original_bind = SessionFactory.kw.get("bind")
+    results = [bench_history(size) for size in sizes]
+    entries, reconcile_ms = bench_reconcile()
+    SessionFactory.configure(bind=original_bind)
+
+    print(f"积分账本（单位 ms，快照间隔 {SNAPSHOT_INTERVAL}）")
+    print("=" * 64)
+    print(f"{'分录数':>10}{'全部求和':>14}{'快照+分录':>14}{'记一笔交易':>16}")
+    for r in results:
+        print(f"{r['postings']:>13}{r['full_sum']:>14.2f}{r['snapshot']:>14.2f}{r['post']:>16.2f}")
+    print("=" * 64)
+    print(f"对账 {RECONCILE_USERS} 个用户、{entries} 条分录: {reconcile_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商品销量统计基准测试
+
+在临时数据库中生成 1万 / 10万 个旧格式订单（orders.items 保存 JSON，每单 3 件商品），比较：
+1. 旧方式：读出全部订单的 JSON，在 Python 中按商品汇总（统计全部商品、单个商品、购买者都要这样做）
+2. 迁移 7 分批把 JSON 转换为 order_items 的耗时
+3. 新方式：get_product_sales() 汇总全部商品、单个商品，get_product_buyers() 查询购买者
+
+旧方式只用原始 SQL 读取 items 字段，没有 ORM 加载 Order 对象的开销，实际差距更大。
+
+用法: python benchmarks/bench_product_sales.py [订单数 ...]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import tempfile
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from database.db_init import Base, create_db_engine, load_models
+from database.session import SessionFactory
+from database.db_operations import get_product_sales, get_product_buyers
+import database.schema as schema
+
+PRODUCTS = 500
+USERS = 2000
+ITEMS_PER_ORDER = 3
+
+def seed_legacy(engine, orders):
+    """旧版本的表结构：orders.items 为 JSON，没有 order_items 和 schema_version"""
+    load_models()
+    tables = [table for name, table in Base.metadata.tables.items()
+              if name not in ("schema_version", "order_items")]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    rng = random.Random(1)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE orders ADD COLUMN items JSON"))
+        conn.execute(text("INSERT INTO users (id, username, email, password_hash, password_salt, user_type) "
+                          "VALUES (:id, :name, :email, 'x', 'x', 'NORMAL')"),
+                     [{"id": i, "name": f"user{i}", "email": f"user{i}@example.com"} for i in range(1, USERS + 1)])
+        rows = []
+        for order_id in range(1, orders + 1):
+            items = []
+            for product_id in rng.sample(range(1, PRODUCTS + 1), ITEMS_PER_ORDER):
+                quantity = rng.randint(1, 3)
+                items.append({"product_id": product_id, "name": f"商品 {product_id}", "price": 10,
+                              "quantity": quantity, "subtotal": 10 * quantity})
+            rows.append({"id": order_id, "user_id": rng.randint(1, USERS), "items": json.dumps(items)})
+        conn.execute(text("INSERT INTO orders (id, user_id, total_points, status, items) "
+                          "VALUES (:id, :user_id, 0, 'completed', :items)"), rows)
+
+def legacy_sales(engine, product_id=None):
+    """旧方式：遍历所有订单的 JSON"""
+    sales = defaultdict(lambda: [0, 0])
+    buyers = defaultdict(int)
+    with engine.connect() as conn:
+        for user_id, raw in conn.execute(text("SELECT user_id, items FROM orders WHERE status != 'cancelled'")):
+            for item in json.loads(raw or "[]"):
+                if product_id is not None and item["product_id"] != product_id:
+                    continue
+                sales[item["product_id"]][0] += item["quantity"]
+                sales[item["product_id"]][1] += item["subtotal"]
+                buyers[user_id] += item["quantity"]
+    return sales, buyers
+
+def ms(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench(orders):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'sales.db')}", echo=False)
+        SessionFactory.configure(bind=engine)
+        seed_legacy(engine, orders)
+        result = {"orders": orders}
+        result["legacy_all"] = ms(lambda: legacy_sales(engine))
+        result["legacy_one"] = ms(lambda: legacy_sales(engine, 7))
+
+        start = time.perf_counter()
+        schema.upgrade(engine)
+        result["migrate"] = (time.perf_counter() - start) * 1000
+
+        old = {pid: tuple(v) for pid, v in legacy_sales(engine)[0].items()}
+        new = get_product_sales()
+        assert old == new, "转换前后的统计结果不一致"
+        result["sql_all"] = ms(get_product_sales)
+        result["sql_one"] = ms(lambda: get_product_sales([7]))
+        result["buyers"] = ms(lambda: get_product_buyers(7))
+        engine.dispose()
+        return result
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    original_bind = SessionFactory.kw.get("bind")
+    results = [bench(size) for size in sizes]
+    SessionFactory.configure(bind=original_bind)
+
+    print(f"商品销量统计（单位 ms，每单 {ITEMS_PER_ORDER} 件，{PRODUCTS} 个商品）")
+    print("=" * 96)
+    print(f"{'订单数':>10}{'旧:全部商品':>14}{'旧:单个商品':>14}{'迁移转换':>12}"
+          f"{'新:全部商品':>14}{'新:单个商品':>14}{'新:购买者':>12}")
+    for r in results:
+        print(f"{r['orders']:>10}{r['legacy_all']:>16.1f}{r['legacy_one']:>16.1f}{r['migrate']:>14.1f}"
+              f"{r['sql_all']:>16.1f}{r['sql_one']:>16.2f}{r['buyers']:>14.2f}")
+    print("=" * 96)
+
+if __name__ == "__main__":
+    main()
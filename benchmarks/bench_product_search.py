@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商品搜索基准测试
+
+在临时数据库中生成 10万 / 100万 件合成商品（武器 + 皮肤名 + 编号，随机描述和分类），比较：
+1. 子串搜索：每个词都要出现在 name / description / category 之一（LIKE '%词%'），
+   不能排序；只取前 50 条时匹配多的查询很快就能凑满，统计全部结果需要扫描全表
+2. search_products()：FTS5 索引，按 bm25 排序取第一页（50 条）
+3. get_search_facets()：搜索结果按分类计数
+以及写入商品（触发器同步索引）和重建索引的耗时。
+
+用法: python benchmarks/bench_product_search.py [商品数 ...]
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from database.db_init import create_db_engine
+from database.session import SessionFactory
+from database.db_operations import search_products, get_search_facets
+from database import search
+from models.product import Product, CATEGORY_CHOICES
+import database.schema as schema
+
+WEAPONS = ["AK-47", "M4A4", "M4A1-S", "AWP", "USP-S", "格洛克 18 型", "沙漠之鹰", "P250", "MP9",
+           "蝴蝶刀", "爪子刀", "折叠刀", "运动手套", "驾驶手套"]
+SKINS = ["红线", "火蛇", "二西莫夫", "渐变之色", "咆哮", "血腥运动", "霓虹骑士", "深海探险", "澄澈之水",
+         "多普勒", "伽玛多普勒", "表面淬火", "森林 DDPAT", "Fade", "Asiimov", "Hyper Beast", "Neon Rider"]
+WEAR = ["崭新出厂", "略有磨损", "久经沙场", "破损不堪", "战痕累累"]
+PHRASES = ["限量发售的收藏品", "来自武器箱的稀有掉落", "StatTrak 计数器", "纪念品贴纸", "社区设计",
+           "适合竞技模式", "经典配色", "Operation Riptide 收藏", "夜间模式下发光", "附带名称标签"]
+CATEGORIES = [value for value, _ in CATEGORY_CHOICES]
+BATCH = 50_000
+
+# (说明, 搜索词)
+QUERIES = [
+    ("常见英文前缀", "ak"),
+    ("英文单词", "asiimov"),
+    ("中文两字", "红线"),
+    ("中文多字", "伽玛多普勒"),
+    ("中英混合", "awp 二西莫夫"),
+    ("少见组合", "蝴蝶刀 深海 崭新"),
+]
+
+def catalog(count, seed=42):
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        yield {"id": i,
+               "name": f"{rng.choice(WEAPONS)} | {rng.choice(SKINS)} ({rng.choice(WEAR)}) #{i}",
+               "description": "，".join(rng.sample(PHRASES, 3)),
+               "category": rng.choice(CATEGORIES),
+               "price": rng.randint(10, 5000), "stock": rng.randint(0, 100), "is_active": True}
+
+def seed_catalog(engine, count):
+    """分批写入商品，触发器同时写入搜索索引"""
+    rows = catalog(count)
+    with engine.begin() as conn:
+        while True:
+            batch = [row for _, row in zip(range(BATCH), rows)]
+            if not batch:
+                break
+            conn.execute(Product.__table__.insert(), batch)
+
+def like_where(query):
+    """每个词一组 (name LIKE ... OR description LIKE ... OR category LIKE ...)，各组之间 AND"""
+    terms = query.split()
+    conditions = [f"(name LIKE :p{i} OR description LIKE :p{i} OR category LIKE :p{i})"
+                  for i in range(len(terms))]
+    return " AND ".join(["is_active = 1"] + conditions), {f"p{i}": f"%{term}%" for i, term in enumerate(terms)}
+
+def like_search(engine, query, limit=50):
+    """子串搜索，取前 limit 条（没有相关度，无法排序）"""
+    where, params = like_where(query)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT id FROM products WHERE {where} LIMIT {limit}"), params).fetchall()
+
+def like_count(engine, query):
+    """子串搜索的分类计数"""
+    where, params = like_where(query)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT category, COUNT(*) FROM products WHERE {where} GROUP BY category"),
+                            params).fetchall()
+
+def ms(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}", echo=False)
+        schema.upgrade(engine)
+        SessionFactory.configure(bind=engine)
+
+        start = time.perf_counter()
+        seed_catalog(engine, count)
+        seed_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            search.rebuild_index(conn)
+        rebuild_ms = (time.perf_counter() - start) * 1000
+        with engine.connect() as conn:
+            index_mb = conn.execute(text("SELECT SUM(pgsize) FROM dbstat WHERE name LIKE 'products_fts%'"))\
+                .scalar() / 1024 / 1024
+        size_mb = os.path.getsize(os.path.join(tmp, "search.db")) / 1024 / 1024
+
+        rows = []
+        for label, query in QUERIES:
+            facets = get_search_facets(query)
+            rows.append({
+                "label": label, "query": query,
+                "matches": sum(n for _, n in facets),
+                "like": ms(lambda: like_search(engine, query), repeat=3),
+                "like_facets": ms(lambda: like_count(engine, query), repeat=3),
+                "fts": ms(lambda: search_products(query)),
+                "fts_page2": ms(lambda: search_products(query, cursor="50")),
+                "fts_category": ms(lambda: search_products(query, category=CATEGORIES[0])),
+                "facets": ms(lambda: get_search_facets(query)),
+            })
+        engine.dispose()
+        return {"count": count, "seed": seed_ms, "rebuild": rebuild_ms, "size": size_mb, "index": index_mb,
+                "rows": rows}
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    original_bind = SessionFactory.kw.get("bind")
+    results = [bench(size) for size in sizes]
+    SessionFactory.configure(bind=original_bind)
+
+    for r in results:
+        print(f"{r['count']} 件商品：写入（含触发器）{r['seed'] / 1000:.1f} s，"
+              f"重建索引 {r['rebuild'] / 1000:.1f} s，数据库 {r['size']:.0f} MB（索引 {r['index']:.0f} MB）")
+        print("单位 ms；LIKE首页 为子串搜索前 50 条（不排序），FTS 为 search_products() 第一页")
+        print(f"{'查询':<22}{'匹配数':>9}{'LIKE首页':>10}{'LIKE计数':>10}{'FTS':>10}"
+              f"{'FTS第2页':>10}{'FTS+分类':>10}{'分类计数':>10}")
+        for row in r["rows"]:
+            title = f"{row['label']} {row['query']}"
+            print(f"{title:<20}{row['matches']:>9}" + "".join(
+                f"{row[key]:10.2f}" for key in ("like", "like_facets", "fts", "fts_page2", "fts_category", "facets")))
+        print("=" * 96)
+
+if __name__ == "__main__":
+    main()
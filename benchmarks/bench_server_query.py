@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSGO 服务器批量查询基准测试
+
+启动若干本地 A2S 模拟服务器（每个应答带固定延迟，其中几个不应答，模拟离线），
+比较刷新全部服务器的耗时：
+1. 逐个调用 CSGOServer.get_server_info（改造前的做法，每次查询 5 秒超时）
+2. query_servers 并发查询（每个服务器独立的 5 秒截止时间）
+
+用法: python benchmarks/bench_server_query.py [服务器数] [离线服务器数] [延迟毫秒]
+"""
+
+import sys
+import os
+import time
+from contextlib import ExitStack, redirect_stdout
+from io import StringIO
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.csgo_server import CSGOServer, query_servers
+from fake_a2s import FakeA2SServer
+
+TIMEOUT = 5.0
+
+def sequential(addresses):
+    return {address: CSGOServer(*address).get_server_info() for address in addresses}
+
+def concurrent(addresses):
+    return query_servers(addresses, timeout=TIMEOUT)
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    offline = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    delay = (int(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FakeA2SServer(name=f"服务器 {i}", players=["alice", "bob"],
+                                                     delay=delay, respond=i >= offline))
+                   for i in range(total)]
+        addresses = [server.address for server in servers]
+
+        print(f"刷新 {total} 个服务器（离线 {offline} 个，应答延迟 {delay * 1000:.0f}ms，超时 {TIMEOUT:.0f}s）")
+        print("=" * 60)
+        print(f"{'查询方式':<16}{'耗时(ms)':>12}{'在线':>8}{'离线':>8}")
+        for label, query in (("逐个查询", sequential), ("并发查询", concurrent)):
+            start = time.perf_counter()
+            # 离线服务器的失败日志不计入输出
+            with redirect_stdout(StringIO()):
+                results = query(addresses)
+            elapsed = (time.perf_counter() - start) * 1000
+            up = sum(1 for result in results.values() if result)
+            print(f"{label:<16}{elapsed:>12.0f}{up:>8}{len(results) - up:>8}")
+        print("=" * 60)
+
+if __name__ == "__main__":
+    main()
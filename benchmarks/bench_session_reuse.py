@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话复用基准测试
+
+对比个人中心刷新时连续调用 get_user_by_id、get_steam_binding、
+get_user_transactions 的开销：
+1. 改造前：每次调用新建会话，SQLite 使用 NullPool（SQLAlchemy 1.4 默认）
+2. 改造后：连接池 + session_scope() 让三次调用共用一个会话和事务
+
+用法: python benchmarks/bench_session_reuse.py [迭代次数]
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from database.db_init import Base, get_engine_options
+from database.session import SessionFactory, session_scope
+from database.db_operations import get_user_by_id, get_steam_binding, get_user_transactions
+from models.user import User
+from models.steam_binding import SteamBinding
+from models.points import PointsTransaction
+
+def seed(engine):
+    """创建测试用户、Steam绑定和20条交易记录"""
+    Base.metadata.create_all(bind=engine)
+    SessionFactory.configure(bind=engine)
+    with session_scope() as db:
+        user = User(username="bench", email="bench@example.com",
+                    password_hash="x", password_salt="x", points=1000)
+        db.add(user)
+        db.flush()
+        db.add(SteamBinding(user_id=user.id, steam_id="76561198000000000", steam_name="bench"))
+        for i in range(20):
+            db.add(PointsTransaction(user_id=user.id, amount=10, type="recharge",
+                                     description=f"充值 {i}"))
+        return user.id
+
+def refresh_profile(user_id):
+    get_user_by_id(user_id)
+    get_steam_binding(user_id)
+    get_user_transactions(user_id)
+
+def run(label, engine, user_id, iterations, shared):
+    SessionFactory.configure(bind=engine)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if shared:
+            with session_scope():
+                refresh_profile(user_id)
+        else:
+            refresh_profile(user_id)
+    elapsed = time.perf_counter() - start
+    per_refresh = elapsed / iterations * 1000
+    print(f"{label:<28} 总耗时 {elapsed:7.3f}s  每次刷新 {per_refresh:6.3f}ms  每次调用 {per_refresh / 3:6.3f}ms")
+    return per_refresh
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    original_bind = SessionFactory.kw.get("bind")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        legacy_engine = create_engine(url, poolclass=NullPool)
+        pooled_engine = create_engine(url, **get_engine_options(url))
+        user_id = seed(pooled_engine)
+
+        print(f"会话复用基准测试（{iterations} 次刷新，每次 3 个查询）")
+        print("=" * 70)
+        before = run("改造前: 每次调用新建连接", legacy_engine, user_id, iterations, shared=False)
+        run("连接池: 每次调用新建会话", pooled_engine, user_id, iterations, shared=False)
+        after = run("改造后: 连接池 + 共享会话", pooled_engine, user_id, iterations, shared=True)
+        print("=" * 70)
+        print(f"加速比: {before / after:.2f}x")
+
+        legacy_engine.dispose()
+        pooled_engine.dispose()
+
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
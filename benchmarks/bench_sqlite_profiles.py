@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 性能配置基准测试
+
+在 csgo_shop.db 的副本上分别测试 config/database.py 中每个 SQLITE_PROFILES：
+1. 插入吞吐：每条记录单独提交（与结账、充值的写入方式一致）
+2. 查询吞吐：按主键读取商品
+3. 读写并发：一个线程持续写入时，另一个线程的商品列表查询吞吐
+
+用法: python benchmarks/bench_sqlite_profiles.py [插入条数] [查询次数]
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from config.database import DB_PATH, SQLITE_PROFILES
+from database.db_init import Base, create_db_engine
+import models.user  # noqa: F401  注册所有表
+from models.product import Product
+
+def prepare(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT COUNT(*) FROM products")).scalar() < 100:
+            conn.execute(Product.__table__.insert(), [
+                {"name": f"基准商品 {i}", "description": "benchmark", "price": 10,
+                 "stock": 1000, "category": "皮肤", "is_active": True}
+                for i in range(100)
+            ])
+        return [row[0] for row in conn.execute(text("SELECT id FROM products"))]
+
+def bench_insert(engine, count):
+    start = time.perf_counter()
+    for i in range(count):
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO points_transactions (user_id, amount, type, description, created_at) "
+                "VALUES (1, 1, 'bench', :desc, CURRENT_TIMESTAMP)"), {"desc": f"bench {i}"})
+    return count / (time.perf_counter() - start)
+
+def bench_select(engine, ids, count):
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        for i in range(count):
+            conn.execute(text("SELECT * FROM products WHERE id = :id"),
+                         {"id": ids[i % len(ids)]}).fetchone()
+    return count / (time.perf_counter() - start)
+
+def bench_read_during_write(engine, duration=2.0):
+    """写线程持续单条提交时，统计读线程完成的商品列表查询次数"""
+    stop = threading.Event()
+    errors = []
+
+    def writer():
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text("UPDATE products SET stock = stock - 1 WHERE id = "
+                                      "(SELECT MIN(id) FROM products)"))
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    reads = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT * FROM products WHERE is_active = 1")).fetchall()
+            reads += 1
+        except Exception as e:
+            errors.append(e)
+    stop.set()
+    thread.join()
+    return reads / duration, len(errors)
+
+def main():
+    inserts = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    selects = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    print(f"SQLite 性能配置基准测试（插入 {inserts} 条，查询 {selects} 次）")
+    print("=" * 78)
+    print(f"{'配置':<14}{'插入/秒':>12}{'查询/秒':>12}{'写入时读取/秒':>16}{'错误':>8}")
+    for profile in SQLITE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_file = os.path.join(tmp, "csgo_shop.db")
+            if os.path.exists(DB_PATH):
+                shutil.copy(DB_PATH, db_file)
+            engine = create_db_engine(f"sqlite:///{db_file}", profile=profile, echo=False)
+            ids = prepare(engine)
+            insert_rate = bench_insert(engine, inserts)
+            select_rate = bench_select(engine, ids, selects)
+            mixed_rate, errors = bench_read_during_write(engine)
+            engine.dispose()
+        print(f"{profile:<14}{insert_rate:>12.0f}{select_rate:>12.0f}{mixed_rate:>16.0f}{errors:>8}")
+    print("=" * 78)
+
+if __name__ == "__main__":
+    main()
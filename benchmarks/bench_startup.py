@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时测试（带时间预算）
+
+在子进程中按 main.py 的流程启动应用（使用临时数据库），主窗口显示后读取启动报告并退出。
+第一次启动会创建数据库和默认管理员，只作预热；之后启动若干次，取各阶段耗时的中位数，
+与时间预算（默认 benchmarks/startup_budget.json）比较，有阶段超出预算时以状态码 1 退出。
+统计每个 import 耗时的钩子本身会拖慢导入，计入预算的启动不带 --profile-startup；
+最后再带 --profile-startup 启动一次，它的导入耗时和最慢的导入只用于报告。
+预算按不带钩子测得的各阶段中位数留出约 50% 余量。
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py [--runs 5]
+          [--budget 预算文件] [--set 阶段=毫秒 ...]
+"""
+
+import sys
+import os
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from utils.startup_profiler import check_budget, format_report, PROFILE_FLAG
+
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "startup_budget.json")
+
+# 与 main.main() 相同的启动流程，主窗口显示后输出报告并退出事件循环
+SNIPPET = """
+import sys, json
+sys.argv = ["main.py"] + sys.argv[1:]
+import main
+from PyQt5.QtCore import qInstallMessageHandler
+qInstallMessageHandler(lambda *args: None)
+
+def shown(window):
+    print("REPORT " + json.dumps(main.startup_profiler.finish()))
+    app.quit()
+
+with main.startup_profiler.phase("qt_application"):
+    app = main.setup_application()
+with main.startup_profiler.phase("splash"):
+    splash = main.show_splash_screen(app)
+main.launch(app, splash, on_shown=shown)
+app.exec_()
+"""
+
+def run_once(db_path, profile_imports=False):
+    env = dict(os.environ, DB_PATH=db_path, QT_QPA_PLATFORM="offscreen")
+    command = [sys.executable, "-c", SNIPPET] + ([PROFILE_FLAG] if profile_imports else [])
+    output = subprocess.run(command, cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True, timeout=120).stdout
+    line = next(line for line in output.splitlines() if line.startswith("REPORT "))
+    return json.loads(line[len("REPORT "):])
+
+def median_report(reports, imports_report):
+    """各阶段耗时取 reports 的中位数；导入耗时和最慢的导入取自 imports_report"""
+    names = [phase["name"] for phase in reports[0]["phases"]]
+    import_ms = {phase["name"]: phase["import_ms"] for phase in imports_report["phases"]}
+    phases = []
+    for name in names:
+        samples = [next(p for p in report["phases"] if p["name"] == name) for report in reports]
+        phases.append({
+            "name": name,
+            "wall_ms": statistics.median(p["wall_ms"] for p in samples),
+            "import_ms": import_ms.get(name, 0.0),
+            "modules": samples[-1]["modules"],
+        })
+    return {
+        "total_ms": statistics.median(report["total_ms"] for report in reports),
+        "phases": phases,
+        "slowest_imports": imports_report["slowest_imports"][:8],
+    }
+
+def load_budget(path, overrides):
+    with open(path, encoding="utf-8") as f:
+        budget = json.load(f)
+    for item in overrides:
+        name, _, value = item.partition("=")
+        budget[name] = float(value)
+    return budget
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时测试")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="时间预算文件（JSON，阶段名 -> 毫秒）")
+    parser.add_argument("--set", action="append", default=[], metavar="阶段=毫秒",
+                        help="覆盖预算文件中的某个阶段")
+    args = parser.parse_args()
+    budget = load_budget(args.budget, args.set)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "startup.db")
+        run_once(db_path)
+        reports = [run_once(db_path) for _ in range(args.runs)]
+        imports_report = run_once(db_path, profile_imports=True)
+
+    report = median_report(reports, imports_report)
+    print(f"启动耗时（{args.runs} 次中位数，临时数据库；导入耗时来自单独一次 {PROFILE_FLAG} 启动）")
+    print("=" * 60)
+    print(format_report(report))
+    print("=" * 60)
+
+    over = check_budget(report, budget)
+    if over:
+        for name, actual, limit in over:
+            actual_text = "缺失" if actual is None else f"{actual:.1f} ms"
+            print(f"✗ {name}: {actual_text}，预算 {limit:.0f} ms")
+        return 1
+    print(f"✓ 全部阶段在预算内（{os.path.relpath(args.budget, ROOT)}）")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
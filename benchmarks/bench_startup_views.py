@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动到登录界面的耗时测试
+
+每次在新的子进程中测量从导入主窗口模块到登录界面显示出来的时间：
+1. 延迟创建（现在的做法）：启动时只创建登录页面，其他页面第一次显示时才导入和创建
+2. 全部创建（改造前的做法）：显示前先创建所有页面
+同时给出每个页面导入和创建的耗时（MainWindow.view_timings），以及首次打开各页面的代价。
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup_views.py [次数]
+"""
+
+import sys
+import os
+import json
+import subprocess
+import statistics
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+VIEWS = ["register_view", "home_view", "cart_view", "profile_view", "admin_view", "csgo_server_view"]
+
+SNIPPET = """
+import sys, time, json
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import qInstallMessageHandler
+qInstallMessageHandler(lambda *args: None)
+app = QApplication(sys.argv)
+from views.main_window import MainWindow
+imported = time.perf_counter()
+window = MainWindow()
+if sys.argv[1] == "eager":
+    for name in %r:
+        getattr(window, name)
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(json.dumps({"import": (imported - start) * 1000, "total": (shown - start) * 1000,
+                  "views": window.view_timings}))
+""" % (VIEWS,)
+
+def run(mode):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run([sys.executable, "-c", SNIPPET, mode], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = {mode: [run(mode) for _ in range(runs)] for mode in ("lazy", "eager")}
+
+    print(f"启动到登录界面显示的耗时（{runs} 次中位数）")
+    print("=" * 56)
+    print(f"{'方式':<16}{'导入(ms)':>12}{'显示登录界面(ms)':>22}")
+    for label, mode in (("延迟创建页面", "lazy"), ("全部创建页面", "eager")):
+        samples = results[mode]
+        print(f"{label:<16}{statistics.median(r['import'] for r in samples):>12.1f}"
+              f"{statistics.median(r['total'] for r in samples):>22.1f}")
+    print("=" * 56)
+
+    print("各页面导入并创建的耗时（首次打开该页面时的额外代价）")
+    print("=" * 56)
+    for name in ["login_view"] + VIEWS:
+        print(f"{name:<24}{statistics.median(r['views'][name] for r in results['eager']):>12.1f} ms")
+    print("=" * 56)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Steam 绑定账号资料刷新基准测试
+
+用本地 Steam Web API 替身模拟刷新 N 个已绑定账号的资料，比较：
+1. 改造前：每个账号一次 requests.get（不复用连接）
+2. SteamAPI 首次刷新：每 100 个账号一次请求，复用 Session
+3. SteamAPI 在缓存有效期内再次刷新
+统计实际发出的 GetPlayerSummaries 请求数、节省的请求数和耗时。
+
+用法: python benchmarks/bench_steam_api.py [账号数]
+"""
+
+import sys
+import os
+import time
+import requests
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+from utils.steam_api import SteamAPI, STEAM64_BASE
+from fake_steam_api import FakeSteamAPI
+
+def legacy_refresh(base_url, steam_ids):
+    """改造前 SteamAPI.get_player_info 的做法：逐个请求"""
+    results = {}
+    for steam_id in steam_ids:
+        response = requests.get(f"{base_url}/ISteamUser/GetPlayerSummaries/v0002/",
+                                params={'key': 'x', 'steamids': steam_id})
+        players = response.json()['response']['players']
+        results[steam_id] = players[0] if players else None
+    return results
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    steam_ids = [str(STEAM64_BASE + i) for i in range(1, count + 1)]
+
+    with FakeSteamAPI() as steam:
+        api = SteamAPI(api_key="x", base_url=steam.url)
+        rows = []
+        for label, refresh in (("逐个请求（改造前）", lambda: legacy_refresh(steam.url, steam_ids)),
+                               ("批量请求（首次）", lambda: api.get_player_summaries(steam_ids)),
+                               ("批量请求（缓存内）", lambda: api.get_player_summaries(steam_ids))):
+            before = steam.calls["GetPlayerSummaries"]
+            start = time.perf_counter()
+            results = refresh()
+            elapsed = (time.perf_counter() - start) * 1000
+            assert len(results) == count
+            rows.append((label, steam.calls["GetPlayerSummaries"] - before, elapsed))
+
+    baseline = rows[0][1]
+    print(f"刷新 {count} 个绑定账号的 Steam 资料")
+    print("=" * 64)
+    print(f"{'方式':<18}{'请求数':>10}{'节省请求':>12}{'耗时(ms)':>12}")
+    for label, calls, elapsed in rows:
+        print(f"{label:<18}{calls:>10}{baseline - calls:>12}{elapsed:>12.1f}")
+    print("=" * 64)
+
+if __name__ == "__main__":
+    main()
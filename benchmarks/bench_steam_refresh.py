@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Steam 绑定资料批量刷新基准测试
+
+在临时数据库中生成 N 个 Steam 绑定，用本地 Steam Web API 替身测量：
+1. 改造前的做法：每个绑定一次请求、一次提交（只测前 LEGACY_SAMPLE 个，按比例推算）
+2. refresh_steam_profiles：分块读取，每 100 个账号一次请求，每块一次 executemany 和提交
+统计请求数、提交次数、耗时和 Python 内存峰值（tracemalloc）。
+本地替身不限速，另外给出按 SteamAPI 默认限速（RATE 次/秒）推算的耗时。
+
+用法: python benchmarks/bench_steam_refresh.py [绑定数]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+from sqlalchemy import event
+from database.db_init import Base, create_db_engine
+from database.session import SessionFactory, session_scope
+from models.user import User
+from models.steam_binding import SteamBinding
+from utils.steam_api import SteamAPI, TokenBucket, STEAM64_BASE
+from fake_steam_api import FakeSteamAPI
+from utils.steam_refresh import refresh_steam_profiles
+
+LEGACY_SAMPLE = 2_000
+
+def seed(engine, rows):
+    batch = 20_000
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch):
+            chunk = range(offset, min(offset + batch, rows))
+            conn.execute(User.__table__.insert(), [
+                {"username": f"user{i:07d}", "email": f"user{i}@example.com",
+                 "password_hash": "x", "password_salt": "x"} for i in chunk
+            ])
+            conn.execute(SteamBinding.__table__.insert(), [
+                {"user_id": i + 1, "steam_id": str(STEAM64_BASE + i + 1), "steam_name": f"old_{i}"}
+                for i in chunk
+            ])
+
+def legacy_refresh(api, limit):
+    """改造前的做法：逐个查询资料，逐个提交"""
+    with session_scope() as db:
+        bindings = db.query(SteamBinding.id, SteamBinding.steam_id).order_by(SteamBinding.id).limit(limit).all()
+    for binding_id, steam_id in bindings:
+        info = api.get_player_info(steam_id)
+        with session_scope() as db:
+            binding = db.query(SteamBinding).get(binding_id)
+            binding.steam_name = info['name']
+            binding.steam_avatar = info['avatar']
+
+def unlimited_api(url):
+    api = SteamAPI(api_key="x", base_url=url)
+    api.rate_limiter = TokenBucket(rate=1_000_000, capacity=1_000_000)
+    return api
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    original_bind = SessionFactory.kw.get("bind")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'steam.db')}", echo=False)
+        Base.metadata.create_all(bind=engine)
+        SessionFactory.configure(bind=engine)
+        seed(engine, rows)
+        commits = [0]
+        event.listen(engine, "commit", lambda conn: commits.__setitem__(0, commits[0] + 1))
+
+        with FakeSteamAPI() as steam:
+            sample = min(LEGACY_SAMPLE, rows)
+            start = time.perf_counter()
+            legacy_refresh(unlimited_api(steam.url), sample)
+            legacy_elapsed = (time.perf_counter() - start) * rows / sample
+            legacy_calls = steam.calls["GetPlayerSummaries"] * rows // sample
+            legacy_commits = commits[0] * rows // sample
+
+            steam.calls.clear()
+            commits[0] = 0
+            tracemalloc.start()
+            start = time.perf_counter()
+            stats = refresh_steam_profiles(unlimited_api(steam.url),
+                                           checkpoint_path=os.path.join(tmp, "checkpoint.json"))
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            calls = steam.calls["GetPlayerSummaries"]
+
+        assert stats['updated'] == rows
+        print(f"刷新 {rows} 个 Steam 绑定")
+        print("=" * 78)
+        print(f"{'方式':<16}{'请求数':>10}{'提交次数':>10}{'耗时(s)':>10}{'默认限速下(s)':>16}{'内存峰值(MB)':>14}")
+        print(f"{'逐个刷新(推算)':<16}{legacy_calls:>10}{legacy_commits:>10}{legacy_elapsed:>10.1f}"
+              f"{legacy_calls / SteamAPI.RATE:>16.0f}{'-':>14}")
+        print(f"{'分块批量刷新':<16}{calls:>10}{commits[0]:>10}{elapsed:>10.1f}"
+              f"{calls / SteamAPI.RATE:>16.0f}{peak / 1024 / 1024:>14.1f}")
+        print("=" * 78)
+        engine.dispose()
+
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
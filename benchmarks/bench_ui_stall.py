@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面切换时的界面卡顿测试
+
+在临时数据库中生成一个有大量购物车商品和交易记录的用户，以及大量管理后台数据，
+在主窗口中反复切换 购物车 -> 个人中心 -> 管理后台，同时用 1ms 定时器记录
+GUI 事件循环两次心跳之间的间隔，统计：
+1. 最长卡顿（最大间隔）
+2. 超过一帧（16ms）的卡顿次数和累计超出时间
+分别测量"在 GUI 线程直接加载"（TaskRunner.synchronous = True，即改造前的做法）
+和"后台线程加载"两种情况。
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_ui_stall.py [管理后台行数]
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QTimer, qInstallMessageHandler
+from database.db_init import Base, create_db_engine
+from database.session import SessionFactory
+from database.db_operations import get_user_by_id
+from models.user import User
+from models.product import Product
+from models.order import Order
+from models.order_item import OrderItem
+from models.cart import CartItem
+from models.points import PointsTransaction
+from models.invite_code import PrivilegeType
+from utils.workers import TaskRunner, task_pool
+from views.main_window import MainWindow
+
+CART_ITEMS = 50
+TRANSACTIONS = 5_000
+ROUNDS = 5
+FRAME_MS = 16
+
+def seed(engine, rows):
+    start = datetime(2024, 1, 1)
+    batch = 20_000
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch):
+            chunk = range(offset, min(offset + batch, rows))
+            conn.execute(User.__table__.insert(), [
+                {"username": f"user{i:07d}", "email": f"user{i}@example.com",
+                 "password_hash": "x", "password_salt": "x", "points": 1_000_000,
+                 "user_type": PrivilegeType.NORMAL, "is_admin": i == 0, "is_banned": False,
+                 "created_at": start + timedelta(seconds=i)}
+                for i in chunk
+            ])
+            conn.execute(Product.__table__.insert(), [
+                {"name": f"商品 {i}", "description": "测试商品", "price": 10 + i % 100,
+                 "stock": 100, "category": "皮肤", "is_active": True}
+                for i in chunk
+            ])
+            conn.execute(Order.__table__.insert(), [
+                {"id": i + 1, "user_id": i % rows + 1, "total_points": 10.0, "status": "completed",
+                 "created_at": start + timedelta(seconds=i)}
+                for i in chunk
+            ])
+            conn.execute(OrderItem.__table__.insert(), [
+                {"order_id": i + 1, "product_id": 1, "name": "商品 0", "unit_price": 10,
+                 "quantity": 1, "subtotal": 10}
+                for i in chunk
+            ])
+        conn.execute(CartItem.__table__.insert(), [
+            {"user_id": 1, "product_id": i + 1, "quantity": 1} for i in range(CART_ITEMS)
+        ])
+        conn.execute(PointsTransaction.__table__.insert(), [
+            {"user_id": 1, "amount": 10.0, "type": "recharge", "description": f"充值 {i}",
+             "created_at": start + timedelta(minutes=i)}
+            for i in range(TRANSACTIONS)
+        ])
+
+class StallMonitor:
+    """用高精度定时器测量 GUI 事件循环的心跳间隔"""
+
+    def __init__(self):
+        self.gaps = []
+        self._last = None
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(1)
+        self.timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+    def start(self):
+        self.gaps = []
+        self._last = None
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+def settle(app, ms=50):
+    """处理事件直到线程池空闲，再多跑一会儿以投递排队的信号"""
+    pool = task_pool()
+    deadline = time.perf_counter() + 30
+    while pool.activeThreadCount() and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.001)
+
+def navigate(app, window):
+    for _ in range(ROUNDS):
+        for show in (window.show_cart, window.show_profile, window.show_admin):
+            # 模拟点击：在事件循环中触发切换
+            QTimer.singleShot(0, show)
+            settle(app)
+
+def measure(app, window, synchronous):
+    TaskRunner.synchronous = synchronous
+    monitor = StallMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    navigate(app, window)
+    elapsed = (time.perf_counter() - start) * 1000
+    monitor.stop()
+    TaskRunner.synchronous = False
+
+    stalls = [gap for gap in monitor.gaps if gap > FRAME_MS]
+    return {
+        "max": max(monitor.gaps, default=0),
+        "count": len(stalls),
+        "over": sum(gap - FRAME_MS for gap in stalls),
+        "elapsed": elapsed,
+    }
+
+def main():
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication(sys.argv)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    original_bind = SessionFactory.kw.get("bind")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'stall.db')}", echo=False)
+        Base.metadata.create_all(bind=engine)
+        SessionFactory.configure(bind=engine)
+        seed(engine, rows)
+
+        window = MainWindow()
+        window.current_user = get_user_by_id(1)
+        window.show()
+        settle(app)
+
+        # 预热一轮，排除首次导入和样式计算
+        navigate(app, window)
+
+        print(f"页面切换卡顿（购物车 {CART_ITEMS} 件 / 交易记录 {TRANSACTIONS} 条 / 后台 {rows} 行，{ROUNDS} 轮）")
+        print("=" * 78)
+        print(f"{'加载方式':<14}{'最长卡顿(ms)':>14}{'>16ms次数':>12}{'累计超出(ms)':>14}{'总耗时(ms)':>14}")
+        for label, synchronous in (("GUI线程加载", True), ("后台线程加载", False)):
+            result = measure(app, window, synchronous)
+            print(f"{label:<14}{result['max']:>14.1f}{result['count']:>12}"
+                  f"{result['over']:>14.1f}{result['elapsed']:>14.1f}")
+        print("=" * 78)
+
+        window.admin_view.session.close()
+        window.hide()
+        task_pool().waitForDone()
+        engine.dispose()
+
+    SessionFactory.configure(bind=original_bind)
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,44 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # 数据库配置
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'csgo_shop.db')
+# DB_PATH 环境变量可以指定其他数据库文件（例如测试时使用临时数据库）
+DB_PATH = os.getenv('DB_PATH', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'csgo_shop.db'))
 
 # 构建数据库URL
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# 连接池配置
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+
+# SQLite 性能配置
+# default: SQLite 默认设置（回滚日志，synchronous=FULL）
+# performance: WAL 日志，读写互不阻塞，适合桌面端日常使用
+# durable: WAL 日志但保持 synchronous=FULL，断电时不丢最后的事务
+SQLITE_PROFILES = {
+    'default': {},
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,  # 256MB
+        'cache_size': -65536,    # 负数单位为KB，即64MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,    # 毫秒
+    },
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16384,
+        'busy_timeout': 5000,
+    },
+}
+DB_PROFILE = os.getenv('DB_PROFILE', 'performance')
+
+# 是否输出SQL语句日志（调试用）
+DB_ECHO = os.getenv('DB_ECHO', 'false').lower() == 'true'
+
 # Steam API配置
 STEAM_API_KEY = os.getenv('STEAM_API_KEY', '658DF34B878A55239139EA6507722DF2')
 
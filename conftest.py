@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+测试共用的辅助函数
+
+测试文件既可以用 pytest 运行，也可以直接 python test_xxx.py 运行，
+因此这里提供普通的上下文管理器，由测试文件 from conftest import temp_database 使用。
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import insert
+from database.db_init import create_db_engine
+from database.session import SessionFactory
+import database.schema as schema
+from models.schema_version import SchemaVersion
+
+@contextmanager
+def temp_database(create=True):
+    """临时数据库，会话工厂临时绑定到它
+
+    create=True 时通过 schema.upgrade() 建表；create=False 时是空库，
+    由测试自行建立旧版表结构后再升级。不会修改 csgo_shop.db。
+    """
+    original_bind = SessionFactory.kw.get("bind")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'test.db')}", echo=False)
+        if create:
+            schema.upgrade(engine)
+        SessionFactory.configure(bind=engine)
+        try:
+            yield engine
+        finally:
+            SessionFactory.configure(bind=original_bind)
+            engine.dispose()
+
+def record_migrations(engine, before):
+    """把编号小于 before 的迁移记为已执行，模拟停在这些迁移之后的旧数据库"""
+    with engine.begin() as conn:
+        SchemaVersion.__table__.create(bind=conn, checkfirst=True)
+        conn.execute(insert(SchemaVersion), [{"version": m.version, "description": m.description}
+                                             for m in schema.MIGRATIONS if m.version < before])
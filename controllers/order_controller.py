@@ -1,105 +1,120 @@
-from database.db_init import SessionLocal
+from database.session import with_session, rollback
 from models.order import Order
+from models.order_item import OrderItem
 from models.product import Product
 from models.user import User
+from models.cart import CartItem
+from database.db_operations import create_points_transaction, record_order_sales
 from datetime import datetime
 
-def create_order(user_id, items):
-    """创建新订单"""
-    db = SessionLocal()
+@with_session
+def create_order(db, user_id, items):
+    """创建新订单
+
+    与 db_operations.create_order 一样：一次 IN 查询加载全部商品，
+    用带条件的 UPDATE 扣减库存，并发下单时不会超卖。
+    """
     try:
         # 检查用户是否存在
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             return False, "用户不存在"
+
+        # 同一商品的多条记录合并数量
+        quantities = {}
+        for item in items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        products = {
+            product.id: product
+            for product in db.query(Product).filter(Product.id.in_(quantities)).with_for_update()
+        }
             
         # 计算总积分
         total_points = 0
         order_items = []
         
-        for item in items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
             if not product:
-                return False, f"商品 {item.product_id} 不存在"
-            if product.stock < item.quantity:
+                return False, f"商品 {product_id} 不存在"
+            if product.stock < quantity:
                 return False, f"商品 {product.name} 库存不足"
                 
-            total_points += product.price * item.quantity
-            order_items.append({
-                "product_id": product.id,
-                "name": product.name,
-                "price": product.price,
-                "quantity": item.quantity
-            })
+            total_points += product.price * quantity
+            order_items.append(OrderItem(
+                product_id=product.id,
+                name=product.name,
+                unit_price=product.price,
+                quantity=quantity,
+                subtotal=product.price * quantity,
+                category=product.category
+            ))
             
         # 检查用户积分是否足够
         if user.points < total_points:
             return False, "积分不足"
+
+        # 扣减库存：库存在读取后可能已被其他订单买走，以 UPDATE 时的值为准
+        for product_id, quantity in quantities.items():
+            updated = db.query(Product).filter(
+                Product.id == product_id,
+                Product.stock >= quantity
+            ).update({Product.stock: Product.stock - quantity}, synchronize_session=False)
+            if updated != 1:
+                rollback(db)
+                return False, f"商品 {products[product_id].name} 库存不足"
             
         # 创建订单
         order = Order(
             user_id=user_id,
             total_points=total_points,
             status="待发货",
-            items=order_items
+            order_items=order_items
         )
         db.add(order)
+        db.flush()
         
-        # 更新用户积分
-        user.points -= total_points
-        
-        # 更新商品库存
-        for item in items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            product.stock -= item.quantity
+        # 通过积分账本扣除用户积分
+        create_points_transaction(user_id, -total_points, "purchase", f"购买商品（订单 #{order.id}）")
             
         # 清空购物车
-        db.query(CartItem).filter(CartItem.user_id == user_id).delete()
+        db.query(CartItem).filter(CartItem.user_id == user_id).delete(synchronize_session=False)
         
-        db.commit()
+        db.flush()
+        record_order_sales(order.id)
         return True, "订单创建成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"创建订单失败: {str(e)}"
-    finally:
-        db.close()
 
-def get_order_by_id(order_id):
+@with_session
+def get_order_by_id(db, order_id):
     """根据ID获取订单"""
-    db = SessionLocal()
-    try:
-        return db.query(Order).filter(Order.id == order_id).first()
-    finally:
-        db.close()
+    return db.query(Order).filter(Order.id == order_id).first()
 
-def get_user_orders(user_id):
+@with_session
+def get_user_orders(db, user_id):
     """获取用户的所有订单"""
-    db = SessionLocal()
-    try:
-        return db.query(Order).filter(Order.user_id == user_id).all()
-    finally:
-        db.close()
+    return db.query(Order).filter(Order.user_id == user_id).all()
 
-def get_all_orders():
+@with_session
+def get_all_orders(db):
     """获取所有订单"""
-    db = SessionLocal()
-    try:
-        return db.query(Order).all()
-    finally:
-        db.close()
+    return db.query(Order).all()
 
-def update_order_status(order_id, status):
+@with_session
+def update_order_status(db, order_id, status):
     """更新订单状态"""
-    db = SessionLocal()
     try:
         order = db.query(Order).filter(Order.id == order_id).first()
         if order:
+            # 取消订单时从看板销售统计中扣出，恢复时重新计入
+            if status != order.status and "cancelled" in (status, order.status):
+                record_order_sales(order.id, -1 if status == "cancelled" else 1)
             order.status = status
-            db.commit()
+            db.flush()
             return True, "订单状态更新成功"
         return False, "订单不存在"
     except Exception as e:
-        db.rollback()
-        return False, f"更新订单状态失败: {str(e)}"
-    finally:
-        db.close() 
\ No newline at end of file
+        rollback(db)
+        return False, f"更新订单状态失败: {str(e)}" 
\ No newline at end of file
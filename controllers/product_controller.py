@@ -1,9 +1,9 @@
-from database.db_init import SessionLocal
+from database.session import with_session, rollback
 from models.product import Product
 
-def create_product(name, description, price, stock, category):
+@with_session
+def create_product(db, name, description, price, stock, category):
     """创建新商品"""
-    db = SessionLocal()
     try:
         product = Product(
             name=name,
@@ -13,17 +13,15 @@ def create_product(name, description, price, stock, category):
             category=category
         )
         db.add(product)
-        db.commit()
+        db.flush()
         return True, "商品创建成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"创建商品失败: {str(e)}"
-    finally:
-        db.close()
 
-def update_product(product_id, name, description, price, stock, category):
+@with_session
+def update_product(db, product_id, name, description, price, stock, category):
     """更新商品信息"""
-    db = SessionLocal()
     try:
         product = db.query(Product).filter(Product.id == product_id).first()
         if product:
@@ -32,61 +30,49 @@ def update_product(product_id, name, description, price, stock, category):
             product.price = price
             product.stock = stock
             product.category = category
-            db.commit()
+            db.flush()
             return True, "商品更新成功"
         return False, "商品不存在"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"更新商品失败: {str(e)}"
-    finally:
-        db.close()
 
-def delete_product(product_id):
+@with_session
+def delete_product(db, product_id):
     """删除商品"""
-    db = SessionLocal()
     try:
         product = db.query(Product).filter(Product.id == product_id).first()
         if product:
             db.delete(product)
-            db.commit()
+            db.flush()
             return True, "商品删除成功"
         return False, "商品不存在"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"删除商品失败: {str(e)}"
-    finally:
-        db.close()
 
-def get_product_by_id(product_id):
+@with_session
+def get_product_by_id(db, product_id):
     """根据ID获取商品"""
-    db = SessionLocal()
-    try:
-        return db.query(Product).filter(Product.id == product_id).first()
-    finally:
-        db.close()
+    return db.query(Product).filter(Product.id == product_id).first()
 
-def get_all_products():
+@with_session
+def get_all_products(db):
     """获取所有商品"""
-    db = SessionLocal()
-    try:
-        return db.query(Product).all()
-    finally:
-        db.close()
+    return db.query(Product).all()
 
-def update_product_stock(product_id, quantity):
+@with_session
+def update_product_stock(db, product_id, quantity):
     """更新商品库存"""
-    db = SessionLocal()
     try:
         product = db.query(Product).filter(Product.id == product_id).first()
         if product:
             if product.stock >= quantity:
                 product.stock -= quantity
-                db.commit()
+                db.flush()
                 return True, "库存更新成功"
             return False, "库存不足"
         return False, "商品不存在"
     except Exception as e:
-        db.rollback()
-        return False, f"更新库存失败: {str(e)}"
-    finally:
-        db.close() 
\ No newline at end of file
+        rollback(db)
+        return False, f"更新库存失败: {str(e)}" 
\ No newline at end of file
@@ -1,11 +1,12 @@
-from database.db_init import SessionLocal
+from database.session import with_session, rollback
 from models.user import User
+from database.db_operations import create_points_transaction
 from werkzeug.security import generate_password_hash
 import json
 
-def create_admin_user(username, password, permissions):
+@with_session
+def create_admin_user(db, username, password, permissions):
     """创建管理员用户"""
-    db = SessionLocal()
     try:
         # 检查用户名是否已存在
         existing_user = db.query(User).filter(User.username == username).first()
@@ -22,58 +23,46 @@ def create_admin_user(username, password, permissions):
         )
         admin.set_password(password)
         db.add(admin)
-        db.commit()
+        db.flush()
         return True, "管理员账号创建成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"创建管理员账号失败: {str(e)}"
-    finally:
-        db.close()
 
-def get_user_by_username(username):
+@with_session
+def get_user_by_username(db, username):
     """根据用户名获取用户"""
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.username == username).first()
-    finally:
-        db.close()
+    return db.query(User).filter(User.username == username).first()
 
-def get_user_by_id(user_id):
+@with_session
+def get_user_by_id(db, user_id):
     """根据ID获取用户"""
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.id == user_id).first()
-    finally:
-        db.close()
+    return db.query(User).filter(User.id == user_id).first()
 
-def update_user_points(user_id, points):
-    """更新用户积分"""
-    db = SessionLocal()
+@with_session
+def update_user_points(db, user_id, points):
+    """把用户积分修改为 points，差额通过积分账本记为一笔管理员调整"""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).filter(User.id == user_id).with_for_update().first()
         if user:
-            user.points = points
-            db.commit()
+            if points != user.points:
+                create_points_transaction(user_id, points - user.points, "adjustment", "管理员修改积分")
             return True, "积分更新成功"
         return False, "用户不存在"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"更新积分失败: {str(e)}"
-    finally:
-        db.close()
 
-def ban_user(user_id):
+@with_session
+def ban_user(db, user_id):
     """封禁用户"""
-    db = SessionLocal()
     try:
         user = db.query(User).filter(User.id == user_id).first()
         if user:
             user.is_banned = not user.is_banned
-            db.commit()
+            db.flush()
             return True, "用户状态已更新"
         return False, "用户不存在"
     except Exception as e:
-        db.rollback()
-        return False, f"更新用户状态失败: {str(e)}"
-    finally:
-        db.close() 
\ No newline at end of file
+        rollback(db)
+        return False, f"更新用户状态失败: {str(e)}" 
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""看板聚合表维护
+
+管理后台的看板只读取聚合表（models.dashboard），读取耗时与订单、积分记录的多少无关：
+
+- daily_sales: 每天的订单数、售出件数、销售额
+- product_sales / category_sales: 每个商品、每个分类累计的售出件数和销售额，
+  分类取订单明细中记录的下单时分类（order_items.category），商品之后改分类不会移动历史销售
+- daily_points: 每天发放和消耗的积分
+
+结账时调用 record_order()，积分记账时调用 record_points()，与业务数据在同一事务内增量更新；
+订单取消时用 sign=-1 再调用一次 record_order() 扣回。
+rebuild() 从订单和积分记录重新计算全部聚合表，用于回填和修复。
+
+这里的函数既可以传入 Session，也可以传入 Connection（迁移中使用）。
+日期按数据库中记录的时间（UTC）划分。
+"""
+from collections import defaultdict
+from sqlalchemy import select, insert, update, delete, func, case
+from models.order import Order
+from models.order_item import OrderItem
+from models.points import PointsTransaction
+from models.dashboard import DailySales, ProductSales, CategorySales, DailyPoints
+
+# 下单时商品没有分类时使用的分类名
+UNCATEGORIZED = "未分类"
+CANCELLED = "cancelled"
+
+def _increment(db, model, key, amounts):
+    """聚合表中 key 对应行的各列加上 amounts，没有这一行时插入"""
+    table = model.__table__
+    result = db.execute(
+        update(table)
+        .where(*[table.c[name] == value for name, value in key.items()])
+        .values({table.c[name]: table.c[name] + amount for name, amount in amounts.items()})
+    )
+    if result.rowcount == 0:
+        db.execute(insert(table).values(**key, **amounts))
+
+def record_order(db, order_id, sign=1):
+    """把一个订单计入（sign=-1 时扣出）销售聚合表"""
+    created_at, total_points = db.execute(
+        select(Order.created_at, Order.total_points).where(Order.id == order_id)).one()
+    lines = db.execute(
+        select(OrderItem.product_id, OrderItem.quantity, OrderItem.subtotal, OrderItem.category)
+        .where(OrderItem.order_id == order_id)).all()
+
+    products = defaultdict(lambda: [0, 0])
+    categories = defaultdict(lambda: [0, 0])
+    for product_id, quantity, subtotal, category in lines:
+        if product_id is not None:
+            products[product_id][0] += quantity
+            products[product_id][1] += subtotal
+        categories[category or UNCATEGORIZED][0] += quantity
+        categories[category or UNCATEGORIZED][1] += subtotal
+
+    units = sum(quantity for _, quantity, _, _ in lines)
+    _increment(db, DailySales, {"day": created_at.date()},
+               {"orders": sign, "units": sign * units, "revenue": sign * total_points})
+    for product_id, (units, revenue) in products.items():
+        _increment(db, ProductSales, {"product_id": product_id},
+                   {"units": sign * units, "revenue": sign * revenue})
+    for category, (units, revenue) in categories.items():
+        _increment(db, CategorySales, {"category": category},
+                   {"units": sign * units, "revenue": sign * revenue})
+
+def record_points(db, day, amount):
+    """把一笔积分交易计入当天的发放（正数）或消耗（负数）"""
+    if amount > 0:
+        _increment(db, DailyPoints, {"day": day}, {"issued": amount, "spent": 0})
+    elif amount < 0:
+        _increment(db, DailyPoints, {"day": day}, {"issued": 0, "spent": -amount})
+
+def rebuild(db):
+    """清空并重新计算全部聚合表（每张表一条 INSERT ... SELECT）"""
+    for model in (DailySales, ProductSales, CategorySales, DailyPoints):
+        db.execute(delete(model.__table__))
+
+    active = Order.status != CANCELLED
+    day = func.date(Order.created_at)
+    order_units = select(OrderItem.order_id, func.sum(OrderItem.quantity).label("units"))\
+        .group_by(OrderItem.order_id).subquery()
+    db.execute(insert(DailySales).from_select(
+        ["day", "orders", "units", "revenue"],
+        select(day, func.count(Order.id), func.coalesce(func.sum(order_units.c.units), 0),
+               func.coalesce(func.sum(Order.total_points), 0))
+        .select_from(Order)
+        .outerjoin(order_units, order_units.c.order_id == Order.id)
+        .where(active)
+        .group_by(day)))
+
+    db.execute(insert(ProductSales).from_select(
+        ["product_id", "units", "revenue"],
+        select(OrderItem.product_id, func.sum(OrderItem.quantity), func.sum(OrderItem.subtotal))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(active, OrderItem.product_id.isnot(None))
+        .group_by(OrderItem.product_id)))
+
+    category = func.coalesce(OrderItem.category, UNCATEGORIZED)
+    db.execute(insert(CategorySales).from_select(
+        ["category", "units", "revenue"],
+        select(category, func.sum(OrderItem.quantity), func.sum(OrderItem.subtotal))
+        .select_from(OrderItem)
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(active)
+        .group_by(category)))
+
+    amount = PointsTransaction.amount
+    points_day = func.date(PointsTransaction.created_at)
+    db.execute(insert(DailyPoints).from_select(
+        ["day", "issued", "spent"],
+        select(points_day,
+               func.sum(case((amount > 0, amount), else_=0)),
+               func.sum(case((amount < 0, -amount), else_=0)))
+        .group_by(points_day)))
@@ -1,18 +1,75 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from config.database import DATABASE_URL
+from sqlalchemy.pool import QueuePool, StaticPool
+from config.database import (DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                             DB_POOL_TIMEOUT, DB_POOL_RECYCLE, SQLITE_PROFILES,
+                             DB_PROFILE, DB_ECHO)
+from database.search import register_functions as register_search_functions
 import logging
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def get_engine_options(url: str) -> dict:
+    """根据数据库类型返回连接池参数
+
+    SQLAlchemy 1.4 对文件型 SQLite 默认使用 NullPool，每个会话都会重新打开
+    数据库文件；这里改为固定大小的 QueuePool，让会话复用已有连接。
+    """
+    if url.startswith("sqlite"):
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # 内存数据库只能共享同一个连接
+            return {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        return {
+            "poolclass": QueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "connect_args": {"check_same_thread": False},
+        }
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+def apply_sqlite_profile(engine, profile: str):
+    """在每个新连接建立时执行对应配置的PRAGMA"""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"未知的SQLite配置: {profile}")
+    pragmas = SQLITE_PROFILES[profile]
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def create_db_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE, echo: bool = DB_ECHO):
+    """创建数据库引擎，SQLite 会应用所选的性能配置，并注册商品搜索用到的函数"""
+    db_engine = create_engine(url, echo=echo, **get_engine_options(url))
+    if url.startswith("sqlite"):
+        apply_sqlite_profile(db_engine, profile)
+        event.listen(db_engine, "connect", register_search_functions)
+    return db_engine
+
 try:
     # 创建数据库引擎
-    engine = create_engine(DATABASE_URL, echo=True)
-    logger.info(f"数据库引擎创建成功: {DATABASE_URL}")
+    engine = create_db_engine()
+    logger.info(f"数据库引擎创建成功: {DATABASE_URL} (配置: {DB_PROFILE})")
 
     # 创建会话工厂
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -20,19 +77,27 @@ try:
     # 创建基类
     Base = declarative_base()
 
+    def load_models():
+        """导入所有模型，让它们的表注册到 Base.metadata"""
+        from models.user import User
+        from models.product import Product
+        from models.order import Order
+        from models.order_item import OrderItem
+        from models.points import PointsTransaction
+        from models.cart import CartItem
+        from models.steam_binding import SteamBinding
+        from models.invite_code import InviteCode
+        from models.schema_version import SchemaVersion
+        from models.dashboard import DailySales, ProductSales, CategorySales, DailyPoints
+
     def init_database():
-        """初始化数据库，创建所有表"""
+        """初始化数据库，创建所有表并记录结构版本
+
+        启动时使用 database.schema.upgrade()，只在需要时建表或迁移。
+        """
         try:
-            from models.user import User
-            from models.product import Product
-            from models.order import Order
-            from models.points import PointsTransaction
-            from models.cart import CartItem
-            from models.steam_binding import SteamBinding
-            from models.invite_code import InviteCode
-            
-            Base.metadata.create_all(bind=engine)
-            logger.info("数据库表创建成功")
+            from database.schema import create_schema
+            create_schema(engine)
         except Exception as e:
             logger.error(f"数据库初始化失败: {str(e)}")
             raise
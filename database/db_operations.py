@@ -1,18 +1,34 @@
 from sqlalchemy.orm import Session
 from database.db_init import SessionLocal
+from database.session import with_session, rollback
 from models.user import User
 from models.product import Product
 from models.order import Order
-from models.points import PointsTransaction
+from models.order_item import OrderItem
+from models.points import (PointsTransaction, PointsLedgerEntry, PointsSnapshot,
+                           LEDGER_USER, LEDGER_ACCOUNTS, SNAPSHOT_INTERVAL)
 from models.steam_binding import SteamBinding
 from models.cart import CartItem
-from utils.password import hash_password, verify_password
-from datetime import datetime
+from utils.password import hash_password
+from datetime import datetime, timedelta
 from typing import List, Optional
+import base64
+import enum
+from itertools import groupby
+import json
 import random
 import string
-from sqlalchemy import func
+from sqlalchemy import func, and_, or_, select, type_coerce, Boolean, DateTime, Integer, bindparam
 from models.invite_code import InviteCode
+from database.schema import open_points_balances
+from database import aggregates, search as product_search
+from models.dashboard import DailySales, ProductSales, CategorySales, DailyPoints
+
+# 说明：以下函数均通过 with_session 获取会话，调用方无需传入 db 参数。
+# 在 session_scope() 中连续调用时会复用同一个会话和事务，
+# 因此函数内部只 flush，由最外层作用域统一提交。
+# 函数捕获异常后用 rollback(db) 撤销自己的修改（内层作用域只回滚到自己的 SAVEPOINT），
+# 不影响调用方在外层作用域中已经做的修改。
 
 def get_db():
     """获取数据库会话"""
@@ -22,41 +38,44 @@ def get_db():
     finally:
         db.close()
 
-def init_test_data():
+@with_session
+def init_test_data(db: Session):
     """初始化测试数据"""
-    db = SessionLocal()
-    try:
-        # 检查是否已有数据
-        if db.query(Product).first():
-            return
-        
-        db.commit()
-    finally:
-        db.close()
+    # 检查是否已有数据
+    if db.query(Product).first():
+        return
 
-def get_products() -> list:
+@with_session
+def get_products(db: Session) -> list:
     """获取所有商品"""
-    db = SessionLocal()
-    try:
-        return db.query(Product).all()
-    finally:
-        db.close()
+    return db.query(Product).all()
 
-def create_user(username: str, email: str, password: str, invite_code: str = None) -> tuple[bool, str]:
+@with_session
+def get_product_stocks(db: Session, product_ids: list) -> dict:
+    """批量获取商品库存，返回 {商品ID: 库存}"""
+    stocks = {}
+    ids = list(product_ids)
+    # SQLite 单条语句的参数个数有限，分批查询
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        stocks.update(db.query(Product.id, Product.stock).filter(Product.id.in_(chunk)).all())
+    return stocks
+
+@with_session
+def create_user(db: Session, username: str, email: str, password: str, invite_code: str = None) -> tuple[bool, str]:
     """创建新用户"""
     from models.invite_code import PrivilegeType
-    db = SessionLocal()
     try:
         # 检查用户名和邮箱是否已存在
         if db.query(User).filter(User.username == username).first():
             return False, "用户名已存在"
         if db.query(User).filter(User.email == email).first():
             return False, "邮箱已被注册"
-        
+
         # 确定用户类型
         user_type = PrivilegeType.NORMAL
         invite_code_used = None
-        
+
         if invite_code:
             # 验证并使用邀请码
             privilege_type = use_invite_code(invite_code, None)  # 先传None，后面更新
@@ -68,7 +87,7 @@ def create_user(username: str, email: str, password: str, invite_code: str = Non
                 invite_code_used = invite_code
             else:
                 return False, "邀请码无效或已使用"
-        
+
         # 创建新用户
         password_hash, password_salt = hash_password(password)
         user = User(
@@ -79,146 +98,207 @@ def create_user(username: str, email: str, password: str, invite_code: str = Non
             user_type=user_type,
             invite_code_used=invite_code_used
         )
-        
+
         # 设置管理员权限
         if user_type == PrivilegeType.ADMIN:
             user.is_admin = True
-        
+
         db.add(user)
-        db.commit()
-        db.refresh(user)
-        
+        db.flush()
+
         # 更新邀请码的使用者ID
         if invite_code_used:
             db.query(InviteCode).filter(InviteCode.code == invite_code_used).update(
                 {"used_by_user_id": user.id}
             )
-            db.commit()
-        
+            db.flush()
+
         return True, "用户创建成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"创建用户失败: {str(e)}"
-    finally:
-        db.close()
 
-def verify_user(username: str, password: str) -> User:
+@with_session
+def verify_user(db: Session, username: str, password: str) -> User:
     """验证用户登录"""
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.username == username).first()
-        if user and verify_password(password, user.password_hash):
-            return user
-        return None
-    finally:
-        db.close()
+    user = db.query(User).filter(User.username == username).first()
+    if user and user.check_password(password):
+        # 旧格式或强度不足的哈希在登录成功时透明升级
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.flush()
+        return user
+    return None
 
-def get_user_by_id(user_id: int) -> User:
+@with_session
+def get_user_by_id(db: Session, user_id: int) -> User:
     """通过ID获取用户"""
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.id == user_id).first()
-    finally:
-        db.close()
+    return db.query(User).filter(User.id == user_id).first()
 
-def update_user_points(user_id: int, points: float) -> User:
-    """更新用户积分"""
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            user.points += points
-            db.commit()
-            db.refresh(user)
-        return user
-    finally:
-        db.close()
+@with_session
+def update_user_points(db: Session, user_id: int, points: float, type: str = "recharge",
+                       description: str = "积分充值") -> User:
+    """增加（points 为负时扣除）用户积分，通过积分账本记账"""
+    create_points_transaction(user_id, points, type, description)
+    user = db.query(User).filter(User.id == user_id).first()
+    db.refresh(user)
+    return user
 
-def create_points_transaction(user_id: int, amount: float, type: str, description: str) -> PointsTransaction:
-    """创建积分交易记录"""
-    db = SessionLocal()
-    try:
-        transaction = PointsTransaction(
-            user_id=user_id,
-            amount=amount,
-            type=type,
-            description=description
-        )
-        db.add(transaction)
-        db.commit()
-        db.refresh(transaction)
-        return transaction
-    finally:
-        db.close()
+@with_session
+def create_points_transaction(db: Session, user_id: int, amount: float, type: str, description: str) -> PointsTransaction:
+    """记一笔积分交易
+
+    用户积分只通过这里变动：在同一事务内更新 User.points（扣除后不能为负）、
+    写入交易记录，并在积分账本中记两条金额相反的分录，
+    用户账户一条，交易类型对应的系统账户一条。
+    用户每记满 SNAPSHOT_INTERVAL 笔分录保存一次余额快照。
+    """
+    counter_account = LEDGER_ACCOUNTS.get(type)
+    if counter_account is None:
+        raise ValueError(f"未知的积分交易类型: {type}")
+
+    query = db.query(User).filter(User.id == user_id)
+    if amount < 0:
+        query = query.filter(User.points >= -amount)
+    if query.update({User.points: User.points + amount}, synchronize_session=False) != 1:
+        if db.query(User.id).filter(User.id == user_id).first() is None:
+            raise ValueError("用户不存在")
+        raise ValueError("积分不足")
+
+    transaction = PointsTransaction(
+        user_id=user_id,
+        amount=amount,
+        type=type,
+        description=description
+    )
+    db.add(transaction)
+    db.flush()
+
+    # 上面的 UPDATE 已经锁住用户行，并发记账时序号不会重复
+    last_seq = db.query(PointsLedgerEntry.seq).filter(PointsLedgerEntry.user_id == user_id)\
+        .order_by(PointsLedgerEntry.seq.desc()).limit(1).scalar()
+    seq = (last_seq or 0) + 1
+    db.execute(PointsLedgerEntry.__table__.insert(), [
+        {"transaction_id": transaction.id, "account": LEDGER_USER, "user_id": user_id,
+         "seq": seq, "amount": amount},
+        {"transaction_id": transaction.id, "account": counter_account, "user_id": None,
+         "seq": None, "amount": -amount},
+    ])
+    if seq % SNAPSHOT_INTERVAL == 0:
+        balance = db.query(User.points).filter(User.id == user_id).scalar()
+        db.add(PointsSnapshot(user_id=user_id, seq=seq, balance=balance))
+    db.flush()
+    db.refresh(transaction)
+    aggregates.record_points(db, transaction.created_at.date(), amount)
+    return transaction
+
+@with_session
+def get_points_balance(db: Session, user_id: int, at: datetime = None) -> float:
+    """用户积分余额；给出 at 时返回该时刻的余额
+
+    当前余额直接读取 User.points。历史余额先按索引找到 at 之前的最后一笔分录，
+    再从它之前最近的快照加上之后的分录（不超过 SNAPSHOT_INTERVAL 笔）。
+    """
+    if at is None:
+        return db.query(User.points).filter(User.id == user_id).scalar()
+    seq = db.query(PointsLedgerEntry.seq).filter(
+        PointsLedgerEntry.user_id == user_id,
+        PointsLedgerEntry.created_at <= at
+    ).order_by(PointsLedgerEntry.created_at.desc(), PointsLedgerEntry.seq.desc()).limit(1).scalar()
+    if seq is None:
+        return 0
+    snapshot = db.query(PointsSnapshot.seq, PointsSnapshot.balance).filter(
+        PointsSnapshot.user_id == user_id,
+        PointsSnapshot.seq <= seq
+    ).order_by(PointsSnapshot.seq.desc()).first()
+    base_seq, balance = snapshot or (0, 0)
+    total = db.query(func.sum(PointsLedgerEntry.amount)).filter(
+        PointsLedgerEntry.user_id == user_id,
+        PointsLedgerEntry.seq > base_seq,
+        PointsLedgerEntry.seq <= seq
+    ).scalar()
+    return balance + (total or 0)
 
-def get_user_transactions(user_id: int) -> list:
+@with_session
+def get_user_transactions(db: Session, user_id: int) -> list:
     """获取用户积分交易记录"""
-    db = SessionLocal()
-    try:
-        return db.query(PointsTransaction).filter(
-            PointsTransaction.user_id == user_id
-        ).order_by(PointsTransaction.created_at.desc()).all()
-    finally:
-        db.close()
+    return db.query(PointsTransaction).filter(
+        PointsTransaction.user_id == user_id
+    ).order_by(PointsTransaction.created_at.desc()).all()
 
-def bind_steam_account(user_id: int, steam_id: str, steam_name: str) -> SteamBinding:
+@with_session
+def bind_steam_account(db: Session, user_id: int, steam_id: str, steam_name: str,
+                       steam_avatar: str = None) -> SteamBinding:
     """绑定Steam账号"""
-    db = SessionLocal()
-    try:
-        # 检查是否已绑定
-        existing = db.query(SteamBinding).filter(
-            SteamBinding.steam_id == steam_id
-        ).first()
-        if existing:
-            raise ValueError("该Steam账号已被绑定")
-        
-        binding = SteamBinding(
-            user_id=user_id,
-            steam_id=steam_id,
-            steam_name=steam_name
-        )
-        db.add(binding)
-        db.commit()
-        db.refresh(binding)
-        return binding
-    finally:
-        db.close()
+    # 检查是否已绑定
+    existing = db.query(SteamBinding).filter(
+        SteamBinding.steam_id == steam_id
+    ).first()
+    if existing:
+        raise ValueError("该Steam账号已被绑定")
 
-def get_steam_binding(user_id: int) -> SteamBinding:
+    binding = SteamBinding(
+        user_id=user_id,
+        steam_id=steam_id,
+        steam_name=steam_name,
+        steam_avatar=steam_avatar
+    )
+    db.add(binding)
+    db.flush()
+    db.refresh(binding)
+    return binding
+
+@with_session
+def get_steam_binding(db: Session, user_id: int) -> SteamBinding:
     """获取用户的Steam绑定信息"""
-    db = SessionLocal()
-    try:
-        return db.query(SteamBinding).filter(
-            SteamBinding.user_id == user_id
-        ).first()
-    finally:
-        db.close()
+    return db.query(SteamBinding).filter(
+        SteamBinding.user_id == user_id
+    ).first()
 
-def get_cart_items(user_id: int) -> list:
+@with_session
+def get_steam_binding_chunk(db: Session, after_id: int = 0, limit: int = 1000) -> list:
+    """按 id 顺序读取 id 大于 after_id 的一批 (id, steam_id)，用于分块遍历全部绑定"""
+    return db.query(SteamBinding.id, SteamBinding.steam_id).filter(
+        SteamBinding.id > after_id
+    ).order_by(SteamBinding.id).limit(limit).all()
+
+@with_session
+def bulk_update_steam_profiles(db: Session, profiles: list) -> int:
+    """批量更新 Steam 昵称和头像，整批只执行一次 executemany
+
+    profiles: [{'id': 绑定id, 'steam_name': 昵称, 'steam_avatar': 头像URL}, ...]
+    """
+    if not profiles:
+        return 0
+    table = SteamBinding.__table__
+    stmt = table.update().where(table.c.id == bindparam('binding_id')).values(
+        steam_name=bindparam('name'), steam_avatar=bindparam('avatar'))
+    db.execute(stmt, [{'binding_id': p['id'], 'name': p['steam_name'], 'avatar': p['steam_avatar']}
+                      for p in profiles])
+    return len(profiles)
+
+@with_session
+def get_cart_items(db: Session, user_id: int) -> list:
     """获取用户的购物车商品"""
-    db = SessionLocal()
-    try:
-        # 使用joinedload预加载product关联数据，避免DetachedInstanceError
-        from sqlalchemy.orm import joinedload
-        cart_items = db.query(CartItem).options(joinedload(CartItem.product)).filter(CartItem.user_id == user_id).all()
-        # 确保所有关联数据都已加载
-        for item in cart_items:
-            _ = item.product.name  # 触发加载
-            _ = item.product.price
-        return cart_items
-    finally:
-        db.close()
+    # 使用joinedload预加载product关联数据，避免DetachedInstanceError
+    from sqlalchemy.orm import joinedload
+    cart_items = db.query(CartItem).options(joinedload(CartItem.product)).filter(CartItem.user_id == user_id).all()
+    # 确保所有关联数据都已加载
+    for item in cart_items:
+        _ = item.product.name  # 触发加载
+        _ = item.product.price
+    return cart_items
 
-def add_to_cart(user_id: int, product_id: int, quantity: int = 1) -> tuple[bool, str]:
+@with_session
+def add_to_cart(db: Session, user_id: int, product_id: int, quantity: int = 1) -> tuple[bool, str]:
     """添加商品到购物车"""
-    db = SessionLocal()
     try:
         # 检查商品是否已在购物车中
         cart_item = db.query(CartItem).filter(
             CartItem.user_id == user_id,
             CartItem.product_id == product_id
         ).first()
-        
+
         if cart_item:
             cart_item.quantity += quantity
             message = "商品数量已更新"
@@ -230,138 +310,460 @@ def add_to_cart(user_id: int, product_id: int, quantity: int = 1) -> tuple[bool,
             )
             db.add(cart_item)
             message = "商品已添加到购物车"
-        
-        db.commit()
-        db.refresh(cart_item)
+
+        db.flush()
         return True, message
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"添加失败: {str(e)}"
-    finally:
-        db.close()
 
-def remove_from_cart(cart_item_id: int) -> bool:
+@with_session
+def remove_from_cart(db: Session, cart_item_id: int) -> bool:
     """从购物车中移除商品"""
-    db = SessionLocal()
-    try:
-        cart_item = db.query(CartItem).filter(CartItem.id == cart_item_id).first()
-        if cart_item:
-            db.delete(cart_item)
-            db.commit()
-            return True
-        return False
-    finally:
-        db.close()
+    cart_item = db.query(CartItem).filter(CartItem.id == cart_item_id).first()
+    if cart_item:
+        db.delete(cart_item)
+        db.flush()
+        return True
+    return False
 
-def update_cart_item(cart_item_id: int, quantity: int) -> tuple[bool, str]:
+@with_session
+def update_cart_item(db: Session, cart_item_id: int, quantity: int) -> tuple[bool, str]:
     """更新购物车商品数量"""
-    db = SessionLocal()
     try:
         cart_item = db.query(CartItem).filter(CartItem.id == cart_item_id).first()
         if not cart_item:
             return False, "购物车商品不存在"
-        
+
         if quantity <= 0:
             return False, "数量必须大于0"
-        
+
         cart_item.quantity = quantity
-        db.commit()
+        db.flush()
         return True, "更新成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"更新失败: {str(e)}"
-    finally:
-        db.close()
 
-def create_order(user_id: int) -> Order:
-    """创建订单"""
-    db = SessionLocal()
-    try:
-        # 获取购物车商品
-        cart_items = db.query(CartItem).filter(CartItem.user_id == user_id).all()
-        if not cart_items:
-            raise ValueError("购物车为空")
-        
-        # 计算总积分并收集商品信息
-        total_points = 0
-        order_items = []
-        for item in cart_items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            if not product or product.stock < item.quantity:
-                raise ValueError(f"商品 {product.name if product else '未知'} 库存不足")
-            
-            total_points += product.price * item.quantity
-            order_items.append({
-                "product_id": product.id,
-                "name": product.name,
-                "price": product.price,
-                "quantity": item.quantity,
-                "subtotal": product.price * item.quantity
-            })
-        
-        # 检查用户积分是否足够
-        user = db.query(User).filter(User.id == user_id).first()
-        if user.points < total_points:
-            raise ValueError("积分不足")
-        
-        # 创建订单
-        order = Order(
-            user_id=user_id,
-            total_points=total_points,
-            status="pending",
-            items=order_items
-        )
-        db.add(order)
-        
-        # 扣除用户积分
-        user.points -= total_points
-        
-        # 更新商品库存
-        for item in cart_items:
-            product = db.query(Product).filter(Product.id == item.product_id).first()
-            product.stock -= item.quantity
-        
-        # 清空购物车
-        db.query(CartItem).filter(CartItem.user_id == user_id).delete()
-        
-        db.commit()
-        db.refresh(order)
-        return order
-    finally:
-        db.close()
+@with_session
+def create_order(db: Session, user_id: int) -> Order:
+    """创建订单
 
-def get_all_users() -> list:
+    在一个事务内完成结账：一次 IN 查询加载购物车中的全部商品，
+    用带条件的 UPDATE 扣减库存，积分通过积分账本扣除，任一条件不满足时整单回滚，
+    并发下单时不会超卖，也不会扣出负积分。
+    """
+    # 获取购物车商品，同一商品的多条记录合并数量
+    cart_items = db.query(CartItem).filter(CartItem.user_id == user_id).all()
+    if not cart_items:
+        raise ValueError("购物车为空")
+    quantities = {}
+    for item in cart_items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+
+    # 一次查询加载所有商品（MySQL 下同时加行锁，SQLite 会忽略 FOR UPDATE）
+    products = {
+        product.id: product
+        for product in db.query(Product).filter(Product.id.in_(quantities)).with_for_update()
+    }
+
+    # 计算总积分并收集商品信息
+    total_points = 0
+    order_items = []
+    for product_id, quantity in quantities.items():
+        product = products.get(product_id)
+        if not product or product.stock < quantity:
+            raise ValueError(f"商品 {product.name if product else '未知'} 库存不足")
+
+        total_points += product.price * quantity
+        order_items.append({
+            "product_id": product.id,
+            "name": product.name,
+            "unit_price": product.price,
+            "quantity": quantity,
+            "subtotal": product.price * quantity,
+            "category": product.category
+        })
+
+    # 扣减库存：库存在读取后可能已被其他订单买走，以 UPDATE 时的值为准
+    for product_id, quantity in quantities.items():
+        updated = db.query(Product).filter(
+            Product.id == product_id,
+            Product.stock >= quantity
+        ).update({Product.stock: Product.stock - quantity}, synchronize_session=False)
+        if updated != 1:
+            raise ValueError(f"商品 {products[product_id].name} 库存不足")
+
+    # 创建订单
+    order = Order(
+        user_id=user_id,
+        total_points=total_points,
+        status="pending"
+    )
+    db.add(order)
+    db.flush()
+
+    # 通过积分账本扣除用户积分，积分不足时抛出 ValueError，整单回滚
+    create_points_transaction(user_id, -total_points, "purchase", f"购买商品（订单 #{order.id}）")
+
+    # 订单明细一次 executemany 写入
+    for item in order_items:
+        item["order_id"] = order.id
+    db.execute(OrderItem.__table__.insert(), order_items)
+
+    # 清空购物车
+    db.query(CartItem).filter(CartItem.user_id == user_id).delete(synchronize_session=False)
+
+    db.flush()
+    db.refresh(order)
+    aggregates.record_order(db, order.id)
+    _ = order.order_items  # 触发加载，会话关闭后仍可读取订单明细
+    return order
+
+@with_session
+def get_all_users(db: Session) -> list:
     """获取所有用户"""
-    db = SessionLocal()
-    try:
-        return db.query(User).all()
-    finally:
-        db.close()
+    return db.query(User).all()
 
-def get_all_products() -> list:
+@with_session
+def get_all_products(db: Session) -> list:
     """获取所有商品"""
-    db = SessionLocal()
-    try:
-        return db.query(Product).all()
-    finally:
-        db.close()
+    return db.query(Product).all()
 
-def get_all_orders() -> list:
+@with_session
+def get_all_orders(db: Session) -> list:
     """获取所有订单"""
-    db = SessionLocal()
+    return db.query(Order).all()
+
+@with_session
+def get_dashboard(db: Session, days: int = 30, top: int = 10) -> dict:
+    """管理后台看板数据，只读取聚合表
+
+    - daily: 最近 days 天每天的 (日期, 订单数, 件数, 销售额)
+    - points: 最近 days 天每天的 (日期, 发放积分, 消耗积分)
+    - top_products: 销量最高的 top 个商品 (商品ID, 名称, 件数, 销售额)
+    - categories: 各分类 (分类, 件数, 销售额)，按销售额从高到低
+    - totals: 最近 days 天的合计和累计销售额
+    """
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    daily = db.query(DailySales.day, DailySales.orders, DailySales.units, DailySales.revenue)\
+        .filter(DailySales.day >= since).order_by(DailySales.day).all()
+    points = db.query(DailyPoints.day, DailyPoints.issued, DailyPoints.spent)\
+        .filter(DailyPoints.day >= since).order_by(DailyPoints.day).all()
+    top_products = db.query(ProductSales.product_id, Product.name, ProductSales.units, ProductSales.revenue)\
+        .outerjoin(Product, Product.id == ProductSales.product_id)\
+        .filter(ProductSales.units > 0)\
+        .order_by(ProductSales.units.desc(), ProductSales.product_id.desc()).limit(top).all()
+    # 分类很少，在内存中排序
+    categories = sorted(db.query(CategorySales.category, CategorySales.units, CategorySales.revenue)
+                        .filter(CategorySales.units > 0),
+                        key=lambda row: row[2], reverse=True)
+    return {
+        "daily": [tuple(row) for row in daily],
+        "points": [tuple(row) for row in points],
+        "top_products": [(product_id, name or f"商品 #{product_id}", units, revenue)
+                         for product_id, name, units, revenue in top_products],
+        "categories": [tuple(row) for row in categories],
+        "totals": {
+            "orders": sum(row[1] for row in daily),
+            "units": sum(row[2] for row in daily),
+            "revenue": sum(row[3] for row in daily),
+            "points_issued": sum(row[1] for row in points),
+            "points_spent": sum(row[2] for row in points),
+            "revenue_all_time": sum(row[2] for row in categories),
+        },
+    }
+
+@with_session
+def rebuild_dashboard(db: Session):
+    """从订单和积分记录重新计算看板聚合表"""
+    aggregates.rebuild(db)
+    db.flush()
+
+@with_session
+def record_order_sales(db: Session, order_id: int, sign: int = 1):
+    """订单计入（sign=-1 时扣出）看板销售统计，用于订单取消或恢复"""
+    aggregates.record_order(db, order_id, sign)
+    db.flush()
+
+@with_session
+def get_product_sales(db: Session, product_ids: list = None) -> dict:
+    """按商品统计销量，返回 {商品ID: (销售数量, 销售积分)}
+
+    直接在 order_items 上分组汇总，不加载订单；已取消的订单不计入。
+    product_ids 为 None 时统计所有商品。
+    """
+    query = db.query(OrderItem.product_id, func.sum(OrderItem.quantity), func.sum(OrderItem.subtotal))\
+        .join(Order, Order.id == OrderItem.order_id)\
+        .filter(Order.status != "cancelled")
+    if product_ids is not None:
+        query = query.filter(OrderItem.product_id.in_(list(product_ids)))
+    return {product_id: (quantity, revenue)
+            for product_id, quantity, revenue in query.group_by(OrderItem.product_id)}
+
+@with_session
+def get_product_buyers(db: Session, product_id: int) -> list:
+    """购买过某商品的用户，返回 [(用户ID, 用户名, 购买数量)]，按数量从多到少排列"""
+    quantity = func.sum(OrderItem.quantity).label("quantity")
+    return db.query(User.id, User.username, quantity)\
+        .select_from(OrderItem)\
+        .join(Order, Order.id == OrderItem.order_id)\
+        .join(User, User.id == Order.user_id)\
+        .filter(OrderItem.product_id == product_id, Order.status != "cancelled")\
+        .group_by(User.id, User.username)\
+        .order_by(quantity.desc(), User.id)\
+        .all()
+
+class Page:
+    """分页查询结果
+
+    items 为当前页数据；next_cursor 为下一页的游标字符串，没有下一页时为None。
+    """
+    def __init__(self, items: list, next_cursor: Optional[str] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    """将(排序值, id)编码为可在界面和API间传递的游标"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    elif isinstance(sort_value, enum.Enum):
+        sort_value = sort_value.name
+    raw = json.dumps([sort_value, row_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str, column) -> tuple:
+    """解码游标，按列类型还原排序值"""
     try:
-        return db.query(Order).all()
-    finally:
-        db.close()
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("无效的分页游标")
+    if sort_value is not None and isinstance(column.type, DateTime):
+        sort_value = datetime.fromisoformat(sort_value)
+    elif sort_value is not None and getattr(column.type, "enum_class", None) is not None:
+        sort_value = column.type.enum_class[sort_value]
+    return sort_value, row_id
+
+def _apply_filters(query, model, filters: dict):
+    """等值过滤，值为列表/元组时使用IN，值为None的条件忽略"""
+    for name, value in (filters or {}).items():
+        if value is None:
+            continue
+        column = getattr(model, name)
+        if isinstance(value, (list, tuple, set)):
+            query = query.filter(column.in_(value))
+        else:
+            query = query.filter(column == value)
+    return query
+
+def like_prefix(search: str) -> str:
+    """前缀匹配的 LIKE 模式（转义字符为 /）"""
+    return search.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+
+def _apply_search(query, column, search: Optional[str]):
+    """前缀搜索（LIKE 'xxx%'）
+
+    模式整体作为一个参数传入，SQLite 才能把它改写成范围查询，
+    使用该列上的 NOCASE 索引（column LIKE ? || '%' 的写法只能全表扫描）。
+    """
+    if search:
+        query = query.filter(column.like(like_prefix(search), escape="/"))
+    return query
+
+def _after_cursor(column, pk, last_value, last_id, descending: bool):
+    """排在游标(last_value, last_id)之后的行
+
+    SQLite 升序时 NULL 排在最前，降序时排在最后；NULL 不能用 < > 比较，需单独处理。
+    布尔列不支持大小比较，按 0/1 整数比较。
+    """
+    if isinstance(column.type, Boolean):
+        column = type_coerce(column, Integer)
+        if last_value is not None:
+            last_value = int(last_value)
+    if last_value is None:
+        same_null = and_(column.is_(None), pk < last_id if descending else pk > last_id)
+        # 降序时 NULL 已是最后一段；升序时其后还有全部非 NULL 的行
+        return same_null if descending else or_(same_null, column.isnot(None))
+    if descending:
+        return or_(column < last_value,
+                   and_(column == last_value, pk < last_id),
+                   column.is_(None))
+    return or_(column > last_value,
+               and_(column == last_value, pk > last_id))
 
-def create_product(name: str, description: str, price: float, stock: int, category: str) -> tuple[bool, str]:
+def _keyset_page(query, model, sort: str, descending: bool, cursor: Optional[str], page_size: int) -> Page:
+    """按(sort, id)做键集分页
+
+    不使用OFFSET，翻到第几页都只读取 page_size + 1 行。
+    """
+    if sort not in model.__table__.columns:
+        raise ValueError(f"不支持的排序字段: {sort}")
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    column = getattr(model, sort)
+    pk = model.id
+
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, column)
+        if sort == "id":
+            query = query.filter(pk < last_id if descending else pk > last_id)
+        else:
+            query = query.filter(_after_cursor(column, pk, last_value, last_id, descending))
+
+    if sort == "id":
+        order_by = [pk.desc() if descending else pk.asc()]
+    elif descending:
+        order_by = [column.desc(), pk.desc()]
+    else:
+        order_by = [column.asc(), pk.asc()]
+
+    rows = query.order_by(*order_by).limit(page_size + 1).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort), last.id)
+    return Page(rows, next_cursor)
+
+def _count(db: Session, model, filters: dict, search_column=None, search: str = None) -> int:
+    """SELECT COUNT(id)，不加载任何行"""
+    query = _apply_filters(db.query(func.count(model.id)), model, filters)
+    return _apply_search(query, search_column, search).scalar()
+
+@with_session
+def paginate_products(db: Session, cursor: str = None, page_size: int = 50, category: str = None,
+                      is_active: bool = None, search: str = None, sort: str = "id",
+                      descending: bool = False) -> Page:
+    """分页获取商品，search 按商品名前缀匹配"""
+    filters = {"category": category, "is_active": is_active}
+    query = _apply_filters(db.query(Product), Product, filters)
+    query = _apply_search(query, Product.name, search)
+    return _keyset_page(query, Product, sort, descending, cursor, page_size)
+
+@with_session
+def search_products(db: Session, query: str, category: str = None, cursor: str = None,
+                    page_size: int = 50) -> Page:
+    """全文搜索上架的商品，按相关度（bm25）排序
+
+    英文、数字按单词前缀匹配，中文按相连的字匹配；名称的权重最高，其次是分类、描述。
+    相关度不是表中的列，无法做键集分页，游标记录的是已读取的行数；
+    搜索结果通常只翻前几页。没有可搜索的词时返回空页。
+    """
+    match = product_search.match_query(query)
+    if match is None:
+        return Page([])
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    try:
+        offset = int(cursor) if cursor else 0
+    except ValueError:
+        raise ValueError("无效的分页游标")
+
+    fts = product_search.products_fts
+    rows = db.query(Product)\
+        .select_from(fts)\
+        .join(Product, Product.id == fts.c.rowid)\
+        .filter(product_search.matches(match), Product.is_active == True)
+    rows = _apply_filters(rows, Product, {"category": category})\
+        .order_by(fts.c.rank)\
+        .offset(offset)\
+        .limit(page_size + 1)\
+        .all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = str(offset + page_size)
+    return Page(rows, next_cursor)
+
+@with_session
+def get_search_facets(db: Session, query: str) -> list:
+    """搜索结果按分类计数：[(分类, 商品数), ...]，商品多的分类在前
+
+    用于在搜索框旁边显示各分类的结果数，选中分类后再调用 search_products(category=...)。
+    """
+    match = product_search.match_query(query)
+    if match is None:
+        return []
+    fts = product_search.products_fts
+    count = func.count(Product.id)
+    rows = db.query(Product.category, count)\
+        .select_from(fts)\
+        .join(Product, Product.id == fts.c.rowid)\
+        .filter(product_search.matches(match), Product.is_active == True)\
+        .group_by(Product.category)\
+        .all()
+    # 分类只有几个，在 Python 中排序
+    return sorted(((category, n) for category, n in rows), key=lambda row: (-row[1], row[0] or ""))
+
+@with_session
+def paginate_orders(db: Session, cursor: str = None, page_size: int = 50, user_id: int = None,
+                    status: str = None, sort: str = "created_at", descending: bool = True) -> Page:
+    """分页获取订单，默认按创建时间倒序"""
+    from sqlalchemy.orm import joinedload, selectinload
+    filters = {"user_id": user_id, "status": status}
+    # 预加载下单用户和订单明细，会话关闭后界面仍可读取 order.user / order.order_items
+    query = db.query(Order).options(joinedload(Order.user), selectinload(Order.order_items))
+    query = _apply_filters(query, Order, filters)
+    return _keyset_page(query, Order, sort, descending, cursor, page_size)
+
+@with_session
+def paginate_users(db: Session, cursor: str = None, page_size: int = 50, user_type=None,
+                   is_admin: bool = None, is_banned: bool = None, search: str = None,
+                   sort: str = "id", descending: bool = False) -> Page:
+    """分页获取用户，search 按用户名前缀匹配"""
+    filters = {"user_type": user_type, "is_admin": is_admin, "is_banned": is_banned}
+    query = _apply_filters(db.query(User), User, filters)
+    query = _apply_search(query, User.username, search)
+    return _keyset_page(query, User, sort, descending, cursor, page_size)
+
+@with_session
+def paginate_user_transactions(db: Session, user_id: int, cursor: str = None, page_size: int = 50,
+                               type: str = None, sort: str = "created_at", descending: bool = True) -> Page:
+    """分页获取用户积分交易记录，默认按时间倒序"""
+    filters = {"user_id": user_id, "type": type}
+    query = _apply_filters(db.query(PointsTransaction), PointsTransaction, filters)
+    return _keyset_page(query, PointsTransaction, sort, descending, cursor, page_size)
+
+@with_session
+def count_products(db: Session, category: str = None, is_active: bool = None, search: str = None) -> int:
+    """统计商品数量"""
+    return _count(db, Product, {"category": category, "is_active": is_active}, Product.name, search)
+
+@with_session
+def count_orders(db: Session, user_id: int = None, status: str = None) -> int:
+    """统计订单数量"""
+    return _count(db, Order, {"user_id": user_id, "status": status})
+
+@with_session
+def count_users(db: Session, user_type=None, is_admin: bool = None, is_banned: bool = None,
+                search: str = None) -> int:
+    """统计用户数量"""
+    filters = {"user_type": user_type, "is_admin": is_admin, "is_banned": is_banned}
+    return _count(db, User, filters, User.username, search)
+
+@with_session
+def count_user_transactions(db: Session, user_id: int, type: str = None) -> int:
+    """统计用户积分交易记录数量"""
+    return _count(db, PointsTransaction, {"user_id": user_id, "type": type})
+
+@with_session
+def create_product(db: Session, name: str, description: str, price: float, stock: int, category: str) -> tuple[bool, str]:
     """创建新商品"""
-    db = SessionLocal()
     try:
         # 检查商品名是否已存在
         if db.query(Product).filter(Product.name == name).first():
             return False, "商品名已存在"
-        
+
         # 创建新商品
         product = Product(
             name=name,
@@ -371,169 +773,214 @@ def create_product(name: str, description: str, price: float, stock: int, catego
             category=category
         )
         db.add(product)
-        db.commit()
-        db.refresh(product)
+        db.flush()
         return True, "商品创建成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"创建商品失败: {str(e)}"
-    finally:
-        db.close()
 
-def update_product(product_id: int, **kwargs) -> tuple[bool, str]:
+@with_session
+def update_product(db: Session, product_id: int, **kwargs) -> tuple[bool, str]:
     """更新商品信息"""
-    db = SessionLocal()
     try:
         product = db.query(Product).filter(Product.id == product_id).first()
         if not product:
             return False, "商品不存在"
-        
+
         # 如果更新名称，检查新名称是否与其他商品重复
         if 'name' in kwargs and kwargs['name'] != product.name:
             if db.query(Product).filter(Product.name == kwargs['name']).first():
                 return False, "商品名已存在"
-        
+
         # 更新商品信息
         for key, value in kwargs.items():
             if hasattr(product, key):
                 setattr(product, key, value)
-        
-        db.commit()
-        db.refresh(product)
+
+        db.flush()
         return True, "商品更新成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"更新商品失败: {str(e)}"
-    finally:
-        db.close()
 
-def delete_product(product_id: int) -> tuple[bool, str]:
+@with_session
+def delete_product(db: Session, product_id: int) -> tuple[bool, str]:
     """删除商品"""
-    db = SessionLocal()
     try:
         product = db.query(Product).filter(Product.id == product_id).first()
         if not product:
             return False, "商品不存在"
-        
+
         db.delete(product)
-        db.commit()
+        db.flush()
         return True, "商品删除成功"
     except Exception as e:
-        db.rollback()
+        rollback(db)
         return False, f"删除商品失败: {str(e)}"
-    finally:
-        db.close()
 
-def get_user_by_username(username: str) -> User:
+@with_session
+def get_user_by_username(db: Session, username: str) -> User:
     """根据用户名获取用户信息"""
-    db = SessionLocal()
-    try:
-        return db.query(User).filter(User.username == username).first()
-    finally:
-        db.close()
+    return db.query(User).filter(User.username == username).first()
 
-def get_user_points_transactions(user_id: int) -> List[PointsTransaction]:
+@with_session
+def get_user_points_transactions(session: Session, user_id: int) -> List[PointsTransaction]:
     """
     获取用户的积分交易记录
-    
+
     Args:
         user_id: 用户ID
-        
+
     Returns:
         List[PointsTransaction]: 积分交易记录列表
     """
-    session = SessionLocal()
-    try:
-        transactions = session.query(PointsTransaction)\
-            .filter_by(user_id=user_id)\
-            .order_by(PointsTransaction.created_at.desc())\
-            .all()
-        return transactions
-    finally:
-        session.close()
+    transactions = session.query(PointsTransaction)\
+        .filter_by(user_id=user_id)\
+        .order_by(PointsTransaction.created_at.desc())\
+        .all()
+    return transactions
 
-def unbind_steam_account(user_id: int) -> bool:
+@with_session
+def unbind_steam_account(db: Session, user_id: int) -> bool:
     """解绑Steam账号"""
-    db = SessionLocal()
-    try:
-        binding = db.query(SteamBinding).filter(
-            SteamBinding.user_id == user_id
-        ).first()
-        
-        if binding:
-            db.delete(binding)
-            db.commit()
-            return True
-        return False
-    finally:
-        db.close()
+    binding = db.query(SteamBinding).filter(
+        SteamBinding.user_id == user_id
+    ).first()
+
+    if binding:
+        db.delete(binding)
+        db.flush()
+        return True
+    return False
 
-def update_user_avatar(user_id: int, avatar_path: str) -> bool:
+@with_session
+def update_user_avatar(db: Session, user_id: int, avatar_path: str) -> bool:
     """
     更新用户头像
-    
+
     Args:
         user_id: 用户ID
         avatar_path: 头像文件路径
-        
+
     Returns:
         bool: 更新是否成功
     """
-    db = SessionLocal()
     try:
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             return False
-            
+
         user.avatar = avatar_path
-        db.commit()
+        db.flush()
         return True
     except Exception as e:
-        db.rollback()
+        rollback(db)
         print(f"更新用户头像失败: {str(e)}")
         return False
-    finally:
-        db.close()
 
-def delete_all_users():
+@with_session
+def delete_all_users(db: Session):
     """
     删除所有用户及其相关数据（Steam绑定、积分记录、购物车、订单等）。
     """
-    db = SessionLocal()
     try:
         db.query(SteamBinding).delete()
+        db.query(PointsSnapshot).delete()
+        db.query(PointsLedgerEntry).delete()
         db.query(PointsTransaction).delete()
         db.query(CartItem).delete()
+        db.query(OrderItem).delete()
         db.query(Order).delete()
         db.query(User).delete()
-        db.commit()
+        aggregates.rebuild(db)
+        db.flush()
         return True
     except Exception as e:
-        db.rollback()
+        rollback(db)
         print(f"删除所有用户失败: {str(e)}")
         return False
-    finally:
-        db.close()
 
-def delete_demo_data():
+@with_session
+def delete_demo_data(db: Session):
     """
-    删除所有商品、购物车、订单、积分、Steam绑定等演示数据。
+    删除所有商品、购物车、订单、积分记录、Steam绑定等演示数据（用户的积分余额保留）。
     """
-    db = SessionLocal()
     try:
         db.query(CartItem).delete()
+        db.query(OrderItem).delete()
         db.query(Order).delete()
         db.query(Product).delete()
+        db.query(PointsSnapshot).delete()
+        db.query(PointsLedgerEntry).delete()
         db.query(PointsTransaction).delete()
         db.query(SteamBinding).delete()
-        db.commit()
+        # 积分记录删除后，用户现有的积分重新记为期初余额
+        open_points_balances(db.connection())
+        aggregates.rebuild(db)
+        db.flush()
         return True
     except Exception as e:
-        db.rollback()
+        rollback(db)
         print(f"删除演示数据失败: {str(e)}")
         return False
-    finally:
-        db.close()
+
+@with_session
+def reconcile_points(db: Session, tolerance: float = 1e-6) -> dict:
+    """核对积分账本和用户余额
+
+    按用户 ID 顺序同时遍历用户、用户账户的分录和快照，一次流式读取完成核对，
+    内存占用与用户数无关。检查：
+    - mismatches: 余额与分录合计不符的用户 [(用户ID, User.points, 分录合计)]
+    - gaps: 分录序号不连续（分录被删除）的用户 [用户ID]
+    - bad_snapshots: 与分录累计不符的快照 [(用户ID, seq, 快照余额, 分录累计)]
+    - unbalanced: 借贷不平（两条分录合计不为 0）的交易 [交易ID]
+    """
+    report = {"users": 0, "entries": 0, "mismatches": [], "gaps": [],
+              "bad_snapshots": [], "unbalanced": []}
+    users = db.execute(select(User.id, User.points).order_by(User.id)
+                       .execution_options(stream_results=True))
+    entries = db.execute(select(PointsLedgerEntry.user_id, PointsLedgerEntry.seq, PointsLedgerEntry.amount)
+                         .where(PointsLedgerEntry.user_id.isnot(None))
+                         .order_by(PointsLedgerEntry.user_id, PointsLedgerEntry.seq)
+                         .execution_options(stream_results=True))
+    snapshots = db.execute(select(PointsSnapshot.user_id, PointsSnapshot.seq, PointsSnapshot.balance)
+                           .order_by(PointsSnapshot.user_id, PointsSnapshot.seq)
+                           .execution_options(stream_results=True))
+    entry_groups = groupby(entries, key=lambda row: row[0])
+    snapshot_groups = groupby(snapshots, key=lambda row: row[0])
+    entry_group = next(entry_groups, None)
+    snapshot_group = next(snapshot_groups, None)
+
+    for user_id, points in users:
+        report["users"] += 1
+        # 跳过已删除用户留下的分组
+        while entry_group is not None and entry_group[0] < user_id:
+            entry_group = next(entry_groups, None)
+        while snapshot_group is not None and snapshot_group[0] < user_id:
+            snapshot_group = next(snapshot_groups, None)
+        user_snapshots = {}
+        if snapshot_group is not None and snapshot_group[0] == user_id:
+            user_snapshots = {seq: balance for _, seq, balance in snapshot_group[1]}
+        user_entries = entry_group[1] if entry_group is not None and entry_group[0] == user_id else ()
+
+        running = 0
+        expected_seq = 1
+        for _, seq, amount in user_entries:
+            report["entries"] += 1
+            running += amount
+            if seq != expected_seq and user_id not in report["gaps"][-1:]:
+                report["gaps"].append(user_id)
+            expected_seq = seq + 1
+            balance = user_snapshots.get(seq)
+            if balance is not None and abs(balance - running) > tolerance:
+                report["bad_snapshots"].append((user_id, seq, balance, running))
+        if abs((points or 0) - running) > tolerance:
+            report["mismatches"].append((user_id, points, running))
+
+    report["unbalanced"] = [transaction_id for transaction_id, in db.query(PointsLedgerEntry.transaction_id)
+                            .group_by(PointsLedgerEntry.transaction_id)
+                            .having(func.abs(func.sum(PointsLedgerEntry.amount)) > tolerance)]
+    return report
 
 def reset_all_data():
     """重置所有数据"""
@@ -544,141 +991,125 @@ def reset_all_data():
         print(f"重置数据失败: {str(e)}")
         return False
 
-def update_user_info(user_id: int, username: str = None, email: str = None, password: str = None) -> bool:
+@with_session
+def update_user_info(db: Session, user_id: int, username: str = None, email: str = None, password: str = None) -> bool:
     """
     更新用户信息
-    
+
     Args:
         user_id: 用户ID
         username: 新用户名（可选）
         email: 新邮箱（可选）
         password: 新密码（可选）
-        
+
     Returns:
         bool: 更新是否成功
     """
-    db = SessionLocal()
     try:
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             return False
-            
+
         if username:
             # 检查用户名是否已存在
             existing = db.query(User).filter(User.username == username, User.id != user_id).first()
             if existing:
                 raise ValueError("用户名已存在")
             user.username = username
-            
+
         if email:
             # 检查邮箱是否已被使用
             existing = db.query(User).filter(User.email == email, User.id != user_id).first()
             if existing:
                 raise ValueError("邮箱已被使用")
             user.email = email
-            
+
         if password:
             user.set_password(password)
-            
-        db.commit()
+
+        db.flush()
         return True
     except Exception as e:
-        db.rollback()
+        rollback(db)
         print(f"更新用户信息失败: {str(e)}")
         return False
-    finally:
-        db.close()
 
 def generate_invite_code(length=8):
     """生成随机邀请码"""
     chars = string.ascii_uppercase + string.digits
     return ''.join(random.choice(chars) for _ in range(length))
 
-def create_invite_code(privilege_type=None):
+@with_session
+def create_invite_code(db: Session, privilege_type=None):
     """创建新的邀请码"""
     from models.invite_code import PrivilegeType
-    db = SessionLocal()
-    try:
-        code = generate_invite_code()
-        if privilege_type is None:
-            privilege_type = PrivilegeType.NORMAL
-        invite_code = InviteCode(code=code, privilege_type=privilege_type)
-        db.add(invite_code)
-        db.commit()
-        db.refresh(invite_code)
-        return invite_code
-    finally:
-        db.close()
+    code = generate_invite_code()
+    if privilege_type is None:
+        privilege_type = PrivilegeType.NORMAL
+    invite_code = InviteCode(code=code, privilege_type=privilege_type)
+    db.add(invite_code)
+    db.flush()
+    db.refresh(invite_code)
+    return invite_code
 
-def get_invite_codes():
+@with_session
+def get_invite_codes(db: Session):
     """获取所有邀请码"""
-    db = SessionLocal()
-    try:
-        return db.query(InviteCode).all()
-    finally:
-        db.close()
+    return db.query(InviteCode).all()
 
-def use_invite_code(code, user_id):
+@with_session
+def use_invite_code(db: Session, code, user_id):
     """使用邀请码"""
-    db = SessionLocal()
-    try:
-        invite_code = db.query(InviteCode).filter(InviteCode.code == code, InviteCode.is_used == False).first()
-        if invite_code:
-            invite_code.is_used = True
-            invite_code.used_at = func.now()
-            invite_code.used_by_user_id = user_id
-            db.commit()
-            return invite_code.privilege_type
-        return None
-    finally:
-        db.close()
+    invite_code = db.query(InviteCode).filter(InviteCode.code == code, InviteCode.is_used == False).first()
+    if invite_code:
+        invite_code.is_used = True
+        invite_code.used_at = func.now()
+        invite_code.used_by_user_id = user_id
+        db.flush()
+        return invite_code.privilege_type
+    return None
 
-def verify_invite_code(code):
+@with_session
+def verify_invite_code(db: Session, code):
     from models.invite_code import InviteCode
-    db = SessionLocal()
-    try:
-        invite = db.query(InviteCode).filter(InviteCode.code == code, InviteCode.is_used == False).first()
-        return invite is not None
-    finally:
-        db.close()
+    invite = db.query(InviteCode).filter(InviteCode.code == code, InviteCode.is_used == False).first()
+    return invite is not None
 
-def delete_invite_code(invite_id: int) -> bool:
+@with_session
+def delete_invite_code(db: Session, invite_id: int) -> bool:
     """根据ID删除邀请码"""
-    db = SessionLocal()
     try:
         code = db.query(InviteCode).filter(InviteCode.id == invite_id).first()
         if code:
             db.delete(code)
-            db.commit()
+            db.flush()
             return True
         return False
     except Exception as e:
-        db.rollback()
+        rollback(db)
         print(f"删除邀请码失败: {str(e)}")
         return False
-    finally:
-        db.close()
 
 # 在文件末尾添加以下函数
 
-def create_admin_user_with_permissions(username, email, password, permissions):
+@with_session
+def create_admin_user_with_permissions(session: Session, username, email, password, permissions):
     """创建具有特定权限的管理员用户"""
-    session = SessionLocal()
     try:
         # 检查用户名是否已存在
         existing_user = session.query(User).filter_by(username=username).first()
         if existing_user:
             return False, "用户名已存在"
-        
+
         # 检查邮箱是否已存在
         existing_email = session.query(User).filter_by(email=email).first()
         if existing_email:
             return False, "邮箱已被使用"
-        
+
         # 创建新管理员
         from utils.password import hash_password
         password_hash, salt = hash_password(password)
-        
+
         new_admin = User(
             username=username,
             email=email,
@@ -687,34 +1118,32 @@ def create_admin_user_with_permissions(username, email, password, permissions):
             is_admin=True,
             permissions=json.dumps(permissions)
         )
-        
+
         session.add(new_admin)
-        session.commit()
+        session.flush()
         return True, f"管理员 {username} 创建成功"
-        
+
     except Exception as e:
-        session.rollback()
+        rollback(session)
         return False, f"创建管理员失败: {str(e)}"
-    finally:
-        session.close()
 
 def validate_email_existence(email):
     """验证邮箱格式和存在性"""
     import re
     import dns.resolver
-    
+
     # 基本邮箱格式验证
     email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     if not re.match(email_pattern, email):
         return False
-    
+
     try:
         # 提取域名
         domain = email.split('@')[1]
-        
+
         # 检查MX记录
         mx_records = dns.resolver.resolve(domain, 'MX')
         return len(mx_records) > 0
     except:
         # 如果DNS查询失败，只进行格式验证
-        return True
\ No newline at end of file
+        return True
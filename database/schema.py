@@ -0,0 +1,234 @@
+"""数据库结构版本管理
+
+schema_version 表记录已经执行过的迁移，启动时只需检查一次这张表：
+
+- 数据库已是最新：什么也不做；
+- 新数据库：直接建表，并把所有迁移记为已执行；
+- 旧版本的数据库（没有 schema_version 表）：从头执行所有迁移，
+  每个迁移都检查后再修改，可以安全地重复执行。
+
+迁移分两类。建表、加字段等结构变更由 upgrade() 在显示界面之前完成；
+deferred=True 的维护任务（例如回填看板聚合表）由 upgrade() 返回，
+调用方在主窗口显示后用 run_deferred() 放到后台线程执行。此时用户已经可以下单，
+延后的迁移不能删除或覆盖用户会修改的数据，删除数据的迁移必须在显示界面之前执行。
+
+新增迁移时在 MIGRATIONS 末尾追加，编号递增，不要修改已经发布的迁移。
+"""
+import json
+import logging
+from collections import namedtuple
+from sqlalchemy import inspect, insert, select, text
+from database.db_init import Base, engine, load_models
+from models.schema_version import SchemaVersion
+from models.order_item import OrderItem
+from models.points import PointsLedgerEntry, PointsSnapshot, LEDGER_USER, LEDGER_ACCOUNTS
+from models.dashboard import DailySales, ProductSales, CategorySales, DailyPoints
+from database.aggregates import rebuild as rebuild_aggregates
+from database import search
+
+logger = logging.getLogger(__name__)
+
+# apply(conn) 在迁移自己的事务中执行，成功后记录版本
+Migration = namedtuple("Migration", "version description apply deferred")
+
+# 转换订单明细时每批读取的订单数
+ORDER_ITEMS_CHUNK = 1000
+
+def add_column(conn, table, column, ddl):
+    """表中没有该字段时添加，返回是否添加"""
+    if column in {col["name"] for col in inspect(conn).get_columns(table)}:
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+def _create_tables(conn):
+    load_models()
+    Base.metadata.create_all(bind=conn)
+
+def _add_password_salt(conn):
+    # 原 migrate_add_password_salt.py
+    add_column(conn, "users", "password_salt", "VARCHAR(128)")
+
+def _add_steam_avatar(conn):
+    # Steam 资料批量刷新（utils.steam_refresh）写入的头像字段
+    add_column(conn, "steam_bindings", "steam_avatar", "VARCHAR(255)")
+
+def _add_user_types(conn):
+    # 原 database/migrate_user_types.py；Enum 字段保存的是枚举名
+    add_column(conn, "invite_codes", "privilege_type", "VARCHAR(20) DEFAULT 'NORMAL' NOT NULL")
+    add_column(conn, "invite_codes", "used_by_user_id", "INTEGER")
+    if add_column(conn, "users", "user_type", "VARCHAR(20) DEFAULT 'NORMAL' NOT NULL"):
+        conn.execute(text("UPDATE users SET user_type = 'ADMIN' WHERE is_admin = 1"))
+    if add_column(conn, "users", "display_name", "VARCHAR(100)"):
+        conn.execute(text("UPDATE users SET display_name = "
+                          "CASE WHEN is_admin = 1 THEN '管理员 - ' ELSE '普通用户 - ' END || username"))
+    add_column(conn, "users", "invite_code_used", "VARCHAR(20)")
+
+def _create_indexes(conn):
+    # 为已有的表补上模型中定义的索引（购物车、订单、积分记录、商品等）；
+    # 还不存在的表由之后的迁移连同索引一起创建
+    load_models()
+    existing = set(inspect(conn).get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+def _delete_demo_data(conn):
+    # 旧版本每次启动都会调用 delete_demo_data()，升级时在显示界面之前清理一次。
+    # order_items 和积分账本由迁移 7、8 创建，可能还不存在，只清理已有的表；
+    # 账本已存在时把用户现有的积分重新记为期初余额，否则由迁移 8 记入
+    existing = set(inspect(conn).get_table_names())
+    for table in ("cart_items", "order_items", "orders", "products", "points_snapshots", "points_ledger",
+                  "points_transactions", "steam_bindings"):
+        if table in existing:
+            conn.execute(text(f"DELETE FROM {table}"))
+    if "points_ledger" in existing:
+        open_points_balances(conn)
+
+def _convert_order_items(conn):
+    # 订单明细原来以 JSON 保存在 orders.items 中，按 id 分批转换为 order_items 行，
+    # 每批只读取 ORDER_ITEMS_CHUNK 个订单；已经有明细的订单跳过
+    OrderItem.__table__.create(bind=conn, checkfirst=True)
+    if "items" not in {col["name"] for col in inspect(conn).get_columns("orders")}:
+        return
+    query = text("SELECT id, items FROM orders WHERE id > :last_id AND items IS NOT NULL "
+                 "AND NOT EXISTS (SELECT 1 FROM order_items WHERE order_items.order_id = orders.id) "
+                 "ORDER BY id LIMIT :limit")
+    last_id = 0
+    while True:
+        rows = conn.execute(query, {"last_id": last_id, "limit": ORDER_ITEMS_CHUNK}).fetchall()
+        if not rows:
+            break
+        items = []
+        for order_id, raw in rows:
+            for item in json.loads(raw) or []:
+                price = item.get("price") or 0
+                quantity = item.get("quantity") or 0
+                items.append({
+                    "order_id": order_id,
+                    "product_id": item.get("product_id"),
+                    "name": item.get("name") or "",
+                    "unit_price": price,
+                    "quantity": quantity,
+                    "subtotal": item.get("subtotal", price * quantity),
+                })
+        if items:
+            conn.execute(insert(OrderItem), items)
+        last_id = rows[-1][0]
+
+def open_points_balances(conn):
+    """把还没有账本分录的用户的现有积分记为期初余额
+
+    每个用户写一笔 opening 交易和两条分录，全部用 INSERT ... SELECT 完成；
+    已经有分录的用户跳过，可以重复执行。
+    """
+    conn.execute(text(
+        "INSERT INTO points_transactions (user_id, amount, type, description, created_at) "
+        "SELECT id, points, 'opening', '期初余额', CURRENT_TIMESTAMP FROM users "
+        "WHERE points IS NOT NULL AND points != 0 "
+        "AND NOT EXISTS (SELECT 1 FROM points_ledger WHERE points_ledger.user_id = users.id)"))
+    conn.execute(text(
+        "INSERT INTO points_ledger (transaction_id, account, user_id, seq, amount, created_at) "
+        "SELECT id, :account, user_id, 1, amount, created_at FROM points_transactions t "
+        "WHERE type = 'opening' "
+        "AND NOT EXISTS (SELECT 1 FROM points_ledger WHERE points_ledger.user_id = t.user_id)"),
+        {"account": LEDGER_USER})
+    conn.execute(text(
+        "INSERT INTO points_ledger (transaction_id, account, amount, created_at) "
+        "SELECT id, :account, -amount, created_at FROM points_transactions t "
+        "WHERE type = 'opening' AND NOT EXISTS (SELECT 1 FROM points_ledger "
+        "WHERE points_ledger.transaction_id = t.id AND points_ledger.user_id IS NULL)"),
+        {"account": LEDGER_ACCOUNTS["opening"]})
+
+def _create_points_ledger(conn):
+    # 积分原来只记在 users.points 上，交易记录另写且不完整（结账不写记录），
+    # 无法和余额对上；启用账本时把现有余额记为期初余额
+    PointsLedgerEntry.__table__.create(bind=conn, checkfirst=True)
+    PointsSnapshot.__table__.create(bind=conn, checkfirst=True)
+    open_points_balances(conn)
+
+def _create_dashboard_tables(conn):
+    # 看板聚合表在结账和记账时增量更新，必须在显示界面前建好；已有数据由迁移 10 回填
+    for model in (DailySales, ProductSales, CategorySales, DailyPoints):
+        model.__table__.create(bind=conn, checkfirst=True)
+
+def _backfill_dashboard(conn):
+    # 从全部订单和积分记录重新计算，在一个事务内完成，期间的增量更新不会丢失
+    rebuild_aggregates(conn)
+
+def _add_order_item_category(conn):
+    # 按分类的销售统计以下单时的分类为准；已有的明细只能用商品当前的分类补上
+    add_column(conn, "order_items", "category", "VARCHAR(50)")
+    conn.execute(text("UPDATE order_items SET category = (SELECT category FROM products "
+                      "WHERE products.id = order_items.product_id) WHERE category IS NULL"))
+
+def _create_search_index(conn):
+    # 触发器建好后商品的增删改都会同步，已有商品在同一事务内写入索引
+    search.create_index(conn)
+    search.rebuild_index(conn)
+
+MIGRATIONS = [
+    Migration(1, "创建数据表", _create_tables, False),
+    Migration(2, "users.password_salt", _add_password_salt, False),
+    Migration(3, "steam_bindings.steam_avatar", _add_steam_avatar, False),
+    Migration(4, "用户类型和邀请码特权", _add_user_types, False),
+    Migration(5, "清理演示数据", _delete_demo_data, False),
+    Migration(6, "二级索引", _create_indexes, False),
+    Migration(7, "订单明细表 order_items", _convert_order_items, False),
+    Migration(8, "积分账本和余额快照", _create_points_ledger, False),
+    Migration(9, "看板聚合表", _create_dashboard_tables, False),
+    Migration(10, "回填看板聚合表", _backfill_dashboard, True),
+    Migration(11, "商品全文搜索索引 products_fts", _create_search_index, False),
+    Migration(12, "order_items.category", _add_order_item_category, False),
+]
+
+def pending_migrations(conn):
+    """返回未执行的迁移（按编号排序）；新数据库（还没有任何表）返回 None"""
+    inspector = inspect(conn)
+    if not inspector.has_table(SchemaVersion.__tablename__):
+        return list(MIGRATIONS) if inspector.has_table("users") else None
+    applied = set(conn.execute(select(SchemaVersion.version)).scalars())
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+def create_schema(bind=None):
+    """新数据库：创建所有表，并把所有迁移记为已执行"""
+    bind = bind or engine
+    with bind.begin() as conn:
+        _create_tables(conn)
+        # 搜索索引不是 ORM 模型，create_all 不会创建
+        _create_search_index(conn)
+        conn.execute(insert(SchemaVersion),
+                     [{"version": m.version, "description": m.description} for m in MIGRATIONS])
+    logger.info(f"数据库表创建成功（结构版本 {MIGRATIONS[-1].version}）")
+
+def apply_migration(migration, bind=None):
+    bind = bind or engine
+    with bind.begin() as conn:
+        migration.apply(conn)
+        conn.execute(insert(SchemaVersion).values(version=migration.version,
+                                                  description=migration.description))
+    logger.info(f"已执行数据库迁移 {migration.version}: {migration.description}")
+
+def upgrade(bind=None):
+    """启动时调用：检查结构版本，执行需要在显示界面之前完成的迁移
+
+    返回尚未执行的延后迁移，交给 run_deferred() 处理。
+    """
+    bind = bind or engine
+    with bind.connect() as conn:
+        pending = pending_migrations(conn)
+    if pending is None:
+        create_schema(bind)
+        return []
+    for migration in pending:
+        if not migration.deferred:
+            apply_migration(migration, bind)
+    return [migration for migration in pending if migration.deferred]
+
+def run_deferred(migrations, bind=None):
+    """执行延后的迁移（可以在后台线程调用），返回执行的迁移编号"""
+    for migration in migrations:
+        apply_migration(migration, bind)
+    return [migration.version for migration in migrations]
@@ -0,0 +1,109 @@
+"""商品全文搜索（SQLite FTS5）
+
+products_fts 是 FTS5 无内容表，rowid 等于商品 ID，索引商品的名称、描述和分类，
+由 products 表上的触发器保持同步。
+
+FTS5 自带的 unicode61 分词器不切分中文（一整串汉字算一个词，搜“蝴蝶”找不到“蝴蝶刀”），
+所以写入索引前先用 search_tokens() 转换文本：英文和数字按单词、转为小写，
+汉字按单字切开（字符 1-gram）。查询时英文单词做前缀匹配，连续的汉字组成短语，
+要求这些字在索引中相邻，相当于按查询长度的 n-gram 匹配，单字、两字的查询都能命中。
+排序使用 FTS5 的 rank 列（bm25），名称的权重最高。
+
+触发器调用的 search_tokens() 是 Python 函数，create_db_engine() 在每个 SQLite 连接上注册；
+绕过本程序直接修改 products 表的工具也需要先注册同名函数。
+"""
+import re
+import unicodedata
+from sqlalchemy import text, column, table, literal_column
+
+# 汉字、日文假名、韩文：每个字单独成词
+_CJK = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff])")
+# 字母、数字（不含下划线）组成的连续片段
+_WORD = re.compile(r"[^\W_]+")
+
+# bm25 中名称、描述、分类各列的权重
+RANK_WEIGHTS = (10.0, 1.0, 5.0)
+
+products_fts = table("products_fts", column("rowid"), column("rank"))
+
+def split_terms(value):
+    """把文本切成词，返回 [[词, ...], ...]，内层列表是原文中相连的一段
+
+    先做 NFKC 规范化，全角字母、数字和半角的一样。
+    """
+    runs = []
+    for word in _WORD.findall(unicodedata.normalize("NFKC", value or "").lower()):
+        runs.append([part for part in _CJK.split(word) if part])
+    return runs
+
+def search_tokens(value):
+    """写入索引的文本：各个词用空格隔开"""
+    return " ".join(term for run in split_terms(value) for term in run)
+
+def match_query(value):
+    """把用户输入转换为 FTS5 查询（各部分之间是 AND）；没有可搜索的词时返回 None
+
+    英文、数字词做前缀匹配："ak"*；相连的汉字组成短语："蝴 蝶"。
+    词里只有字母和数字，直接放进双引号不需要转义。
+    """
+    parts = []
+    for run in split_terms(value):
+        chars = []
+        for term in run:
+            if _CJK.fullmatch(term):
+                chars.append(term)
+                continue
+            if chars:
+                parts.append('"%s"' % " ".join(chars))
+                chars = []
+            parts.append('"%s"*' % term)
+        if chars:
+            parts.append('"%s"' % " ".join(chars))
+    return " ".join(parts) or None
+
+def matches(query):
+    """WHERE products_fts MATCH :query"""
+    return literal_column("products_fts").op("MATCH")(query)
+
+def register_functions(dbapi_connection, connection_record=None):
+    """在 SQLite 连接上注册触发器使用的 search_tokens()（connect 事件的监听函数）"""
+    dbapi_connection.create_function("search_tokens", 1, search_tokens, deterministic=True)
+
+# 无内容表（content=''）只保存索引，不保存文本副本；删除时要传入写入时的同样内容
+_DELETE_OLD = """INSERT INTO products_fts (products_fts, rowid, name, description, category)
+        VALUES ('delete', old.id, search_tokens(old.name), search_tokens(old.description),
+                search_tokens(old.category));"""
+_INSERT_NEW = """INSERT INTO products_fts (rowid, name, description, category)
+        VALUES (new.id, search_tokens(new.name), search_tokens(new.description),
+                search_tokens(new.category));"""
+
+_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+        {_INSERT_NEW}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+        {_DELETE_OLD}
+    END""",
+    # 只在搜索的字段变化时更新，结账扣库存不会触发
+    f"""CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF id, name, description, category
+    ON products BEGIN
+        {_DELETE_OLD}
+        {_INSERT_NEW}
+    END""",
+]
+
+def create_index(conn):
+    """创建搜索索引和同步触发器（已存在时跳过）"""
+    conn.execute(text("CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+                      "name, description, category, content = '', tokenize = 'unicode61')"))
+    conn.execute(text("INSERT INTO products_fts (products_fts, rank) VALUES ('rank', :rank)"),
+                 {"rank": "bm25(%s)" % ", ".join(str(weight) for weight in RANK_WEIGHTS)})
+    for trigger in _TRIGGERS:
+        conn.execute(text(trigger))
+
+def rebuild_index(conn):
+    """清空并从 products 表重新生成搜索索引（修改了 search_tokens() 的切分方式后必须执行）"""
+    conn.execute(text("INSERT INTO products_fts (products_fts) VALUES ('delete-all')"))
+    conn.execute(text("INSERT INTO products_fts (rowid, name, description, category) "
+                      "SELECT id, search_tokens(name), search_tokens(description), search_tokens(category) "
+                      "FROM products"))
@@ -0,0 +1,106 @@
+"""数据库会话管理
+
+db_operations 和 controllers 共用的会话/工作单元管理：
+- session_scope(): 上下文管理器，最外层负责提交/回滚和关闭，
+  嵌套调用时复用外层的会话；外层已经有修改时在 SAVEPOINT 中执行
+- with_session: 装饰器，把当前会话作为第一个参数注入被装饰的函数
+- rollback(db): 撤销当前作用域的修改，不影响外层作用域已做的修改
+
+被装饰的函数捕获异常后应调用 rollback(db)，而不是 db.rollback()：
+后者会回滚整个事务，连同调用方在外层作用域中已经做的修改。
+
+视图中需要连续调用多个数据库函数时，用 session_scope() 包起来即可
+让它们共享同一个连接和事务。
+"""
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy.orm import sessionmaker
+from database.db_init import engine
+
+# 提交后不使对象过期，会话关闭后返回的对象仍然可以读取属性
+SessionFactory = sessionmaker(autocommit=False, autoflush=False,
+                              expire_on_commit=False, bind=engine)
+
+_current_session = ContextVar("current_session", default=None)
+# 当前内层作用域的 SAVEPOINT；在最外层作用域中，或外层还没有修改时为 None
+_current_savepoint = ContextVar("current_savepoint", default=None)
+
+def get_current_session():
+    """获取当前上下文中的会话，没有时返回None"""
+    return _current_session.get()
+
+@contextmanager
+def session_scope():
+    """工作单元上下文管理器
+
+    最外层作用域创建会话，正常退出时提交，异常时回滚；
+    内层作用域复用同一个会话，不单独提交。内层失败时只撤销内层的修改，
+    外层已做的修改保留，由外层决定是否提交。
+    """
+    db = _current_session.get()
+    if db is not None:
+        savepoint = _begin_savepoint(db)
+        token = _current_savepoint.set(savepoint)
+        try:
+            yield db
+        except Exception:
+            _rollback_scope(db, savepoint)
+            raise
+        else:
+            if savepoint is not None and savepoint.is_active:
+                savepoint.commit()
+            elif savepoint is not None:
+                # flush 失败后 SAVEPOINT 失效，回滚后外层事务才能继续使用
+                _rollback_scope(db, savepoint)
+        finally:
+            _current_savepoint.reset(token)
+        return
+
+    db = SessionFactory()
+    token = _current_session.set(db)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        db.close()
+
+def _begin_savepoint(db):
+    """内层作用域开始时调用：外层已经写过数据时开一个 SAVEPOINT 保护它们
+
+    外层还没有修改时返回 None，内层失败直接回滚整个事务，不会丢失外层的修改；
+    内层大多是只读查询，这样不必为每次调用付出 SAVEPOINT 的开销。
+    pysqlite 只在写语句前自动 BEGIN，连接不在事务中就说明外层还没有写过数据
+    （此时发出的 SAVEPOINT 会自己成为最外层事务，RELEASE 时就直接提交了）。
+    """
+    db.flush()
+    conn = db.connection()
+    if conn.dialect.name == "sqlite" and not conn.connection.dbapi_connection.in_transaction:
+        return None
+    return db.begin_nested()
+
+def rollback(db):
+    """撤销当前作用域中的修改
+
+    有 SAVEPOINT 的内层作用域只回滚到自己的 SAVEPOINT，其他情况回滚整个事务。
+    """
+    _rollback_scope(db, _current_savepoint.get())
+
+def _rollback_scope(db, savepoint):
+    if savepoint is None:
+        db.rollback()
+    elif db.get_nested_transaction() is savepoint:
+        # 已经回滚过的 SAVEPOINT 不再是会话当前的嵌套事务；flush 失败只会让它失效，仍需回滚
+        savepoint.rollback()
+
+def with_session(func):
+    """在 session_scope 中执行函数，并将会话作为第一个参数传入"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with session_scope() as db:
+            return func(db, *args, **kwargs)
+    return wrapper
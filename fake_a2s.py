@@ -0,0 +1,130 @@
+"""本地 A2S 模拟服务器
+
+用于测试和性能测试：在 127.0.0.1 上监听 UDP 端口，按 Source 引擎协议应答
+A2S_INFO（0x54）和 A2S_PLAYER（0x55）查询。A2S_PLAYER 先返回挑战码，
+与真实服务器的行为一致。
+
+    server = FakeA2SServer(name="测试服", players=["alice", "bob"], delay=0.2)
+    server.start()
+    query_servers([server.address])
+    server.stop()
+"""
+import socket
+import struct
+import threading
+
+HEADER = b"\xFF\xFF\xFF\xFF"
+A2S_INFO = 0x54
+A2S_PLAYER = 0x55
+S2A_INFO = b"I"
+S2A_PLAYER = b"D"
+S2C_CHALLENGE = b"A"
+CHALLENGE = 0x12345678
+
+def _cstring(value):
+    return value.encode("utf-8") + b"\x00"
+
+class FakeA2SServer:
+    """模拟的 CSGO 服务器
+
+    delay: 每个应答延迟的秒数，模拟网络延迟
+    respond: 为 False 时不应答任何查询，模拟离线服务器
+    """
+
+    def __init__(self, name="Fake CSGO Server", map_name="de_dust2", players=(),
+                 max_players=32, delay=0.0, respond=True):
+        self.name = name
+        self.map_name = map_name
+        self.players = list(players)
+        self.max_players = max_players
+        self.delay = delay
+        self.respond = respond
+        self.requests = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._thread = None
+        self._running = False
+
+    @property
+    def address(self):
+        return self._sock.getsockname()
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        # 关闭前发一个空包，让阻塞在 recvfrom 的线程退出
+        try:
+            self._sock.sendto(b"", self.address)
+        except OSError:
+            pass
+        if self._thread is not None:
+            self._thread.join(1)
+        self._sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _serve(self):
+        while self._running:
+            try:
+                packet, client = self._sock.recvfrom(1400)
+            except OSError:
+                break
+            if not self._running:
+                break
+            reply = self._handle(packet)
+            if reply is None or not self.respond:
+                continue
+            self.requests += 1
+            if self.delay:
+                threading.Timer(self.delay, self._send, (reply, client)).start()
+            else:
+                self._send(reply, client)
+
+    def _send(self, reply, client):
+        try:
+            self._sock.sendto(HEADER + reply, client)
+        except OSError:
+            pass
+
+    def _handle(self, packet):
+        if len(packet) < 5 or packet[:4] != HEADER:
+            return None
+        if packet[4] == A2S_INFO:
+            return self.info_packet()
+        if packet[4] == A2S_PLAYER:
+            challenge = struct.unpack("<l", packet[5:9])[0] if len(packet) >= 9 else -1
+            if challenge != CHALLENGE:
+                return S2C_CHALLENGE + struct.pack("<L", CHALLENGE)
+            return self.players_packet()
+        return None
+
+    def info_packet(self):
+        return b"".join((
+            S2A_INFO,
+            struct.pack("<B", 17),
+            _cstring(self.name),
+            _cstring(self.map_name),
+            _cstring("csgo"),
+            _cstring("Counter-Strike: Global Offensive"),
+            struct.pack("<HBBB", 730, len(self.players), self.max_players, 0),
+            b"dl",
+            struct.pack("<BB", 0, 1),
+            _cstring("1.38.8.1"),
+        ))
+
+    def players_packet(self):
+        parts = [S2A_PLAYER, struct.pack("<B", len(self.players))]
+        for index, name in enumerate(self.players):
+            parts.append(struct.pack("<B", index))
+            parts.append(_cstring(name))
+            parts.append(struct.pack("<lf", index * 3, 60.0 * (index + 1)))
+        return b"".join(parts)
@@ -0,0 +1,105 @@
+"""本地 Steam Web API 替身
+
+用于测试和性能测试：在 127.0.0.1 上启动 HTTP 服务，实现 SteamAPI 用到的
+GetPlayerSummaries 和 ResolveVanityURL，并统计每个接口被调用的次数。
+
+    with FakeSteamAPI(vanity={"gaben": "76561197960287930"}) as steam:
+        api = SteamAPI(base_url=steam.url)
+        api.get_player_summaries(steam_ids)
+        steam.calls["GetPlayerSummaries"]
+"""
+import json
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+class FakeSteamAPI:
+    """Steam Web API 替身
+
+    missing: 不存在的 steamid，GetPlayerSummaries 不返回它们
+    vanity: 自定义 URL -> steamid
+    names: steamid -> 昵称，没有指定时昵称为 player_<steamid>
+    fail_calls: 返回 503 的 GetPlayerSummaries 调用序号（从 1 开始），模拟临时故障或限流
+    """
+
+    def __init__(self, missing=(), vanity=None, names=None, max_ids=100, fail_calls=()):
+        self.missing = set(missing)
+        self.fail_calls = set(fail_calls)
+        self.vanity = dict(vanity or {})
+        self.names = dict(names or {})
+        self.max_ids = max_ids
+        self.calls = Counter()
+        self.requested_ids = []
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 响应头和正文分两次发送，关闭 Nagle 避免每个请求多等一个延迟确认
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, reply = fake.handle(url.path, params)
+                data = json.dumps(reply).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def player(self, steam_id):
+        name = self.names.get(steam_id, f"player_{steam_id}")
+        return {
+            'steamid': steam_id,
+            'personaname': name,
+            'profileurl': f"https://steamcommunity.com/profiles/{steam_id}/",
+            'avatarfull': f"https://avatars.example.com/{steam_id}_full.jpg",
+            'lastlogoff': 1700000000,
+        }
+
+    def handle(self, path, params):
+        method = path.strip("/").split("/")[1] if path.count("/") >= 2 else path
+        with self._lock:
+            self.calls[method] += 1
+            call = self.calls[method]
+        if method == "GetPlayerSummaries":
+            if call in self.fail_calls:
+                return 503, {'error': 'service unavailable'}
+            steam_ids = [s for s in params.get('steamids', '').split(",") if s]
+            if len(steam_ids) > self.max_ids:
+                return 400, {'error': 'too many steamids'}
+            with self._lock:
+                self.requested_ids.extend(steam_ids)
+            players = [self.player(s) for s in steam_ids if s not in self.missing]
+            return 200, {'response': {'players': players}}
+        if method == "ResolveVanityURL":
+            steam_id = self.vanity.get(params.get('vanityurl'))
+            if steam_id:
+                return 200, {'response': {'steamid': steam_id, 'success': 1}}
+            return 200, {'response': {'success': 42, 'message': 'No match'}}
+        return 404, {}
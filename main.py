@@ -1,14 +1,22 @@
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QSplashScreen
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPixmap, QFont
-from views.main_window import MainWindow
-from database.db_init import init_database, SessionLocal
-from database.db_operations import delete_demo_data
-from models.user import User
-from utils.password import hash_password
-from utils.splash_animation import AnimatedSplashScreen
+from utils.startup_profiler import startup_profiler, format_report, PROFILE_FLAG
+
+# 需要统计导入耗时时，在导入其他模块之前开始
+if PROFILE_FLAG in sys.argv:
+    startup_profiler.enable_import_timing()
+
+with startup_profiler.phase("imports"):
+    from PyQt5.QtWidgets import QApplication, QSplashScreen
+    from PyQt5.QtCore import Qt, QTimer
+    from PyQt5.QtGui import QPixmap, QFont
+    from views.main_window import MainWindow
+    from database.db_init import SessionLocal
+    from database.schema import upgrade, run_deferred
+    from models.user import User
+    from utils.password import hash_password
+    from utils.splash_animation import AnimatedSplashScreen
+    from utils.workers import TaskRunner
 
 
 os.environ['USE_PAYMENT_SIMULATION'] = 'true'
@@ -38,7 +46,7 @@ def create_default_admin():
 
 def setup_application():
     """设置应用程序"""
-    app = QApplication(sys.argv)
+    app = QApplication([arg for arg in sys.argv if arg != PROFILE_FLAG])
     from utils.language_manager import language_manager
     app.setApplicationName(language_manager.get_text('app_title'))
     app.setApplicationVersion("1.0.0")
@@ -58,49 +66,72 @@ def show_splash_screen(app):
     app.processEvents()
     return splash
 
+def launch(app, splash, on_shown=None):
+    """启动画面之后的各个启动阶段，返回主窗口
+
+    主窗口在事件循环开始后显示，显示后调用 on_shown(window)。
+    """
+    # 检查数据库结构版本，需要时建表或迁移
+    splash.update_progress(20, "正在初始化数据库...")
+    app.processEvents()
+    with startup_profiler.phase("schema"):
+        deferred = upgrade()
+    
+    # 创建默认管理员
+    splash.update_progress(40, "正在创建默认账户...")
+    app.processEvents()
+    with startup_profiler.phase("create_default_admin"):
+        create_default_admin()
+    
+    # 创建主窗口
+    splash.update_progress(80, "正在加载界面...")
+    app.processEvents()
+    
+    with startup_profiler.phase("main_window"):
+        window = MainWindow()
+    
+    # 完成加载
+    splash.update_progress(100, "启动完成！")
+    app.processEvents()
+    
+    def show_window():
+        with startup_profiler.phase("show_window"):
+            splash.finish_animation()
+            # 先显示主窗口：finish() 会等待主窗口显示出来（最多 1 秒），
+            # 主窗口还没 show 时总要等满这 1 秒
+            window.show()
+            splash.finish(window)
+        if deferred:
+            # 回填看板等维护任务在主窗口显示后于后台执行
+            TaskRunner(window).submit("schema", run_deferred, deferred,
+                                      on_error=lambda e: print(f"✗ 数据库维护失败：{e}"))
+        if on_shown is not None:
+            on_shown(window)
+    
+    # 延迟显示主窗口
+    QTimer.singleShot(0, show_window)
+    return window
+
+def report_startup(window):
+    """主窗口显示后输出启动报告"""
+    report = startup_profiler.finish()
+    if PROFILE_FLAG in sys.argv:
+        print(format_report(report))
+
 def main():
     """主函数"""
     print("🚀 Hurricane Community Store 启动中...")
     
     # 设置应用程序
-    app = setup_application()
+    with startup_profiler.phase("qt_application"):
+        app = setup_application()
     
     # 显示启动画面
-    splash = show_splash_screen(app)
+    with startup_profiler.phase("splash"):
+        splash = show_splash_screen(app)
     
     try:
-        # 初始化数据库
-        splash.update_progress(20, "正在初始化数据库...")
-        app.processEvents()
-        init_database()
-        
-        # 创建默认管理员
-        splash.update_progress(40, "正在创建默认账户...")
-        app.processEvents()
-        create_default_admin()
-        
-        # 清理演示数据
-        splash.update_progress(60, "正在清理演示数据...")
-        app.processEvents()
-        delete_demo_data()
-        
-        # 创建主窗口
-        splash.update_progress(80, "正在加载界面...")
-        app.processEvents()
-        
-        window = MainWindow()
-        
-        # 完成加载
-        splash.update_progress(100, "启动完成！")
-        app.processEvents()
-        
-        # 延迟显示主窗口
-        QTimer.singleShot(0, lambda: (
-            splash.finish_animation(),
-            splash.finish(window),
-            window.show()
-        ))
-        
+        window = launch(app, splash, on_shown=report_startup)
         print("✓ 应用程序启动成功！")
         
     except Exception as e:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database.db_init import Base
@@ -6,10 +6,15 @@ from models.product import Product
 
 class CartItem(Base):
     __tablename__ = "cart_items"
+    __table_args__ = (
+        # 按用户读取购物车；add_to_cart 按 (用户, 商品) 查找已有条目。
+        # product_id 单独的索引用于删除商品时查找引用它的购物车条目
+        Index("ix_cart_items_user_product", "user_id", "product_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
     quantity = Column(Integer, default=1)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
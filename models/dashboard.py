@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Index
+from database.db_init import Base
+
+# 管理后台看板的聚合表，由 database.aggregates 维护，不直接修改
+
+class DailySales(Base):
+    """每天的订单数、售出件数和销售额（积分），不含已取消的订单"""
+    __tablename__ = "daily_sales"
+
+    day = Column(Date, primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class ProductSales(Base):
+    """每个商品累计售出的件数和销售额"""
+    __tablename__ = "product_sales"
+    __table_args__ = (
+        Index("ix_product_sales_units", "units", "product_id"),
+    )
+
+    product_id = Column(Integer, primary_key=True, autoincrement=False)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class CategorySales(Base):
+    """每个分类累计售出的件数和销售额（按下单时商品所属的分类）"""
+    __tablename__ = "category_sales"
+
+    category = Column(String(50), primary_key=True)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+class DailyPoints(Base):
+    """每天发放（入账）和消耗（扣除）的积分"""
+    __tablename__ = "daily_points"
+
+    day = Column(Date, primary_key=True)
+    issued = Column(Float, nullable=False, default=0)
+    spent = Column(Float, nullable=False, default=0)
@@ -1,18 +1,26 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database.db_init import Base
+from models.order_item import OrderItem
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # 订单按 (created_at, id) 倒序分页，升序索引倒着读即可，不需要额外排序
+        Index("ix_orders_user_created", "user_id", "created_at"),
+        Index("ix_orders_status_created", "status", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     total_points = Column(Float, nullable=False)
     status = Column(String(20), default="pending")  # pending, completed, cancelled
-    items = Column(JSON)  # 存储订单商品信息
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 关联关系
-    user = relationship("User", back_populates="orders")
\ No newline at end of file
+    user = relationship("User", back_populates="orders")
+    # 订单商品明细（旧版本保存在 items JSON 字段中，由迁移 7 转换）
+    order_items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
\ No newline at end of file
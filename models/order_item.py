@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from database.db_init import Base
+
+class OrderItem(Base):
+    __tablename__ = "order_items"
+    __table_args__ = (
+        # 按商品统计销量、查询购买过某商品的订单
+        Index("ix_order_items_product_order", "product_id", "order_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    name = Column(String(100), nullable=False)  # 下单时的商品名称
+    unit_price = Column(Float, nullable=False)  # 下单时的单价（积分）
+    quantity = Column(Integer, nullable=False)
+    subtotal = Column(Float, nullable=False)
+    category = Column(String(50))  # 下单时的商品分类（按分类统计销售）
+
+    # 关联关系
+    order = relationship("Order", back_populates="order_items")
@@ -1,17 +1,68 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database.db_init import Base
 
+# 积分账本的账户：用户余额记在 user 账户，每笔交易的对方记在交易类型对应的系统账户
+LEDGER_USER = "user"
+LEDGER_ACCOUNTS = {
+    "recharge": "system:recharge",      # 充值：积分来自外部支付
+    "purchase": "system:sales",         # 购买商品
+    "refund": "system:sales",           # 退款
+    "adjustment": "system:adjustment",  # 管理员调整
+    "opening": "system:opening",        # 启用账本时已有的余额
+}
+# 用户每记满这么多笔分录保存一次余额快照
+SNAPSHOT_INTERVAL = 100
+
 class PointsTransaction(Base):
     __tablename__ = "points_transactions"
+    __table_args__ = (
+        Index("ix_points_transactions_user_created", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount = Column(Float, nullable=False)  # 正数表示增加，负数表示减少
-    type = Column(String(20), nullable=False)  # recharge, purchase, refund
+    type = Column(String(20), nullable=False)  # recharge, purchase, refund, adjustment, opening
     description = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # 关联关系
-    user = relationship("User", back_populates="points_transactions")
\ No newline at end of file
+    user = relationship("User", back_populates="points_transactions")
+    entries = relationship("PointsLedgerEntry", back_populates="transaction")
+
+class PointsLedgerEntry(Base):
+    """积分账本分录（只追加，不修改）
+
+    每笔 PointsTransaction 对应两条金额相反的分录：用户账户一条（user_id、seq 有值），
+    系统账户一条（user_id、seq 为空）。seq 是该用户分录的连续序号，从 1 开始。
+    """
+    __tablename__ = "points_ledger"
+    __table_args__ = (
+        Index("ix_points_ledger_user_seq", "user_id", "seq", unique=True),
+        Index("ix_points_ledger_user_created", "user_id", "created_at", "seq"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(Integer, ForeignKey("points_transactions.id"), nullable=False, index=True)
+    account = Column(String(32), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    seq = Column(Integer)
+    amount = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    transaction = relationship("PointsTransaction", back_populates="entries")
+
+class PointsSnapshot(Base):
+    """用户记到第 seq 笔分录时的积分余额"""
+    __tablename__ = "points_snapshots"
+    __table_args__ = (
+        Index("ix_points_snapshots_user_seq", "user_id", "seq", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    balance = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
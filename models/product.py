@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from database.db_init import Base
 
@@ -13,15 +13,19 @@ CATEGORY_CHOICES = [
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # 按名称前缀搜索（LIKE 不区分大小写，需要 NOCASE 索引）
+        Index("ix_products_name_nocase", text("name COLLATE NOCASE")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
+    name = Column(String(100), nullable=False, index=True)
     description = Column(Text)
     price = Column(Float, nullable=False)  # 积分价格
     stock = Column(Integer, default=0)
     image_url = Column(String(255))
-    category = Column(String(50))
-    is_active = Column(Boolean, default=True)
+    category = Column(String(50), index=True)
+    is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
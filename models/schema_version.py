@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from database.db_init import Base
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)  # 迁移编号
+    description = Column(String(255))
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -7,9 +7,10 @@ class SteamBinding(Base):
     __tablename__ = "steam_bindings"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     steam_id = Column(String(50), unique=True, nullable=False)
     steam_name = Column(String(100))
+    steam_avatar = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,17 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from database.db_init import Base
 from models.invite_code import PrivilegeType
-from utils.password import hash_password, verify_password
-from utils.image_utils import compress_image, image_to_base64, base64_to_image, save_avatar, load_avatar
-import hashlib
+from utils.password import hash_password, verify_password, needs_rehash
 from models.order import Order
 from models.cart import CartItem
 from models.points import PointsTransaction
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # 按用户名前缀搜索（LIKE 不区分大小写，需要 NOCASE 索引）
+        Index("ix_users_username_nocase", text("username COLLATE NOCASE")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, index=True, nullable=False)
@@ -19,7 +21,7 @@ class User(Base):
     password_hash = Column(String(128), nullable=False)
     password_salt = Column(String(128), nullable=False)
     points = Column(Integer, default=0)
-    user_type = Column(Enum(PrivilegeType), default=PrivilegeType.NORMAL, nullable=False)  # 用户类型
+    user_type = Column(Enum(PrivilegeType), default=PrivilegeType.NORMAL, nullable=False, index=True)  # 用户类型
     display_name = Column(String(100), nullable=True)  # 显示名称
     is_admin = Column(Boolean, default=False)
     is_banned = Column(Boolean, default=False)  # 是否被封禁
@@ -40,20 +42,20 @@ class User(Base):
         self.password_hash, self.password_salt = hash_password(password)
         
     def check_password(self, password):
-        """验证密码"""
-        if not self.password_salt:
-            # 兼容老用户（无盐值，直接hash）
-            return self.password_hash == hashlib.sha256(password.encode()).hexdigest()
+        """验证密码（兼容老用户的单轮 SHA-256 哈希，无盐值时直接hash）"""
         return verify_password(password, self.password_hash, self.password_salt)
+
+    def password_needs_rehash(self):
+        """密码哈希是旧格式或强度低于当前设置"""
+        return needs_rehash(self.password_hash)
         
     def set_avatar(self, avatar_data):
         """设置用户头像"""
         try:
-            # 压缩图片
-            compressed_data = compress_image(avatar_data)
-            
-            # 保存头像文件
-            filename = save_avatar(compressed_data, self.id)
+            # Pillow 只在处理头像时才导入，不拖慢启动
+            from utils.image_utils import save_avatar
+            # 保存头像文件（save_avatar 负责压缩并生成各尺寸缩略图）
+            filename = save_avatar(avatar_data, self.id)
             if filename:
                 self.avatar = filename
                 return True
@@ -62,13 +64,21 @@ class User(Base):
             print(f"设置头像失败: {str(e)}")
             return False
     
-    def get_avatar_data(self):
+    def get_avatar_data(self, size=None):
         """获取用户头像数据"""
         try:
-            return load_avatar(self.avatar)
+            from utils.image_utils import load_avatar
+            return load_avatar(self.avatar, size)
         except Exception as e:
             print(f"加载头像失败: {str(e)}")
             return None
+
+    def get_avatar_pixmap(self, size=200):
+        """获取用户头像 QPixmap（按尺寸缓存）"""
+        if not self.avatar:
+            return None
+        from utils.image_utils import load_avatar_pixmap
+        return load_avatar_pixmap(self.avatar, size)
     
     def generate_display_name(self):
         """根据用户类型自动生成显示名称"""
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+积分对账
+
+一次流式遍历全部用户，核对 users.points 与积分账本的分录合计、
+分录序号是否连续、余额快照是否正确，以及每笔交易的两条分录是否借贷平衡。
+有任何不一致时以退出码 1 结束，可用于定时任务。
+
+用法: python reconcile_points.py [--limit N]
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.db_operations import reconcile_points
+
+def main():
+    parser = argparse.ArgumentParser(description="核对积分账本和用户余额")
+    parser.add_argument("--limit", type=int, default=20, help="每类问题最多列出的条数")
+    args = parser.parse_args()
+
+    report = reconcile_points()
+    print(f"积分对账：{report['users']} 个用户，{report['entries']} 条用户分录")
+    problems = 0
+    sections = [
+        ("mismatches", "余额与账本不符（用户ID, 余额, 分录合计）"),
+        ("gaps", "分录序号不连续的用户"),
+        ("bad_snapshots", "快照错误（用户ID, 序号, 快照余额, 分录累计）"),
+        ("unbalanced", "借贷不平的交易"),
+    ]
+    for key, title in sections:
+        rows = report[key]
+        if not rows:
+            continue
+        problems += len(rows)
+        print(f"{title}: {len(rows)}")
+        for row in rows[:args.limit]:
+            print(f"  {row}")
+    if problems:
+        print(f"❌ 发现 {problems} 处不一致")
+        return 1
+    print("✅ 账本与余额一致")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+A2S 批量查询测试
+
+使用本地 A2S 模拟服务器（fake_a2s）验证 query_servers：
+1. 应答内容正确解析为界面使用的字典
+2. 多个慢速服务器并发查询，总耗时约等于一个服务器的耗时
+3. 离线服务器在截止时间后返回 None，不影响其他服务器
+
+测试不访问外部网络。
+"""
+
+import sys
+import os
+import time
+from contextlib import ExitStack
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.csgo_server import CSGOServer, query_servers
+from fake_a2s import FakeA2SServer
+
+def start_servers(stack, count, **kwargs):
+    return [stack.enter_context(FakeA2SServer(name=f"服务器 {i}", **kwargs)) for i in range(count)]
+
+def test_result_parsed():
+    """批量查询和单个查询返回相同格式的结果"""
+    with FakeA2SServer(name="Hurricane 测试服", map_name="de_mirage",
+                       players=["alice", "bob", "carol"], max_players=20) as server:
+        result = query_servers([server.address], timeout=2.0)[server.address]
+        assert result['服务器名称'] == "Hurricane 测试服"
+        assert result['地图'] == "de_mirage"
+        assert result['玩家数量'] == 3 and result['最大玩家数'] == 20
+        assert (result['IP地址'], result['端口']) == server.address
+        assert [p['姓名'] for p in result['玩家列表']] == ["alice", "bob", "carol"]
+        single = CSGOServer(*server.address).get_server_info()
+        assert single.keys() == result.keys()
+        assert single['玩家列表'] == result['玩家列表']
+
+def test_concurrent_queries():
+    """20 个各有 200ms 延迟的服务器并发查询"""
+    with ExitStack() as stack:
+        servers = start_servers(stack, 20, players=["alice"], delay=0.2)
+        start = time.perf_counter()
+        results = query_servers([s.address for s in servers], timeout=2.0)
+        elapsed = time.perf_counter() - start
+
+        print(f"20 个服务器并发查询耗时: {elapsed * 1000:.0f}ms")
+        assert all(results[s.address]['服务器名称'] == f"服务器 {i}" for i, s in enumerate(servers))
+        # A2S_PLAYER 需要先取挑战码，单个服务器约 2 x 200ms；逐个查询需要 20 倍
+        assert elapsed < 1.5
+
+def test_offline_server_deadline():
+    """离线服务器只占用一个超时窗口"""
+    with ExitStack() as stack:
+        online = start_servers(stack, 5)
+        offline = start_servers(stack, 3, respond=False)
+        start = time.perf_counter()
+        results = query_servers([s.address for s in online + offline], timeout=0.5)
+        elapsed = time.perf_counter() - start
+
+        assert all(results[s.address] is not None for s in online)
+        assert all(results[s.address] is None for s in offline)
+        assert elapsed < 1.0
+
+def test_duplicate_addresses():
+    """重复的地址只查询一次"""
+    with FakeA2SServer() as server:
+        results = query_servers([server.address, server.address], timeout=2.0)
+        assert list(results) == [server.address]
+        # 一次 A2S_INFO，加上 A2S_PLAYER 的挑战和应答
+        assert server.requests == 3
+
+def main():
+    """主测试函数"""
+    print("A2S 批量查询测试")
+    print("=" * 50)
+    test_result_parsed()
+    test_concurrent_queries()
+    test_offline_server_deadline()
+    test_duplicate_addresses()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
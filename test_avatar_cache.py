@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+头像缓存测试
+
+在临时目录中验证 AvatarStore：
+1. 保存时生成各尺寸缩略图，大图按比例缩小
+2. 同一张图片再次保存时不重新编码，换图后重新生成
+3. QPixmap 按尺寸缓存，头像文件被覆盖后缓存失效
+4. 缓存个数超过上限时淘汰最久未使用的
+
+测试不修改 assets/avatars 和数据库。
+"""
+
+import sys
+import os
+import io
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PIL import Image
+from PyQt5.QtWidgets import QApplication
+from utils.image_utils import AvatarStore, AVATAR_SIZES, bucket_size
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def make_jpeg(width, height, color=(200, 80, 40)):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(output, format="JPEG")
+    return output.getvalue()
+
+def test_thumbnails_generated():
+    """保存一次生成全部尺寸，宽高比保持不变"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AvatarStore(tmp)
+        filename = store.save(make_jpeg(3000, 1500), 7)
+        assert filename == "avatar_7.jpg"
+        for size in AVATAR_SIZES:
+            with Image.open(store.path(filename, size)) as img:
+                assert img.size == (size, size // 2), (size, img.size)
+        assert bucket_size(100) == 128 and bucket_size(500) == AVATAR_SIZES[-1]
+        # 原文件名就是最大的一档，老代码按文件名读取仍然可用
+        assert store.load(filename) == store.load(filename, AVATAR_SIZES[-1])
+        assert store.load("missing.jpg") is None
+
+def test_unchanged_image_not_reencoded():
+    """内容不变时跳过编码，换图后重新生成"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AvatarStore(tmp)
+        data = make_jpeg(800, 800)
+        store.save(data, 1)
+        encoded = store.encode_count
+        assert encoded == len(AVATAR_SIZES)
+        store.save(data, 1)
+        assert store.encode_count == encoded
+        store.save(make_jpeg(800, 800, (0, 0, 255)), 1)
+        assert store.encode_count == encoded * 2
+
+def test_pixmap_cache_invalidated_by_mtime():
+    """同一尺寸返回同一个 QPixmap，文件更新后重新加载"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AvatarStore(tmp)
+        filename = store.save(make_jpeg(400, 400), 3)
+        small = store.pixmap(filename, 64)
+        assert small.width() == 64
+        assert store.pixmap(filename, 64) is small
+        large = store.pixmap(filename, 200)
+        assert large is not small and large.width() == 200
+
+        # 其他进程直接覆盖了文件（修改时间变化）
+        path = store.path(filename, 64)
+        with open(path, "wb") as f:
+            f.write(make_jpeg(32, 32))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        reloaded = store.pixmap(filename, 64)
+        assert reloaded is not small and reloaded.width() == 32
+        assert store.pixmap("missing.jpg", 64) is None
+
+def test_lru_eviction():
+    """超过上限时淘汰最久未使用的头像"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AvatarStore(tmp, cache_size=2)
+        names = [store.save(make_jpeg(100, 100), user_id) for user_id in range(3)]
+        first = store.pixmap(names[0], 64)
+        store.pixmap(names[1], 64)
+        store.pixmap(names[0], 64)
+        store.pixmap(names[2], 64)
+        assert store.pixmap(names[0], 64) is first
+        assert len(store._pixmaps) == 2
+        assert all(key[0] != names[1] for key in store._pixmaps)
+
+def main():
+    """主测试函数"""
+    print("头像缓存测试")
+    print("=" * 50)
+    test_thumbnails_generated()
+    test_unchanged_image_not_reencoded()
+    test_pixmap_cache_invalidated_by_mtime()
+    test_lru_eviction()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Steam 登录回调服务器测试
+
+验证 SteamCallbackServer：
+1. 多个登录流程同时进行，回调按 nonce 交给各自的流程
+2. received 信号在 GUI 线程送达
+3. 未知或已经完成的 nonce 被拒绝
+4. 不在工作目录写任何文件，最后一个流程结束后服务器停止
+
+测试只访问本机回调服务器，不访问 Steam。
+"""
+
+import sys
+import os
+import threading
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer, QEventLoop
+from utils.callback_server import SteamCallbackServer
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def visit(url):
+    """模拟浏览器跳转到回调地址，返回状态码"""
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def callback_url(server, nonce, steam_id):
+    return (f"{server.return_url(nonce)}&openid.mode=id_res"
+            f"&openid.claimed_id=https://steamcommunity.com/openid/id/{steam_id}")
+
+def run_until(predicate, timeout=5):
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: predicate() and loop.quit())
+    timer.start(5)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec_()
+    timer.stop()
+    assert predicate(), "回调没有在规定时间内送达"
+
+def test_concurrent_flows():
+    """5 个流程同时完成，各自收到自己的参数，信号在 GUI 线程送达"""
+    server = SteamCallbackServer(host="127.0.0.1", port=0)
+    received = []
+    server.received.connect(lambda nonce, params: received.append((nonce, params, threading.get_ident())))
+    files_before = set(os.listdir("."))
+
+    nonces = [server.begin_flow() for _ in range(5)]
+    assert len(set(nonces)) == 5 and server.pending() == 5
+    with ThreadPoolExecutor(5) as pool:
+        statuses = list(pool.map(lambda i: visit(callback_url(server, nonces[i], 1000 + i)), range(5)))
+    assert statuses == [200] * 5
+
+    for i, nonce in enumerate(nonces):
+        params = server.wait(nonce, timeout=1)
+        assert params['openid.claimed_id'].endswith(str(1000 + i))
+        assert 'nonce' not in params
+
+    run_until(lambda: len(received) == 5)
+    assert {nonce for nonce, _, _ in received} == set(nonces)
+    assert all(thread == threading.get_ident() for _, _, thread in received)
+
+    for nonce in nonces:
+        server.end_flow(nonce)
+    assert not server.is_running()
+    assert set(os.listdir(".")) == files_before
+
+def test_unknown_nonce_rejected():
+    """未知 nonce、重复回调、其他路径都被拒绝"""
+    server = SteamCallbackServer(host="127.0.0.1", port=0)
+    nonce = server.begin_flow()
+    try:
+        assert visit(callback_url(server, "forged", 1)) == 400
+        assert visit(f"{server.url}/other") == 404
+        assert visit(callback_url(server, nonce, 1)) == 200
+        # 同一个流程只接受一次回调
+        assert visit(callback_url(server, nonce, 2)) == 400
+        assert server.wait(nonce, timeout=1)['openid.claimed_id'].endswith("/1")
+        assert server.wait("forged", timeout=0.1) is None
+    finally:
+        server.end_flow(nonce)
+    assert not server.is_running()
+
+def main():
+    """主测试函数"""
+    print("Steam 登录回调服务器测试")
+    print("=" * 50)
+    test_concurrent_flows()
+    test_unknown_nonce_rejected()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+验证码池测试
+
+验证 CaptchaPool：
+1. 后台线程补充验证码，取出时直接返回现成的 QPixmap
+2. 池子为空时同步生成，仍然能拿到验证码
+3. 取出的验证码不重复发放，图片与验证码对应
+4. 字体只加载一次
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from utils.captcha_generator import CaptchaGenerator, CaptchaPool, load_font
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def wait_filled(pool, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        pool.tasks.wait(10)
+        app.processEvents()
+        if not pool.tasks.is_running("fill"):
+            return
+    assert False, "验证码池没有在规定时间内补充完成"
+
+def test_pool_prefills_in_background():
+    """fill() 在后台生成，完成后取出不再同步生成"""
+    pool = CaptchaPool()
+    pool.fill()
+    wait_filled(pool)
+    assert len(pool) == CaptchaPool.SIZE
+    code, pixmap = pool.take()
+    assert len(code) == 4 and code.isdigit()
+    assert not pixmap.isNull() and pixmap.width() == pool.generator.width
+    assert pool.misses == 0
+
+def test_empty_pool_falls_back_and_refills():
+    """池子为空时同步生成，同时触发补充"""
+    pool = CaptchaPool()
+    code, pixmap = pool.take()
+    assert pool.misses == 1 and not pixmap.isNull()
+    assert pool.tasks.is_running("fill")
+    wait_filled(pool)
+    assert len(pool) == CaptchaPool.SIZE
+
+def test_low_water_refill():
+    """连续取出到低水位以下时自动补充，每个验证码对象只发出一次"""
+    pool = CaptchaPool()
+    pool.fill()
+    wait_filled(pool)
+    taken = [pool.take() for _ in range(CaptchaPool.SIZE - CaptchaPool.LOW_WATER + 1)]
+    assert len({id(pixmap) for _, pixmap in taken}) == len(taken)
+    wait_filled(pool)
+    assert len(pool) == CaptchaPool.SIZE
+    assert pool.misses == 0
+
+def test_font_cached():
+    """多次生成只加载一次字体"""
+    load_font.cache_clear()
+    generator = CaptchaGenerator()
+    generator.render(5)
+    info = load_font.cache_info()
+    assert info.misses == 1 and info.hits == 4
+
+def main():
+    """主测试函数"""
+    print("验证码池测试")
+    print("=" * 50)
+    test_pool_prefills_in_background()
+    test_empty_pool_falls_back_and_refills()
+    test_low_water_refill()
+    test_font_cached()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
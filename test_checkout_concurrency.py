@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结账并发压力测试
+
+多个用户同时购买同一件低库存商品，验证 create_order：
+1. 库存不会被扣成负数，成功订单数等于售出数量
+2. 成功的订单准确扣除积分，失败的订单不扣积分
+3. 单个用户积分不足时整单回滚，库存不变
+4. controllers.order_controller.create_order 并发下单同样不超卖
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.session import session_scope
+from database.db_operations import create_order
+from controllers import order_controller
+from models.user import User
+from models.product import Product
+from models.cart import CartItem
+from models.order import Order
+from conftest import temp_database
+
+BUYERS = 40
+STOCK = 7
+PRICE = 10
+START_POINTS = 100
+
+def seed(buyers, stock, points):
+    with session_scope() as db:
+        product = Product(name="限量皮肤", description="压力测试", price=PRICE,
+                          stock=stock, category="皮肤")
+        db.add(product)
+        db.flush()
+        user_ids = []
+        for i in range(buyers):
+            user = User(username=f"buyer{i}", email=f"buyer{i}@example.com",
+                        password_hash="x", password_salt="x", points=points)
+            db.add(user)
+            db.flush()
+            db.add(CartItem(user_id=user.id, product_id=product.id, quantity=1))
+            user_ids.append(user.id)
+        return product.id, user_ids
+
+def checkout(user_id, barrier):
+    barrier.wait()
+    try:
+        create_order(user_id)
+        return True
+    except ValueError:
+        return False
+
+def test_parallel_checkout_no_oversell():
+    """并发结账不超卖、不丢积分"""
+    with temp_database():
+        product_id, user_ids = seed(BUYERS, STOCK, START_POINTS)
+        barrier = threading.Barrier(BUYERS)
+        with ThreadPoolExecutor(max_workers=BUYERS) as pool:
+            results = list(pool.map(lambda uid: checkout(uid, barrier), user_ids))
+
+        succeeded = sum(results)
+        with session_scope() as db:
+            product = db.query(Product).get(product_id)
+            orders = db.query(Order).count()
+            users = {u.id: u.points for u in db.query(User).all()}
+
+        print(f"成功订单: {succeeded}/{BUYERS}，剩余库存: {product.stock}")
+        assert product.stock >= 0
+        assert succeeded == STOCK
+        assert orders == succeeded
+        assert product.stock == STOCK - succeeded
+        for user_id, ok in zip(user_ids, results):
+            expected = START_POINTS - PRICE if ok else START_POINTS
+            assert users[user_id] == expected
+        assert sum(START_POINTS - p for p in users.values()) == succeeded * PRICE
+
+def test_controller_checkout_no_oversell():
+    """控制器的下单接口并发调用时同样不超卖"""
+    with temp_database():
+        product_id, user_ids = seed(BUYERS, STOCK, START_POINTS)
+        with session_scope() as db:
+            carts = {item.user_id: [item] for item in db.query(CartItem)}
+        barrier = threading.Barrier(BUYERS)
+
+        def controller_checkout(user_id):
+            barrier.wait()
+            return order_controller.create_order(user_id, carts[user_id])[0]
+
+        with ThreadPoolExecutor(max_workers=BUYERS) as pool:
+            results = list(pool.map(controller_checkout, user_ids))
+
+        with session_scope() as db:
+            stock = db.query(Product).get(product_id).stock
+            orders = db.query(Order).count()
+        print(f"控制器成功订单: {sum(results)}/{BUYERS}，剩余库存: {stock}")
+        assert stock >= 0
+        assert orders == sum(results) == STOCK - stock
+
+def test_insufficient_points_rolls_back():
+    """积分不足时库存和购物车保持不变"""
+    with temp_database():
+        product_id, user_ids = seed(1, STOCK, PRICE - 1)
+        try:
+            create_order(user_ids[0])
+            assert False, "积分不足时应当抛出 ValueError"
+        except ValueError as e:
+            print(f"下单失败: {e}")
+
+        with session_scope() as db:
+            assert db.query(Product).get(product_id).stock == STOCK
+            assert db.query(CartItem).count() == 1
+            assert db.query(Order).count() == 0
+            assert db.query(User).get(user_ids[0]).points == PRICE - 1
+
+def main():
+    """主测试函数"""
+    print("结账并发压力测试")
+    print("=" * 50)
+    test_parallel_checkout_no_oversell()
+    test_controller_checkout_no_oversell()
+    test_insufficient_points_rolls_back()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+看板聚合表测试
+
+验证 daily_sales / product_sales / category_sales / daily_points：
+1. 结账、充值、取消订单后增量维护的结果与 rebuild_dashboard() 重新计算的一致
+2. 结账失败时聚合表随事务一起回滚
+3. get_dashboard() 只读取聚合表，历史订单增加到两千个时执行的查询不变
+4. 管理后台的数据看板标签页显示聚合数据
+5. 按分类的销售以下单时的分类为准，商品之后改分类不移动历史销售
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from sqlalchemy import event
+from database.session import session_scope
+from database.db_operations import (create_order, update_user_points, get_dashboard, rebuild_dashboard)
+from controllers.order_controller import update_order_status
+from models.user import User
+from models.product import Product
+from models.cart import CartItem
+from models.order import Order
+from models.order_item import OrderItem
+from models.dashboard import DailySales, ProductSales, CategorySales, DailyPoints
+from conftest import temp_database
+
+def seed_shop():
+    """两个用户、三件商品（两个分类），返回 (用户ID列表, 商品ID列表)"""
+    with session_scope() as db:
+        users = [User(username=f"buyer{i}", email=f"buyer{i}@example.com", password_hash="x",
+                      password_salt="x", points=0) for i in range(2)]
+        products = [Product(name="AK-47 | 红线", price=30, stock=50, category="步枪"),
+                    Product(name="M4A4 | 咆哮", price=50, stock=50, category="步枪"),
+                    Product(name="蝴蝶刀", price=200, stock=50, category="刀")]
+        db.add_all(users + products)
+        db.flush()
+        return [u.id for u in users], [p.id for p in products]
+
+def buy(user_id, *lines):
+    with session_scope() as db:
+        db.add_all([CartItem(user_id=user_id, product_id=product_id, quantity=quantity)
+                    for product_id, quantity in lines])
+    return create_order(user_id)
+
+def snapshot():
+    """聚合表的全部内容"""
+    with session_scope() as db:
+        return {
+            "daily": sorted(tuple(r) for r in db.query(DailySales.day, DailySales.orders,
+                                                       DailySales.units, DailySales.revenue)),
+            "products": sorted(tuple(r) for r in db.query(ProductSales.product_id, ProductSales.units,
+                                                          ProductSales.revenue).filter(ProductSales.units != 0)),
+            "categories": sorted(tuple(r) for r in db.query(CategorySales.category, CategorySales.units,
+                                                            CategorySales.revenue).filter(CategorySales.units != 0)),
+            "points": sorted(tuple(r) for r in db.query(DailyPoints.day, DailyPoints.issued, DailyPoints.spent)),
+        }
+
+def test_incremental_matches_rebuild():
+    """增量维护与重新计算一致；取消订单扣出，结账失败回滚"""
+    with temp_database():
+        (alice, bob), (ak, m4, knife) = seed_shop()
+        update_user_points(alice, 1000)
+        update_user_points(bob, 300)
+        buy(alice, (ak, 2), (knife, 1))
+        cancelled = buy(alice, (m4, 3))
+        buy(bob, (ak, 1), (m4, 1))
+        assert update_order_status(cancelled.id, "cancelled")[0]
+
+        data = get_dashboard()
+        assert data["totals"]["orders"] == 2
+        assert data["totals"]["units"] == 5
+        assert data["totals"]["revenue"] == 340
+        assert data["totals"]["points_issued"] == 1300
+        # 取消的订单没有退还积分，消耗积分仍包含它
+        assert data["totals"]["points_spent"] == 490
+        assert [(name, units) for _, name, units, _ in data["top_products"]] == \
+            [("AK-47 | 红线", 3), ("蝴蝶刀", 1), ("M4A4 | 咆哮", 1)]
+        assert data["categories"] == [("刀", 1, 200), ("步枪", 4, 140)]
+
+        incremental = snapshot()
+        rebuild_dashboard()
+        assert snapshot() == incremental
+
+        # 恢复订单重新计入
+        assert update_order_status(cancelled.id, "completed")[0]
+        incremental = snapshot()
+        rebuild_dashboard()
+        assert snapshot() == incremental
+        assert get_dashboard()["totals"]["orders"] == 3
+
+        # 积分不足：订单和聚合表一起回滚
+        try:
+            buy(bob, (knife, 2))
+            assert False, "积分不足时应当抛出 ValueError"
+        except ValueError:
+            pass
+        assert snapshot() == incremental
+
+def test_category_at_order_time():
+    """商品改分类后，历史订单仍计在原分类；取消订单从原分类扣回"""
+    with temp_database():
+        (alice, _), (ak, _, _) = seed_shop()
+        update_user_points(alice, 1000)
+        first = buy(alice, (ak, 2))
+        with session_scope() as db:
+            db.query(Product).get(ak).category = "收藏品"
+        buy(alice, (ak, 1))
+        expected = [("步枪", 2, 60), ("收藏品", 1, 30)]
+        assert get_dashboard()["categories"] == expected
+
+        rebuild_dashboard()
+        assert get_dashboard()["categories"] == expected
+
+        assert update_order_status(first.id, "cancelled")[0]
+        assert get_dashboard()["categories"] == [("收藏品", 1, 30)]
+
+def test_dashboard_reads_only_aggregates():
+    """看板查询与历史订单数量无关"""
+    with temp_database() as engine:
+        (alice, _), (ak, _, _) = seed_shop()
+        update_user_points(alice, 10_000)
+        buy(alice, (ak, 1))
+
+        def dashboard_statements():
+            statements = []
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                get_dashboard()
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            return statements
+
+        before = dashboard_statements()
+        with engine.begin() as conn:
+            # 直接写入大量历史订单，再重新计算聚合表
+            conn.execute(Order.__table__.insert(), [
+                {"id": 100 + i, "user_id": alice, "total_points": 30, "status": "completed",
+                 "created_at": datetime(2024, 1, 1 + i % 28)} for i in range(2000)])
+            conn.execute(OrderItem.__table__.insert(), [
+                {"order_id": 100 + i, "product_id": ak, "name": "AK-47 | 红线", "unit_price": 30,
+                 "quantity": 1, "subtotal": 30} for i in range(2000)])
+        rebuild_dashboard()
+        after = dashboard_statements()
+
+        assert before == after
+        for statement in after:
+            assert not any(f" {table} " in f" {statement} " for table in
+                           ("orders", "order_items", "points_transactions")), statement
+        assert get_dashboard()["top_products"][0][2] == 2001
+
+def test_admin_dashboard_tab():
+    """数据看板标签页"""
+    from PyQt5.QtWidgets import QApplication
+    from views.admin_view import AdminView
+
+    class StubMainWindow:
+        current_user = None
+
+        def show_home(self):
+            pass
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with temp_database():
+        (alice, _), (ak, _, knife) = seed_shop()
+        update_user_points(alice, 1000)
+        buy(alice, (ak, 2), (knife, 1))
+
+        view = AdminView(StubMainWindow())
+        try:
+            deadline = time.monotonic() + 10
+            while view.dashboard_cards["orders"].text() == "-" and time.monotonic() < deadline:
+                app.processEvents()
+                time.sleep(0.005)
+            assert view.tab_widget.widget(0) is view.dashboard_tab
+            assert view.dashboard_cards["orders"].text() == "1"
+            assert view.dashboard_cards["revenue"].text() == "260"
+            assert view.top_products_table.rowCount() == 2
+            assert view.top_products_table.item(0, 0).text() == "AK-47 | 红线"
+            assert view.categories_table.item(0, 0).text() == "刀"
+            assert view.daily_table.rowCount() == 1
+            assert view.daily_table.item(0, 4).text() == "1000"
+        finally:
+            view.session.close()
+            view.close()
+            view.deleteLater()
+            app.processEvents()
+
+def main():
+    """主测试函数"""
+    print("看板聚合表测试")
+    print("=" * 50)
+    test_incremental_matches_rebuild()
+    test_category_at_order_time()
+    test_dashboard_reads_only_aggregates()
+    test_admin_dashboard_tab()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+语言管理器测试
+
+验证 LanguageManager：
+1. 翻译文件按语言延迟读取
+2. 没有翻译的键原样返回并被记录
+3. 绑定的控件在切换语言时自动更新，已销毁的控件不会出错
+4. 视图中绑定的翻译键在中英文翻译文件中都存在
+"""
+
+import sys
+import os
+import re
+import glob
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import sip
+from PyQt5.QtWidgets import QApplication, QLabel, QLineEdit
+from utils.language_manager import LanguageManager, LANGUAGES
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def test_catalogs_loaded_lazily():
+    """只读取用到的语言"""
+    manager = LanguageManager()
+    assert manager._catalogs == {}
+    assert manager.get_text('login') == '登录'
+    assert list(manager._catalogs) == ['zh']
+    manager.set_language('en')
+    assert manager.get_text('login') == 'Login'
+    assert sorted(manager._catalogs) == ['en', 'zh']
+    assert not manager.set_language('fr')
+    assert manager.get_current_language() == 'en'
+
+def test_missing_keys_tracked():
+    """缺失的键返回键本身，并按语言记录"""
+    manager = LanguageManager()
+    assert manager.get_text('no_such_key') == 'no_such_key'
+    manager.toggle_language()
+    manager.get_text('no_such_key')
+    manager.get_text('login')
+    assert manager.missing == {'zh': {'no_such_key'}, 'en': {'no_such_key'}}
+
+def test_bound_widgets_follow_language():
+    """切换语言时绑定的控件自动更新，信号只发出一次"""
+    manager = LanguageManager()
+    changes = []
+    manager.language_changed.connect(changes.append)
+    label = manager.bind(QLabel(), 'login')
+    line_edit = manager.bind(QLineEdit(), 'username', 'setPlaceholderText')
+    doomed = manager.bind(QLabel(), 'logout')
+    assert label.text() == '登录' and line_edit.placeholderText() == '用户名'
+
+    # 控件的 C++ 对象已经销毁，Python 端引用还在
+    sip.delete(doomed)
+    manager.toggle_language()
+    assert label.text() == 'Login' and line_edit.placeholderText() == 'Username'
+    assert changes == ['en']
+    assert len(manager._bindings) == 2
+    # 设置成当前语言不会重复通知
+    manager.set_language('en')
+    assert changes == ['en']
+
+def test_bound_keys_translated():
+    """视图中 bind 的翻译键在每种语言中都有翻译"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    pattern = re.compile(r"language_manager\.bind\(.*?,\s*'([a-z0-9_]+)'")
+    keys = set()
+    for path in glob.glob(os.path.join(root, "views", "*.py")):
+        with open(path, encoding="utf-8") as f:
+            keys.update(pattern.findall(f.read()))
+    assert len(keys) > 20
+    manager = LanguageManager()
+    for language in LANGUAGES:
+        missing = keys - set(manager.translations[language])
+        assert not missing, (language, missing)
+
+def main():
+    """主测试函数"""
+    print("语言管理器测试")
+    print("=" * 50)
+    test_catalogs_loaded_lazily()
+    test_missing_keys_tracked()
+    test_bound_widgets_follow_language()
+    test_bound_keys_translated()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主窗口延迟创建页面测试
+
+验证：
+1. 启动时只创建登录页面，其他页面的模块也没有导入
+2. 第一次显示页面时创建并加入堆叠部件，之后复用同一个页面
+3. loaded_view 不会触发创建
+4. 导入用户模型不会导入 Pillow
+
+测试不修改数据库。
+"""
+
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import qInstallMessageHandler
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout.strip().splitlines()[-1]
+
+def test_only_login_view_at_startup():
+    """新进程中创建主窗口后，只有登录页面被导入和创建"""
+    output = run_python(
+        "import sys; from PyQt5.QtWidgets import QApplication; app = QApplication(sys.argv);"
+        "from views.main_window import MainWindow; window = MainWindow();"
+        "print(sorted(window.view_timings), 'views.register_view' in sys.modules,"
+        " 'views.csgo_server_view' in sys.modules, 'PIL' in sys.modules, 'a2s' in sys.modules)")
+    assert output == "['login_view'] False False False False", output
+
+def test_view_created_on_first_navigation():
+    """第一次显示时创建，之后复用"""
+    from views.main_window import MainWindow
+    qInstallMessageHandler(lambda *args: None)
+    window = MainWindow()
+    assert window.loaded_view('register_view') is None
+    assert window.stacked_widget.count() == 1
+
+    window.show_register()
+    register_view = window.loaded_view('register_view')
+    assert register_view is not None
+    assert window.stacked_widget.currentWidget() is register_view
+    assert window.stacked_widget.count() == 2
+
+    window.show_login()
+    window.show_register()
+    assert window.register_view is register_view
+    assert window.stacked_widget.count() == 2
+    assert set(window.view_timings) == {'login_view', 'register_view'}
+    qInstallMessageHandler(None)
+
+def test_user_model_does_not_import_pillow():
+    """Pillow 只在处理头像时导入"""
+    output = run_python("import sys, models.user; print('PIL' in sys.modules)")
+    assert output == "False"
+
+def main():
+    """主测试函数"""
+    print("主窗口延迟创建页面测试")
+    print("=" * 50)
+    test_only_login_view_at_startup()
+    test_view_created_on_first_navigation()
+    test_user_model_does_not_import_pillow()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
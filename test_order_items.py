@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+订单明细表测试
+
+验证 order_items：
+1. 结账时明细批量写入 order_items，返回的订单在会话关闭后仍可读取明细
+2. 旧数据库中 orders.items 的 JSON 由迁移分批转换，重复执行不会重复写入
+3. 按商品统计销量、查询购买者直接在 order_items 上汇总，不计入已取消的订单
+4. 明细记录下单时的商品分类，旧明细由迁移用商品当前的分类补上
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, text
+from database.db_init import Base, load_models
+from database.session import session_scope
+from database.db_operations import create_order, get_product_sales, get_product_buyers
+import database.schema as schema
+from models.user import User
+from models.product import Product
+from models.cart import CartItem
+from models.order import Order
+from models.order_item import OrderItem
+from conftest import temp_database, record_migrations
+
+def add_user(db, name, points=1000):
+    user = User(username=name, email=f"{name}@example.com", password_hash="x",
+                password_salt="x", points=points)
+    db.add(user)
+    db.flush()
+    return user.id
+
+def test_checkout_writes_order_items():
+    """结账写入明细行，同一商品的多条购物车记录合并"""
+    with temp_database() as engine:
+        with session_scope() as db:
+            user_id = add_user(db, "buyer")
+            products = [Product(name=f"商品{i}", price=10 * (i + 1), stock=10, category="皮肤") for i in range(3)]
+            db.add_all(products)
+            db.flush()
+            db.add_all([CartItem(user_id=user_id, product_id=products[0].id, quantity=1),
+                        CartItem(user_id=user_id, product_id=products[0].id, quantity=2),
+                        CartItem(user_id=user_id, product_id=products[2].id, quantity=1)])
+            product_ids = [p.id for p in products]
+
+        inserts = []
+        listener = lambda conn, cursor, statement, params, context, many: \
+            statement.startswith("INSERT INTO order_items") and inserts.append(many)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            order = create_order(user_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        # 明细只执行一次 INSERT（executemany）
+        assert inserts == [True]
+        lines = sorted((item.product_id, item.unit_price, item.quantity, item.subtotal) for item in order.order_items)
+        assert lines == [(product_ids[0], 10, 3, 30), (product_ids[2], 30, 1, 30)]
+        assert {item.category for item in order.order_items} == {"皮肤"}
+        assert order.total_points == 60
+        assert [item.name for item in order.order_items] == ["商品0", "商品2"]
+
+def create_legacy_orders(engine, orders):
+    """旧版本的数据库：orders 带 items JSON 字段，没有 order_items 表，已执行到迁移 6"""
+    load_models()
+    tables = [table for name, table in Base.metadata.tables.items()
+              if name not in ("schema_version", "order_items")]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE orders ADD COLUMN items JSON"))
+        conn.execute(text("INSERT INTO users (username, email, password_hash, password_salt, user_type) "
+                          "VALUES ('legacy', 'legacy@example.com', 'x', 'y', 'NORMAL')"))
+        conn.execute(text("INSERT INTO orders (id, user_id, total_points, status, items) "
+                          "VALUES (:id, 1, :total, 'completed', :items)"), orders)
+    # 更早的数据库会先清理演示数据（迁移 5），没有订单需要转换
+    record_migrations(engine, before=7)
+
+def test_legacy_json_converted_in_chunks():
+    """旧订单的 JSON 分批转换，重复执行迁移不会重复写入"""
+    orders = []
+    for i in range(1, 2501):
+        items = [{"product_id": 1, "name": "AK-47", "price": 10, "quantity": 2, "subtotal": 20}]
+        if i % 2:
+            # order_controller 写入的旧格式没有 subtotal
+            items.append({"product_id": 2, "name": "AWP", "price": 50, "quantity": 1})
+        orders.append({"id": i, "total": 20 + (i % 2) * 50, "items": json.dumps(items)})
+    orders.append({"id": 2501, "total": 0, "items": None})
+
+    with temp_database(create=False) as engine:
+        create_legacy_orders(engine, orders)
+        chunks = []
+        listener = lambda conn, cursor, statement, *args: \
+            statement.startswith("SELECT id, items FROM orders") and chunks.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            schema.upgrade(engine)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        # 每批 1000 个订单：3 批有数据，最后一次查询为空
+        assert schema.ORDER_ITEMS_CHUNK == 1000 and len(chunks) == 4
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT COUNT(*) FROM order_items")).scalar()
+            awp = conn.execute(text("SELECT unit_price, quantity, subtotal FROM order_items "
+                                    "WHERE order_id = 1 AND product_id = 2")).one()
+        assert count == 2500 + 1250
+        assert tuple(awp) == (50, 1, 50)
+
+        with engine.begin() as conn:
+            schema._convert_order_items(conn)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM order_items")).scalar() == count
+
+        sales = get_product_sales()
+        assert sales[1] == (5000, 50000) and sales[2] == (1250, 62500)
+
+def test_product_sales_and_buyers():
+    """按商品汇总销量和购买者，已取消的订单不计入"""
+    with temp_database():
+        with session_scope() as db:
+            alice, bob = add_user(db, "alice"), add_user(db, "bob")
+            for user_id, product_id, quantity, status in ((alice, 1, 2, "completed"), (bob, 1, 5, "pending"),
+                                                         (alice, 1, 1, "completed"), (bob, 2, 1, "completed"),
+                                                         (alice, 2, 9, "cancelled")):
+                db.add(Order(user_id=user_id, total_points=10 * quantity, status=status, order_items=[
+                    OrderItem(product_id=product_id, name=f"商品{product_id}", unit_price=10,
+                              quantity=quantity, subtotal=10 * quantity)]))
+
+        assert get_product_sales() == {1: (8, 80), 2: (1, 10)}
+        assert get_product_sales([2]) == {2: (1, 10)}
+        assert get_product_sales([3]) == {}
+        assert [tuple(row) for row in get_product_buyers(1)] == [(bob, "bob", 5), (alice, "alice", 3)]
+        assert [tuple(row) for row in get_product_buyers(2)] == [(bob, "bob", 1)]
+
+def test_legacy_items_get_category():
+    """没有 category 字段的旧明细升级后补上商品当前的分类"""
+    with temp_database(create=False) as engine:
+        load_models()
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE order_items DROP COLUMN category"))
+            conn.execute(text("INSERT INTO products (id, name, price, stock, category) "
+                              "VALUES (1, 'AK-47', 10, 5, '步枪'), (2, '贴纸', 1, 5, NULL)"))
+            conn.execute(text("INSERT INTO orders (id, user_id, total_points, status) "
+                              "VALUES (1, 1, 11, 'completed')"))
+            conn.execute(text("INSERT INTO order_items (order_id, product_id, name, unit_price, quantity, subtotal) "
+                              "VALUES (1, 1, 'AK-47', 10, 1, 10), (1, 2, '贴纸', 1, 1, 1)"))
+        record_migrations(engine, before=12)
+        schema.upgrade(engine)
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT product_id, category FROM order_items ORDER BY product_id")).all()
+        assert [tuple(row) for row in rows] == [(1, "步枪"), (2, None)]
+
+def main():
+    """主测试函数"""
+    print("订单明细表测试")
+    print("=" * 50)
+    test_checkout_writes_order_items()
+    test_legacy_json_converted_in_chunks()
+    test_product_sales_and_buyers()
+    test_legacy_items_get_category()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+键集分页测试
+
+对管理界面表格允许排序的每一列（升序和降序）逐页翻到最后，检查：
+1. 每一行恰好出现一次，顺序与一次性 ORDER BY (列, id) 查询的结果相同
+2. 可为空的列（游标停在 NULL 上）和布尔列都能继续翻页
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from database.session import session_scope
+from database.db_operations import decode_cursor
+from models.user import User
+from models.product import Product
+from models.order import Order
+from models.invite_code import PrivilegeType
+from views.admin_models import UserTableModel, ProductTableModel, OrderTableModel
+from conftest import temp_database
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+ROWS = 23
+PAGE_SIZE = 3
+
+def seed():
+    """每列都有重复值，可为空的列每三行有一个 NULL"""
+    start = datetime(2026, 1, 1)
+    with session_scope() as db:
+        users = []
+        for i in range(ROWS):
+            users.append(User(username=f"user{i:02d}", email=f"user{i:02d}@example.com",
+                              password_hash="x", password_salt="x", points=(i % 4) * 10,
+                              user_type=list(PrivilegeType)[i % len(PrivilegeType)],
+                              display_name=None if i % 3 == 0 else f"name{i % 5}",
+                              is_banned=i % 2 == 0, created_at=start + timedelta(days=i // 2)))
+        db.add_all(users)
+        db.flush()
+        db.add_all([Product(name=f"product{i:02d}", price=(i % 4) * 10, stock=None if i % 3 == 0 else i % 5,
+                            category=None if i % 3 == 1 else f"category{i % 2}", is_active=i % 2 == 1)
+                    for i in range(ROWS)])
+        db.add_all([Order(user_id=users[i].id, total_points=(i % 4) * 10,
+                          status=None if i % 3 == 2 else ("pending", "completed")[i % 2],
+                          created_at=start + timedelta(days=i // 3))
+                    for i in range(ROWS)])
+
+def expected_ids(model, sort, descending):
+    column = getattr(model, sort)
+    order_by = [column.desc(), model.id.desc()] if descending else [column.asc(), model.id.asc()]
+    with session_scope() as db:
+        return [row.id for row in db.query(model.id).order_by(*order_by)]
+
+def walk(table_model, sort, descending):
+    """逐页读取，返回所有行的 id"""
+    ids, cursor = [], None
+    while True:
+        page = table_model.fetch_page(cursor, PAGE_SIZE, sort, descending, None)
+        ids.extend(row.id for row in page)
+        if not page.has_more:
+            return ids
+        cursor = page.next_cursor
+
+def test_every_sortable_column():
+    """每个可排序列升序、降序翻页都不丢行、不重复"""
+    with temp_database():
+        seed()
+        for table_model, model in ((UserTableModel(), User), (ProductTableModel(), Product),
+                                   (OrderTableModel(), Order)):
+            for _, _, sort in table_model.columns:
+                if sort is None:
+                    continue
+                for descending in (False, True):
+                    assert walk(table_model, sort, descending) == expected_ids(model, sort, descending), \
+                        f"{model.__tablename__}.{sort} descending={descending}"
+
+def test_cursor_on_null_and_bool():
+    """游标可以停在 NULL 和布尔值上"""
+    with temp_database():
+        seed()
+        products = ProductTableModel()
+        page = products.fetch_page(None, PAGE_SIZE, "category", False, None)
+        assert decode_cursor(page.next_cursor, Product.category)[0] is None
+        page = products.fetch_page(None, PAGE_SIZE, "is_active", True, None)
+        assert decode_cursor(page.next_cursor, Product.is_active)[0] is True
+        assert len(walk(products, "is_active", False)) == ROWS
+
+def main():
+    """主测试函数"""
+    print("键集分页测试")
+    print("=" * 50)
+    test_every_sortable_column()
+    test_cursor_on_null_and_bool()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+密码哈希测试
+
+验证 utils.password 和登录流程：
+1. 新格式（PBKDF2 / scrypt）记录算法、强度和盐，可以验证
+2. 旧格式（单轮 SHA-256 有盐 / 无盐、"盐:密钥" PBKDF2）仍然可以验证，并需要升级
+3. verify_user 使用盐值验证，登录成功时把旧哈希升级为当前格式
+4. 在后台线程验证密码时 GUI 事件循环不被阻塞
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+import time
+import hashlib
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer, QEventLoop
+from database.session import session_scope
+from database.db_operations import verify_user
+from models.user import User
+from utils.password import (hash_password, verify_password, needs_rehash, calibrate,
+                            PBKDF2, SCRYPT, PASSWORD_HASH_SCHEME)
+from utils.workers import TaskRunner
+from conftest import temp_database
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def legacy_hmac(password, salt=b"0123456789abcdef"):
+    key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100000)
+    return f"{salt.hex()}:{key.hex()}"
+
+def test_versioned_formats():
+    """新格式包含算法、强度和盐"""
+    for scheme, cost, prefix in ((PBKDF2, 1000, "pbkdf2_sha256$1000$"),
+                                 (SCRYPT, 2 ** 10, "scrypt$1024:8:1$")):
+        hashed, salt = hash_password("正确的密码", scheme=scheme, cost=cost)
+        assert hashed.startswith(prefix) and f"${salt}$" in hashed
+        assert len(hashed) <= 128
+        assert verify_password("正确的密码", hashed)
+        assert not verify_password("错误的密码", hashed)
+    # 同一个密码每次的盐不同
+    assert hash_password("pw")[0] != hash_password("pw")[0]
+
+def test_legacy_formats():
+    """旧格式可以验证，并且都需要升级"""
+    salted = hashlib.sha256(b"pwsalt").hexdigest()
+    unsalted = hashlib.sha256(b"pw").hexdigest()
+    assert verify_password("pw", salted, "salt") and not verify_password("pw", salted, "other")
+    assert verify_password("pw", unsalted) and not verify_password("px", unsalted)
+    assert verify_password("pw", legacy_hmac("pw")) and not verify_password("px", legacy_hmac("pw"))
+    for legacy in (salted, unsalted, legacy_hmac("pw")):
+        assert needs_rehash(legacy)
+    # 强度低于当前设置或算法不同也需要升级
+    assert needs_rehash(hash_password("pw", cost=1000)[0])
+    other = SCRYPT if PASSWORD_HASH_SCHEME == PBKDF2 else PBKDF2
+    assert needs_rehash(hash_password("pw", scheme=other, cost=1024)[0])
+    assert not needs_rehash(hash_password("pw")[0])
+
+def test_verify_user_rehashes_legacy():
+    """旧的有盐 SHA-256 用户可以登录（以前 verify_user 漏传盐值），登录后哈希被升级"""
+    with temp_database():
+        with session_scope() as db:
+            db.add(User(username="legacy", email="legacy@example.com",
+                        password_hash=hashlib.sha256(b"secretsalt").hexdigest(), password_salt="salt"))
+            db.add(User(username="unsalted", email="unsalted@example.com",
+                        password_hash=hashlib.sha256(b"secret").hexdigest(), password_salt=""))
+
+        assert verify_user("legacy", "wrong") is None
+        with session_scope() as db:
+            assert db.query(User).filter_by(username="legacy").one().password_hash == \
+                hashlib.sha256(b"secretsalt").hexdigest()
+
+        for username in ("legacy", "unsalted"):
+            user = verify_user(username, "secret")
+            assert user is not None and user.username == username
+            with session_scope() as db:
+                stored = db.query(User).filter_by(username=username).one()
+                assert stored.password_hash.startswith(f"{PASSWORD_HASH_SCHEME}$")
+                assert not needs_rehash(stored.password_hash)
+                assert stored.password_salt in stored.password_hash
+            # 升级后仍然用同一个密码登录，且不再重复升级
+            assert verify_user(username, "secret") is not None
+            assert verify_user(username, "wrong") is None
+
+def test_calibrate():
+    """校准结果随目标耗时增长"""
+    low = calibrate(PBKDF2, target_ms=5)
+    high = calibrate(PBKDF2, target_ms=40)
+    assert 10000 <= low <= high
+    n = calibrate(SCRYPT, target_ms=5)
+    assert n >= 2 ** 12 and n & (n - 1) == 0
+
+def test_verify_off_gui_thread():
+    """后台验证较慢的哈希时，GUI 事件循环保持响应"""
+    hashed, _ = hash_password("pw", scheme=PBKDF2, cost=600000)
+    start = time.perf_counter()
+    verify_password("pw", hashed)
+    single = time.perf_counter() - start
+
+    runner = TaskRunner()
+    results = []
+    gaps = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    heartbeat = QTimer()
+    heartbeat.timeout.connect(tick)
+    heartbeat.start(5)
+    runner.submit("login", verify_password, "pw", hashed, on_result=results.append)
+    loop = QEventLoop()
+    QTimer.singleShot(int(single * 1000 * 3) + 500, loop.quit)
+    timer = QTimer()
+    timer.timeout.connect(lambda: results and loop.quit())
+    timer.start(5)
+    loop.exec_()
+    heartbeat.stop()
+    timer.stop()
+
+    print(f"单次验证 {single * 1000:.0f}ms，后台验证期间最长事件循环间隔 {max(gaps) * 1000:.1f}ms")
+    assert results == [True]
+    assert max(gaps) < max(0.05, single / 2)
+
+def main():
+    """主测试函数"""
+    print("密码哈希测试")
+    print("=" * 50)
+    test_versioned_formats()
+    test_legacy_formats()
+    test_verify_user_rehashes_legacy()
+    test_calibrate()
+    test_verify_off_gui_thread()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步支付流程测试
+
+启动一个本地支付桩服务（/create、/check），验证 PaymentFlow / PaymentManager：
+1. 多笔支付同时进行：成功、失败、用户取消互不影响
+2. 轮询按退避间隔进行，成功后只入账一次
+3. 一直未支付时超时
+4. 支付进行期间 GUI 事件循环不被阻塞
+
+测试不访问真实支付接口，也不修改数据库。
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, closing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["USE_PAYMENT_SIMULATION"] = "false"
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer, QEventLoop
+from utils.payment import PaymentAPI
+from utils.payment_flow import PaymentFlow, PaymentManager, PaymentState
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+class StubPaymentServer:
+    """本地支付桩服务
+
+    plans: order_id 前缀 -> check 依次返回的状态列表（最后一个状态重复返回）
+    """
+
+    def __init__(self, plans, delay=0.0):
+        self.plans = plans
+        self.delay = delay
+        self.checks = {}
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                time.sleep(stub.delay)
+                if self.path == "/create":
+                    reply = {'success': True, 'payment_id': f"pay_{body['order_id']}",
+                             'qr_code_url': f"https://pay.example.com/{body['order_id']}"}
+                else:
+                    reply = stub.next_status(body['payment_id'])
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def next_status(self, payment_id):
+        with self.lock:
+            count = self.checks.get(payment_id, 0)
+            self.checks[payment_id] = count + 1
+        plan = next(p for prefix, p in self.plans.items() if payment_id.startswith(f"pay_{prefix}"))
+        status = plan[min(count, len(plan) - 1)]
+        reply = {'success': True, 'status': status, 'payment_id': payment_id}
+        if status == "failed":
+            reply['message'] = "余额不足"
+        return reply
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@contextmanager
+def flow_timing(**attrs):
+    """临时缩短退避间隔和超时，便于测试"""
+    saved = {name: getattr(PaymentFlow, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(PaymentFlow, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(PaymentFlow, name, value)
+
+def run_until(predicate, timeout=10):
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: predicate() and loop.quit())
+    timer.start(5)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec_()
+    timer.stop()
+    assert predicate(), "支付流程没有在规定时间内结束"
+
+def start_flow(server, prefix, settled, amount=10):
+    flow = PaymentFlow(amount, "alipay", settle=settled.append,
+                       api=PaymentAPI(api_url=server.url), order_id=f"{prefix}_{time.time_ns()}")
+    states = []
+    flow.state_changed.connect(states.append)
+    flow.start()
+    return flow, states
+
+def test_concurrent_payments():
+    """成功、失败、取消三笔支付同时进行"""
+    plans = {
+        "ok": ["pending", "pending", "success"],
+        "bad": ["pending", "failed"],
+        "wait": ["pending"],
+    }
+    with flow_timing(POLL_INITIAL=0.02, POLL_FACTOR=2.0, POLL_MAX=0.1, TIMEOUT=5.0), \
+            closing(StubPaymentServer(plans)) as server:
+        settled = []
+        ok, ok_states = start_flow(server, "ok", settled)
+        bad, bad_states = start_flow(server, "bad", settled)
+        wait, wait_states = start_flow(server, "wait", settled)
+        run_until(lambda: wait.state == PaymentState.AWAITING_SCAN)
+        wait.cancel()
+        run_until(lambda: ok.is_finished() and bad.is_finished())
+
+        assert ok_states == ["creating", "awaiting_scan", "settling", "succeeded"], ok_states
+        assert ok.result()['success'] and ok.poll_count == 3
+        assert bad_states[-1] == "failed" and not bad.result()['success']
+        # 服务端的说明不作为语言键，单独放在 detail 中
+        assert bad.result()['message'] == "payment_failed" and bad.result()['detail'] == "余额不足"
+        assert wait_states[-1] == "cancelled"
+        # 只有成功的支付入账，且只入账一次
+        assert [r['order_id'] for r in settled] == [ok.order_id]
+
+def test_confirm_scanned_polls_immediately():
+    """用户点击已完成支付后立即查询，不等退避间隔"""
+    with flow_timing(POLL_INITIAL=30.0, TIMEOUT=60.0), \
+            closing(StubPaymentServer({"scan": ["success"]})) as server:
+        settled = []
+        flow, states = start_flow(server, "scan", settled)
+        run_until(lambda: flow.state == PaymentState.AWAITING_SCAN)
+        flow.confirm_scanned()
+        run_until(flow.is_finished, timeout=5)
+        assert states == ["creating", "awaiting_scan", "polling", "settling", "succeeded"], states
+        assert len(settled) == 1
+
+def test_timeout():
+    """一直未支付时超时，不入账"""
+    with flow_timing(POLL_INITIAL=0.02, POLL_FACTOR=1.5, POLL_MAX=0.05, TIMEOUT=0.3), \
+            closing(StubPaymentServer({"slow": ["pending"]})) as server:
+        settled = []
+        flow, states = start_flow(server, "slow", settled)
+        run_until(flow.is_finished)
+        assert states[-1] == "timed_out"
+        assert settled == []
+        assert flow.poll_count >= 3
+
+def test_event_loop_not_blocked():
+    """服务端每次响应都很慢时，GUI 事件循环仍然保持响应"""
+    # PaymentManager 生成的订单号以 order_ 开头
+    with flow_timing(POLL_INITIAL=0.01, TIMEOUT=5.0), \
+            closing(StubPaymentServer({"order": ["pending", "success"]}, delay=0.3)) as server:
+        manager = PaymentManager(api_factory=lambda: PaymentAPI(api_url=server.url))
+        results = []
+        manager.payment_finished.connect(results.append)
+        gaps = []
+        last = [time.perf_counter()]
+
+        def tick():
+            now = time.perf_counter()
+            gaps.append(now - last[0])
+            last[0] = now
+
+        heartbeat = QTimer()
+        heartbeat.timeout.connect(tick)
+        heartbeat.start(5)
+        for _ in range(3):
+            manager.start(10, "alipay")
+        assert len(manager.pending()) == 3
+        run_until(lambda: len(results) == 3)
+        heartbeat.stop()
+
+        print(f"慢速支付服务下最长事件循环间隔: {max(gaps) * 1000:.1f}ms")
+        assert all(r['success'] for r in results)
+        assert manager.pending() == []
+        # 每次请求耗时 300ms，阻塞式轮询至少会卡住 600ms
+        assert max(gaps) < 0.2
+
+def main():
+    """主测试函数"""
+    print("异步支付流程测试")
+    print("=" * 50)
+    test_concurrent_payments()
+    test_confirm_scanned_polls_immediately()
+    test_timeout()
+    test_event_loop_not_blocked()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
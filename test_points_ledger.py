@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+积分账本测试
+
+验证积分账本：
+1. 充值、结账、管理员修改积分都在同一事务内记账，每笔交易两条分录借贷平衡；
+   积分不足时余额、账本都不变
+2. 每 SNAPSHOT_INTERVAL 笔分录保存一次快照，历史余额只读取快照之后的少量分录
+3. 对账能发现余额被直接修改、分录被删除、快照错误和借贷不平
+4. 旧数据库升级时把现有余额记为期初余额，重复执行不会重复记账
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, text
+from database.db_init import Base, load_models
+from database.session import session_scope
+from database.db_operations import (create_order, update_user_points, create_points_transaction,
+                                    get_points_balance, reconcile_points)
+from controllers.user_controller import update_user_points as admin_set_points
+import database.schema as schema
+from models.user import User
+from models.product import Product
+from models.cart import CartItem
+from models.points import PointsTransaction, PointsLedgerEntry, PointsSnapshot, SNAPSHOT_INTERVAL
+from conftest import temp_database
+
+def add_user(db, name, points=0):
+    user = User(username=name, email=f"{name}@example.com", password_hash="x",
+                password_salt="x", points=points)
+    db.add(user)
+    db.flush()
+    return user.id
+
+def clean(report):
+    return not (report["mismatches"] or report["gaps"] or report["bad_snapshots"] or report["unbalanced"])
+
+def test_every_change_goes_through_ledger():
+    """充值、购买、管理员修改都记账，账本和余额一致"""
+    with temp_database():
+        with session_scope() as db:
+            user_id = add_user(db, "buyer")
+            product = Product(name="AK-47 | 红线", price=30, stock=5, category="皮肤")
+            db.add(product)
+            db.flush()
+            db.add(CartItem(user_id=user_id, product_id=product.id, quantity=2))
+
+        assert update_user_points(user_id, 100).points == 100
+        order = create_order(user_id)
+        assert admin_set_points(user_id, 25) == (True, "积分更新成功")
+
+        with session_scope() as db:
+            assert db.query(User).get(user_id).points == 25
+            transactions = db.query(PointsTransaction).order_by(PointsTransaction.id).all()
+            assert [(t.type, t.amount) for t in transactions] == \
+                [("recharge", 100), ("purchase", -60), ("adjustment", -15)]
+            assert f"#{order.id}" in transactions[1].description
+            entries = db.query(PointsLedgerEntry).all()
+            assert len(entries) == 6
+            assert [e.seq for e in entries if e.user_id] == [1, 2, 3]
+        assert get_points_balance(user_id) == 25
+        assert clean(reconcile_points())
+
+        # 积分不足：订单回滚，余额和账本不变
+        with session_scope() as db:
+            db.add(CartItem(user_id=user_id, product_id=product.id, quantity=1))
+        try:
+            create_order(user_id)
+            assert False, "积分不足时应当抛出 ValueError"
+        except ValueError as e:
+            assert str(e) == "积分不足"
+        with session_scope() as db:
+            assert db.query(User).get(user_id).points == 25
+            assert db.query(PointsLedgerEntry).count() == 6
+            assert db.query(Product).get(product.id).stock == 3
+
+def test_snapshots_and_history():
+    """快照间隔和任意时刻的历史余额"""
+    postings = SNAPSHOT_INTERVAL * 2 + 30
+    with temp_database() as engine:
+        with session_scope() as db:
+            user_id = add_user(db, "saver")
+        amounts = [(i % 7) + 1 if i % 3 else -1 for i in range(postings)]
+        amounts[0] = 10
+        for amount in amounts:
+            create_points_transaction(user_id, amount, "recharge" if amount > 0 else "purchase", "测试")
+
+        start = datetime(2024, 1, 1)
+        with engine.begin() as conn:
+            # 分录时间改为每笔间隔一分钟，便于按时间查询
+            conn.execute(text("UPDATE points_ledger SET created_at = datetime(:start, '+' || seq || ' minutes') "
+                              "WHERE user_id = :user_id"), {"start": str(start), "user_id": user_id})
+        with session_scope() as db:
+            assert [s.seq for s in db.query(PointsSnapshot).order_by(PointsSnapshot.seq)] == \
+                [SNAPSHOT_INTERVAL, SNAPSHOT_INTERVAL * 2]
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            for minutes in (0, 1, 57, SNAPSHOT_INTERVAL, SNAPSHOT_INTERVAL * 2 + 11, postings + 5):
+                expected = sum(amounts[:min(minutes, postings)])
+                assert get_points_balance(user_id, at=start + timedelta(minutes=minutes)) == expected
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        # 每次最多三条按索引的查询
+        assert len(statements) <= 6 * 3
+        assert get_points_balance(user_id) == sum(amounts)
+        assert clean(reconcile_points())
+
+def test_reconcile_finds_problems():
+    """对账发现不一致"""
+    with temp_database() as engine:
+        with session_scope() as db:
+            ids = [add_user(db, f"user{i}") for i in range(4)]
+        for user_id in ids:
+            for _ in range(SNAPSHOT_INTERVAL + 2):
+                create_points_transaction(user_id, 1, "recharge", "测试")
+        report = reconcile_points()
+        assert clean(report)
+        assert report["users"] == 4 and report["entries"] == 4 * (SNAPSHOT_INTERVAL + 2)
+
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE users SET points = points + 5 WHERE id = :id"), {"id": ids[0]})
+            conn.execute(text("DELETE FROM points_ledger WHERE user_id = :id AND seq = 3"), {"id": ids[1]})
+            conn.execute(text("UPDATE points_snapshots SET balance = 1 WHERE user_id = :id"), {"id": ids[2]})
+            conn.execute(text("UPDATE points_ledger SET amount = 0 WHERE user_id IS NULL AND transaction_id = "
+                              "(SELECT MAX(transaction_id) FROM points_ledger WHERE user_id = :id)"), {"id": ids[3]})
+        report = reconcile_points()
+        assert report["mismatches"] == [(ids[0], SNAPSHOT_INTERVAL + 7, SNAPSHOT_INTERVAL + 2),
+                                        (ids[1], SNAPSHOT_INTERVAL + 2, SNAPSHOT_INTERVAL + 1)]
+        assert report["gaps"] == [ids[1]]
+        assert report["bad_snapshots"] == [(ids[1], SNAPSHOT_INTERVAL, SNAPSHOT_INTERVAL, SNAPSHOT_INTERVAL - 1),
+                                           (ids[2], SNAPSHOT_INTERVAL, 1, SNAPSHOT_INTERVAL)]
+        # 被删除分录所在的交易也不再平衡
+        assert len(report["unbalanced"]) == 2
+
+def test_legacy_balances_opened():
+    """旧数据库升级：现有余额记为期初余额，可以重复执行"""
+    with temp_database(create=False) as engine:
+        load_models()
+        legacy = [table for name, table in Base.metadata.tables.items()
+                  if name not in ("schema_version", "points_ledger", "points_snapshots")]
+        Base.metadata.create_all(bind=engine, tables=legacy)
+        with session_scope() as db:
+            rich = add_user(db, "rich", points=500)
+            add_user(db, "poor")
+            db.add(PointsTransaction(user_id=rich, amount=300, type="recharge"))
+
+        # 演示数据清理（迁移 5）在界面显示前执行，删除积分记录后余额重新记为期初余额
+        deferred = schema.upgrade(engine)
+        assert [m.version for m in deferred] == [10]
+        with engine.begin() as conn:
+            schema.open_points_balances(conn)
+        with session_scope() as db:
+            assert db.query(PointsTransaction).filter_by(type="opening").count() == 1
+            assert db.query(PointsLedgerEntry).count() == 2
+        assert clean(reconcile_points())
+
+        schema.run_deferred(deferred, engine)
+        assert clean(reconcile_points())
+        update_user_points(rich, -100, "purchase", "测试")
+        assert get_points_balance(rich) == 400
+        assert clean(reconcile_points())
+
+def main():
+    """主测试函数"""
+    print("积分账本测试")
+    print("=" * 50)
+    test_every_change_goes_through_ledger()
+    test_snapshots_and_history()
+    test_reconcile_finds_problems()
+    test_legacy_balances_opened()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+商品全文搜索测试
+
+验证 products_fts 搜索索引：
+1. 分词：英文按单词前缀匹配，中文按相连的字匹配，全角字符与半角相同
+2. 搜索结果按相关度排序（名称命中在前），支持分类过滤、分页和分类计数，不返回下架商品
+3. 新增、修改、删除商品后索引由触发器同步
+4. 旧数据库升级时为已有商品建立索引
+5. 首页搜索框和分类下拉框
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from sqlalchemy import text
+from database.db_init import Base, load_models
+from database.session import session_scope
+from database.db_operations import (search_products, get_search_facets, create_product,
+                                    update_product, delete_product)
+from database.search import search_tokens, match_query
+import database.schema as schema
+from models.product import Product
+from conftest import temp_database, record_migrations
+
+CATALOG = [
+    # (名称, 描述, 分类, 是否上架)
+    ("AK-47 | 红线", "经典步枪皮肤，红黑配色", "皮肤", True),
+    ("蝴蝶刀 | 渐变之色", "Fade 渐变涂装的刀", "皮肤", True),
+    ("AWP | 二西莫夫", "狙击步枪皮肤", "皮肤", True),
+    ("音乐盒：红线", "击杀时播放 AK 主题音乐", "特效", True),
+    ("VIP 月卡", "三十天 VIP 特权", "特权", True),
+    ("AK-47 | 火蛇", "已下架的步枪皮肤", "皮肤", False),
+]
+
+def seed_catalog():
+    with session_scope() as db:
+        products = [Product(name=name, description=description, category=category, is_active=active,
+                            price=10, stock=5) for name, description, category, active in CATALOG]
+        db.add_all(products)
+        db.flush()
+        return [p.id for p in products]
+
+def names(page):
+    return [product.name for product in page]
+
+def test_tokens():
+    """写入索引的词和查询语句"""
+    assert search_tokens("AK-47 | 红线") == "ak 47 红 线"
+    assert search_tokens("ＡＫ４７") == "ak47"
+    assert search_tokens(None) == ""
+    assert match_query("ak 红线") == '"ak"* "红 线"'
+    assert match_query("M4A4咆哮") == '"m4a4"* "咆 哮"'
+    assert match_query('" * OR') == '"or"*'
+    assert match_query("| - _") is None
+
+def test_search_ranking_and_facets():
+    """排序、分类过滤、分页和分类计数"""
+    with temp_database():
+        seed_catalog()
+        # 前缀匹配；名称命中排在只有描述命中的前面，下架商品不出现
+        assert names(search_products("ak")) == ["AK-47 | 红线", "音乐盒：红线"]
+        assert names(search_products("fa")) == ["蝴蝶刀 | 渐变之色"]
+        # 中文：单字、两个字、名称中间的字都能命中，字不相连时不命中
+        assert names(search_products("蝴蝶")) == ["蝴蝶刀 | 渐变之色"]
+        assert names(search_products("刀")) == ["蝴蝶刀 | 渐变之色"]
+        assert names(search_products("红线")) == ["AK-47 | 红线", "音乐盒：红线"]
+        assert names(search_products("红蝶")) == []
+        assert sorted(names(search_products("步枪"))) == ["AK-47 | 红线", "AWP | 二西莫夫"]
+        assert names(search_products("ｖｉｐ 月卡")) == ["VIP 月卡"]
+        assert names(search_products("   ")) == []
+
+        assert names(search_products("红线", category="特效")) == ["音乐盒：红线"]
+        assert get_search_facets("红线") == [("特效", 1), ("皮肤", 1)]
+        assert get_search_facets("皮肤") == [("皮肤", 3)]
+        assert get_search_facets("|") == []
+
+        first = search_products("皮肤", page_size=2)
+        assert len(first) == 2 and first.has_more
+        second = search_products("皮肤", page_size=2, cursor=first.next_cursor)
+        assert len(second) == 1 and not second.has_more
+        assert set(names(first) + names(second)) == {"AK-47 | 红线", "蝴蝶刀 | 渐变之色", "AWP | 二西莫夫"}
+        try:
+            search_products("皮肤", cursor="abc")
+            assert False, "无效的游标应当抛出 ValueError"
+        except ValueError:
+            pass
+
+def test_index_follows_products():
+    """新增、修改、删除商品后索引同步"""
+    with temp_database() as engine:
+        ids = seed_catalog()
+        assert create_product("M4A4 | 咆哮", "咆哮的老虎", 50, 3, "皮肤")[0]
+        assert names(search_products("咆哮")) == ["M4A4 | 咆哮"]
+
+        assert update_product(ids[0], name="AK-47 | 血腥运动")[0]
+        assert names(search_products("血腥")) == ["AK-47 | 血腥运动"]
+        assert names(search_products("红线")) == ["音乐盒：红线"]
+
+        assert delete_product(ids[3])[0]
+        assert names(search_products("红线")) == []
+        assert get_search_facets("ak") == [("皮肤", 1)]
+
+        # 只改库存不重写索引
+        with engine.begin() as conn:
+            before = conn.execute(text("SELECT COUNT(*) FROM products_fts_data")).scalar()
+            conn.execute(text("UPDATE products SET stock = stock - 1"))
+            assert conn.execute(text("SELECT COUNT(*) FROM products_fts_data")).scalar() == before
+            indexed = conn.execute(text("SELECT COUNT(*) FROM products_fts")).scalar()
+            assert indexed == conn.execute(text("SELECT COUNT(*) FROM products")).scalar()
+
+def test_legacy_database_indexed():
+    """旧数据库升级时为已有商品建立索引"""
+    with temp_database(create=False) as engine:
+        load_models()
+        Base.metadata.create_all(bind=engine, tables=[table for name, table in Base.metadata.tables.items()
+                                                      if name != "schema_version"])
+        seed_catalog()
+        record_migrations(engine, before=11)
+        schema.upgrade(engine)
+        assert names(search_products("蝴蝶")) == ["蝴蝶刀 | 渐变之色"]
+        with engine.begin() as conn:
+            # 重复执行迁移不会重复写入
+            schema._create_search_index(conn)
+            assert conn.execute(text("SELECT COUNT(*) FROM products_fts")).scalar() == len(CATALOG)
+
+def test_home_view_search():
+    """首页搜索框和分类下拉框"""
+    from PyQt5.QtWidgets import QApplication
+    from views.home_view import HomeView
+    from utils.language_manager import language_manager
+    from utils.workers import task_pool
+
+    class StubMainWindow:
+        current_user = None
+
+        def show_cart(self): pass
+        def show_profile(self): pass
+        def show_csgo_server(self): pass
+        def show_admin(self): pass
+        def logout(self): pass
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    def settle():
+        """等待后台搜索结束并处理结果信号"""
+        for _ in range(3):
+            task_pool().waitForDone(5000)
+            app.processEvents()
+
+    active = sum(1 for *_, is_active in CATALOG if is_active)
+    with temp_database():
+        seed_catalog()
+        view = HomeView(StubMainWindow())
+        try:
+            # 未搜索时的列表和搜索结果一样，只有上架的商品
+            view.load_products()
+            assert view.product_model.rowCount() == active
+
+            view.search_input.setText("红线")
+            assert view.search_timer.isActive()
+            view.search_products()
+            # 搜索在后台线程执行，结果经事件循环送回
+            assert view.product_model.rowCount() == 0
+            settle()
+            assert [view.category_filter.itemText(i) for i in range(view.category_filter.count())] == \
+                ["全部分类 (2)", "特效 (1)", "皮肤 (1)"]
+            assert view.product_model.rowCount() == 2
+
+            view.category_filter.setCurrentIndex(1)
+            view._apply_search()
+            settle()
+            assert view.product_model.rowCount() == 1
+            assert view.product_model.index(0).data() == "音乐盒：红线"
+
+            view.search_input.setText("咆哮")
+            view.search_products()
+            settle()
+            assert view.product_model.rowCount() == 0
+            assert view.empty_label.text() == language_manager.get_text('no_search_results')
+
+            # 新的搜索作废尚未返回的结果
+            view.search_input.setText("AK")
+            view.search_products()
+            view.search_input.setText("蝴蝶")
+            view.search_products()
+            settle()
+            assert [view.product_model.index(i).data() for i in range(view.product_model.rowCount())] == \
+                ["蝴蝶刀 | 渐变之色"]
+
+            view.search_input.clear()
+            view.search_products()
+            assert view.category_filter.isHidden()
+            assert view.product_model.rowCount() == active
+        finally:
+            view.close()
+            view.deleteLater()
+            app.processEvents()
+
+def main():
+    """主测试函数"""
+    print("商品全文搜索测试")
+    print("=" * 50)
+    test_tokens()
+    test_search_ranking_and_facets()
+    test_index_follows_products()
+    test_legacy_database_indexed()
+    test_home_view_search()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
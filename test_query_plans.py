@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+查询计划回归测试
+
+在临时数据库上逐个调用 database.db_operations 中的数据库函数，记录它们执行的 SQL，
+再用 EXPLAIN QUERY PLAN 检查每条语句：
+1. 不允许全表扫描（SCAN 表名，没有使用索引），本来就要读取整张表的函数除外
+2. 分页查询不允许 USE TEMP B-TREE FOR ORDER BY（那意味着先读出所有匹配行再排序）
+3. 每个数据库函数都必须出现在检查列表中，新增函数时需要补充
+4. 旧数据库升级后会补上模型中定义的索引
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+import re
+from datetime import datetime
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, inspect, text
+from database.db_init import Base, load_models
+from database.schema import upgrade
+from database.session import session_scope
+import database.db_operations as ops
+from models.user import User
+from models.product import Product
+from models.order import Order
+from models.order_item import OrderItem
+from models.points import PointsTransaction
+from models.cart import CartItem
+from models.steam_binding import SteamBinding
+from models.invite_code import InviteCode, PrivilegeType
+from conftest import temp_database
+
+# 本来就要读取（或删除）整张表的函数 -> 允许全表扫描的表
+FULL_TABLE = {
+    "init_test_data": {"products"},
+    "get_products": {"products"},
+    "get_all_users": {"users"},
+    "get_all_products": {"products"},
+    "get_all_orders": {"orders"},
+    "get_invite_codes": {"invite_codes"},
+    "reconcile_points": {"users"},
+    # 分类数量很少，读取全部分类
+    "get_dashboard": {"category_sales"},
+    "delete_demo_data": {"cart_items", "orders", "products", "points_transactions", "steam_bindings"},
+    "delete_all_users": {"steam_bindings", "points_transactions", "cart_items", "orders", "users"},
+}
+
+def two_pages(fn, *args, **kwargs):
+    """读取两页，第二页带游标条件"""
+    page = fn(*args, page_size=2, **kwargs)
+    assert page.next_cursor, f"{fn.__name__} 测试数据不足两页"
+    return fn(*args, page_size=2, cursor=page.next_cursor, **kwargs)
+
+# 只对按索引取出的少量匹配行排序（前缀搜索的结果、某个商品的购买者），允许排序用的临时 B 树
+SORT_MATCHES = "sort_matches"
+
+# (函数名, 调用[, SORT_MATCHES])；按顺序执行，后面的调用依赖前面的数据变化
+CASES = [
+    ("init_test_data", lambda: ops.init_test_data()),
+    ("get_products", lambda: ops.get_products()),
+    ("get_product_stocks", lambda: ops.get_product_stocks([1, 2])),
+    ("create_user", lambda: ops.create_user("carol", "carol@example.com", "secret")),
+    ("create_user", lambda: ops.create_user("dave", "dave@example.com", "secret", invite_code="VIPCODE1")),
+    ("verify_user", lambda: ops.verify_user("alice", "secret")),
+    ("get_user_by_id", lambda: ops.get_user_by_id(1)),
+    ("update_user_points", lambda: ops.update_user_points(1, 100)),
+    ("create_points_transaction", lambda: ops.create_points_transaction(1, 5, "recharge", "测试")),
+    ("get_user_transactions", lambda: ops.get_user_transactions(1)),
+    ("get_points_balance", lambda: ops.get_points_balance(1)),
+    ("get_points_balance", lambda: ops.get_points_balance(1, at=datetime.now())),
+    ("bind_steam_account", lambda: ops.bind_steam_account(2, "76561190000000009", "bob")),
+    ("get_steam_binding", lambda: ops.get_steam_binding(1)),
+    ("get_steam_binding_chunk", lambda: ops.get_steam_binding_chunk(0, 10)),
+    ("bulk_update_steam_profiles", lambda: ops.bulk_update_steam_profiles(
+        [{'id': 1, 'steam_name': "新昵称", 'steam_avatar': None}])),
+    ("get_cart_items", lambda: ops.get_cart_items(1)),
+    ("add_to_cart", lambda: ops.add_to_cart(1, 2)),
+    ("update_cart_item", lambda: ops.update_cart_item(1, 2)),
+    ("remove_from_cart", lambda: ops.remove_from_cart(2)),
+    ("create_order", lambda: ops.create_order(1)),
+    ("get_all_users", lambda: ops.get_all_users()),
+    ("get_all_products", lambda: ops.get_all_products()),
+    ("get_all_orders", lambda: ops.get_all_orders()),
+    ("reconcile_points", lambda: ops.reconcile_points()),
+    ("record_order_sales", lambda: ops.record_order_sales(1, -1)),
+    ("record_order_sales", lambda: ops.record_order_sales(1)),
+    ("get_dashboard", lambda: ops.get_dashboard()),
+    ("rebuild_dashboard", lambda: ops.rebuild_dashboard()),
+    ("get_product_sales", lambda: ops.get_product_sales()),
+    ("get_product_sales", lambda: ops.get_product_sales([1, 2])),
+    ("get_product_buyers", lambda: ops.get_product_buyers(1), SORT_MATCHES),
+    ("paginate_products", lambda: two_pages(ops.paginate_products, category="皮肤")),
+    ("paginate_products", lambda: two_pages(ops.paginate_products, is_active=True)),
+    ("paginate_products", lambda: ops.paginate_products(search="ak"), SORT_MATCHES),
+    ("search_products", lambda: two_pages(ops.search_products, "皮肤")),
+    ("search_products", lambda: ops.search_products("ak", category="皮肤")),
+    ("get_search_facets", lambda: ops.get_search_facets("ak")),
+    ("paginate_orders", lambda: two_pages(ops.paginate_orders, user_id=1)),
+    ("paginate_orders", lambda: two_pages(ops.paginate_orders, status="completed")),
+    ("paginate_orders", lambda: two_pages(ops.paginate_orders)),
+    ("paginate_users", lambda: ops.paginate_users(user_type=PrivilegeType.VIP)),
+    ("paginate_users", lambda: ops.paginate_users(search="AL"), SORT_MATCHES),
+    ("paginate_user_transactions", lambda: two_pages(ops.paginate_user_transactions, 1)),
+    ("count_products", lambda: ops.count_products(category="皮肤")),
+    ("count_products", lambda: ops.count_products(search="ak")),
+    ("count_orders", lambda: ops.count_orders(user_id=1)),
+    ("count_orders", lambda: ops.count_orders(status="completed")),
+    ("count_users", lambda: ops.count_users(user_type=PrivilegeType.NORMAL)),
+    ("count_users", lambda: ops.count_users(search="al")),
+    ("count_user_transactions", lambda: ops.count_user_transactions(1)),
+    ("create_product", lambda: ops.create_product("M4A4 | 咆哮", "", 50, 3, "皮肤")),
+    ("update_product", lambda: ops.update_product(1, name="AK-47 | 火蛇", price=60)),
+    ("delete_product", lambda: ops.delete_product(3)),
+    ("get_user_by_username", lambda: ops.get_user_by_username("bob")),
+    ("get_user_points_transactions", lambda: ops.get_user_points_transactions(1)),
+    ("unbind_steam_account", lambda: ops.unbind_steam_account(1)),
+    ("update_user_avatar", lambda: ops.update_user_avatar(1, "avatar_1.jpg")),
+    ("update_user_info", lambda: ops.update_user_info(2, username="bobby", email="bobby@example.com")),
+    ("create_invite_code", lambda: ops.create_invite_code()),
+    ("get_invite_codes", lambda: ops.get_invite_codes()),
+    ("verify_invite_code", lambda: ops.verify_invite_code("NORMAL01")),
+    ("use_invite_code", lambda: ops.use_invite_code("NORMAL01", 2)),
+    ("delete_invite_code", lambda: ops.delete_invite_code(1)),
+    ("create_admin_user_with_permissions", lambda: ops.create_admin_user_with_permissions(
+        "root", "root@example.com", "secret", ["manage_products"])),
+    ("delete_demo_data", lambda: ops.delete_demo_data()),
+    ("delete_all_users", lambda: ops.delete_all_users()),
+]
+
+def seed():
+    with session_scope() as db:
+        users = [User(username=name, email=f"{name}@example.com", points=1000) for name in ("alice", "bob")]
+        for user in users:
+            user.set_password("secret")
+        db.add_all(users)
+        db.add_all([Product(name=name, price=10, stock=100, category=category) for name, category in (
+            ("AK-47 | 红线", "皮肤"), ("AWP | 二西莫夫", "皮肤"), ("音乐盒", "特效"),
+            ("AK-47 | 血腥运动", "皮肤"), ("VIP 月卡", "特权"))])
+        db.flush()
+        db.add_all([Order(user_id=1, total_points=10, status="completed",
+                          order_items=[OrderItem(product_id=1, name="AK-47 | 红线", unit_price=10,
+                                                 quantity=1, subtotal=10)]) for _ in range(3)])
+        db.add_all([PointsTransaction(user_id=1, amount=10, type="recharge") for _ in range(3)])
+        db.add_all([CartItem(user_id=1, product_id=1), CartItem(user_id=1, product_id=4)])
+        db.add(SteamBinding(user_id=1, steam_id="76561190000000001", steam_name="alice"))
+        db.add_all([InviteCode(code="NORMAL01"), InviteCode(code="VIPCODE1", privilege_type=PrivilegeType.VIP)])
+
+@contextmanager
+def capture_statements(engine):
+    """记录执行的 (SQL, 参数)；executemany 只保留第一组参数"""
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0]
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+def explain(engine, statement, parameters):
+    """返回查询计划每一步的说明"""
+    connection = engine.raw_connection()
+    try:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return [row[-1] for row in rows]
+    finally:
+        connection.close()
+
+def plan_problems(details, allowed_tables=(), allow_sort=False):
+    """找出计划中的全表扫描和排序用的临时 B 树"""
+    problems = []
+    for detail in details:
+        scan = re.fullmatch(r"SCAN (?:TABLE )?(\w+)", detail)
+        if scan and scan.group(1) not in allowed_tables:
+            problems.append(detail)
+        elif detail.startswith("USE TEMP B-TREE FOR ORDER BY") and not allow_sort:
+            problems.append(detail)
+    return problems
+
+def test_no_table_scans():
+    """数据库函数执行的每条查询都使用索引"""
+    problems = []
+    checked = 0
+    with temp_database() as engine:
+        seed()
+        for name, call, *flags in CASES:
+            with capture_statements(engine) as statements:
+                call()
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                checked += 1
+                details = explain(engine, statement, parameters)
+                for problem in plan_problems(details, FULL_TABLE.get(name, ()), SORT_MATCHES in flags):
+                    problems.append(f"{name}: {problem}\n    {' '.join(statement.split())}")
+    print(f"检查了 {checked} 条查询")
+    assert not problems, "查询计划退化:\n" + "\n".join(problems)
+
+def test_every_function_is_checked():
+    """db_operations 中每个使用会话的函数都在检查列表中"""
+    functions = {name for name, value in vars(ops).items()
+                 if callable(value) and getattr(value, "__module__", None) == ops.__name__
+                 and hasattr(value, "__wrapped__")}
+    missing = functions - {case[0] for case in CASES}
+    assert not missing, f"以下函数没有查询计划检查: {sorted(missing)}"
+
+def test_plan_problems():
+    """计划解析：只有未使用索引的扫描和排序临时表算问题"""
+    assert plan_problems(["SCAN orders"]) == ["SCAN orders"]
+    assert plan_problems(["SCAN TABLE orders"]) == ["SCAN TABLE orders"]
+    assert plan_problems(["SCAN orders"], {"orders"}) == []
+    assert plan_problems(["SCAN orders USING INDEX ix_orders_created_at",
+                          "SEARCH users USING INTEGER PRIMARY KEY (rowid=?)"]) == []
+    assert plan_problems(["SEARCH orders USING INDEX ix_orders_user_created (user_id=?)",
+                          "USE TEMP B-TREE FOR ORDER BY"]) == ["USE TEMP B-TREE FOR ORDER BY"]
+    assert plan_problems(["SEARCH products USING INDEX ix_products_name_nocase (name>? AND name<?)",
+                          "USE TEMP B-TREE FOR ORDER BY"], allow_sort=True) == []
+
+def test_legacy_database_gets_indexes():
+    """旧数据库（没有二级索引）升级后补上索引"""
+    with temp_database(create=False) as engine:
+        load_models()
+        tables = [table for name, table in Base.metadata.tables.items() if name != "schema_version"]
+        Base.metadata.create_all(bind=engine, tables=tables)
+        with engine.begin() as conn:
+            for table in tables:
+                for index in table.indexes:
+                    conn.execute(text(f"DROP INDEX {index.name}"))
+        upgrade(engine)
+        names = {index["name"] for index in inspect(engine).get_indexes("orders")}
+        assert {"ix_orders_user_created", "ix_orders_status_created", "ix_orders_created_at"} <= names
+        names = {index["name"] for index in inspect(engine).get_indexes("products")}
+        assert {"ix_products_name", "ix_products_name_nocase", "ix_products_category"} <= names
+
+def main():
+    """主测试函数"""
+    print("查询计划回归测试")
+    print("=" * 50)
+    test_plan_problems()
+    test_every_function_is_checked()
+    test_no_table_scans()
+    test_legacy_database_gets_indexes()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库结构版本测试
+
+验证 database.schema：
+1. 新数据库直接建表并记录所有迁移，之后启动只做版本检查
+2. 旧版本数据库（没有 schema_version 表、缺少字段）启动时补齐结构，
+   演示数据在显示界面之前清理一次，延后的迁移和之后的启动都不再删除商品
+3. 每个迁移都可以在已是最新的数据库上重复执行
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event, inspect, text
+from database.db_init import Base, load_models
+from database.schema import MIGRATIONS, upgrade, run_deferred, pending_migrations
+from models.schema_version import SchemaVersion
+from conftest import temp_database, record_migrations
+
+def count_statements(engine, fn):
+    """执行 fn，返回期间执行的 SQL 语句"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return statements
+
+def create_legacy_database(engine):
+    """旧版本的数据库：没有 schema_version 表，缺少后来添加的字段，带有演示数据"""
+    load_models()
+    tables = [table for name, table in Base.metadata.tables.items() if name != SchemaVersion.__tablename__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE steam_bindings DROP COLUMN steam_avatar"))
+        conn.execute(text("ALTER TABLE users DROP COLUMN display_name"))
+        conn.execute(text("INSERT INTO users (username, email, password_hash, password_salt, "
+                          "user_type, is_admin) VALUES ('boss', 'boss@example.com', 'x', 'y', 'NORMAL', 1)"))
+        conn.execute(text("INSERT INTO products (name, price, stock) VALUES ('演示商品', 10, 5)"))
+
+def product_count(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM products")).scalar()
+
+def test_new_database():
+    """新数据库：建表并记录全部迁移；再次启动只检查版本"""
+    with temp_database(create=False) as engine:
+        assert upgrade(engine) == []
+        with engine.connect() as conn:
+            assert pending_migrations(conn) == []
+            versions = conn.execute(text("SELECT version FROM schema_version ORDER BY version")).scalars().all()
+        assert versions == [migration.version for migration in MIGRATIONS]
+        assert {"users", "products", "orders"} <= set(inspect(engine).get_table_names())
+
+        statements = count_statements(engine, lambda: upgrade(engine))
+        print(f"已是最新时启动执行的语句: {statements}")
+        assert not [s for s in statements if s.lstrip().upper().startswith(("CREATE", "ALTER", "INSERT", "DELETE"))]
+        assert len(statements) <= 3
+
+def test_legacy_database_upgrade():
+    """旧数据库：启动前补齐字段并清理一次演示数据"""
+    with temp_database(create=False) as engine:
+        create_legacy_database(engine)
+        deferred = upgrade(engine)
+        assert [m.version for m in deferred] == [m.version for m in MIGRATIONS if m.deferred]
+
+        columns = {col["name"] for col in inspect(engine).get_columns("users")}
+        assert "display_name" in columns
+        assert "steam_avatar" in {col["name"] for col in inspect(engine).get_columns("steam_bindings")}
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT display_name FROM users")).scalar() == "管理员 - boss"
+        assert product_count(engine) == 0
+
+        # 主窗口显示后用户已经可以上架、购买商品，延后的迁移不能删除它们
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO products (name, price, stock) VALUES ('正式商品', 10, 5)"))
+        assert run_deferred(deferred, engine) == [m.version for m in deferred]
+        assert product_count(engine) == 1
+
+        # 之后的启动也不再删除商品
+        assert upgrade(engine) == []
+        assert product_count(engine) == 1
+
+def test_cleanup_before_later_tables():
+    """只执行过迁移 1-4 的数据库：清理演示数据时订单明细表和积分账本还不存在"""
+    with temp_database(create=False) as engine:
+        create_legacy_database(engine)
+        with engine.begin() as conn:
+            for table in ("order_items", "points_snapshots", "points_ledger"):
+                conn.execute(text(f"DROP TABLE {table}"))
+        record_migrations(engine, before=5)
+        deferred = upgrade(engine)
+        assert [m.version for m in deferred] == [m.version for m in MIGRATIONS if m.deferred]
+        assert 5 not in [m.version for m in deferred]
+        assert product_count(engine) == 0
+        assert {"order_items", "points_ledger"} <= set(inspect(engine).get_table_names())
+
+def test_migrations_are_repeatable():
+    """迁移在已是最新的数据库上重复执行不会出错，也不改动数据"""
+    with temp_database(create=False) as engine:
+        upgrade(engine)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO users (username, email, password_hash, password_salt, "
+                              "user_type, display_name) VALUES ('u', 'u@example.com', 'x', 'y', 'VIP', 'U')"))
+        with engine.begin() as conn:
+            for migration in MIGRATIONS:
+                if not migration.deferred:
+                    migration.apply(conn)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT user_type, display_name FROM users")).one() == ("VIP", "U")
+
+def main():
+    """主测试函数"""
+    print("数据库结构版本测试")
+    print("=" * 50)
+    test_new_database()
+    test_legacy_database_upgrade()
+    test_cleanup_before_later_tables()
+    test_migrations_are_repeatable()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
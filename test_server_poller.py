@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务器状态轮询测试
+
+使用本地 A2S 模拟服务器验证 ServerStatusPoller：
+1. 一轮查询后缓存快照，离线服务器记录为 None
+2. 定时轮询累积延迟 / 玩家数历史，并受 HISTORY_SIZE 限制
+3. 上一轮未结束时再次刷新不会重复发出查询
+4. 取消关注后丢弃缓存
+5. 查询失败或被 stop() 取消时发出 poll_failed，界面可以恢复刷新按钮
+
+测试不访问外部网络。
+"""
+
+import sys
+import os
+import time
+from contextlib import ExitStack
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer, QEventLoop
+from utils.csgo_server import query_servers
+from fake_a2s import FakeA2SServer
+from utils.server_poller import ServerStatusPoller
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def run_until(predicate, timeout=10):
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: predicate() and loop.quit())
+    timer.start(5)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec_()
+    timer.stop()
+    assert predicate(), "轮询没有在规定时间内结束"
+
+def make_poller(interval=30.0, timeout=0.5, history=120):
+    poller = ServerStatusPoller()
+    poller.INTERVAL = interval
+    poller.QUERY_TIMEOUT = timeout
+    poller.HISTORY_SIZE = history
+    rounds = []
+    poller.updated.connect(rounds.append)
+    return poller, rounds
+
+def test_snapshot_cached():
+    """一轮查询后在线和离线服务器都有快照"""
+    with ExitStack() as stack:
+        online = stack.enter_context(FakeA2SServer(name="在线服", players=["alice", "bob"]))
+        offline = stack.enter_context(FakeA2SServer(respond=False))
+        poller, rounds = make_poller()
+        assert poller.snapshot(online.address) is None and not poller.is_fresh(online.address)
+        poller.watch(online.address)
+        poller.watch(offline.address)
+        poller.start()
+        run_until(lambda: rounds)
+        poller.stop()
+
+        snapshot = poller.snapshot(online.address)
+        assert snapshot['online'] and snapshot['info']['服务器名称'] == "在线服"
+        assert snapshot['info']['玩家数量'] == 2
+        assert len(snapshot['history']) == 1 and snapshot['history'][0][2] == 2
+        assert poller.is_fresh(online.address) and poller.age(online.address) < 5
+
+        missing = poller.snapshot(offline.address)
+        assert not missing['online'] and missing['info'] is None
+        assert missing['history'][0][1:] == (None, None)
+
+def test_history_accumulates():
+    """定时轮询累积历史，超出 HISTORY_SIZE 的旧记录被丢弃"""
+    with FakeA2SServer(players=["alice"]) as server:
+        poller, rounds = make_poller(interval=0.05, history=3)
+        poller.watch(server.address)
+        poller.start()
+        run_until(lambda: len(rounds) >= 5)
+        poller.stop()
+
+        history = poller.snapshot(server.address)['history']
+        assert len(history) == 3
+        assert [timestamp for timestamp, _, _ in history] == sorted(timestamp for timestamp, _, _ in history)
+        assert all(players == 1 for _, _, players in history)
+
+def test_refresh_not_duplicated():
+    """查询进行中再次刷新不会再发出一轮查询"""
+    calls = []
+
+    def counting_query(addresses, timeout):
+        calls.append(list(addresses))
+        return query_servers(addresses, timeout=timeout)
+
+    with FakeA2SServer(delay=0.2) as server:
+        poller = ServerStatusPoller(query=counting_query)
+        rounds = []
+        poller.updated.connect(rounds.append)
+        poller.watch(server.address)
+        assert poller.refresh()
+        # 模拟多个页面同时点击刷新
+        assert not poller.refresh()
+        assert not poller.refresh()
+        run_until(lambda: rounds)
+        assert len(calls) == 1
+        # 上一轮结束后可以再次刷新
+        assert poller.refresh()
+        run_until(lambda: len(rounds) == 2)
+        assert len(calls) == 2
+        assert server.requests == 6
+
+def test_unwatch_drops_cache():
+    """取消关注的服务器不再查询，缓存被丢弃"""
+    with FakeA2SServer() as server:
+        poller, rounds = make_poller()
+        poller.watch(server.address)
+        poller.watch(server.address)
+        assert poller.addresses() == [server.address]
+        poller.refresh()
+        run_until(lambda: rounds)
+        poller.unwatch(server.address)
+        assert poller.snapshot(server.address) is None
+        assert poller.addresses() == []
+        assert not poller.refresh()
+
+def test_failed_and_cancelled_rounds():
+    """查询出错或被取消的一轮发出 poll_failed，之后可以再次刷新"""
+    def failing_query(addresses, timeout):
+        raise OSError("network down")
+
+    def slow_query(addresses, timeout):
+        time.sleep(0.2)
+        return {address: None for address in addresses}
+
+    poller = ServerStatusPoller(query=failing_query)
+    failures = []
+    poller.poll_failed.connect(failures.append)
+    poller.watch(("127.0.0.1", 1))
+    assert poller.refresh()
+    run_until(lambda: failures)
+    assert failures == ["network down"] and not poller.is_polling()
+
+    poller = ServerStatusPoller(query=slow_query)
+    failures, rounds = [], []
+    poller.poll_failed.connect(failures.append)
+    poller.updated.connect(rounds.append)
+    poller.watch(("127.0.0.1", 1))
+    poller.start()
+    poller.stop()
+    assert failures == [""]
+    poller._tasks.wait()
+    app.processEvents()
+    assert rounds == []
+    # 没有进行中的查询时 stop() 不发信号
+    poller.stop()
+    assert failures == [""]
+
+def main():
+    """主测试函数"""
+    print("服务器状态轮询测试")
+    print("=" * 50)
+    test_snapshot_cached()
+    test_history_accumulates()
+    test_refresh_not_duplicated()
+    test_unwatch_drops_cache()
+    test_failed_and_cancelled_rounds()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话作用域测试
+
+验证 database.session：
+1. 在外层 session_scope() 中调用的函数失败时，只撤销它自己的修改，外层已做的修改照常提交
+2. 内层作用域抛出的数据库异常不会让外层会话无法继续使用
+3. 外层作用域异常时全部回滚
+
+测试使用临时数据库，不会修改 csgo_shop.db。
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import IntegrityError
+from database.session import session_scope
+from database.db_operations import update_user_info, create_product
+from models.user import User
+from models.product import Product
+from conftest import temp_database
+
+def add_user(db, name):
+    user = User(username=name, email=f"{name}@example.com", password_hash="x", password_salt="x")
+    db.add(user)
+    db.flush()
+    return user.id
+
+def product_names():
+    with session_scope() as db:
+        return sorted(name for name, in db.query(Product.name))
+
+def test_inner_failure_keeps_outer_work():
+    """内层函数捕获异常并回滚，外层的修改和之后的调用照常提交"""
+    with temp_database():
+        with session_scope() as db:
+            alice = add_user(db, "alice")
+            add_user(db, "bob")
+            db.add(Product(name="外层商品", price=10, stock=1))
+            db.flush()
+            # 用户名先改了，邮箱冲突时整个函数的修改都被撤销
+            assert update_user_info(alice, username="alice2", email="bob@example.com") is False
+            assert create_product("内层商品", "", 10, 5, "皮肤")[0]
+
+        assert product_names() == ["内层商品", "外层商品"]
+        with session_scope() as db:
+            user = db.query(User).get(alice)
+            assert (user.username, user.email) == ("alice", "alice@example.com")
+
+def test_inner_flush_error():
+    """内层 flush 失败只回滚到内层的 SAVEPOINT"""
+    with temp_database():
+        with session_scope() as db:
+            add_user(db, "alice")
+            db.add(Product(name="A", price=10, stock=1))
+            db.flush()
+            try:
+                with session_scope() as inner:
+                    add_user(inner, "alice")
+                assert False, "用户名重复时应当抛出 IntegrityError"
+            except IntegrityError:
+                pass
+            db.add(Product(name="B", price=10, stock=1))
+
+        assert product_names() == ["A", "B"]
+        with session_scope() as db:
+            assert db.query(User).count() == 1
+
+def test_outer_failure_rolls_back_everything():
+    """外层作用域异常时内层已完成的修改也一起回滚"""
+    with temp_database():
+        try:
+            with session_scope():
+                assert create_product("商品", "", 10, 5, "皮肤")[0]
+                raise RuntimeError("外层失败")
+        except RuntimeError:
+            pass
+        assert product_names() == []
+
+def main():
+    """主测试函数"""
+    print("会话作用域测试")
+    print("=" * 50)
+    test_inner_failure_keeps_outer_work()
+    test_inner_flush_error()
+    test_outer_failure_rolls_back_everything()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动性能记录测试
+
+验证 utils.startup_profiler：
+1. 阶段耗时和新导入的模块数
+2. 导入计时：嵌套导入分别统计总耗时和自身耗时，只把最外层导入计入阶段
+3. 时间预算检查
+4. finish() 把报告以 JSON 写入日志，并停止导入计时
+"""
+
+import sys
+import os
+import json
+import time
+import logging
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.startup_profiler import StartupProfiler, check_budget, format_report
+
+def write_modules(directory, prefix):
+    """outer 导入 inner，两者各自 sleep 一段时间"""
+    with open(os.path.join(directory, f"{prefix}_inner.py"), "w") as f:
+        f.write("import time\ntime.sleep(0.03)\n")
+    with open(os.path.join(directory, f"{prefix}_outer.py"), "w") as f:
+        f.write(f"import time\nimport {prefix}_inner\ntime.sleep(0.02)\n")
+
+def test_phase_records_time_and_modules():
+    """阶段记录耗时和新导入的模块数"""
+    profiler = StartupProfiler()
+    with profiler.phase("idle"):
+        time.sleep(0.02)
+    with profiler.phase("import"):
+        sys.modules["startup_probe_fake"] = object()
+    sys.modules.pop("startup_probe_fake")
+    idle, imported = profiler.phases
+    assert idle["name"] == "idle" and idle["wall_ms"] >= 20 and idle["modules"] == 0
+    assert imported["modules"] == 1
+    report = profiler.report()
+    assert [phase["name"] for phase in report["phases"]] == ["idle", "import"]
+    assert report["total_ms"] >= idle["wall_ms"]
+
+def test_import_timing_self_and_total():
+    """嵌套导入：outer 的自身耗时不包含 inner，阶段只计入最外层导入"""
+    prefix = f"startup_probe_{os.getpid()}"
+    with tempfile.TemporaryDirectory() as tmp:
+        write_modules(tmp, prefix)
+        sys.path.insert(0, tmp)
+        profiler = StartupProfiler()
+        profiler.enable_import_timing()
+        try:
+            with profiler.phase("imports"):
+                __import__(f"{prefix}_outer")
+        finally:
+            profiler.finish()
+            sys.path.remove(tmp)
+            sys.modules.pop(f"{prefix}_outer", None)
+            sys.modules.pop(f"{prefix}_inner", None)
+
+    timings = dict(profiler.imports)
+    inner, outer = timings[f"{prefix}_inner"], timings[f"{prefix}_outer"]
+    print(f"inner 自身 {inner:.1f}ms，outer 自身 {outer:.1f}ms")
+    assert 30 <= inner < 60
+    assert 20 <= outer < 30 + 20
+    phase = profiler.phases[0]
+    # 阶段的导入时间约等于 outer 的总耗时，不重复计算 inner
+    assert 50 <= phase["import_ms"] <= phase["wall_ms"] + 1
+    assert phase["modules"] == 2
+    report = profiler.report()
+    assert report["slowest_imports"][0][0] == f"{prefix}_inner"
+    assert "最慢的导入" in format_report(report)
+
+def test_check_budget():
+    """超出预算和缺失的阶段都会报告"""
+    report = {
+        "total_ms": 300.0,
+        "phases": [{"name": "imports", "wall_ms": 180.0, "import_ms": 170.0, "modules": 200},
+                   {"name": "show_window", "wall_ms": 120.0, "import_ms": 0.0, "modules": 0}],
+        "slowest_imports": [],
+    }
+    assert check_budget(report, {"imports": 200, "show_window": 200, "total": 500}) == []
+    over = check_budget(report, {"imports": 200, "show_window": 100, "main_window": 50, "total": 250})
+    assert over == [("show_window", 120.0, 100), ("main_window", None, 50), ("total", 300.0, 250)]
+
+def test_finish_logs_json():
+    """finish() 以一行 JSON 写入 startup 日志，之后不再统计导入"""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("startup")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        profiler = StartupProfiler()
+        profiler.enable_import_timing()
+        with profiler.phase("work"):
+            pass
+        report = profiler.finish()
+    finally:
+        logger.removeHandler(handler)
+    assert profiler._timer not in sys.meta_path
+    assert json.loads(records[-1].getMessage()) == report
+    assert report["phases"][0]["name"] == "work"
+
+def main():
+    """主测试函数"""
+    print("启动性能记录测试")
+    print("=" * 50)
+    test_phase_records_time_and_modules()
+    test_import_timing_self_and_total()
+    test_check_budget()
+    test_finish_logs_json()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
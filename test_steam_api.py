@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Steam Web API 客户端测试
+
+使用本地 Steam Web API 替身（fake_steam_api）验证 SteamAPI：
+1. 玩家资料按 100 个一批查询，命中缓存时不再请求
+2. 缓存过期后重新查询
+3. 自定义 URL 解析结果被缓存
+4. validate_steam_id 对格式错误的 ID 不访问网络
+5. 令牌桶限速
+
+测试不访问真实的 Steam 接口。
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+from utils.steam_api import SteamAPI, TokenBucket, STEAM64_BASE
+from fake_steam_api import FakeSteamAPI
+
+def steam_ids(count, start=1):
+    return [str(STEAM64_BASE + i) for i in range(start, start + count)]
+
+def test_batched_and_cached():
+    """250 个账号分 3 次请求，再次查询全部命中缓存"""
+    ids = steam_ids(250)
+    with FakeSteamAPI(missing=ids[:5]) as steam:
+        api = SteamAPI(base_url=steam.url)
+        results = api.get_player_summaries(ids)
+        assert steam.calls["GetPlayerSummaries"] == 3
+        assert len(results) == 250
+        assert all(results[s] is None for s in ids[:5])
+        assert results[ids[10]]['name'] == f"player_{ids[10]}"
+        assert results[ids[10]]['avatar'].endswith("_full.jpg")
+
+        # 再次查询（包括不存在的账号）不发请求
+        assert api.get_player_summaries(ids) == results
+        assert api.get_player_info(ids[10]) == results[ids[10]]
+        assert steam.calls["GetPlayerSummaries"] == 3
+        # 只有新的账号会被请求
+        api.get_player_summaries(ids + steam_ids(1, start=1000))
+        assert steam.calls["GetPlayerSummaries"] == 4
+        assert steam.requested_ids[-1] == str(STEAM64_BASE + 1000)
+        assert api.request_count == 4
+
+def test_cache_expires():
+    """缓存过期后重新查询"""
+    with FakeSteamAPI() as steam:
+        api = SteamAPI(base_url=steam.url)
+        api.summary_cache.ttl = 0.05
+        steam_id = steam_ids(1)[0]
+        api.get_player_info(steam_id)
+        api.get_player_info(steam_id)
+        assert steam.calls["GetPlayerSummaries"] == 1
+        time.sleep(0.1)
+        api.get_player_info(steam_id)
+        assert steam.calls["GetPlayerSummaries"] == 2
+
+def test_vanity_url_cached():
+    """自定义 URL 只解析一次，无效的自定义 URL 也被缓存"""
+    gaben = str(STEAM64_BASE + 22202)
+    with FakeSteamAPI(vanity={"gaben": gaben}) as steam:
+        api = SteamAPI(base_url=steam.url)
+        for _ in range(3):
+            assert api.convert_to_steam64("https://steamcommunity.com/id/gaben/") == gaben
+            assert api.get_steam_id_from_vanity_url("nobody") is None
+        assert steam.calls["ResolveVanityURL"] == 2
+        assert api.get_player_info("https://steamcommunity.com/id/gaben")['steam_id'] == gaben
+
+def test_validate_steam_id():
+    """格式错误的 ID 不访问网络，有效 ID 只查询一次"""
+    with FakeSteamAPI(missing=steam_ids(1, start=7)) as steam:
+        api = SteamAPI(base_url=steam.url)
+        for invalid in ("12345", "abc", "STEAM_0:1", str(STEAM64_BASE)):
+            assert not api.validate_steam_id(invalid)
+        assert sum(steam.calls.values()) == 0
+
+        valid = steam_ids(1)[0]
+        assert api.validate_steam_id(valid) and api.validate_steam_id(valid)
+        assert api.validate_steam_id("STEAM_0:1:0")
+        assert not api.validate_steam_id(steam_ids(1, start=7)[0])
+        assert steam.calls["GetPlayerSummaries"] == 2
+
+def test_token_bucket():
+    """令牌用完后按速率等待"""
+    bucket = TokenBucket(rate=20, capacity=2)
+    start = time.perf_counter()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+    # 前 2 次立即通过，后 4 次每次等待 50ms
+    assert 0.18 <= elapsed < 0.5, elapsed
+
+def main():
+    """主测试函数"""
+    print("Steam Web API 客户端测试")
+    print("=" * 50)
+    test_batched_and_cached()
+    test_cache_expires()
+    test_vanity_url_cached()
+    test_validate_steam_id()
+    test_token_bucket()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
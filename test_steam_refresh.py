@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Steam 绑定资料批量刷新测试
+
+使用临时数据库和本地 Steam Web API 替身验证 refresh_steam_profiles：
+1. 分块遍历全部绑定，每 100 个账号一次请求，昵称和头像被更新
+2. Steam 没有返回资料的绑定保持不变
+3. 中断后从检查点继续，不重复请求已完成的部分
+4. 某块请求失败时任务停止，检查点停在上一块，重新运行时刷新失败的那一块
+
+测试使用临时数据库，不会修改 csgo_shop.db，也不访问真实的 Steam 接口。
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+from database.session import session_scope
+from models.user import User
+from models.steam_binding import SteamBinding
+from utils.steam_api import SteamAPI, SteamAPIError, STEAM64_BASE
+from fake_steam_api import FakeSteamAPI
+from utils.steam_refresh import refresh_steam_profiles, load_checkpoint
+from conftest import temp_database
+
+BINDINGS = 2500
+
+def seed_bindings(engine, bindings=BINDINGS):
+    """生成用户和绑定（绑定时的旧昵称为 old_<i>）"""
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"username": f"user{i}", "email": f"user{i}@example.com",
+             "password_hash": "x", "password_salt": "x"} for i in range(bindings)
+        ])
+        conn.execute(SteamBinding.__table__.insert(), [
+            {"user_id": i + 1, "steam_id": str(STEAM64_BASE + i + 1), "steam_name": f"old_{i}"}
+            for i in range(bindings)
+        ])
+
+def load_bindings():
+    with session_scope() as db:
+        return {b.steam_id: (b.steam_name, b.steam_avatar) for b in db.query(SteamBinding)}
+
+class Interrupt(Exception):
+    pass
+
+def test_refresh_all_bindings():
+    """全部绑定被刷新，缺失的账号保持旧昵称"""
+    missing = {str(STEAM64_BASE + 10), str(STEAM64_BASE + 2000)}
+    with temp_database() as engine, tempfile.TemporaryDirectory() as tmp:
+        seed_bindings(engine)
+        checkpoint = os.path.join(tmp, "checkpoint.json")
+        with FakeSteamAPI(missing=missing) as steam:
+            stats = refresh_steam_profiles(SteamAPI(base_url=steam.url), chunk_size=1000,
+                                           checkpoint_path=checkpoint)
+            assert steam.calls["GetPlayerSummaries"] == BINDINGS // 100
+        assert stats['chunks'] == 3 and stats['bindings'] == BINDINGS
+        assert stats['updated'] == BINDINGS - 2 and stats['missing'] == 2
+        assert not os.path.exists(checkpoint)
+
+        bindings = load_bindings()
+        steam_id = str(STEAM64_BASE + 1)
+        assert bindings[steam_id] == (f"player_{steam_id}",
+                                      f"https://avatars.example.com/{steam_id}_full.jpg")
+        assert bindings[str(STEAM64_BASE + 10)] == ("old_9", None)
+
+def test_resume_from_checkpoint():
+    """第一块提交后中断，再次运行只处理剩下的绑定"""
+    with temp_database() as engine, tempfile.TemporaryDirectory() as tmp:
+        seed_bindings(engine)
+        checkpoint = os.path.join(tmp, "checkpoint.json")
+        with FakeSteamAPI() as steam:
+            def interrupt(stats):
+                raise Interrupt()
+
+            try:
+                refresh_steam_profiles(SteamAPI(base_url=steam.url), chunk_size=1000,
+                                       checkpoint_path=checkpoint, progress=interrupt)
+                assert False, "任务应该被中断"
+            except Interrupt:
+                pass
+            assert load_checkpoint(checkpoint) == 1000
+            assert steam.calls["GetPlayerSummaries"] == 10
+
+            # 新的客户端（没有缓存）从检查点继续
+            stats = refresh_steam_profiles(SteamAPI(base_url=steam.url), chunk_size=1000,
+                                           checkpoint_path=checkpoint)
+            assert stats['bindings'] == BINDINGS - 1000
+            assert steam.calls["GetPlayerSummaries"] == BINDINGS // 100
+            assert len(steam.requested_ids) == len(set(steam.requested_ids)) == BINDINGS
+        assert all(name.startswith("player_") for name, _ in load_bindings().values())
+
+def test_retry_failed_chunk():
+    """第二块的请求失败（503），不算作账号不存在，重新运行时刷新这一块"""
+    with temp_database() as engine, tempfile.TemporaryDirectory() as tmp:
+        seed_bindings(engine)
+        checkpoint = os.path.join(tmp, "checkpoint.json")
+        # 每块 10 次请求，第 12 次在第二块中
+        with FakeSteamAPI(fail_calls={12}) as steam:
+            try:
+                refresh_steam_profiles(SteamAPI(base_url=steam.url), chunk_size=1000,
+                                       checkpoint_path=checkpoint)
+                assert False, "请求失败时任务应该停止"
+            except SteamAPIError:
+                pass
+            assert load_checkpoint(checkpoint) == 1000
+            bindings = load_bindings()
+            assert bindings[str(STEAM64_BASE + 1001)] == ("old_1000", None)
+
+            stats = refresh_steam_profiles(SteamAPI(base_url=steam.url), chunk_size=1000,
+                                           checkpoint_path=checkpoint)
+            assert stats['bindings'] == BINDINGS - 1000
+            assert stats['updated'] == BINDINGS - 1000 and stats['missing'] == 0
+        assert not os.path.exists(checkpoint)
+        assert all(name.startswith("player_") for name, _ in load_bindings().values())
+
+def main():
+    """主测试函数"""
+    print("Steam 绑定资料批量刷新测试")
+    print("=" * 50)
+    test_refresh_all_bindings()
+    test_resume_from_checkpoint()
+    test_retry_failed_chunk()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
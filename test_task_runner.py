@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+后台任务层测试
+
+验证 TaskRunner：
+1. 任务在后台线程执行，结果回到 GUI 线程
+2. 同一个 key 重复提交时，旧任务的结果被丢弃
+3. 异常通过 on_error 交给调用方
+4. 任务函数可以通过 current_token() 配合取消
+5. 提交任务的对象销毁后，排队中的结果被丢弃，不会崩溃
+"""
+
+import sys
+import os
+import gc
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from utils.workers import TaskRunner, current_token, task_pool
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+def wait_for(runner, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        runner.wait(10)
+        app.processEvents()
+        if not runner._tokens:
+            return
+    assert False, "任务没有在规定时间内结束"
+
+def slow_echo(value, delay):
+    time.sleep(delay)
+    return value, threading.get_ident()
+
+def test_result_delivered_on_gui_thread():
+    """结果在 GUI 线程回调，任务在其他线程执行"""
+    runner = TaskRunner()
+    received = []
+    runner.submit("echo", slow_echo, 1, 0.01,
+                  on_result=lambda r: received.append((r, threading.get_ident())))
+    wait_for(runner)
+    (value, worker_thread), callback_thread = received[0]
+    assert value == 1
+    assert worker_thread != threading.get_ident()
+    assert callback_thread == threading.get_ident()
+
+def test_stale_result_discarded():
+    """同一 key 的新请求使旧请求作废"""
+    runner = TaskRunner()
+    received = []
+    runner.submit("echo", slow_echo, "old", 0.2, on_result=lambda r: received.append(r[0]))
+    runner.submit("echo", slow_echo, "new", 0.01, on_result=lambda r: received.append(r[0]))
+    wait_for(runner)
+    time.sleep(0.3)
+    runner.wait()
+    app.processEvents()
+    assert received == ["new"]
+
+def test_error_reported():
+    """任务异常交给 on_error"""
+    runner = TaskRunner()
+    errors = []
+
+    def fail():
+        raise ValueError("库存不足")
+
+    runner.submit("fail", fail, on_error=errors.append)
+    wait_for(runner)
+    assert len(errors) == 1 and str(errors[0]) == "库存不足"
+
+def test_cooperative_cancel():
+    """取消后任务在下一次检查时退出，不回调结果"""
+    runner = TaskRunner()
+    started = threading.Event()
+    progress = []
+    received = []
+
+    def long_job():
+        started.set()
+        for i in range(200):
+            current_token().raise_if_cancelled()
+            progress.append(i)
+            time.sleep(0.005)
+        return "finished"
+
+    runner.submit("job", long_job, on_result=received.append)
+    started.wait(2)
+    runner.cancel("job")
+    runner.wait()
+    app.processEvents()
+    assert received == []
+    assert len(progress) < 200
+    assert not runner.is_running("job")
+
+def test_owner_destroyed_before_delivery():
+    """界面对象销毁时任务的结果还在排队：结果被丢弃，之后的事件循环正常"""
+    received = []
+    for _ in range(20):
+        owner = QWidget()
+        runner = TaskRunner(owner)
+        runner.submit("job", slow_echo, "late", 0.001, on_result=received.append)
+        task_pool().waitForDone()
+        del owner, runner
+        gc.collect()
+        app.processEvents()
+    assert received == []
+
+    runner = TaskRunner()
+    runner.submit("job", slow_echo, "ok", 0.001, on_result=received.append)
+    wait_for(runner)
+    assert received[0][0] == "ok"
+
+def main():
+    """主测试函数"""
+    print("后台任务层测试")
+    print("=" * 50)
+    test_result_delivered_on_gui_thread()
+    test_stale_result_discarded()
+    test_error_reported()
+    test_cooperative_cancel()
+    test_owner_destroyed_before_delivery()
+    print("✅ 全部通过")
+
+if __name__ == "__main__":
+    main()
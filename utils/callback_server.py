@@ -1,70 +1,93 @@
-from http.server import HTTPServer, BaseHTTPRequestHandler
+"""Steam OpenID 登录回调服务器
+
+浏览器完成 Steam 登录后跳转到 http://localhost:8000/steam/callback?nonce=...，
+回调参数通过内存交给应用，不再写 steam_callback.json 再由界面定时读取：
+
+    callbacks = callback_server()
+    callbacks.received.connect(self.on_steam_callback)   # (nonce, params)，在 GUI 线程调用
+    nonce = callbacks.begin_flow()
+    login_url = steam_web.get_login_url(callbacks.return_url(nonce))
+
+每次登录用一个随机 nonce 区分，多个登录流程（例如注册页和个人中心同时绑定）
+共用一个服务器，互不覆盖。最后一个流程结束后服务器自动停止。
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
+from typing import Dict, Optional
+import queue
+import secrets
 import threading
-import json
-import os
+from PyQt5.QtCore import QObject, pyqtSignal
+
+CALLBACK_PATH = "/steam/callback"
+
+SUCCESS_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Steam Login Success</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            height: 100vh;
+            margin: 0;
+            background-color: #171a21;
+            color: #ffffff;
+        }
+        .container {
+            text-align: center;
+            padding: 20px;
+            background-color: #2a3f5f;
+            border-radius: 10px;
+            box-shadow: 0 0 10px rgba(0,0,0,0.5);
+        }
+        h1 {
+            color: #66c0f4;
+        }
+        p {
+            margin: 20px 0;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Steam Login Success</h1>
+        <p>You can close this window and return to the application.</p>
+    </div>
+</body>
+</html>
+"""
+
+EXPIRED_HTML = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Steam Login Expired</title></head>
+<body><p>This login request is unknown or has expired. Please start again from the application.</p></body>
+</html>
+"""
 
 class SteamCallbackHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """处理GET请求"""
         try:
-            # 解析URL参数
-            query = urlparse(self.path).query
-            params = parse_qs(query)
+            url = urlparse(self.path)
+            if url.path != CALLBACK_PATH:
+                self.send_error(404, "Not Found")
+                return
             
             # 将列表值转换为单个值
-            params = {k: v[0] if isinstance(v, list) else v for k, v in params.items()}
+            params = {k: v[0] for k, v in parse_qs(url.query).items()}
+            delivered = self.server.callbacks.deliver(params)
             
-            # 保存回调参数
-            with open('steam_callback.json', 'w', encoding='utf-8') as f:
-                json.dump(params, f)
-            
-            # 发送成功响应
-            self.send_response(200)
+            html = SUCCESS_HTML if delivered else EXPIRED_HTML
+            data = html.encode('utf-8')
+            self.send_response(200 if delivered else 400)
             self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
             self.end_headers()
-            
-            # 返回成功页面
-            html = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Steam Login Success</title>
-                <style>
-                    body {
-                        font-family: Arial, sans-serif;
-                        display: flex;
-                        justify-content: center;
-                        align-items: center;
-                        height: 100vh;
-                        margin: 0;
-                        background-color: #171a21;
-                        color: #ffffff;
-                    }
-                    .container {
-                        text-align: center;
-                        padding: 20px;
-                        background-color: #2a3f5f;
-                        border-radius: 10px;
-                        box-shadow: 0 0 10px rgba(0,0,0,0.5);
-                    }
-                    h1 {
-                        color: #66c0f4;
-                    }
-                    p {
-                        margin: 20px 0;
-                    }
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>Steam Login Success</h1>
-                    <p>You can close this window and return to the application.</p>
-                </div>
-            </body>
-            </html>
-            """
-            self.wfile.write(html.encode('utf-8'))
+            self.wfile.write(data)
             
         except Exception as e:
             print(f"处理回调请求失败: {str(e)}")
@@ -74,35 +97,112 @@ class SteamCallbackHandler(BaseHTTPRequestHandler):
         """禁用日志输出"""
         pass
 
-def start_callback_server(port=8000):
-    """启动回调服务器"""
-    try:
-        server = HTTPServer(('localhost', port), SteamCallbackHandler)
-        thread = threading.Thread(target=server.serve_forever)
-        thread.daemon = True
-        thread.start()
-        return server
-    except Exception as e:
-        print(f"启动回调服务器失败: {str(e)}")
-        return None
-
-def stop_callback_server(server):
-    """停止回调服务器"""
-    if server:
+class SteamCallbackServer(QObject):
+    """按 nonce 分发 Steam 登录回调
+
+    回调在 HTTP 服务线程中到达：参数放入该 nonce 的队列（供 wait() 使用），
+    同时发出 received 信号（跨线程信号自动排队到 GUI 线程）。
+    """
+    received = pyqtSignal(str, dict)
+
+    def __init__(self, host: str = 'localhost', port: int = 8000, parent=None):
+        super().__init__(parent)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._flows = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        port = self._server.server_port if self._server else self.port
+        return f"http://{self.host}:{port}"
+
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    def start(self) -> bool:
+        """启动回调服务器，已经在运行时直接返回 True"""
+        if self._server is not None:
+            return True
         try:
-            server.shutdown()
-            server.server_close()
-        except Exception as e:
-            print(f"停止回调服务器失败: {str(e)}")
-
-def get_callback_params():
-    """获取回调参数"""
-    try:
-        if os.path.exists('steam_callback.json'):
-            with open('steam_callback.json', 'r', encoding='utf-8') as f:
-                params = json.load(f)
-            os.remove('steam_callback.json')  # 删除文件
-            return params
-    except Exception as e:
-        print(f"获取回调参数失败: {str(e)}")
-    return None 
\ No newline at end of file
+            server = ThreadingHTTPServer((self.host, self.port), SteamCallbackHandler)
+        except OSError as e:
+            print(f"启动回调服务器失败: {str(e)}")
+            return False
+        server.daemon_threads = True
+        server.callbacks = self
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._server = server
+        return True
+
+    def stop(self):
+        """停止回调服务器，未完成的流程全部作废"""
+        with self._lock:
+            self._flows.clear()
+        server, self._server = self._server, None
+        if server:
+            try:
+                server.shutdown()
+                server.server_close()
+            except Exception as e:
+                print(f"停止回调服务器失败: {str(e)}")
+
+    def begin_flow(self) -> Optional[str]:
+        """开始一个登录流程，返回它的 nonce；服务器无法启动时返回 None"""
+        if not self.start():
+            return None
+        nonce = secrets.token_urlsafe(16)
+        with self._lock:
+            self._flows[nonce] = queue.Queue(maxsize=1)
+        return nonce
+
+    def return_url(self, nonce: str) -> str:
+        return f"{self.url}{CALLBACK_PATH}?nonce={nonce}"
+
+    def end_flow(self, nonce: str):
+        """结束登录流程（完成或放弃）；没有其他流程时停止服务器"""
+        with self._lock:
+            self._flows.pop(nonce, None)
+            idle = not self._flows
+        if idle:
+            self.stop()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._flows)
+
+    def deliver(self, params: Dict) -> bool:
+        """把回调参数交给对应的流程；nonce 未知或已经收到过回调时返回 False"""
+        params = dict(params)
+        nonce = params.pop('nonce', None)
+        with self._lock:
+            flow = self._flows.get(nonce)
+            if flow is None:
+                return False
+            try:
+                flow.put_nowait(params)
+            except queue.Full:
+                return False
+        self.received.emit(nonce, params)
+        return True
+
+    def wait(self, nonce: str, timeout: float = None) -> Optional[Dict]:
+        """阻塞等待某个流程的回调（非界面代码使用），超时返回 None"""
+        with self._lock:
+            flow = self._flows.get(nonce)
+        if flow is None:
+            return None
+        try:
+            return flow.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+_callback_server = None
+
+def callback_server() -> SteamCallbackServer:
+    """应用内共享的回调服务器（需在 GUI 线程首次调用）"""
+    global _callback_server
+    if _callback_server is None:
+        _callback_server = SteamCallbackServer()
+    return _callback_server
@@ -3,9 +3,27 @@ import random
 import string
 import io
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import QByteArray
+from PyQt5.QtCore import QByteArray, QObject
 import os
-from PIL import Image, ImageDraw, ImageFont
+import threading
+from collections import deque
+from functools import lru_cache
+from utils.workers import TaskRunner
+
+# Windows系统字体路径
+FONT_PATH = "C:/Windows/Fonts/arial.ttf"
+# 缓存的字体对象在线程间共享，同一时间只有一个线程绘制
+_render_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def load_font(size):
+    """加载验证码字体（按字号缓存），失败时使用默认字体"""
+    try:
+        if os.path.exists(FONT_PATH):
+            return ImageFont.truetype(FONT_PATH, size)
+        return ImageFont.load_default()
+    except Exception:
+        return ImageFont.load_default()
 
 class CaptchaGenerator:
     def __init__(self, width=160, height=70):
@@ -28,16 +46,8 @@ class CaptchaGenerator:
         image = Image.new('RGB', (self.width, self.height), color='white')
         draw = ImageDraw.Draw(image)
         
-        # 尝试加载字体，如果失败则使用默认字体
-        try:
-            # Windows系统字体路径
-            font_path = "C:/Windows/Fonts/arial.ttf"
-            if os.path.exists(font_path):
-                font = ImageFont.truetype(font_path, self.font_size)
-            else:
-                font = ImageFont.load_default()
-        except:
-            font = ImageFont.load_default()
+        # 字体只加载一次
+        font = load_font(self.font_size)
         
         # 绘制背景干扰线
         for _ in range(5):
@@ -98,23 +108,80 @@ class CaptchaGenerator:
                 random.randint(min_val, max_val),
                 random.randint(min_val, max_val))
     
-    def image_to_qpixmap(self, image):
-        """将PIL图片转换为QPixmap"""
-        # 将PIL图片转换为字节流
+    def image_to_bytes(self, image):
+        """将PIL图片编码为PNG字节（不涉及Qt，可以在后台线程调用）"""
         byte_array = io.BytesIO()
-        image.save(byte_array, format='PNG')
-        byte_array.seek(0)
-        
-        # 转换为QPixmap
-        qbyte_array = QByteArray(byte_array.read())
+        # 验证码图片很小，压缩级别对体积影响不大，用最快的级别
+        image.save(byte_array, format='PNG', compress_level=1)
+        return byte_array.getvalue()
+
+    def bytes_to_qpixmap(self, data):
+        """将PNG字节转换为QPixmap（只能在GUI线程调用）"""
         pixmap = QPixmap()
-        pixmap.loadFromData(qbyte_array)
-        
+        pixmap.loadFromData(QByteArray(data))
         return pixmap
+
+    def image_to_qpixmap(self, image):
+        """将PIL图片转换为QPixmap"""
+        return self.bytes_to_qpixmap(self.image_to_bytes(image))
     
+    def render(self, count=1):
+        """在后台线程生成 count 个验证码，返回 [(验证码, PNG字节)]"""
+        rendered = []
+        for _ in range(count):
+            code = self.generate_code()
+            # 逐个加锁，GUI 线程同步生成时最多等待一张图片
+            with _render_lock:
+                image = self.create_image(code)
+            rendered.append((code, self.image_to_bytes(image)))
+        return rendered
+
     def generate_captcha(self):
         """生成验证码和对应的图片"""
-        code = self.generate_code()
-        image = self.create_image(code)
-        pixmap = self.image_to_qpixmap(image)
-        return code, pixmap
\ No newline at end of file
+        code, data = self.render()[0]
+        return code, self.bytes_to_qpixmap(data)
+
+class CaptchaPool(QObject):
+    """预先生成的验证码池
+
+    后台线程一次生成一批验证码（PNG 字节），在 GUI 线程转成 QPixmap 放入池中；
+    take() 直接取出现成的验证码，剩余数量低于 LOW_WATER 时异步补充。
+    池子为空（刚创建或连续快速刷新）时退回到同步生成，不会拿不到验证码。
+    每个验证码只发出一次。
+    """
+    SIZE = 8
+    LOW_WATER = 4
+
+    def __init__(self, generator=None, parent=None):
+        super().__init__(parent)
+        self.generator = generator or CaptchaGenerator()
+        self.tasks = TaskRunner(self)
+        self._ready = deque()
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._ready)
+
+    def fill(self):
+        """补充到 SIZE 个；已经在补充时不重复提交"""
+        missing = self.SIZE - len(self._ready)
+        if missing <= 0 or self.tasks.is_running("fill"):
+            return
+        self.tasks.submit("fill", self.generator.render, missing, on_result=self._on_rendered)
+
+    def _on_rendered(self, rendered):
+        for code, data in rendered:
+            if len(self._ready) >= self.SIZE:
+                break
+            self._ready.append((code, self.generator.bytes_to_qpixmap(data)))
+
+    def take(self):
+        """取出一个验证码，返回 (验证码, QPixmap)"""
+        if self._ready:
+            captcha = self._ready.popleft()
+        else:
+            self.misses += 1
+            captcha = self.generator.generate_captcha()
+        if len(self._ready) < self.LOW_WATER:
+            self.fill()
+        return captcha
\ No newline at end of file
@@ -1,7 +1,11 @@
 import a2s
+import asyncio
 import socket
 import time
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Iterable, Optional, Tuple, List
+
+# 批量查询时同时进行的服务器数量上限
+MAX_CONCURRENT_QUERIES = 64
 
 
 class CSGOServer:
@@ -62,24 +66,10 @@ class CSGOServer:
             # 获取玩家信息
             try:
                 players = a2s.players(self.address, timeout=5.0)
-                player_count = len(players)
             except (socket.timeout, a2s.BrokenMessageError):
-                player_count = info.player_count
-                players = []
+                players = None
             
-            return {
-                '服务器名称': info.server_name,
-                '地图': info.map_name,
-                '玩家数量': player_count,
-                '最大玩家数': info.max_players,
-                '延迟': ping,
-                'IP地址': self.ip,
-                '端口': self.port,
-                '游戏': info.folder,
-                '版本': info.version,
-                '协议': info.protocol,
-                '玩家列表': [{'姓名': p.name, '分数': p.score, '游戏时长': p.duration} for p in players]
-            }
+            return build_server_info(self.address, info, players, ping)
         except (socket.timeout, ConnectionRefusedError, a2s.BrokenMessageError, OSError) as e:
             print(f"查询服务器失败 {self.ip}:{self.port}: {str(e)}")
             return None
@@ -89,3 +79,65 @@ class CSGOServer:
     
     def __repr__(self) -> str:
         return f"CSGOServer(ip='{self.ip}', port={self.port})"
+
+
+def build_server_info(address: Tuple[str, int], info, players, ping: int) -> Dict:
+    """把 A2S 应答整理成界面使用的字典；players 为 None 表示玩家列表查询失败"""
+    return {
+        '服务器名称': info.server_name,
+        '地图': info.map_name,
+        '玩家数量': len(players) if players is not None else info.player_count,
+        '最大玩家数': info.max_players,
+        '延迟': ping,
+        'IP地址': address[0],
+        '端口': address[1],
+        '游戏': info.folder,
+        '版本': info.version,
+        '协议': info.protocol,
+        '玩家列表': [{'姓名': p.name, '分数': p.score, '游戏时长': p.duration} for p in players or []]
+    }
+
+
+async def _query_server_async(address: Tuple[str, int], timeout: float) -> Optional[Dict]:
+    """同时发送 A2S_INFO 和 A2S_PLAYER，整个查询不超过 timeout 秒"""
+    try:
+        info, players = await asyncio.wait_for(asyncio.gather(
+            a2s.ainfo(address, timeout=timeout),
+            a2s.aplayers(address, timeout=timeout),
+            return_exceptions=True,
+        ), timeout)
+    except asyncio.TimeoutError:
+        info, players = asyncio.TimeoutError(), None
+    if isinstance(info, BaseException):
+        print(f"查询服务器失败 {address[0]}:{address[1]}: {info!r}")
+        return None
+    if isinstance(players, BaseException):
+        players = None
+    return build_server_info(address, info, players, round(info.ping * 1000))
+
+
+async def query_servers_async(addresses: Iterable[Tuple[str, int]], timeout: float = 5.0,
+                              concurrency: int = MAX_CONCURRENT_QUERIES) -> Dict[Tuple[str, int], Optional[Dict]]:
+    """并发查询多个服务器
+
+    每个服务器有独立的截止时间，离线的服务器只占用一个超时窗口，
+    不会拖慢其他服务器。返回 {(ip, port): 服务器信息或 None}。
+    """
+    addresses = list(dict.fromkeys(addresses))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def query(address):
+        async with semaphore:
+            return await _query_server_async(address, timeout)
+
+    results = await asyncio.gather(*(query(address) for address in addresses))
+    return dict(zip(addresses, results))
+
+
+def query_servers(addresses: Iterable[Tuple[str, int]], timeout: float = 5.0,
+                  concurrency: int = MAX_CONCURRENT_QUERIES) -> Dict[Tuple[str, int], Optional[Dict]]:
+    """并发查询多个服务器（阻塞调用，在后台线程中使用）
+
+    20 个服务器大约只需要一个超时窗口，而不是逐个查询的 20 个。
+    """
+    return asyncio.run(query_servers_async(addresses, timeout, concurrency))
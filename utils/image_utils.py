@@ -2,15 +2,39 @@ from PIL import Image
 import io
 import base64
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtCore import Qt, QBuffer
 
+# 头像目录和预生成的缩略图尺寸（正方形边长），最大的一档同时保存为 avatar_{id}.jpg
+AVATAR_DIR = os.path.join("assets", "avatars")
+AVATAR_SIZES = (64, 128, 200)
+# 内存中缓存的已解码头像 QPixmap 个数
+PIXMAP_CACHE_SIZE = 64
+
 def qimage_to_bytes(qimage, fmt="PNG"):
     buffer = QBuffer()
     buffer.open(QBuffer.ReadWrite)
     qimage.save(buffer, fmt)
     return buffer.data().data()
 
+def open_image(image_data, max_size=None):
+    """解码图片；给定 max_size 时对 JPEG 使用 draft 模式，解码时直接按 1/2~1/8 缩小"""
+    img = Image.open(io.BytesIO(image_data))
+    if max_size:
+        img.draft('RGB', max_size)
+    # 转换为RGB模式（如果是RGBA、调色板等）
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return img
+
+def encode_jpeg(img, quality=85):
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=quality, optimize=True)
+    return output.getvalue()
+
 def compress_image(image_data, max_size=(200, 200), quality=85):
     """压缩图片
     
@@ -25,17 +49,127 @@ def compress_image(image_data, max_size=(200, 200), quality=85):
     # 如果是QImage，转换为PIL Image
     if isinstance(image_data, QImage):
         image_data = qimage_to_bytes(image_data)
-    # 打开图片
-    img = Image.open(io.BytesIO(image_data))
-    # 转换为RGB模式（如果是RGBA）
-    if img.mode == 'RGBA':
-        img = img.convert('RGB')
+    img = open_image(image_data, max_size)
     # 调整大小
     img.thumbnail(max_size, Image.Resampling.LANCZOS)
-    # 保存为JPEG
-    output = io.BytesIO()
-    img.save(output, format='JPEG', quality=quality, optimize=True)
-    return output.getvalue()
+    return encode_jpeg(img, quality)
+
+def bucket_size(size):
+    """返回不小于 size 的最小缩略图尺寸，超过最大尺寸时返回最大的一档"""
+    for bucket in AVATAR_SIZES:
+        if bucket >= size:
+            return bucket
+    return AVATAR_SIZES[-1]
+
+class AvatarStore:
+    """头像存储
+
+    保存时只解码一次上传的图片，按 AVATAR_SIZES 生成各档缩略图，
+    并记录原图的 SHA-256，同一张图片再次上传时不重新编码。
+    读取时按 (文件名, 尺寸档, 修改时间) 缓存已解码的 QPixmap，文件被覆盖后自动失效。
+    """
+
+    def __init__(self, directory=AVATAR_DIR, cache_size=PIXMAP_CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._pixmaps = OrderedDict()
+        self._lock = threading.Lock()
+        self.encode_count = 0
+
+    def path(self, filename, size=None):
+        """头像文件路径；size 为 None 或最大一档时就是原文件名"""
+        if size is not None and bucket_size(size) != AVATAR_SIZES[-1]:
+            stem, ext = os.path.splitext(filename)
+            filename = f"{stem}_{bucket_size(size)}{ext}"
+        return os.path.join(self.directory, filename)
+
+    def _hash_path(self, filename):
+        return os.path.join(self.directory, os.path.splitext(filename)[0] + ".sha256")
+
+    def save(self, image_data, user_id):
+        """保存用户头像，返回头像文件名"""
+        if isinstance(image_data, QImage):
+            image_data = qimage_to_bytes(image_data)
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"avatar_{user_id}.jpg"
+        digest = hashlib.sha256(image_data).hexdigest()
+
+        # 内容没有变化且缩略图齐全时直接复用
+        hash_path = self._hash_path(filename)
+        if os.path.exists(hash_path):
+            with open(hash_path) as f:
+                unchanged = f.read().strip() == digest
+            if unchanged and all(os.path.exists(self.path(filename, size)) for size in AVATAR_SIZES):
+                return filename
+
+        largest = AVATAR_SIZES[-1]
+        img = open_image(image_data, (largest, largest))
+        img.thumbnail((largest, largest), Image.Resampling.LANCZOS)
+        # 从大到小依次缩小，每一档都在上一档的基础上生成
+        for size in reversed(AVATAR_SIZES):
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            self._write(self.path(filename, size), encode_jpeg(img))
+            self.encode_count += 1
+        self._write(hash_path, digest.encode())
+        self.invalidate(filename)
+        return filename
+
+    @staticmethod
+    def _write(path, data):
+        # 先写临时文件再替换，读取方不会看到写了一半的图片
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def load(self, filename, size=None):
+        """读取头像数据（字节）；没有对应尺寸的缩略图时回退到原文件，都不存在时返回None"""
+        for path in (self.path(filename, size), self.path(filename)):
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return f.read()
+        return None
+
+    def pixmap(self, filename, size=AVATAR_SIZES[-1]):
+        """返回缩放到 size x size 以内的头像 QPixmap，头像不存在时返回None"""
+        bucket = bucket_size(size)
+        path = self.path(filename, bucket)
+        if not os.path.exists(path):
+            path = self.path(filename)
+            if not os.path.exists(path):
+                return None
+        key = (filename, size, os.stat(path).st_mtime_ns)
+        with self._lock:
+            pixmap = self._pixmaps.get(key)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(key)
+                return pixmap
+
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return None
+        if pixmap.width() > size or pixmap.height() > size:
+            pixmap = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        with self._lock:
+            self._pixmaps[key] = pixmap
+            while len(self._pixmaps) > self.cache_size:
+                self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def invalidate(self, filename=None):
+        """丢弃某个头像（默认全部）已缓存的 QPixmap"""
+        with self._lock:
+            for key in [key for key in self._pixmaps if filename is None or key[0] == filename]:
+                del self._pixmaps[key]
+
+_store = None
+
+def avatar_store():
+    """全局头像存储"""
+    global _store
+    if _store is None:
+        _store = AvatarStore()
+    return _store
 
 def save_avatar(image_data, user_id):
     """保存用户头像
@@ -47,37 +181,31 @@ def save_avatar(image_data, user_id):
     Returns:
         头像文件名
     """
-    # 确保目录存在
-    avatar_dir = os.path.join("assets", "avatars")
-    os.makedirs(avatar_dir, exist_ok=True)
-    
-    # 压缩图片
-    compressed_data = compress_image(image_data)
-    
-    # 生成文件名
-    filename = f"avatar_{user_id}.jpg"
-    filepath = os.path.join(avatar_dir, filename)
-    
-    # 保存文件
-    with open(filepath, "wb") as f:
-        f.write(compressed_data)
-        
-    return filename
+    return avatar_store().save(image_data, user_id)
 
-def load_avatar(filename):
+def load_avatar(filename, size=None):
     """加载用户头像
     
     Args:
         filename: 文件名
+        size: 需要的尺寸，None 表示最大的一档
         
     Returns:
         图片数据（字节）或None
     """
-    filepath = os.path.join("assets", "avatars", filename)
-    if os.path.exists(filepath):
-        with open(filepath, "rb") as f:
-            return f.read()
-    return None
+    return avatar_store().load(filename, size)
+
+def load_avatar_pixmap(filename, size=AVATAR_SIZES[-1]):
+    """加载用户头像 QPixmap（带内存缓存）
+    
+    Args:
+        filename: 文件名
+        size: 边长
+        
+    Returns:
+        QPixmap对象或None
+    """
+    return avatar_store().pixmap(filename, size)
 
 def image_to_base64(image_data):
     """将图片数据转换为Base64编码
@@ -1,43 +1,136 @@
+"""密码哈希
+
+新密码使用带版本的格式保存在 password_hash 中，算法、强度和盐都写在里面：
+
+    pbkdf2_sha256$<迭代次数>$<盐>$<哈希>
+    scrypt$<n>:<r>:<p>$<盐>$<哈希>
+
+盐同时写入 password_salt 列（该列不允许为空）。旧格式——单轮 SHA-256（有盐 / 无盐）
+和 verify_password_hmac 使用的 "盐:密钥" 格式——仍然可以验证，needs_rehash() 对它们
+返回 True，登录成功时由 db_operations.verify_user 透明地升级为当前格式。
+
+强度参数由 benchmarks/bench_password_hash.py 的 calibrate() 测得（单次约 100ms），
+可以通过环境变量 PASSWORD_HASH_SCHEME / PASSWORD_HASH_COST 调整。
+"""
 import hashlib
 import os
 import hmac
+import time
+
+PBKDF2 = "pbkdf2_sha256"
+SCRYPT = "scrypt"
+
+# 各算法的默认强度：PBKDF2 为迭代次数，scrypt 为 n（r=8, p=1）
+DEFAULT_COSTS = {
+    PBKDF2: 320000,
+    SCRYPT: 2 ** 15,
+}
+SCRYPT_R = 8
+SCRYPT_P = 1
+KEY_LENGTH = 32
+
+PASSWORD_HASH_SCHEME = os.getenv('PASSWORD_HASH_SCHEME', PBKDF2)
+PASSWORD_HASH_COST = int(os.getenv('PASSWORD_HASH_COST', DEFAULT_COSTS.get(PASSWORD_HASH_SCHEME, 0)))
+
+# verify_password_hmac 旧格式使用的迭代次数
+LEGACY_HMAC_ITERATIONS = 100000
 
 def generate_salt():
     """生成随机盐值"""
     return os.urandom(16).hex()
 
-def hash_password(password, salt=None):
+def _derive(scheme, cost, password, salt):
+    """按算法和强度计算密钥"""
+    if scheme == PBKDF2:
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), cost, KEY_LENGTH)
+    if scheme == SCRYPT:
+        n, r, p = cost
+        # scrypt 需要约 128 * n * r 字节内存，默认上限 32MB 不够用
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt.encode('ascii'), n=n, r=r, p=p,
+                              maxmem=256 * n * r, dklen=KEY_LENGTH)
+    raise ValueError(f"不支持的密码哈希算法: {scheme}")
+
+def _format_cost(scheme, cost):
+    if scheme == SCRYPT:
+        return ":".join(str(v) for v in cost)
+    return str(cost)
+
+def _parse(hashed_password):
+    """解析带版本的哈希，返回 (算法, 强度, 盐, 哈希)；不是新格式时返回 None"""
+    parts = hashed_password.split('$') if hashed_password else []
+    if len(parts) != 4:
+        return None
+    scheme, cost, salt, digest = parts
+    try:
+        if scheme == PBKDF2:
+            return scheme, int(cost), salt, digest
+        if scheme == SCRYPT:
+            n, r, p = (int(v) for v in cost.split(':'))
+            return scheme, (n, r, p), salt, digest
+    except ValueError:
+        pass
+    return None
+
+def _scheme_cost(scheme=None, cost=None):
+    scheme = scheme or PASSWORD_HASH_SCHEME
+    cost = cost or (PASSWORD_HASH_COST if scheme == PASSWORD_HASH_SCHEME else DEFAULT_COSTS[scheme])
+    if scheme == SCRYPT and isinstance(cost, int):
+        cost = (cost, SCRYPT_R, SCRYPT_P)
+    return scheme, cost
+
+def hash_password(password, salt=None, scheme=None, cost=None):
     """对密码进行哈希处理
     
     Args:
         password: 原始密码
         salt: 盐值，如果为None则生成新的盐值
+        scheme: 算法（pbkdf2_sha256 / scrypt），默认 PASSWORD_HASH_SCHEME
+        cost: 强度（迭代次数 / scrypt 的 n），默认为该算法的当前强度
         
     Returns:
-        (哈希后的密码, 盐值)
+        (带版本的哈希字符串, 盐值)
     """
     if salt is None:
         salt = generate_salt()
-    
-    # 使用SHA-256进行哈希
-    hashed = hashlib.sha256((password + salt).encode()).hexdigest()
-    return hashed, salt
+    scheme, cost = _scheme_cost(scheme, cost)
+    digest = _derive(scheme, cost, password, salt).hex()
+    return f"{scheme}${_format_cost(scheme, cost)}${salt}${digest}", salt
+
+def _legacy_sha256(password, salt=None):
+    """改造前的单轮 SHA-256（有盐时为 sha256(密码 + 盐)）"""
+    return hashlib.sha256((password + (salt or "")).encode()).hexdigest()
 
-def verify_password(password, hashed_password, salt):
+def verify_password(password, hashed_password, salt=None):
     """验证密码
     
     Args:
         password: 原始密码
-        hashed_password: 哈希后的密码
-        salt: 盐值
+        hashed_password: 哈希后的密码（新格式或旧格式）
+        salt: 盐值，只有旧的单轮 SHA-256 格式需要
         
     Returns:
         密码是否正确
     """
-    return hash_password(password, salt)[0] == hashed_password
+    if not hashed_password:
+        return False
+    parsed = _parse(hashed_password)
+    if parsed is not None:
+        scheme, cost, stored_salt, digest = parsed
+        return hmac.compare_digest(_derive(scheme, cost, password, stored_salt).hex(), digest)
+    if ':' in hashed_password:
+        return verify_password_hmac(password, hashed_password)
+    return hmac.compare_digest(_legacy_sha256(password, salt), hashed_password)
+
+def needs_rehash(hashed_password, scheme=None, cost=None):
+    """哈希不是当前算法，或强度低于当前强度时返回 True"""
+    parsed = _parse(hashed_password)
+    if parsed is None:
+        return True
+    scheme, cost = _scheme_cost(scheme, cost)
+    return parsed[0] != scheme or parsed[1] < cost
 
 def verify_password_hmac(password: str, stored_hash: str) -> bool:
-    """验证密码是否正确"""
+    """验证 "盐:密钥" 格式的旧 PBKDF2 哈希"""
     try:
         # 分离盐值和密钥
         salt_hex, key_hex = stored_hash.split(':')
@@ -49,10 +142,33 @@ def verify_password_hmac(password: str, stored_hash: str) -> bool:
             'sha256',
             password.encode('utf-8'),
             salt,
-            100000  # 迭代次数
+            LEGACY_HMAC_ITERATIONS
         )
         
         # 使用 hmac.compare_digest 进行安全的比较
         return hmac.compare_digest(key, stored_key)
     except Exception:
-        return False 
\ No newline at end of file
+        return False
+
+def calibrate(scheme=PBKDF2, target_ms=100.0, password="calibration-password"):
+    """测出单次哈希约 target_ms 毫秒的强度
+
+    PBKDF2 的耗时与迭代次数成正比，按比例推算并取整到 1 万；
+    scrypt 的 n 必须是 2 的幂，取耗时不超过目标的最大值。
+    """
+    salt = generate_salt()
+    if scheme == PBKDF2:
+        probe = 50000
+        start = time.perf_counter()
+        _derive(PBKDF2, probe, password, salt)
+        elapsed = (time.perf_counter() - start) * 1000
+        return max(10000, int(probe * target_ms / elapsed) // 10000 * 10000)
+    if scheme == SCRYPT:
+        n = 2 ** 12
+        while True:
+            start = time.perf_counter()
+            _derive(SCRYPT, (n * 2, SCRYPT_R, SCRYPT_P), password, salt)
+            if (time.perf_counter() - start) * 1000 > target_ms:
+                return n
+            n *= 2
+    raise ValueError(f"不支持的密码哈希算法: {scheme}")
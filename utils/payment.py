@@ -8,9 +8,9 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 class PaymentAPI:
-    def __init__(self):
-        self.api_key = PAYMENT_API_KEY
-        self.api_url = PAYMENT_API_URL
+    def __init__(self, api_url: str = None, api_key: str = None):
+        self.api_key = api_key or PAYMENT_API_KEY
+        self.api_url = api_url or PAYMENT_API_URL
         self.session = self._create_session()
         
     def _create_session(self):
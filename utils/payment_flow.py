@@ -0,0 +1,216 @@
+"""异步支付流程
+
+一次充值对应一个 PaymentFlow，状态依次为：
+
+    creating -> awaiting_scan -> polling -> settling -> succeeded
+                                        \\-> failed / cancelled / timed_out
+
+创建订单、查询状态和入账都在后台线程执行（utils.workers），轮询间隔由 QTimer
+按指数退避安排，GUI 线程不会阻塞。PaymentManager 管理同时进行的多笔支付。
+"""
+import time
+import uuid
+from enum import Enum
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from utils.payment import PaymentAPI
+from utils.workers import TaskRunner
+
+class PaymentState(str, Enum):
+    CREATING = "creating"
+    AWAITING_SCAN = "awaiting_scan"
+    POLLING = "polling"
+    SETTLING = "settling"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+
+FINAL_STATES = {PaymentState.SUCCEEDED, PaymentState.FAILED,
+                PaymentState.CANCELLED, PaymentState.TIMED_OUT}
+
+# check_payment 返回的已支付状态（模拟模式返回 paid）
+PAID_STATUSES = {"success", "paid"}
+
+def new_order_id():
+    return f"order_{int(time.time())}_{str(uuid.uuid4())[:8]}"
+
+class PaymentFlow(QObject):
+    """单笔支付的状态机
+
+    settle(result) 在支付确认后于后台线程调用一次，用于给用户入账；
+    它抛出异常时支付进入 failed 状态。
+    message 总是语言键，显示前经 language_manager.get_text 转换；
+    detail 是服务端返回的说明或异常信息，原样显示，不作为语言键查找。
+    """
+    state_changed = pyqtSignal(str)
+    # (进度 0-100, 状态说明)
+    progress = pyqtSignal(int, str)
+    # 支付二维码内容
+    qr_ready = pyqtSignal(str)
+    # 最终结果：{'success', 'state', 'payment_id', 'order_id', 'amount', 'method', 'message', 'detail'}
+    finished = pyqtSignal(dict)
+
+    # 轮询退避（秒）
+    POLL_INITIAL = 2.0
+    POLL_FACTOR = 1.5
+    POLL_MAX = 15.0
+    # 最长等待时间（秒），与原来的 60 次 x 5 秒一致
+    TIMEOUT = 300.0
+
+    def __init__(self, amount, method, settle=None, api=None, order_id=None, parent=None):
+        super().__init__(parent)
+        self.amount = amount
+        self.method = method
+        self.order_id = order_id or new_order_id()
+        self.payment_id = None
+        self.state = None
+        self.message = ""
+        self.detail = ""
+        self._settle = settle
+        self._api = api or PaymentAPI()
+        self._tasks = TaskRunner(self)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._poll)
+        self._delay = self.POLL_INITIAL
+        self._deadline = None
+        self.poll_count = 0
+
+    def start(self):
+        self._set_state(PaymentState.CREATING, 10, "creating_payment_order")
+        self._tasks.submit("create", self._api.create_payment, self.amount, self.order_id,
+                           on_result=self._on_created, on_error=self._on_error)
+
+    def confirm_scanned(self):
+        """用户表示已经扫码支付：立即查询一次，并重置退避间隔"""
+        if self.state != PaymentState.AWAITING_SCAN:
+            return
+        self._set_state(PaymentState.POLLING, 50, "waiting_payment_complete")
+        self._delay = self.POLL_INITIAL
+        self._schedule_poll(0)
+
+    def cancel(self):
+        """取消支付；已确认支付、正在入账时不能取消"""
+        if self.is_finished() or self.state == PaymentState.SETTLING:
+            return
+        self._timer.stop()
+        self._tasks.cancel_all()
+        self._finish(PaymentState.CANCELLED, "user_cancelled_payment")
+
+    def is_finished(self):
+        return self.state in FINAL_STATES
+
+    def _on_created(self, order):
+        if self.is_finished():
+            return
+        if not order or not order.get("payment_id"):
+            self._finish(PaymentState.FAILED, "create_order_failed")
+            return
+        if order.get("success") is False:
+            self._finish(PaymentState.FAILED, "payment_failed", order.get("message") or "")
+            return
+        self.payment_id = order["payment_id"]
+        self._deadline = time.monotonic() + self.TIMEOUT
+        qr_code_url = order.get("qr_code_url")
+        if qr_code_url:
+            # 等待扫码期间也在后台轮询，用户扫码后无需手动确认
+            self._set_state(PaymentState.AWAITING_SCAN, 30, "order_created_complete_payment")
+            self.qr_ready.emit(qr_code_url)
+            self._schedule_poll(self._delay)
+        else:
+            self._set_state(PaymentState.POLLING, 50, "waiting_payment_complete")
+            self._schedule_poll(0)
+
+    def _schedule_poll(self, delay):
+        self._timer.start(int(delay * 1000))
+
+    def _poll(self):
+        if self.is_finished():
+            return
+        self.poll_count += 1
+        self._tasks.submit("check", self._api.check_payment, self.payment_id,
+                           on_result=self._on_checked, on_error=self._on_error)
+
+    def _on_checked(self, status):
+        if self.is_finished():
+            return
+        status_value = (status or {}).get("status")
+        if status_value in PAID_STATUSES:
+            self._set_state(PaymentState.SETTLING, 90, "payment_success")
+            self._tasks.submit("settle", self._run_settle,
+                               on_result=lambda _: self._finish(PaymentState.SUCCEEDED, "payment_success"),
+                               on_error=self._on_error)
+            return
+        if status_value == "failed":
+            self._finish(PaymentState.FAILED, "payment_failed", status.get("message") or "")
+            return
+
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            self._finish(PaymentState.TIMED_OUT, "payment_timeout")
+            return
+        elapsed = self.TIMEOUT - remaining
+        self.progress.emit(50 + int(40 * elapsed / self.TIMEOUT), self.message)
+        self._schedule_poll(min(self._delay, remaining))
+        self._delay = min(self._delay * self.POLL_FACTOR, self.POLL_MAX)
+
+    def _run_settle(self):
+        if self._settle is not None:
+            self._settle(self.result())
+
+    def _on_error(self, error):
+        if not self.is_finished():
+            self._finish(PaymentState.FAILED, "payment_exception", str(error))
+
+    def _set_state(self, state, progress, message):
+        self.state = state
+        self.message = message
+        self.state_changed.emit(state.value)
+        self.progress.emit(progress, message)
+
+    def _finish(self, state, message, detail=""):
+        self._timer.stop()
+        self.detail = detail
+        self._set_state(state, 100, message)
+        self.finished.emit(self.result())
+
+    def result(self):
+        return {
+            'success': self.state in (PaymentState.SETTLING, PaymentState.SUCCEEDED),
+            'state': self.state.value if self.state else None,
+            'payment_id': self.payment_id,
+            'order_id': self.order_id,
+            'amount': self.amount,
+            'method': self.method,
+            'message': self.message,
+            'detail': self.detail,
+        }
+
+class PaymentManager(QObject):
+    """管理同时进行的多笔支付"""
+    payment_finished = pyqtSignal(dict)
+
+    def __init__(self, parent=None, api_factory=PaymentAPI):
+        super().__init__(parent)
+        self._api_factory = api_factory
+        self._flows = {}
+
+    def start(self, amount, method, settle=None):
+        """创建并启动一笔支付，返回 PaymentFlow，调用方可连接它的信号显示进度"""
+        flow = PaymentFlow(amount, method, settle=settle, api=self._api_factory(), parent=self)
+        self._flows[flow.order_id] = flow
+        flow.finished.connect(lambda result: self._on_finished(flow, result))
+        flow.start()
+        return flow
+
+    def _on_finished(self, flow, result):
+        self._flows.pop(flow.order_id, None)
+        flow.deleteLater()
+        self.payment_finished.emit(result)
+
+    def pending(self):
+        return list(self._flows.values())
+
+    def cancel_all(self):
+        for flow in list(self._flows.values()):
+            flow.cancel()
@@ -0,0 +1,146 @@
+"""服务器状态轮询
+
+ServerStatusPoller 在后台按固定间隔批量查询所有关注的服务器（utils.csgo_server.query_servers），
+在内存中保存每个服务器最近一次的快照和延迟 / 玩家数历史。界面直接读取缓存，
+重复打开服务器页面不需要等待网络；无论多少界面在看，每个间隔最多只发出一轮查询。
+
+    poller = server_poller()
+    poller.watch(("180.188.21.76", 27015))
+    poller.updated.connect(view.on_servers_polled)
+    poller.poll_failed.connect(view.on_poll_failed)
+    poller.start()
+"""
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from utils.csgo_server import query_servers
+from utils.workers import TaskRunner
+
+_poller = None
+
+def server_poller():
+    """应用内共享的轮询器"""
+    global _poller
+    if _poller is None:
+        _poller = ServerStatusPoller()
+    return _poller
+
+class ServerStatusPoller(QObject):
+    """定时批量查询服务器并缓存结果
+
+    快照格式：
+        {'info': query_servers 返回的服务器信息（离线时为 None）,
+         'online': bool, 'updated_at': 时间戳, 'history': [(时间戳, 延迟, 玩家数), ...]}
+    离线时历史记录中的延迟和玩家数为 None。
+    """
+    # 一轮查询结束，参数为本轮涉及的地址列表
+    updated = pyqtSignal(list)
+    # 一轮查询失败或被 stop() 取消，参数为错误说明（取消时为空字符串）；
+    # 每轮查询结束时 updated 和 poll_failed 恰好发出一个
+    poll_failed = pyqtSignal(str)
+
+    # 轮询间隔（秒）
+    INTERVAL = 30.0
+    # 每个服务器的截止时间（秒），小于轮询间隔，保证一轮结束后才开始下一轮
+    QUERY_TIMEOUT = 5.0
+    # 每个服务器保留的历史记录条数（默认间隔下约 1 小时）
+    HISTORY_SIZE = 120
+
+    def __init__(self, parent=None, query=query_servers):
+        super().__init__(parent)
+        self._query = query
+        self._addresses = []
+        self._snapshots = {}
+        self._history = {}
+        self._tasks = TaskRunner(self)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+    def watch(self, address):
+        """关注一个服务器，下一轮开始查询"""
+        address = tuple(address)
+        if address not in self._addresses:
+            self._addresses.append(address)
+
+    def unwatch(self, address):
+        """取消关注，同时丢弃它的缓存"""
+        address = tuple(address)
+        if address in self._addresses:
+            self._addresses.remove(address)
+        self._snapshots.pop(address, None)
+        self._history.pop(address, None)
+
+    def addresses(self):
+        return list(self._addresses)
+
+    def start(self):
+        """开始定时轮询，并立即查询一轮"""
+        self._timer.start(int(self.INTERVAL * 1000))
+        self.refresh()
+
+    def stop(self):
+        self._timer.stop()
+        polling = self.is_polling()
+        self._tasks.cancel_all()
+        if polling:
+            self.poll_failed.emit("")
+
+    def is_active(self):
+        return self._timer.isActive()
+
+    def is_polling(self):
+        return self._tasks.is_running("poll")
+
+    def refresh(self):
+        """立即查询一轮；上一轮还没结束时不重复发出查询，返回是否发出了查询"""
+        if self.is_polling() or not self._addresses:
+            return False
+        addresses = list(self._addresses)
+        self._tasks.submit("poll", self._query, addresses, timeout=self.QUERY_TIMEOUT,
+                           on_result=self._on_polled, on_error=self._on_poll_error)
+        return True
+
+    def record(self, address, info, updated_at=None):
+        """写入一个服务器的查询结果（轮询结果或界面单独查询的结果）"""
+        address = tuple(address)
+        updated_at = updated_at or time.time()
+        history = self._history.setdefault(address, deque(maxlen=self.HISTORY_SIZE))
+        if info:
+            history.append((updated_at, info.get('延迟'), info.get('玩家数量')))
+        else:
+            history.append((updated_at, None, None))
+        self._snapshots[address] = {
+            'info': info,
+            'online': bool(info),
+            'updated_at': updated_at,
+        }
+
+    def _on_polled(self, results):
+        now = time.time()
+        for address, info in results.items():
+            # 轮询期间被取消关注的服务器不再写入
+            if address in self._addresses:
+                self.record(address, info, now)
+        self.updated.emit(list(results))
+
+    def _on_poll_error(self, error):
+        print(f"轮询服务器状态失败: {error}")
+        self.poll_failed.emit(str(error))
+
+    def snapshot(self, address):
+        """返回缓存的快照（包含历史记录），从未查询过时返回 None"""
+        address = tuple(address)
+        snapshot = self._snapshots.get(address)
+        if snapshot is None:
+            return None
+        return dict(snapshot, history=list(self._history.get(address, ())))
+
+    def age(self, address):
+        """快照距今的秒数，从未查询过时返回 None"""
+        snapshot = self._snapshots.get(tuple(address))
+        return None if snapshot is None else time.time() - snapshot['updated_at']
+
+    def is_fresh(self, address):
+        """快照是否在一个轮询间隔之内"""
+        age = self.age(address)
+        return age is not None and age <= self.INTERVAL
@@ -0,0 +1,189 @@
+"""启动性能记录
+
+main.py 把启动过程分成若干阶段，用 startup_profiler.phase(name) 包起来，
+记录每个阶段的耗时、其中导入模块花的时间和新导入的模块数：
+
+    with startup_profiler.phase("schema"):
+        upgrade()
+
+启动完成后 finish() 生成报告，并以一行 JSON 写入日志（logger "startup"）。
+使用 --profile-startup 启动时还会统计每个 import 的耗时并打印报告表格。
+check_budget() 把报告和各阶段的时间预算比较，供启动测试判断是否退化。
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("startup")
+
+PROFILE_FLAG = "--profile-startup"
+# 报告中列出的最慢导入个数
+TOP_IMPORTS = 15
+
+class ImportTimer:
+    """统计模块导入耗时
+
+    放在 sys.meta_path 最前面，找到模块后给加载器套上计时。
+    on_import(name, total_ms, self_ms, outermost)：total_ms 包括嵌套导入的时间，
+    self_ms 不包括；outermost 表示不是在导入其他模块的过程中发生的。
+    内置和冻结模块的加载器是类本身，不做处理，它们的耗时可以忽略。
+    """
+
+    def __init__(self, on_import):
+        self.on_import = on_import
+        self._local = threading.local()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        loader = spec.loader
+        if (loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module")
+                and "exec_module" not in getattr(loader, "__dict__", {"exec_module": None})):
+            self._wrap(loader, name)
+        return spec
+
+    def _wrap(self, loader, name):
+        # 扩展模块的主要耗时在 create_module（加载动态库），Python 模块在 exec_module，
+        # 从 create_module 开始计时到 exec_module 结束
+        create_module = getattr(loader, "create_module", None)
+        exec_module = loader.exec_module
+        local = self._local
+        state = {}
+
+        def enter():
+            if not hasattr(local, "stack"):
+                local.stack = []
+            # 栈中记录每个正在导入的模块里嵌套导入的累计耗时
+            local.stack.append(0.0)
+            state["start"] = time.perf_counter()
+
+        def leave():
+            total = (time.perf_counter() - state["start"]) * 1000
+            nested = local.stack.pop()
+            if local.stack:
+                local.stack[-1] += total
+            # 同一个加载器对象只用一次，结束后恢复原方法
+            loader.__dict__.pop("create_module", None)
+            loader.__dict__.pop("exec_module", None)
+            self.on_import(name, total, total - nested, not local.stack)
+
+        def timed_create_module(spec):
+            enter()
+            try:
+                return create_module(spec)
+            except BaseException:
+                leave()
+                raise
+
+        def timed_exec_module(module):
+            if "start" not in state:
+                enter()
+            try:
+                exec_module(module)
+            finally:
+                leave()
+
+        if create_module is not None:
+            loader.create_module = timed_create_module
+        loader.exec_module = timed_exec_module
+
+class StartupProfiler:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.phases = []
+        self.imports = []
+        self._current = None
+        self._timer = None
+
+    def enable_import_timing(self):
+        """开始统计每个 import 的耗时（--profile-startup 时使用）"""
+        if self._timer is None:
+            self._timer = ImportTimer(self._record_import)
+        self._timer.install()
+
+    def _record_import(self, name, total_ms, self_ms, outermost):
+        self.imports.append((name, self_ms))
+        if outermost and self._current is not None:
+            self._current["import_ms"] += total_ms
+
+    @contextmanager
+    def phase(self, name):
+        """记录一个启动阶段；阶段不嵌套"""
+        record = {"name": name, "wall_ms": 0.0, "import_ms": 0.0, "modules": 0}
+        previous, self._current = self._current, record
+        modules = len(sys.modules)
+        start = self.clock()
+        try:
+            yield record
+        finally:
+            record["wall_ms"] = (self.clock() - start) * 1000
+            record["modules"] = len(sys.modules) - modules
+            self.phases.append(record)
+            self._current = previous
+
+    def report(self):
+        """生成报告（可以 JSON 序列化）"""
+        imports = sorted(self.imports, key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+        return {
+            "total_ms": round((self.clock() - self.started) * 1000, 2),
+            "phases": [dict(phase, wall_ms=round(phase["wall_ms"], 2),
+                            import_ms=round(phase["import_ms"], 2)) for phase in self.phases],
+            "slowest_imports": [[name, round(ms, 2)] for name, ms in imports],
+        }
+
+    def finish(self):
+        """启动完成：停止统计导入，把报告写入日志并返回"""
+        if self._timer is not None:
+            self._timer.uninstall()
+        report = self.report()
+        logger.info(json.dumps(report, ensure_ascii=False))
+        return report
+
+def format_report(report):
+    """报告的文本表格"""
+    lines = [f"{'阶段':<24}{'耗时(ms)':>12}{'导入(ms)':>12}{'新模块':>8}"]
+    for phase in report["phases"]:
+        lines.append(f"{phase['name']:<24}{phase['wall_ms']:>12.1f}"
+                     f"{phase['import_ms']:>12.1f}{phase['modules']:>8}")
+    lines.append(f"{'合计':<24}{report['total_ms']:>12.1f}")
+    if report["slowest_imports"]:
+        lines.append("最慢的导入（不含其中嵌套导入的模块）:")
+        lines.extend(f"  {name:<40}{ms:>10.1f} ms" for name, ms in report["slowest_imports"])
+    return "\n".join(lines)
+
+def check_budget(report, budget):
+    """和时间预算比较，返回超出预算的 [(阶段, 实际毫秒, 预算毫秒)]
+
+    budget 为 {阶段名: 毫秒}，"total" 表示启动总耗时；报告中没有的阶段视为超出预算。
+    """
+    actual = {phase["name"]: phase["wall_ms"] for phase in report["phases"]}
+    actual["total"] = report["total_ms"]
+    return [(name, actual.get(name), limit) for name, limit in budget.items()
+            if actual.get(name) is None or actual[name] > limit]
+
+# 全局启动记录，main.py 导入时开始计时
+startup_profiler = StartupProfiler()
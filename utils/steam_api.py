@@ -1,12 +1,168 @@
+import threading
+import time
 import requests
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
 from config.database import STEAM_API_KEY
 
+# GetPlayerSummaries 每次最多接受的 steamid 数量
+MAX_SUMMARIES_PER_CALL = 100
+STEAM64_BASE = 76561197960265728
+
+# 缓存未命中标记（缓存值本身可能是 None）
+_MISSING = object()
+
+class SteamAPIError(Exception):
+    """Steam Web API 请求失败（网络错误、限流或服务端错误），与"账号不存在"区分"""
+
+class TTLCache:
+    """带过期时间的线程安全缓存；值可以是 None（用于缓存"查无此人"）"""
+
+    def __init__(self, ttl: float, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # 所有项的存活时间相同，写入顺序就是过期顺序
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            self._data.pop(key, None)
+            # 从最早写入的一项开始清理已过期的项，仍然满了就继续丢弃最早的项
+            while self._data:
+                expires, _ = next(iter(self._data.values()))
+                if expires >= now and len(self._data) < self.maxsize:
+                    break
+                self._data.popitem(last=False)
+            self._data[key] = (now + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class TokenBucket:
+    """令牌桶限速：平均每秒 rate 次，最多连续 capacity 次"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取一个令牌，没有令牌时等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
 class SteamAPI:
-    def __init__(self):
-        self.api_key = STEAM_API_KEY
-        self.base_url = "https://api.steampowered.com"
-    
+    """Steam Web API 客户端
+
+    所有请求复用同一个 requests.Session（连接池），经过令牌桶限速；
+    玩家资料按 100 个一批查询，资料和自定义 URL 解析结果按 TTL 缓存。
+    """
+    # 玩家资料缓存时间（秒）
+    SUMMARY_TTL = 300
+    # 自定义 URL -> steamid 很少变化，缓存更久
+    VANITY_TTL = 3600
+    # 限速：平均每秒请求数和突发上限
+    RATE = 5.0
+    BURST = 10
+    TIMEOUT = 10
+
+    def __init__(self, api_key: str = None, base_url: str = None):
+        self.api_key = api_key or STEAM_API_KEY
+        self.base_url = base_url or "https://api.steampowered.com"
+        self.session = requests.Session()
+        self.rate_limiter = TokenBucket(self.RATE, self.BURST)
+        self.summary_cache = TTLCache(self.SUMMARY_TTL)
+        self.vanity_cache = TTLCache(self.VANITY_TTL)
+        # 实际发出的 HTTP 请求数
+        self.request_count = 0
+
+    def _get(self, path: str, **params) -> Optional[Dict]:
+        """限速后发出 GET 请求，成功时返回 JSON"""
+        self.rate_limiter.acquire()
+        self.request_count += 1
+        response = self.session.get(f"{self.base_url}{path}", params=dict(params, key=self.api_key),
+                                    timeout=self.TIMEOUT)
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    @staticmethod
+    def _player_info(player: Dict) -> Dict:
+        return {
+            'steam_id': player['steamid'],
+            'name': player['personaname'],
+            'avatar': player['avatarfull'],
+            'profile_url': player['profileurl'],
+            'last_online': player.get('lastlogoff', 0)
+        }
+
+    def get_player_summaries(self, steam_ids: Iterable[str],
+                             raise_on_error: bool = False) -> Dict[str, Optional[Dict]]:
+        """批量获取玩家信息，返回 {steam_id: 玩家信息或 None}
+
+        缓存中没有的 steamid 每 100 个合并为一次 GetPlayerSummaries 请求；
+        Steam 没有返回的 steamid 也会缓存为 None，避免反复查询无效账号。
+        请求失败时这一批返回 None 且不缓存；raise_on_error=True 时改为抛出 SteamAPIError，
+        调用方可以把它与"账号不存在"区分开。
+        """
+        results = {}
+        missing = []
+        for steam_id in dict.fromkeys(str(s) for s in steam_ids):
+            cached = self.summary_cache.get(steam_id, _MISSING)
+            if cached is _MISSING:
+                missing.append(steam_id)
+            else:
+                results[steam_id] = cached
+
+        for offset in range(0, len(missing), MAX_SUMMARIES_PER_CALL):
+            chunk = missing[offset:offset + MAX_SUMMARIES_PER_CALL]
+            try:
+                data = self._get("/ISteamUser/GetPlayerSummaries/v0002/", steamids=",".join(chunk))
+            except requests.RequestException as e:
+                if raise_on_error:
+                    raise SteamAPIError(f"获取Steam玩家信息失败: {str(e)}") from e
+                print(f"获取Steam玩家信息失败: {str(e)}")
+                data = None
+            if data is None:
+                if raise_on_error:
+                    raise SteamAPIError("获取Steam玩家信息失败: Steam 没有返回结果")
+                # 请求失败时不缓存，下次重试
+                results.update((steam_id, None) for steam_id in chunk)
+                continue
+            players = {p['steamid']: self._player_info(p) for p in data['response'].get('players', [])}
+            for steam_id in chunk:
+                info = players.get(steam_id)
+                self.summary_cache.set(steam_id, info)
+                results[steam_id] = info
+        return results
+
     def get_player_info(self, steam_id: str) -> Optional[Dict]:
         """获取Steam玩家信息"""
         try:
@@ -15,28 +171,7 @@ class SteamAPI:
                 steam_id = self.convert_to_steam64(steam_id)
                 if not steam_id:
                     return None
-            
-            # 使用Steam Web API获取玩家信息
-            url = f"{self.base_url}/ISteamUser/GetPlayerSummaries/v0002/"
-            params = {
-                'key': self.api_key,
-                'steamids': steam_id
-            }
-            
-            response = requests.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data['response']['players']:
-                    player = data['response']['players'][0]
-                    return {
-                        'steam_id': player['steamid'],
-                        'name': player['personaname'],
-                        'avatar': player['avatarfull'],
-                        'profile_url': player['profileurl'],
-                        'last_online': player.get('lastlogoff', 0)
-                    }
-            return None
+            return self.get_player_summaries([steam_id]).get(steam_id)
         except Exception as e:
             print(f"获取Steam玩家信息失败: {str(e)}")
             return None
@@ -50,12 +185,12 @@ class SteamAPI:
                 if len(parts) == 3:
                     y = int(parts[1])
                     z = int(parts[2])
-                    return str(z * 2 + y + 76561197960265728)
+                    return str(z * 2 + y + STEAM64_BASE)
             
             # 处理[U:1:XXXXXX]格式
             if steam_id.startswith('[U:1:'):
                 steam_id = steam_id[5:-1]
-                return str(int(steam_id) + 76561197960265728)
+                return str(int(steam_id) + STEAM64_BASE)
             
             # 处理社区URL
             if 'steamcommunity.com' in steam_id:
@@ -73,45 +208,38 @@ class SteamAPI:
     
     def get_steam_id_from_vanity_url(self, vanity_url: str) -> Optional[str]:
         """从自定义URL获取Steam ID"""
+        cached = self.vanity_cache.get(vanity_url, _MISSING)
+        if cached is not _MISSING:
+            return cached
         try:
-            url = f"{self.base_url}/ISteamUser/ResolveVanityURL/v0001/"
-            params = {
-                'key': self.api_key,
-                'vanityurl': vanity_url
-            }
-            
-            response = requests.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data['response']['success'] == 1:
-                    return data['response']['steamid']
-            return None
+            data = self._get("/ISteamUser/ResolveVanityURL/v0001/", vanityurl=vanity_url)
+            if data is None:
+                return None
+            steam_id = data['response']['steamid'] if data['response']['success'] == 1 else None
+            self.vanity_cache.set(vanity_url, steam_id)
+            return steam_id
         except Exception as e:
             print(f"获取Steam ID失败: {str(e)}")
             return None
     
     def validate_steam_id(self, steam_id: str) -> bool:
-        """验证Steam ID是否有效"""
-        player_info = self.get_player_info(steam_id)
-        return player_info is not None
+        """验证Steam ID是否有效
+
+        格式不对的 ID 不访问网络；格式正确的 ID 查询玩家资料（结果有缓存）。
+        """
+        if not steam_id.isdigit():
+            steam_id = self.convert_to_steam64(steam_id)
+            if not steam_id:
+                return False
+        if len(steam_id) != 17 or int(steam_id) <= STEAM64_BASE:
+            return False
+        return self.get_player_info(steam_id) is not None
     
     def get_player_owned_games(self, steam_id: str) -> Optional[Dict]:
         """获取玩家拥有的游戏列表"""
         try:
-            url = f"{self.base_url}/IPlayerService/GetOwnedGames/v0001/"
-            params = {
-                'key': self.api_key,
-                'steamid': steam_id,
-                'include_appinfo': 1,
-                'include_played_free_games': 1
-            }
-            
-            response = requests.get(url, params=params)
-            
-            if response.status_code == 200:
-                return response.json()
-            return None
+            return self._get("/IPlayerService/GetOwnedGames/v0001/", steamid=steam_id,
+                             include_appinfo=1, include_played_free_games=1)
         except Exception as e:
             print(f"获取玩家游戏列表失败: {str(e)}")
             return None
@@ -119,18 +247,7 @@ class SteamAPI:
     def get_player_friends(self, steam_id: str) -> Optional[Dict]:
         """获取玩家的好友列表"""
         try:
-            url = f"{self.base_url}/ISteamUser/GetFriendList/v0001/"
-            params = {
-                'key': self.api_key,
-                'steamid': steam_id,
-                'relationship': 'friend'
-            }
-            
-            response = requests.get(url, params=params)
-            
-            if response.status_code == 200:
-                return response.json()
-            return None
+            return self._get("/ISteamUser/GetFriendList/v0001/", steamid=steam_id, relationship='friend')
         except Exception as e:
             print(f"获取好友列表失败: {str(e)}")
             return None 
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""批量刷新 Steam 绑定资料
+
+SteamBinding.steam_name 只在绑定时写入一次。refresh_steam_profiles 按 id 分块遍历
+steam_bindings，每块的资料按 100 个一批向 Steam 查询（utils.steam_api），
+再用一次 executemany 写回昵称和头像。每块提交后把进度写入检查点文件，
+任务中断或请求失败后再次运行会从上次完成的位置继续。
+
+可以在后台线程中运行（支持 TaskRunner 的取消）：
+
+    self.tasks.submit("steam_refresh", refresh_steam_profiles, on_result=...)
+
+也可以在命令行中运行：python -m utils.steam_refresh
+"""
+import json
+import os
+import sys
+import time
+from config.database import DB_PATH
+from database.db_operations import get_steam_binding_chunk, bulk_update_steam_profiles
+from utils.steam_api import SteamAPI, SteamAPIError
+from utils.workers import current_token
+
+# 每块读取的绑定数：10 次 GetPlayerSummaries 请求，一次提交
+CHUNK_SIZE = 1000
+# 检查点记录的是某个数据库中的进度，放在数据库文件旁边，与当前工作目录无关
+CHECKPOINT_FILE = os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "steam_refresh_checkpoint.json")
+
+def load_checkpoint(path: str) -> int:
+    """返回上次完成的最后一个绑定 id，没有检查点时返回 0"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return int(json.load(f)["last_id"])
+    except (OSError, ValueError, KeyError):
+        return 0
+
+def save_checkpoint(path: str, last_id: int):
+    """先写临时文件再替换，中途崩溃也不会留下损坏的检查点"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"last_id": last_id, "saved_at": time.time()}, f)
+    os.replace(tmp_path, path)
+
+def clear_checkpoint(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def refresh_steam_profiles(api: SteamAPI = None, chunk_size: int = CHUNK_SIZE,
+                           checkpoint_path: str = CHECKPOINT_FILE, progress=None) -> dict:
+    """刷新所有绑定的 Steam 昵称和头像
+
+    内存中只保留一块数据。progress(stats) 在每块提交后调用。
+    全部完成后删除检查点，返回统计：
+    {'chunks', 'bindings', 'updated', 'missing', 'last_id'}，
+    missing 为 Steam 没有返回资料（账号不存在）的绑定数，这些绑定保持不变。
+    请求失败时抛出 SteamAPIError，当前块不写入也不记入检查点，下次运行从这一块重新开始。
+    """
+    api = api or SteamAPI()
+    last_id = load_checkpoint(checkpoint_path)
+    stats = {'chunks': 0, 'bindings': 0, 'updated': 0, 'missing': 0, 'last_id': last_id}
+    token = current_token()
+
+    while True:
+        if token is not None:
+            token.raise_if_cancelled()
+        rows = get_steam_binding_chunk(last_id, chunk_size)
+        if not rows:
+            break
+
+        summaries = api.get_player_summaries((steam_id for _, steam_id in rows), raise_on_error=True)
+        profiles = []
+        for binding_id, steam_id in rows:
+            info = summaries.get(steam_id)
+            if info:
+                profiles.append({'id': binding_id, 'steam_name': info['name'],
+                                 'steam_avatar': info['avatar']})
+        bulk_update_steam_profiles(profiles)
+
+        last_id = rows[-1][0]
+        save_checkpoint(checkpoint_path, last_id)
+        stats['chunks'] += 1
+        stats['bindings'] += len(rows)
+        stats['updated'] += len(profiles)
+        stats['missing'] += len(rows) - len(profiles)
+        stats['last_id'] = last_id
+        if progress is not None:
+            progress(dict(stats))
+
+    clear_checkpoint(checkpoint_path)
+    return stats
+
+def main():
+    print("刷新 Steam 绑定资料...")
+    start = time.perf_counter()
+    try:
+        stats = refresh_steam_profiles(
+            progress=lambda s: print(f"  已处理 {s['bindings']} 个绑定（更新 {s['updated']}，缺失 {s['missing']}）"))
+    except SteamAPIError as e:
+        print(f"{e}，已完成的部分保存在检查点中，稍后重新运行即可继续")
+        return 1
+    print(f"完成：{stats['bindings']} 个绑定，更新 {stats['updated']} 个，"
+          f"耗时 {time.perf_counter() - start:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
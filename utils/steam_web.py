@@ -5,7 +5,7 @@ import hashlib
 import base64
 import time
 import requests
-from urllib.parse import urlencode, parse_qs
+from urllib.parse import urlencode, parse_qs, urlparse
 from config.database import STEAM_API_KEY
 
 class SteamWebLogin:
@@ -16,8 +16,14 @@ class SteamWebLogin:
         self.session = requests.Session()
         
     def get_login_url(self, return_url: str) -> str:
-        """获取Steam登录URL"""
+        """获取Steam登录URL
+
+        return_url 中的查询参数（登录流程的 nonce）会带到实际的回调地址上。
+        """
+        query = urlparse(return_url).query
         return_url = "https://cnhvh.com/steam/callback"
+        if query:
+            return_url = f"{return_url}?{query}"
         realm = "https://cnhvh.com"
         params = {
             'openid.ns': 'http://specs.openid.net/auth/2.0',
@@ -0,0 +1,180 @@
+"""后台任务层
+
+视图通过 TaskRunner 把数据库和网络调用放到 QThreadPool 中执行，
+结果经信号回到 GUI 线程再更新界面：
+
+    self.tasks = TaskRunner(self)
+    self.tasks.submit("cart", get_cart_items, user_id, on_result=self._show_cart_items)
+
+同一个 key 再次提交时，上一次的任务会被取消，它的结果即使已经算出来也会被丢弃，
+因此快速来回切换页面时界面只显示最后一次请求的数据。
+"""
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5 import sip
+
+class TaskCancelled(Exception):
+    """任务已被取消"""
+
+class CancellationToken:
+    """取消标记，由提交方取消，任务函数可以在循环中检查"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+_local = threading.local()
+_pool = None
+# 已提交、done 信号尚未处理的任务。引用放在模块级而不是 TaskRunner 上：
+# 提交任务的界面对象可能先被销毁，WorkerSignals 不能在排队的信号处理前被回收
+_running = set()
+
+# 数据库连接池默认大小为 5，后台线程数不超过它
+MAX_THREADS = 4
+
+def task_pool():
+    """后台任务专用线程池
+
+    不使用 QThreadPool.globalInstance()：Qt 内部（例如按文件名创建 QIcon 时）
+    也会使用全局线程池并等待它，而此时 GUI 线程持有 GIL，
+    正在全局线程池中执行的 Python 任务拿不到 GIL，两边互相等待。
+    """
+    global _pool
+    if _pool is None:
+        _pool = QThreadPool()
+        _pool.setMaxThreadCount(MAX_THREADS)
+    return _pool
+
+def current_token():
+    """返回当前工作线程正在执行的任务的取消标记；不在任务中时返回 None"""
+    return getattr(_local, "token", None)
+
+class WorkerSignals(QObject):
+    """QRunnable 不是 QObject，信号放在这里；在 GUI 线程创建，跨线程发射时自动排队"""
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    done = pyqtSignal()
+
+class Worker(QRunnable):
+    """在线程池中执行 fn(*args, **kwargs)"""
+
+    def __init__(self, fn, *args, token=None, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.token = token or CancellationToken()
+        self.signals = WorkerSignals()
+
+    def run(self):
+        _local.token = self.token
+        try:
+            self.token.raise_if_cancelled()
+            result = self.fn(*self.args, **self.kwargs)
+            self.token.raise_if_cancelled()
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            _local.token = None
+            self.signals.done.emit()
+
+class TaskRunner(QObject):
+    """按 key 管理后台任务
+
+    每个 key 同时只有一个有效任务：新提交会取消旧任务，旧任务的结果和错误都被丢弃。
+    synchronous 为 True 时直接在调用线程执行（用于测试和对比测量）。
+    """
+    synchronous = False
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or task_pool()
+        self._generations = {}
+        self._tokens = {}
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, on_finished=None, **kwargs):
+        """提交任务，返回它的取消标记
+
+        on_result(result) / on_error(exception) 只在任务仍是该 key 的最新任务时调用，
+        on_finished() 在两者之后调用（同样只针对最新任务）。
+        """
+        self.cancel(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        token = CancellationToken()
+        self._tokens[key] = token
+
+        def is_current():
+            # TaskRunner 随界面一起销毁后，排队中的结果全部丢弃
+            if sip.isdeleted(self):
+                token.cancel()
+                return False
+            return self._generations.get(key) == generation and not token.cancelled
+
+        def deliver_result(result):
+            if is_current() and on_result is not None:
+                on_result(result)
+
+        def deliver_error(error):
+            if is_current() and on_error is not None:
+                on_error(error)
+
+        def finish():
+            if not is_current():
+                return
+            self._tokens.pop(key, None)
+            if on_finished is not None:
+                on_finished()
+
+        if self.synchronous:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                deliver_error(e)
+            else:
+                deliver_result(result)
+            finish()
+            return token
+
+        worker = Worker(fn, *args, token=token, **kwargs)
+        worker.signals.result.connect(deliver_result)
+        worker.signals.error.connect(deliver_error)
+        worker.signals.done.connect(finish)
+        # 保留引用直到任务结束，避免 Python 端对象被提前回收
+        _running.add(worker)
+        worker.signals.done.connect(lambda: _running.discard(worker))
+        self.pool.start(worker)
+        return token
+
+    def cancel(self, key):
+        """取消 key 对应的任务（已经在执行的任务会跑完，但结果被丢弃）"""
+        token = self._tokens.pop(key, None)
+        if token is not None:
+            token.cancel()
+
+    def cancel_all(self):
+        for key in list(self._tokens):
+            self.cancel(key)
+
+    def is_running(self, key):
+        return key in self._tokens
+
+    def wait(self, msecs=-1):
+        """等待线程池中的任务全部结束"""
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,245 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+from utils.workers import TaskRunner
+from database.db_operations import (paginate_users, paginate_products, paginate_orders,
+                                    count_users, count_products, count_orders)
+
+class PagedTableModel(QAbstractTableModel):
+    """按页从数据库加载的表格模型
+
+    排序和过滤都交给数据库完成（键集分页），表格滚动到底部时
+    通过 canFetchMore/fetchMore 再取下一页。查询在后台线程执行，
+    新的排序/过滤条件会使尚未返回的旧查询结果作废。
+    子类需要定义 columns，并实现 fetch_page 和 count。
+    """
+    PAGE_SIZE = 200
+
+    # 第一页和总数加载完成
+    loaded = pyqtSignal()
+    load_failed = pyqtSignal(str)
+
+    # (表头, 取值函数, 排序字段；None 表示该列不支持排序)
+    columns = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._next_cursor = None
+        self._exhausted = True
+        self._total = 0
+        self._sort = "id"
+        self._descending = False
+        self._search = None
+        self._filters = {}
+        self._loaded = False
+        self._fetching = False
+        self._tasks = TaskRunner(self)
+
+    def fetch_page(self, cursor, page_size, sort, descending, search, **filters):
+        raise NotImplementedError
+
+    def count(self, search, **filters):
+        raise NotImplementedError
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        if role == Qt.DisplayRole:
+            value = self.columns[index.column()][1](self._rows[index.row()])
+            return "" if value is None else str(value)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._fetching:
+            return
+        self._fetching = True
+        self._tasks.submit("page", self.fetch_page, self._next_cursor, self.PAGE_SIZE, self._sort,
+                           self._descending, self._search, **self._filters,
+                           on_result=self._append_page, on_error=self._on_load_error,
+                           on_finished=self._on_fetch_finished)
+
+    def reload(self):
+        """按当前排序和过滤条件重新加载第一页（同时作废正在进行的查询）"""
+        self.beginResetModel()
+        self._rows = []
+        self._next_cursor = None
+        self._exhausted = True
+        self._loaded = True
+        self._fetching = True
+        self.endResetModel()
+        self._tasks.submit("page", self._fetch_first_page, self._sort, self._descending,
+                           self._search, dict(self._filters),
+                           on_result=self._apply_first_page, on_error=self._on_load_error,
+                           on_finished=self._on_fetch_finished)
+
+    def _fetch_first_page(self, sort, descending, search, filters):
+        """后台线程：总数和第一页"""
+        return (self.count(search, **filters),
+                self.fetch_page(None, self.PAGE_SIZE, sort, descending, search, **filters))
+
+    def _apply_first_page(self, result):
+        self._total, page = result
+        self._append_page(page)
+        self.loaded.emit()
+
+    def _append_page(self, page):
+        self._next_cursor = page.next_cursor
+        self._exhausted = not page.has_more
+        if not page.items:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page.items) - 1)
+        self._rows.extend(page.items)
+        self.endInsertRows()
+
+    def _on_fetch_finished(self):
+        self._fetching = False
+
+    def _on_load_error(self, error):
+        self.load_failed.emit(str(error))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """服务端排序：不支持排序的列忽略；首次加载前只记录排序条件"""
+        field = self.columns[column][2]
+        if field is None:
+            return
+        self._sort = field
+        self._descending = order == Qt.DescendingOrder
+        if self._loaded:
+            self.reload()
+
+    def sort_indicator(self):
+        """当前排序对应的(列号, 顺序)，用于初始化表头的排序标记"""
+        for column, (_, _, field) in enumerate(self.columns):
+            if field == self._sort:
+                return column, Qt.DescendingOrder if self._descending else Qt.AscendingOrder
+        return -1, Qt.AscendingOrder
+
+    def set_search(self, text):
+        """服务端前缀搜索"""
+        text = (text or "").strip() or None
+        if text != self._search:
+            self._search = text
+            if self._loaded:
+                self.reload()
+
+    def set_filter(self, name, value):
+        """服务端等值过滤，value 为 None 时取消该过滤"""
+        if value is None:
+            self._filters.pop(name, None)
+        else:
+            self._filters[name] = value
+        if self._loaded:
+            self.reload()
+
+    def row_object(self, row):
+        return self._rows[row]
+
+    def total_count(self):
+        """符合当前过滤条件的总行数"""
+        return self._total
+
+class ServerSortFilterProxyModel(QSortFilterProxyModel):
+    """把排序和过滤转交给 PagedTableModel 在数据库端完成
+
+    本地只保存了已加载的几页数据，在代理中排序/过滤会得到错误结果，
+    因此这里不做本地处理，只转发请求。
+    """
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        source = self.sourceModel()
+        if source is not None and column >= 0:
+            source.sort(column, order)
+
+    def setFilterFixedString(self, pattern):
+        source = self.sourceModel()
+        if source is not None:
+            source.set_search(pattern)
+
+    def source_object(self, proxy_index):
+        """返回代理索引对应的数据库对象"""
+        source_index = self.mapToSource(proxy_index)
+        return self.sourceModel().row_object(source_index.row())
+
+class UserTableModel(PagedTableModel):
+    columns = [
+        ("ID", lambda u: u.id, "id"),
+        ("用户名", lambda u: u.username, "username"),
+        ("类型", lambda u: u.get_type_display(), "user_type"),
+        ("显示名称", lambda u: u.display_name, "display_name"),
+        ("邮箱", lambda u: u.email, "email"),
+        ("积分", lambda u: u.points, "points"),
+        ("状态", lambda u: "已封禁" if u.is_banned else "正常", "is_banned"),
+        ("邀请码", lambda u: u.invite_code_used, None),
+        ("注册时间", lambda u: u.created_at.strftime('%Y-%m-%d %H:%M:%S') if u.created_at else "", "created_at"),
+    ]
+
+    def fetch_page(self, cursor, page_size, sort, descending, search, **filters):
+        return paginate_users(cursor=cursor, page_size=page_size, sort=sort,
+                              descending=descending, search=search, **filters)
+
+    def count(self, search, **filters):
+        return count_users(search=search, **filters)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.ForegroundRole and index.isValid() and self._rows[index.row()].is_banned:
+            return QColor("#e74c3c")
+        return super().data(index, role)
+
+class ProductTableModel(PagedTableModel):
+    columns = [
+        ("ID", lambda p: p.id, "id"),
+        ("名称", lambda p: p.name, "name"),
+        ("分类", lambda p: p.category, "category"),
+        ("价格(积分)", lambda p: p.price, "price"),
+        ("库存", lambda p: p.stock, "stock"),
+        ("上架", lambda p: "是" if p.is_active else "否", "is_active"),
+        ("描述", lambda p: p.description, None),
+    ]
+
+    def fetch_page(self, cursor, page_size, sort, descending, search, **filters):
+        return paginate_products(cursor=cursor, page_size=page_size, sort=sort,
+                                 descending=descending, search=search, **filters)
+
+    def count(self, search, **filters):
+        return count_products(search=search, **filters)
+
+def _order_items_summary(order):
+    return ", ".join(f"{item.name} x{item.quantity}" for item in order.order_items)
+
+class OrderTableModel(PagedTableModel):
+    columns = [
+        ("订单号", lambda o: o.id, "id"),
+        ("用户", lambda o: o.user.username if o.user else "", None),
+        ("商品", _order_items_summary, None),
+        ("总计(积分)", lambda o: o.total_points, "total_points"),
+        ("状态", lambda o: o.status, "status"),
+        ("下单时间", lambda o: o.created_at.strftime('%Y-%m-%d %H:%M:%S') if o.created_at else "", "created_at"),
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sort = "created_at"
+        self._descending = True
+
+    def fetch_page(self, cursor, page_size, sort, descending, search, **filters):
+        # 订单没有文本搜索，按状态等条件过滤
+        return paginate_orders(cursor=cursor, page_size=page_size, sort=sort,
+                               descending=descending, **filters)
+
+    def count(self, search, **filters):
+        return count_orders(**filters)
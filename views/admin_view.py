@@ -1,18 +1,21 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QScrollArea, QFrame, QMessageBox,
+                             QPushButton, QMessageBox,
                              QDialog, QLineEdit, QFormLayout, QSpinBox,
                              QDoubleSpinBox, QComboBox, QTabWidget, QGroupBox,
                              QCheckBox, QInputDialog, QTextEdit, QTableWidget,
-                             QTableWidgetItem)
+                             QTableWidgetItem, QTableView, QAbstractItemView, QHeaderView)
 from PyQt5.QtCore import Qt
-from database.db_operations import (get_all_users, get_all_products, get_all_orders,
-                                   create_product, update_product, delete_product, reset_all_data,
-                                   create_invite_code, get_invite_codes, delete_invite_code)
+from database.db_operations import (create_product, update_product, delete_product, reset_all_data,
+                                   create_invite_code, get_invite_codes, delete_invite_code,
+                                   get_dashboard)
 from models.user import User
 import json
 from database.db_init import SessionLocal
-from controllers.user_controller import create_admin_user
+from controllers.user_controller import create_admin_user, ban_user, update_user_points
+from .admin_models import (UserTableModel, ProductTableModel, OrderTableModel,
+                           ServerSortFilterProxyModel)
 from resources.icons import get_app_icon, get_icon
+from utils.workers import TaskRunner
 from utils.language_manager import language_manager
 from PyQt5.QtGui import QIcon, QPixmap
 
@@ -90,6 +93,7 @@ class AdminView(QWidget):
         self.main_window = main_window
         self.setWindowIcon(get_app_icon())
         self.session = SessionLocal()
+        self.tasks = TaskRunner(self)
         self.init_ui()
         self.load_data()
     
@@ -219,6 +223,10 @@ class AdminView(QWidget):
             }
         """)
         
+        self.dashboard_tab = QWidget()
+        self.init_dashboard_tab()
+        self.tab_widget.addTab(self.dashboard_tab, "数据看板")
+        
         self.users_tab = QWidget()
         self.init_users_tab()
         self.tab_widget.addTab(self.users_tab, "用户管理")
@@ -250,17 +258,171 @@ class AdminView(QWidget):
         self.setLayout(layout)
         self.load_invite_codes()
 
+    def _create_table_view(self, model):
+        """创建表格视图：排序和过滤由数据库完成，滚动到底部时自动加载下一页"""
+        proxy = ServerSortFilterProxyModel(self)
+        proxy.setSourceModel(model)
+        table = QTableView()
+        table.setModel(proxy)
+        table.setSortingEnabled(True)
+        table.setAlternatingRowColors(True)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setWordWrap(False)
+        table.verticalHeader().setVisible(False)
+        table.verticalHeader().setDefaultSectionSize(32)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        table.horizontalHeader().setSortIndicator(*model.sort_indicator())
+        table.setStyleSheet("""
+            QTableView {
+                background-color: white;
+                alternate-background-color: #f8f9fa;
+                border: 1px solid #dee2e6;
+                border-radius: 8px;
+                gridline-color: #eef0f2;
+                selection-background-color: #cfe2ff;
+                selection-color: #212529;
+                font-size: 13px;
+            }
+            QHeaderView::section {
+                background-color: #f1f3f5;
+                border: none;
+                border-bottom: 1px solid #dee2e6;
+                padding: 6px;
+                font-weight: bold;
+                color: #495057;
+            }
+        """)
+        return table, proxy
+
+    def _create_action_button(self, text, color, hover_color, slot):
+        button = QPushButton(text)
+        button.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {color};
+                color: white;
+                border: none;
+                padding: 6px 12px;
+                border-radius: 4px;
+                font-size: 13px;
+            }}
+            QPushButton:hover {{
+                background-color: {hover_color};
+            }}
+        """)
+        button.clicked.connect(slot)
+        return button
+
+    def _selected_object(self, table, proxy):
+        """返回表格当前选中行对应的对象，未选中时提示并返回None"""
+        index = table.currentIndex()
+        if not index.isValid():
+            QMessageBox.warning(self, "提示", "请先选择一行")
+            return None
+        return proxy.source_object(index)
+
+    def init_dashboard_tab(self):
+        """数据看板：只读取聚合表，耗时与订单数量无关"""
+        layout = QVBoxLayout()
+        
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(QLabel("最近 30 天"))
+        toolbar.addStretch()
+        toolbar.addWidget(self._create_action_button("刷新", "#3498db", "#2980b9", self.load_dashboard))
+        layout.addLayout(toolbar)
+        
+        cards = QHBoxLayout()
+        self.dashboard_cards = {}
+        for key, title in (("orders", "订单数"), ("units", "售出件数"), ("revenue", "销售额"),
+                           ("points_issued", "发放积分"), ("points_spent", "消耗积分"),
+                           ("revenue_all_time", "累计销售额")):
+            box = QGroupBox(title)
+            box_layout = QVBoxLayout()
+            value = QLabel("-")
+            value.setStyleSheet("font-size: 20px; font-weight: bold; color: #2c3e50;")
+            value.setAlignment(Qt.AlignCenter)
+            box_layout.addWidget(value)
+            box.setLayout(box_layout)
+            cards.addWidget(box)
+            self.dashboard_cards[key] = value
+        layout.addLayout(cards)
+        
+        tables = QHBoxLayout()
+        self.daily_table = self._create_dashboard_table(["日期", "订单", "件数", "销售额", "发放积分", "消耗积分"])
+        self.top_products_table = self._create_dashboard_table(["商品", "件数", "销售额"])
+        self.categories_table = self._create_dashboard_table(["分类", "件数", "销售额"])
+        for title, table in (("每日统计", self.daily_table), ("热销商品", self.top_products_table),
+                             ("分类销售", self.categories_table)):
+            box = QGroupBox(title)
+            box_layout = QVBoxLayout()
+            box_layout.addWidget(table)
+            box.setLayout(box_layout)
+            tables.addWidget(box)
+        layout.addLayout(tables)
+        self.dashboard_tab.setLayout(layout)
+
+    def _create_dashboard_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        return table
+
+    def _fill_dashboard_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                text = f"{value:g}" if isinstance(value, float) else str(value)
+                table.setItem(row, column, QTableWidgetItem(text))
+
+    def load_dashboard(self):
+        self.tasks.submit("dashboard", get_dashboard, on_result=self._show_dashboard,
+                          on_error=lambda e: self._show_load_error(str(e)))
+
+    def _show_dashboard(self, data):
+        for key, label in self.dashboard_cards.items():
+            value = data["totals"][key]
+            label.setText(f"{value:g}" if isinstance(value, float) else str(value))
+        points = {day: (issued, spent) for day, issued, spent in data["points"]}
+        days = sorted({row[0] for row in data["daily"]} | set(points), reverse=True)
+        sales = {row[0]: row[1:] for row in data["daily"]}
+        self._fill_dashboard_table(self.daily_table, [
+            (day.isoformat(), *sales.get(day, (0, 0, 0)), *points.get(day, (0, 0))) for day in days])
+        self._fill_dashboard_table(self.top_products_table,
+                                   [(name, units, revenue) for _, name, units, revenue in data["top_products"]])
+        self._fill_dashboard_table(self.categories_table, data["categories"])
+
     def init_users_tab(self):
         layout = QVBoxLayout()
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.users_widget = QWidget()
-        self.users_layout = QVBoxLayout()
-        self.users_widget.setLayout(self.users_layout)
-        scroll.setWidget(self.users_widget)
-        layout.addWidget(scroll)
-        layout.addStretch()
+        
+        toolbar = QHBoxLayout()
+        self.user_search_input = QLineEdit()
+        self.user_search_input.setPlaceholderText("按用户名搜索")
+        toolbar.addWidget(self.user_search_input)
+        self.users_count_label = QLabel()
+        toolbar.addWidget(self.users_count_label)
+        toolbar.addStretch()
+        toolbar.addWidget(self._create_action_button(
+            "封禁/解禁", "#e74c3c", "#c0392b",
+            lambda: self._with_selected_user(self.ban_user_dialog)))
+        toolbar.addWidget(self._create_action_button(
+            "修改点数", "#2ecc71", "#27ae60",
+            lambda: self._with_selected_user(self.modify_user_points_dialog)))
+        toolbar.addWidget(self._create_action_button(
+            "删除用户", "#e74c3c", "#c0392b",
+            lambda: self._with_selected_user(self.delete_user_dialog)))
+        layout.addLayout(toolbar)
+        
+        self.users_model = UserTableModel(self)
+        self.users_table, self.users_proxy = self._create_table_view(self.users_model)
+        self.user_search_input.textChanged.connect(self.users_proxy.setFilterFixedString)
+        self.users_model.loaded.connect(self._update_users_count)
+        self.users_model.load_failed.connect(self._show_load_error)
+        layout.addWidget(self.users_table)
+        
         if self.main_window.current_user and getattr(self.main_window.current_user, 'is_admin', False):
             add_admin_button = QPushButton("增加管理员账号")
             add_admin_button.setStyleSheet("background-color: #007bff; color: white; border-radius: 6px;")
@@ -270,29 +432,55 @@ class AdminView(QWidget):
 
     def init_products_tab(self):
         layout = QVBoxLayout()
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.products_widget = QWidget()
-        self.products_layout = QVBoxLayout()
-        self.products_widget.setLayout(self.products_layout)
-        scroll.setWidget(self.products_widget)
-        layout.addWidget(scroll)
+        
+        toolbar = QHBoxLayout()
+        self.product_search_input = QLineEdit()
+        self.product_search_input.setPlaceholderText("按商品名搜索")
+        toolbar.addWidget(self.product_search_input)
+        self.products_count_label = QLabel()
+        toolbar.addWidget(self.products_count_label)
+        toolbar.addStretch()
+        toolbar.addWidget(self._create_action_button(
+            "编辑", "#3498db", "#2980b9", self._edit_selected_product))
+        toolbar.addWidget(self._create_action_button(
+            "删除", "#e74c3c", "#c0392b", self._delete_selected_product))
+        layout.addLayout(toolbar)
+        
+        self.products_model = ProductTableModel(self)
+        self.products_table, self.products_proxy = self._create_table_view(self.products_model)
+        self.product_search_input.textChanged.connect(self.products_proxy.setFilterFixedString)
+        self.products_model.loaded.connect(self._update_products_count)
+        self.products_model.load_failed.connect(self._show_load_error)
+        self.products_table.doubleClicked.connect(self._edit_selected_product)
+        layout.addWidget(self.products_table)
         self.products_tab.setLayout(layout)
 
     def init_orders_tab(self):
         layout = QVBoxLayout()
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.orders_widget = QWidget()
-        self.orders_layout = QVBoxLayout()
-        self.orders_widget.setLayout(self.orders_layout)
-        scroll.setWidget(self.orders_widget)
-        layout.addWidget(scroll)
+        
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(QLabel("状态:"))
+        self.order_status_filter = QComboBox()
+        self.order_status_filter.addItem("全部", None)
+        for status in ("pending", "completed", "cancelled", "待发货"):
+            self.order_status_filter.addItem(status, status)
+        self.order_status_filter.currentIndexChanged.connect(
+            lambda _: self.orders_model.set_filter("status", self.order_status_filter.currentData()))
+        toolbar.addWidget(self.order_status_filter)
+        self.orders_count_label = QLabel()
+        toolbar.addWidget(self.orders_count_label)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+        
+        self.orders_model = OrderTableModel(self)
+        self.orders_table, self.orders_proxy = self._create_table_view(self.orders_model)
+        self.orders_model.loaded.connect(self._update_orders_count)
+        self.orders_model.load_failed.connect(self._show_load_error)
+        layout.addWidget(self.orders_table)
         self.orders_tab.setLayout(layout)
 
     def load_data(self):
+        self.load_dashboard()
         self.load_users()
         self.load_products()
         self.load_orders()
@@ -301,169 +489,40 @@ class AdminView(QWidget):
         self.session.close()
         from database.db_init import SessionLocal
         self.session = SessionLocal()
-        while self.users_layout.count():
-            item = self.users_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        users = get_all_users()
-        if not users:
-            empty_label = QLabel("暂无用户")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("font-size: 16px; color: #666;")
-            self.users_layout.addWidget(empty_label)
-            return
-        for user in users:
-            user_frame = self.create_user_frame(user)
-            self.users_layout.addWidget(user_frame)
-        self.users_layout.addStretch()
+        self.users_model.reload()
 
     def load_products(self):
-        while self.products_layout.count():
-            item = self.products_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        products = get_all_products()
-        if not products:
-            empty_label = QLabel("暂无商品")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("font-size: 16px; color: #666;")
-            self.products_layout.addWidget(empty_label)
-            return
-        for product in products:
-            product_frame = self.create_product_frame(product)
-            self.products_layout.addWidget(product_frame)
-        self.products_layout.addStretch()
+        self.products_model.reload()
 
     def load_orders(self):
-        while self.orders_layout.count():
-            item = self.orders_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        orders = get_all_orders()
-        if not orders:
-            empty_label = QLabel("暂无订单")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("font-size: 16px; color: #666;")
-            self.orders_layout.addWidget(empty_label)
-            return
-        for order in orders:
-            order_frame = self.create_order_frame(order)
-            self.orders_layout.addWidget(order_frame)
-        self.orders_layout.addStretch()
-
-    def create_user_frame(self, user):
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.StyledPanel)
-        frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                margin: 5px;
-            }
-            QFrame:hover {
-                border-color: #007bff;
-                box-shadow: 0 0 5px rgba(0,123,255,0.3);
-            }
-        """)
-        
-        layout = QHBoxLayout()
-        layout.setSpacing(15)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(8)
-        
-        name_label = QLabel(f"用户名: {user.username}")
-        name_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #212529;")
-        info_layout.addWidget(name_label)
-        
-        # 显示用户类型和显示名称
-        if hasattr(user, 'user_type') and user.user_type:
-            user_type_display = user.get_type_display() if hasattr(user, 'get_type_display') else str(user.user_type)
-            type_label = QLabel(f"类型: {user_type_display}")
-            type_label.setStyleSheet("font-size: 13px; color: #007bff; font-weight: bold;")
-            info_layout.addWidget(type_label)
-            
-            if user.display_name:
-                display_name_label = QLabel(f"显示名称: {user.display_name}")
-                display_name_label.setStyleSheet("font-size: 12px; color: #6c757d;")
-                info_layout.addWidget(display_name_label)
-        
-        email_label = QLabel(f"邮箱: {user.email}")
-        email_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-        info_layout.addWidget(email_label)
-        
-        points_label = QLabel(f"积分: {user.points}")
-        points_label.setStyleSheet("font-size: 14px; color: #28a745; font-weight: bold;")
-        info_layout.addWidget(points_label)
-        
-        # 显示使用的邀请码
-        if hasattr(user, 'invite_code_used') and user.invite_code_used:
-            invite_label = QLabel(f"邀请码: {user.invite_code_used}")
-            invite_label.setStyleSheet("font-size: 12px; color: #ffc107;")
-            info_layout.addWidget(invite_label)
-        
-        layout.addLayout(info_layout)
-        
-        button_layout = QVBoxLayout()
-        button_layout.setSpacing(8)
-        
-        ban_button = QPushButton("解禁账号" if user.is_banned else "封禁账号")
-        ban_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
-        ban_button.clicked.connect(lambda: self.ban_user_dialog(user))
-        button_layout.addWidget(ban_button)
-        
-        modify_points_button = QPushButton("修改点数")
-        modify_points_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71;
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-        """)
-        modify_points_button.clicked.connect(lambda: self.modify_user_points_dialog(user))
-        button_layout.addWidget(modify_points_button)
-        
-        # 新增：删除用户按钮
-        delete_user_button = QPushButton("删除用户")
-        delete_user_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
-        delete_user_button.clicked.connect(lambda: self.delete_user_dialog(user))
-        button_layout.addWidget(delete_user_button)
-        
-        layout.addLayout(button_layout)
-        frame.setLayout(layout)
-        return frame
+        self.orders_model.reload()
+
+    def _update_users_count(self):
+        self.users_count_label.setText(f"共 {self.users_model.total_count()} 个用户")
+
+    def _update_products_count(self):
+        self.products_count_label.setText(f"共 {self.products_model.total_count()} 件商品")
+
+    def _update_orders_count(self):
+        self.orders_count_label.setText(f"共 {self.orders_model.total_count()} 个订单")
+
+    def _show_load_error(self, message):
+        QMessageBox.warning(self, "错误", f"加载数据失败: {message}")
+
+    def _with_selected_user(self, action):
+        user = self._selected_object(self.users_table, self.users_proxy)
+        if user is not None:
+            action(user)
+
+    def _edit_selected_product(self, *_):
+        product = self._selected_object(self.products_table, self.products_proxy)
+        if product is not None:
+            self.show_edit_product_dialog(product)
+
+    def _delete_selected_product(self):
+        product = self._selected_object(self.products_table, self.products_proxy)
+        if product is not None:
+            self.delete_product(product.id)
 
     def ban_user_dialog(self, user):
         action = "解禁" if user.is_banned else "封禁"
@@ -476,9 +535,10 @@ class AdminView(QWidget):
         )
         if reply == QMessageBox.Yes:
             try:
-                user.is_banned = not user.is_banned
-                self.session.commit()
-                self.session.expire_all()
+                success, message = ban_user(user.id)
+                if not success:
+                    QMessageBox.warning(self, "错误", message)
+                    return
                 QMessageBox.information(self, "成功", f"用户 {user.username} 已{action}")
                 self.load_users()
             except Exception as e:
@@ -496,8 +556,10 @@ class AdminView(QWidget):
         )
         if ok:
             try:
-                db_user.points = points
-                self.session.commit()
+                success, message = update_user_points(db_user.id, points)
+                if not success:
+                    QMessageBox.warning(self, "错误", message)
+                    return
                 self.session.expire_all()
                 QMessageBox.information(self, "成功", f"用户 {db_user.username} 的商店点数已修改为 {points}")
                 self.load_users()
@@ -526,156 +588,6 @@ class AdminView(QWidget):
             except Exception as e:
                 QMessageBox.warning(self, "错误", f"删除用户失败: {str(e)}")
 
-    def create_product_frame(self, product):
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.StyledPanel)
-        frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                margin: 5px;
-            }
-            QFrame:hover {
-                border-color: #007bff;
-                box-shadow: 0 0 5px rgba(0,123,255,0.3);
-            }
-        """)
-        
-        layout = QHBoxLayout()
-        layout.setSpacing(15)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(8)
-        
-        name_label = QLabel(product.name)
-        name_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #212529;")
-        info_layout.addWidget(name_label)
-        
-        desc_label = QLabel(product.description)
-        desc_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-        info_layout.addWidget(desc_label)
-        
-        price_label = QLabel(f"价格: {product.price} 积分")
-        price_label.setStyleSheet("font-size: 14px; color: #28a745; font-weight: bold;")
-        info_layout.addWidget(price_label)
-        
-        stock_label = QLabel(f"库存: {product.stock}")
-        stock_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-        info_layout.addWidget(stock_label)
-        
-        layout.addLayout(info_layout)
-        
-        button_layout = QVBoxLayout()
-        button_layout.setSpacing(8)
-            
-        edit_button = QPushButton("编辑")
-        edit_button.clicked.connect(lambda: self.show_edit_product_dialog(product))
-        button_layout.addWidget(edit_button)
-            
-        delete_button = QPushButton("删除")
-        delete_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                padding: 6px 12px;
-                border-radius: 4px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
-        delete_button.clicked.connect(lambda: self.delete_product(product.id))
-        button_layout.addWidget(delete_button)
-            
-        layout.addLayout(button_layout)
-        frame.setLayout(layout)
-        return frame
-
-    def create_order_frame(self, order):
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.StyledPanel)
-        frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                margin: 5px;
-            }
-            QFrame:hover {
-                border-color: #007bff;
-                box-shadow: 0 0 5px rgba(0,123,255,0.3);
-            }
-        """)
-        
-        layout = QVBoxLayout()
-        layout.setSpacing(12)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        header_layout = QHBoxLayout()
-        header_layout.setSpacing(15)
-        
-        order_id_label = QLabel(f"订单号: {order.id}")
-        order_id_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #212529;")
-        header_layout.addWidget(order_id_label)
-        
-        user_label = QLabel(f"用户: {order.user.username}")
-        user_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-        header_layout.addWidget(user_label)
-        
-        date_label = QLabel(f"下单时间: {order.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        date_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-        header_layout.addWidget(date_label)
-        
-        status_label = QLabel(f"状态: {order.status}")
-        status_label.setStyleSheet("font-size: 14px; color: #28a745; font-weight: bold;")
-        header_layout.addWidget(status_label)
-        
-        layout.addLayout(header_layout)
-        
-        for item in order.items:
-            item_frame = QFrame()
-            item_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #f8f9fa;
-                    border-radius: 4px;
-                    padding: 8px;
-                }
-            """)
-            
-            item_layout = QHBoxLayout()
-            item_layout.setSpacing(10)
-            
-            name_label = QLabel(item["name"])
-            name_label.setStyleSheet("font-size: 14px; color: #212529;")
-            item_layout.addWidget(name_label)
-            
-            price_label = QLabel(f"单价: {item['price']} 积分")
-            price_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-            item_layout.addWidget(price_label)
-            
-            quantity_label = QLabel(f"数量: {item['quantity']}")
-            quantity_label.setStyleSheet("font-size: 14px; color: #6c757d;")
-            item_layout.addWidget(quantity_label)
-            
-            subtotal_label = QLabel(f"小计: {item['price'] * item['quantity']} 积分")
-            subtotal_label.setStyleSheet("font-size: 14px; color: #28a745; font-weight: bold;")
-            item_layout.addWidget(subtotal_label)
-            
-            item_frame.setLayout(item_layout)
-            layout.addWidget(item_frame)
-        
-        total_label = QLabel(f"总计: {order.total_points} 积分")
-        total_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #28a745;")
-        total_label.setAlignment(Qt.AlignRight)
-        layout.addWidget(total_label)
-        
-        frame.setLayout(layout)
-        return frame
-
     def show_add_product_dialog(self):
         dialog = AddProductDialog(self)
         if dialog.exec_() == QDialog.Accepted:
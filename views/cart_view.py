@@ -3,14 +3,16 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QSpinBox)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon, QFont, QPixmap
-from database.db_operations import get_cart_items, update_cart_item, remove_from_cart, create_order
+from database.db_operations import get_cart_items, update_cart_item, remove_from_cart, create_order, get_user_by_id
 from resources.icons import get_app_icon, get_icon
 from utils.language_manager import language_manager
+from utils.workers import TaskRunner
 
 class CartView(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.tasks = TaskRunner(self)
         self.setWindowIcon(get_app_icon())
         self.init_ui()
 
@@ -154,13 +156,13 @@ class CartView(QWidget):
         header_layout = QHBoxLayout(header_frame)
         header_layout.setContentsMargins(20, 15, 20, 15)
         
-        self.back_button = QPushButton(get_icon("back"), language_manager.get_text('back'))
+        self.back_button = language_manager.bind(QPushButton(get_icon("back"), ""), 'back')
         self.back_button.clicked.connect(self.main_window.show_home)
         header_layout.addWidget(self.back_button)
         
         header_layout.addStretch()
         
-        self.title = QLabel(language_manager.get_text('cart_title'))
+        self.title = language_manager.bind(QLabel(), 'cart_title')
         self.title.setObjectName("title")
         self.title.setAlignment(Qt.AlignCenter)
         header_layout.addWidget(self.title)
@@ -203,7 +205,7 @@ class CartView(QWidget):
         
         total_layout.addStretch()
         
-        self.checkout_button = QPushButton(get_icon("checkmark"), language_manager.get_text('checkout'))
+        self.checkout_button = language_manager.bind(QPushButton(get_icon("checkmark"), ""), 'checkout')
         self.checkout_button.setObjectName("checkout_btn")
         self.checkout_button.clicked.connect(self.checkout)
         total_layout.addWidget(self.checkout_button)
@@ -214,16 +216,25 @@ class CartView(QWidget):
         self.setLayout(main_layout)
 
     def load_cart_items(self):
-        # 清空现有项目
+        """在后台线程查询购物车，查询完成后再重建列表"""
+        if not self.main_window.current_user:
+            self.tasks.cancel("cart")
+            self._clear_cart_items()
+            return
+        
+        self.tasks.submit("cart", get_cart_items, self.main_window.current_user.id,
+                          on_result=self._show_cart_items,
+                          on_error=lambda e: QMessageBox.warning(self, language_manager.get_text('error'), str(e)))
+
+    def _clear_cart_items(self):
         while self.cart_layout.count():
             item = self.cart_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
-        
-        if not self.main_window.current_user:
-            return
-        
-        cart_items = get_cart_items(self.main_window.current_user.id)
+
+    def _show_cart_items(self, cart_items):
+        # 清空现有项目
+        self._clear_cart_items()
         
         if not cart_items:
             self.empty_label = QLabel(language_manager.get_text('empty_cart'))
@@ -346,23 +357,18 @@ class CartView(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                success, message = create_order(self.main_window.current_user.id)
-                if success:
-                    QMessageBox.information(self, language_manager.get_text('success'), language_manager.get_text('order_created_success'))
-                    self.load_cart_items()
-                    # Update user points display
-                    self.main_window.current_user = get_user_by_username(self.main_window.current_user.username)
-                else:
-                    QMessageBox.warning(self, language_manager.get_text('error'), message)
+                create_order(self.main_window.current_user.id)
+                QMessageBox.information(self, language_manager.get_text('success'), language_manager.get_text('order_created_success'))
+                self.load_cart_items()
+                # Update user points display
+                self.main_window.current_user = get_user_by_id(self.main_window.current_user.id)
+            except ValueError as e:
+                # 库存不足、积分不足等业务错误，订单已整体回滚
+                QMessageBox.warning(self, language_manager.get_text('error'), str(e))
             except Exception as e:
                 QMessageBox.warning(self, language_manager.get_text('error'), f"{language_manager.get_text('create_order_failed')}: {str(e)}")
     
     def update_language(self):
         """Update language"""
-        # Update button and label text
-        self.back_button.setText(language_manager.get_text('back'))
-        self.title.setText(language_manager.get_text('cart_title'))
-        self.checkout_button.setText(language_manager.get_text('checkout'))
-        
-        # Reload cart items to update text
+        # Static text is bound to language_manager; reload cart items to update their text
         self.load_cart_items()
\ No newline at end of file
@@ -5,7 +5,9 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon, QPixmap, QPainter, QBrush, QLinearGradient, QColor
 from utils.csgo_server import CSGOServer
+from utils.server_poller import server_poller
 import threading
+from datetime import datetime
 from resources.icons import get_app_icon, get_icon
 from utils.language_manager import language_manager
 
@@ -44,6 +46,12 @@ class CSGOServerView(QWidget):
         self.main_window = main_window
         self.query_thread = None
         self.server_list = []  # 存储添加的服务器列表
+        # 服务器卡片上的状态标签：id(server_info) -> (server_info, QLabel)
+        self.status_labels = {}
+        # 服务器状态由共享的轮询器定时刷新，页面只读取它的缓存
+        self.poller = server_poller()
+        self.poller.updated.connect(self.on_servers_polled)
+        self.poller.poll_failed.connect(self.on_poll_failed)
         
         # 添加固定的Hurricane服务器（不可删除）
         self.init_default_servers()
@@ -432,11 +440,16 @@ class CSGOServerView(QWidget):
         self.query_button.setObjectName("query_button")
         self.query_button.clicked.connect(self.query_server)
         
+        self.refresh_all_button = QPushButton(f"🔄 {language_manager.get_text('refresh_all_servers')}")
+        self.refresh_all_button.setObjectName("refresh_all_button")
+        self.refresh_all_button.clicked.connect(self.refresh_all_servers)
+        
         self.clear_button = QPushButton(f"🗑️ {language_manager.get_text('clear_results')}")
         self.clear_button.setObjectName("clear_button")
         self.clear_button.clicked.connect(self.clear_results)
         
         button_layout.addWidget(self.query_button)
+        button_layout.addWidget(self.refresh_all_button)
         button_layout.addWidget(self.clear_button)
         button_layout.addStretch()
         query_layout.addLayout(button_layout)
@@ -569,6 +582,10 @@ class CSGOServerView(QWidget):
             status_label = QLabel(f"📊 {language_manager.get_text('status')}: {language_manager.get_text('online')} | {language_manager.get_text('players')}: {server_info.get('players', 0)}/{server_info.get('max_players', 0)}")
         status_label.setStyleSheet("color: #718096; font-size: 14px;")
         name_status_layout.addWidget(status_label)
+        if server_info.get('is_custom'):
+            self.status_labels[id(server_info)] = (server_info, status_label)
+            self.poller.watch((server_info['ip'], server_info['port']))
+            self.apply_snapshot(server_info)
         
         header_layout.addLayout(name_status_layout)
         header_layout.addStretch()
@@ -694,7 +711,7 @@ class CSGOServerView(QWidget):
                 try:
                     webbrowser.open(steam_url)
                     QMessageBox.information(self, language_manager.get_text('success'), language_manager.get_text('steam_connect_sent'))
-                except Exception as e:
+                except Exception:
                     # 如果webbrowser失败，尝试使用subprocess
                     try:
                         subprocess.run(['start', steam_url], shell=True, check=True)
@@ -717,6 +734,8 @@ class CSGOServerView(QWidget):
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.server_list.remove(server_info)
+            self.status_labels.pop(id(server_info), None)
+            self.unwatch_server(server_info)
             card_frame.deleteLater()
             self.update_empty_state()
     
@@ -733,6 +752,15 @@ class CSGOServerView(QWidget):
             QMessageBox.warning(self, language_manager.get_text('warning'), language_manager.get_text('invalid_address_format'))
             return
         
+        # 轮询器里有足够新的结果时直接使用，不再访问网络
+        if self.poller.is_fresh(address):
+            snapshot = self.poller.snapshot(address)
+            if snapshot['info']:
+                self.on_query_success(snapshot['info'], snapshot['updated_at'])
+            else:
+                self.on_query_error(language_manager.get_text('server_connection_failed'))
+            return
+        
         # 开始查询
         self.query_button.setEnabled(False)
         self.progress_bar.setVisible(True)
@@ -745,8 +773,83 @@ class CSGOServerView(QWidget):
         self.query_thread.finished.connect(self.on_query_finished)
         self.query_thread.start()
     
-    def on_query_success(self, result):
+    def showEvent(self, event):
+        """进入页面时先显示缓存的状态，再确保轮询器在运行"""
+        super().showEvent(event)
+        for server_info, _ in self.status_labels.values():
+            self.apply_snapshot(server_info)
+        if not self.poller.is_active():
+            self.poller.start()
+    
+    def unwatch_server(self, server_info):
+        """没有其他卡片使用同一地址时，取消轮询该服务器"""
+        address = (server_info['ip'], server_info['port'])
+        if not any((info['ip'], info['port']) == address for info, _ in self.status_labels.values()):
+            self.poller.unwatch(address)
+    
+    def refresh_all_servers(self):
+        """立即让轮询器查询全部服务器（并发查询，只等待一个超时窗口）"""
+        if not self.status_labels:
+            return
+        for server_info, _ in self.status_labels.values():
+            server_info['status'] = language_manager.get_text('querying')
+            self.update_server_status(server_info)
+        self.refresh_all_button.setEnabled(False)
+        # 上一轮还在进行时不重复查询，等它结束即可
+        self.poller.refresh()
+    
+    def on_servers_polled(self, addresses):
+        """轮询器完成一轮查询后刷新服务器卡片"""
+        for server_info, _ in self.status_labels.values():
+            self.apply_snapshot(server_info)
+        self.refresh_all_button.setEnabled(True)
+    
+    def on_poll_failed(self, error):
+        """一轮查询失败或被取消：有缓存的服务器恢复缓存状态，其余显示连接失败"""
+        for server_info, _ in self.status_labels.values():
+            if self.poller.snapshot((server_info['ip'], server_info['port'])) is not None:
+                self.apply_snapshot(server_info)
+            elif server_info['status'] == language_manager.get_text('querying'):
+                server_info['status'] = language_manager.get_text('server_connection_failed')
+                self.update_server_status(server_info)
+        self.refresh_all_button.setEnabled(True)
+    
+    def apply_snapshot(self, server_info):
+        """用轮询器缓存的快照更新服务器信息和卡片"""
+        snapshot = self.poller.snapshot((server_info['ip'], server_info['port']))
+        if snapshot is None:
+            return
+        result = snapshot['info']
+        if result:
+            server_info['status'] = language_manager.get_text('online')
+            server_info['players'] = result.get('玩家数量', 0)
+            server_info['max_players'] = result.get('最大玩家数', 0)
+            server_info['ping'] = result.get('延迟', 0)
+            server_info['map'] = result.get('地图', 'Unknown')
+        else:
+            server_info['status'] = language_manager.get_text('offline')
+        server_info['query_time'] = datetime.fromtimestamp(snapshot['updated_at']).strftime("%H:%M:%S")
+        self.update_server_status(server_info)
+    
+    def update_server_status(self, server_info):
+        """刷新服务器卡片上的状态标签"""
+        entry = self.status_labels.get(id(server_info))
+        if entry is None:
+            return
+        text = f"📍 {language_manager.get_text('type')}: {server_info['type']} | {language_manager.get_text('status')}: {server_info['status']}"
+        if server_info['status'] == language_manager.get_text('online'):
+            text += (f" | {language_manager.get_text('players')}: {server_info['players']}/{server_info['max_players']}"
+                     f" | {language_manager.get_text('map')}: {server_info['map']}"
+                     f" | {language_manager.get_text('ping')}: {server_info['ping']}ms")
+        if server_info.get('query_time'):
+            text += f" | {language_manager.get_text('query_time')}: {server_info['query_time']}"
+        entry[1].setText(text)
+    
+    def on_query_success(self, result, updated_at=None):
         """Query success callback"""
+        if updated_at is None:
+            self.poller.record((result.get('IP地址'), result.get('端口')), result)
+            updated_at = datetime.now().timestamp()
         # 将中文键名映射为英文键名，以匹配add_server_card的期望格式
         server_info = {
             'name': result.get('服务器名称', language_manager.get_text('unknown_server')),
@@ -762,8 +865,7 @@ class CSGOServerView(QWidget):
             'player_list': result.get('玩家列表', [])
         }
         
-        from datetime import datetime
-        server_info['query_time'] = datetime.now().strftime("%H:%M:%S")
+        server_info['query_time'] = datetime.fromtimestamp(updated_at).strftime("%H:%M:%S")
         server_info['is_custom'] = False
         
         self.add_server_card(server_info)
@@ -788,6 +890,10 @@ class CSGOServerView(QWidget):
         if reply == QMessageBox.Yes:
             # 清空服务器列表
             self.server_list.clear()
+            for server_info, _ in list(self.status_labels.values()):
+                self.poller.unwatch((server_info['ip'], server_info['port']))
+            self.status_labels.clear()
+            self.refresh_all_button.setEnabled(True)
             
             # 移除所有卡片
             while self.results_layout.count() > 1:
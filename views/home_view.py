@@ -1,14 +1,21 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QScrollArea, QFrame, QMessageBox)
-from PyQt5.QtCore import Qt
+                             QPushButton, QListView, QAbstractItemView, QFrame, QMessageBox,
+                             QLineEdit, QComboBox)
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPixmap, QIcon, QFont
-from database.db_operations import get_products, add_to_cart
+from database.db_operations import add_to_cart, get_search_facets
 from utils.language_manager import language_manager
+from utils.workers import TaskRunner
+from .product_list import ProductListModel, ProductCardDelegate
 
 class HomeView(QWidget):
+    # 停止输入这么久之后才搜索
+    SEARCH_DELAY_MS = 300
+
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.tasks = TaskRunner(self)
         self.init_ui()
 
     def init_ui(self):
@@ -54,21 +61,20 @@ class HomeView(QWidget):
                 border: 2px solid rgba(255,255,255,0.3);
                 box-shadow: 0 15px 35px rgba(0,0,0,0.08);
             }
-            QFrame#product_card {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255,255,255,0.98), 
-                    stop:1 rgba(248,250,252,0.95));
-                border-radius: 15px;
-                border: 2px solid rgba(255,255,255,0.5);
-                margin: 10px;
-                box-shadow: 0 8px 25px rgba(0,0,0,0.06);
+            QLineEdit#search_input, QComboBox#category_filter {
+                background: white;
+                font-size: 14px;
+                padding: 8px 12px;
+                border-radius: 8px;
+                border: 1px solid #ddd;
             }
-            QFrame#product_card:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(255,255,255,1), 
-                    stop:1 rgba(248,250,252,1));
-                border: 2px solid rgba(102,126,234,0.4);
-                box-shadow: 0 15px 40px rgba(102,126,234,0.15);
+            QLineEdit#search_input:focus {
+                border: 1px solid #667eea;
+            }
+            QListView#product_list {
+                background: transparent;
+                border: none;
+                outline: none;
             }
             QPushButton {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
@@ -85,35 +91,6 @@ class HomeView(QWidget):
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                     stop:0 #5a6fd8, stop:1 #6a4190);
             }
-            QPushButton#add_cart_btn {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #4CAF50, stop:1 #45a049);
-            }
-            QPushButton#add_cart_btn:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #45a049, stop:1 #3d8b40);
-            }
-            QLabel#title {
-                font-size: 20px;
-                font-weight: bold;
-                color: #333;
-                margin-bottom: 8px;
-            }
-            QLabel#desc {
-                color: #666;
-                font-size: 14px;
-                margin-bottom: 10px;
-            }
-            QLabel#price {
-                color: #e74c3c;
-                font-size: 18px;
-                font-weight: bold;
-                margin-bottom: 5px;
-            }
-            QLabel#stock {
-                color: #2196F3;
-                font-size: 13px;
-            }
             QLabel#user_info {
                 font-size: 16px;
                 color: #333;
@@ -144,10 +121,6 @@ class HomeView(QWidget):
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                     stop:0 #5a6fd8, stop:1 #6a4190);
             }
-            QScrollArea {
-                border: none;
-                background: transparent;
-            }
         """
 
     def _create_nav_frame(self):
@@ -196,25 +169,25 @@ class HomeView(QWidget):
         button_layout.setSpacing(10)
         
         # 购物车按钮
-        self.cart_button = QPushButton(language_manager.get_text('cart'))
+        self.cart_button = language_manager.bind(QPushButton(), 'cart')
         self.cart_button.setIcon(QIcon("assets/icons/cart.ico"))
         self.cart_button.clicked.connect(self.main_window.show_cart)
         button_layout.addWidget(self.cart_button)
         
         # 个人中心按钮
-        self.profile_button = QPushButton(language_manager.get_text('profile'))
+        self.profile_button = language_manager.bind(QPushButton(), 'profile')
         self.profile_button.setIcon(QIcon("assets/icons/user.ico"))
         self.profile_button.clicked.connect(self.main_window.show_profile)
         button_layout.addWidget(self.profile_button)
         
         # CSGO服务器查询按钮
-        self.csgo_button = QPushButton(language_manager.get_text('csgo_server'))
+        self.csgo_button = language_manager.bind(QPushButton(), 'csgo_server')
         self.csgo_button.setIcon(QIcon("assets/icons/settings.ico"))
         self.csgo_button.clicked.connect(self.main_window.show_csgo_server)
         button_layout.addWidget(self.csgo_button)
         
         # 管理员按钮
-        self.admin_button = QPushButton(language_manager.get_text('admin'))
+        self.admin_button = language_manager.bind(QPushButton(), 'admin')
         self.admin_button.setObjectName("admin_button")
         self.admin_button.setIcon(QIcon("assets/icons/admin.ico"))
         self.admin_button.setVisible(False)
@@ -222,7 +195,7 @@ class HomeView(QWidget):
         button_layout.addWidget(self.admin_button)
         
         # 退出登录按钮
-        self.logout_button = QPushButton(language_manager.get_text('logout'))
+        self.logout_button = language_manager.bind(QPushButton(), 'logout')
         self.logout_button.setIcon(QIcon("assets/icons/logout.ico"))
         self.logout_button.clicked.connect(self.main_window.logout)
         button_layout.addWidget(self.logout_button)
@@ -235,25 +208,58 @@ class HomeView(QWidget):
         content_layout = QVBoxLayout(content_frame)
         content_layout.setContentsMargins(20, 20, 20, 20)
         
-        # 滚动区域
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        
-        self.products_widget = QWidget()
-        self.products_layout = QVBoxLayout()
-        self.products_widget.setLayout(self.products_layout)
-        scroll.setWidget(self.products_widget)
-        
-        content_layout.addWidget(scroll)
+        # 搜索栏：停止输入后再搜索，分类下拉框显示各分类的结果数
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("search_input")
+        language_manager.bind(self.search_input, 'search_products_placeholder', 'setPlaceholderText')
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self._schedule_search)
+        self.search_input.returnPressed.connect(self.search_products)
+        search_layout.addWidget(self.search_input)
+        
+        self.category_filter = QComboBox()
+        self.category_filter.setObjectName("category_filter")
+        self.category_filter.setVisible(False)
+        self.category_filter.activated.connect(self._apply_search)
+        search_layout.addWidget(self.category_filter)
+        content_layout.addLayout(search_layout)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.search_products)
+        
+        # 商品列表：模型按页懒加载，委托只绘制可见的卡片
+        self.product_model = ProductListModel(self)
+        self.product_model.search_loaded.connect(self._on_search_loaded)
+        self.product_delegate = ProductCardDelegate(self)
+        self.product_delegate.add_to_cart_requested.connect(self.add_to_cart)
+        
+        self.product_list = QListView()
+        self.product_list.setObjectName("product_list")
+        self.product_list.setModel(self.product_model)
+        self.product_list.setItemDelegate(self.product_delegate)
+        self.product_list.setUniformItemSizes(True)
+        self.product_list.setMouseTracking(True)
+        self.product_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.product_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.product_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.product_list.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        content_layout.addWidget(self.product_list)
+        
+        # 无商品提示
+        self.empty_label = QLabel(language_manager.get_text('no_products'))
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.empty_label.setStyleSheet("font-size: 18px; color: #666; margin: 50px;")
+        self.empty_label.setVisible(False)
+        content_layout.addWidget(self.empty_label)
         
         return content_frame
 
     def load_products(self):
         """加载商品并更新用户信息"""
         self._update_user_info()
-        self._clear_products()
         self._load_product_list()
 
     def _update_user_info(self):
@@ -267,93 +273,63 @@ class HomeView(QWidget):
             if hasattr(self.main_window.current_user, 'is_admin') and self.main_window.current_user.is_admin:
                 self.admin_button.setVisible(True)
 
-    def _clear_products(self):
-        """清空现有商品显示"""
-        while self.products_layout.count():
-            item = self.products_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
     def _load_product_list(self):
-        """加载商品列表"""
-        products = get_products()
-        if not products:
-            self._show_empty_message()
-            return
-        
-        for product in products:
-            product_frame = self.create_product_frame(product)
-            self.products_layout.addWidget(product_frame)
-        
-        self.products_layout.addStretch()
+        """加载商品列表（已加载过时只就地刷新库存）"""
+        self.product_model.refresh()
+        # 搜索结果在后台加载，返回后由 _on_search_loaded 更新提示
+        if not self.product_model.is_searching():
+            self._show_empty_message(self.product_model.rowCount() == 0)
 
-    def _show_empty_message(self):
-        """显示无商品提示"""
-        empty_label = QLabel("暂无商品")
-        empty_label.setAlignment(Qt.AlignCenter)
-        empty_label.setStyleSheet("font-size: 18px; color: #666; margin: 50px;")
-        self.products_layout.addWidget(empty_label)
+    def _schedule_search(self):
+        """输入变化时重新计时，连续输入只搜索一次"""
+        self.search_timer.start()
 
-    def create_product_frame(self, product):
-        """创建商品展示框架"""
-        frame = QFrame()
-        frame.setObjectName("product_card")
-        
-        layout = QHBoxLayout(frame)
-        layout.setSpacing(20)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        # 商品信息
-        info_layout = self._create_product_info(product)
-        layout.addLayout(info_layout)
-        layout.addStretch()
-        
-        # 操作按钮
-        button_layout = self._create_product_button(product)
-        layout.addLayout(button_layout)
-        
-        return frame
+    def search_products(self):
+        """按搜索框的内容搜索商品，并更新分类计数
 
-    def _create_product_info(self, product):
-        """创建商品信息布局"""
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(8)
-        
-        # 商品名称
-        name_label = QLabel(product.name)
-        name_label.setObjectName("title")
-        info_layout.addWidget(name_label)
-        
-        # 商品描述
-        desc_label = QLabel(product.description)
-        desc_label.setObjectName("desc")
-        desc_label.setWordWrap(True)
-        info_layout.addWidget(desc_label)
-        
-        # 价格
-        price_label = QLabel(f"价格: {product.price} 积分")
-        price_label.setObjectName("price")
-        info_layout.addWidget(price_label)
-        
-        # 库存
-        stock_label = QLabel(f"库存: {product.stock}")
-        stock_label.setObjectName("stock")
-        info_layout.addWidget(stock_label)
-        
-        return info_layout
+        分类计数和搜索结果都在后台线程查询，新的搜索会作废上一次尚未返回的结果。
+        """
+        self.search_timer.stop()
+        query = self.search_input.text().strip()
+        if query:
+            selected = self.category_filter.currentData() if self.category_filter.isVisible() else None
+            self.tasks.submit("facets", get_search_facets, query,
+                              on_result=lambda facets: self._update_category_filter(facets, selected))
+        else:
+            self.tasks.cancel("facets")
+            self.category_filter.setVisible(False)
+        self._apply_search()
 
-    def _create_product_button(self, product):
-        """创建商品操作按钮"""
-        button_layout = QVBoxLayout()
-        button_layout.setAlignment(Qt.AlignCenter)
-        
-        add_button = QPushButton("加入购物车")
-        add_button.setObjectName("add_cart_btn")
-        add_button.setIcon(QIcon("assets/icons/cart.ico"))
-        add_button.clicked.connect(lambda: self.add_to_cart(product))
-        button_layout.addWidget(add_button)
-        
-        return button_layout
+    def _update_category_filter(self, facets, selected=None):
+        """分类下拉框：全部分类和每个有结果的分类，保留之前的选择"""
+        self.category_filter.clear()
+        total = sum(count for _, count in facets)
+        self.category_filter.addItem(f"{language_manager.get_text('all_categories')} ({total})", None)
+        for category, count in facets:
+            if category:
+                self.category_filter.addItem(f"{category} ({count})", category)
+        index = self.category_filter.findData(selected) if selected else 0
+        self.category_filter.setCurrentIndex(max(index, 0))
+        self.category_filter.setVisible(True)
+
+    def _apply_search(self):
+        """按当前的搜索词和分类重新加载商品列表"""
+        query = self.search_input.text().strip()
+        category = self.category_filter.currentData() if query else None
+        self.product_model.set_search(query, category)
+        if not self.product_model.is_searching():
+            self._show_empty_message(self.product_model.rowCount() == 0)
+
+    def _on_search_loaded(self):
+        """搜索结果返回后更新无结果提示"""
+        self._show_empty_message(self.product_model.rowCount() == 0)
+
+    def _show_empty_message(self, empty=True):
+        """显示或隐藏无商品提示"""
+        key = 'no_search_results' if self.product_model.is_searching() else 'no_products'
+        self.empty_label.setText(language_manager.get_text(key))
+        self.empty_label.setVisible(empty)
+        self.product_list.setVisible(not empty)
 
     def add_to_cart(self, product):
         """添加商品到购物车"""
@@ -393,12 +369,3 @@ class HomeView(QWidget):
     def goto_admin(self):
         """跳转到管理员界面"""
         self.main_window.show_admin()
-    
-    def update_language(self):
-        """更新语言"""
-        # 更新按钮文本
-        self.cart_button.setText(language_manager.get_text('cart'))
-        self.profile_button.setText(language_manager.get_text('profile'))
-        self.csgo_button.setText(language_manager.get_text('csgo_server'))
-        self.admin_button.setText(language_manager.get_text('admin'))
-        self.logout_button.setText(language_manager.get_text('logout'))
\ No newline at end of file
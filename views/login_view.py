@@ -8,11 +8,13 @@ from database.db_init import SessionLocal
 from models.user import User
 from resources.icons import get_app_icon, get_icon
 from utils.language_manager import language_manager
+from utils.workers import TaskRunner
 
 class LoginView(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.tasks = TaskRunner(self)
         self.init_ui()
     
     def init_ui(self):
@@ -36,7 +38,7 @@ class LoginView(QWidget):
         left_layout.setAlignment(Qt.AlignCenter)
         
         # 左侧内容
-        self.welcome_label = QLabel(language_manager.get_text('switch_to_english') if language_manager.get_current_language() == 'zh' else "欢迎来到")
+        self.welcome_label = language_manager.bind(QLabel(), 'welcome_to')
         self.welcome_label.setStyleSheet("""
             QLabel {
                 color: white;
@@ -100,7 +102,7 @@ class LoginView(QWidget):
         form_layout.setSpacing(25)
         
         # 登录标题
-        self.login_title = QLabel(language_manager.get_text('login'))
+        self.login_title = language_manager.bind(QLabel(), 'login')
         self.login_title.setStyleSheet("""
             QLabel {
                 font-size: 32px;
@@ -114,16 +116,16 @@ class LoginView(QWidget):
         
         # 用户名输入
         username_container = self.create_input_field(language_manager.get_text('username'), "user")
-        self.username_input = username_container.findChild(QLineEdit)
+        self.username_input = language_manager.bind(username_container.findChild(QLineEdit), 'username', 'setPlaceholderText')
         form_layout.addWidget(username_container)
         
         # 密码输入
         password_container = self.create_input_field(language_manager.get_text('password'), "password", is_password=True)
-        self.password_input = password_container.findChild(QLineEdit)
+        self.password_input = language_manager.bind(password_container.findChild(QLineEdit), 'password', 'setPlaceholderText')
         form_layout.addWidget(password_container)
         
         # 登录按钮
-        self.login_button = QPushButton(language_manager.get_text('login_button'))
+        self.login_button = language_manager.bind(QPushButton(), 'login_button')
         self.login_button.setStyleSheet("""
             QPushButton {
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
@@ -151,10 +153,10 @@ class LoginView(QWidget):
         
         # 注册链接
         register_layout = QHBoxLayout()
-        self.register_text = QLabel(language_manager.get_text('no_account_text'))
+        self.register_text = language_manager.bind(QLabel(), 'no_account_yet')
         self.register_text.setStyleSheet("color: #7f8c8d; font-size: 14px;")
         
-        self.register_link = QPushButton(language_manager.get_text('register_now'))
+        self.register_link = language_manager.bind(QPushButton(), 'register_now')
         self.register_link.setStyleSheet("""
             QPushButton {
                 background: transparent;
@@ -227,10 +229,19 @@ class LoginView(QWidget):
             self.show_message("请输入用户名和密码", "warning")
             return
         
-        if self.main_window.login(username, password):
+        # 密码哈希有意设计得较慢，放到后台线程验证，避免界面卡住
+        self.login_button.setEnabled(False)
+        self.tasks.submit("login", verify_user, username, password,
+                          on_result=self._on_verified,
+                          on_error=lambda e: self.show_message(f"登录失败: {e}", "error"),
+                          on_finished=lambda: self.login_button.setEnabled(True))
+    
+    def _on_verified(self, user):
+        """后台验证完成"""
+        if self.main_window.complete_login(user):
             self.username_input.clear()
             self.password_input.clear()
-        else:
+        elif user is None:
             self.show_message("用户名或密码错误", "error")
     
     def show_register(self):
@@ -269,36 +280,3 @@ class LoginView(QWidget):
             }
         """)
         msg_box.exec_()
-    
-    def update_language(self):
-        """更新界面语言"""
-        # 更新左侧欢迎文本
-        if hasattr(self, 'welcome_label'):
-            self.welcome_label.setText(language_manager.get_text('welcome_to'))
-        
-        # 更新登录标题
-        if hasattr(self, 'login_title'):
-            self.login_title.setText(language_manager.get_text('login'))
-        
-        # 更新输入框占位符
-        if hasattr(self, 'username_input'):
-            self.username_input.setPlaceholderText(language_manager.get_text('username'))
-        
-        if hasattr(self, 'password_input'):
-            self.password_input.setPlaceholderText(language_manager.get_text('password'))
-        
-        # 更新按钮文本
-        if hasattr(self, 'login_button'):
-            self.login_button.setText(language_manager.get_text('login_button'))
-        
-        if hasattr(self, 'register_text'):
-            if language_manager.get_current_language() == 'zh':
-                self.register_text.setText("还没有账户？")
-            else:
-                self.register_text.setText("Don't have an account?")
-        
-        if hasattr(self, 'register_link'):
-            if language_manager.get_current_language() == 'zh':
-                self.register_link.setText("立即注册")
-            else:
-                self.register_link.setText("Sign up now")
\ No newline at end of file
@@ -2,15 +2,10 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QFrame,
                              QStackedWidget, QPushButton, QMessageBox, QHBoxLayout)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont
-from .login_view import LoginView
-from .register_view import RegisterView
-from .home_view import HomeView
-from .cart_view import CartView
-from .user_profile_view import UserProfileView
-from .admin_view import AdminView
-from .csgo_server_view import CSGOServerView
+import time
+import importlib
 from models.user import User
-from database.db_operations import get_user_by_username, create_user
+from database.db_operations import get_user_by_username, create_user, verify_user
 from resources.icons import get_app_icon
 from resources.enhanced_styles import (
     get_enhanced_background_style, 
@@ -21,22 +16,51 @@ from resources.enhanced_styles import (
 )
 from utils.language_manager import language_manager
 
+class LazyView:
+    """主窗口上的页面属性：第一次访问时才导入页面模块并创建页面
+
+    创建后页面保存在实例字典中，之后的访问不再经过这里。
+    """
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, window, owner=None):
+        if window is None:
+            return self
+        return window.create_view(self)
+
 class MainWindow(QMainWindow):
     # 语言切换信号
     language_changed = pyqtSignal(str)
+
+    # 页面在第一次显示时创建，启动时只创建登录页面
+    login_view = LazyView(".login_view", "LoginView")
+    register_view = LazyView(".register_view", "RegisterView")
+    home_view = LazyView(".home_view", "HomeView")
+    cart_view = LazyView(".cart_view", "CartView")
+    profile_view = LazyView(".user_profile_view", "UserProfileView")
+    admin_view = LazyView(".admin_view", "AdminView")
+    csgo_server_view = LazyView(".csgo_server_view", "CSGOServerView")
     
     def __init__(self):
         super().__init__()
         self.current_user = None
         self.floating_decorations = []
         self.floating_animations = []
+        # 页面名 -> 导入并创建页面的耗时（毫秒）
+        self.view_timings = {}
         self.init_ui()
         self.init_views()
         self.show_login()
     
     def init_ui(self):
         """初始化主窗口UI"""
-        self.setWindowTitle(language_manager.get_text('app_title'))
+        language_manager.bind(self, 'app_title', 'setWindowTitle')
         self.setWindowIcon(get_app_icon())
         self.setMinimumSize(1400, 900)
         self.resize(1600, 1000)
@@ -93,23 +117,22 @@ class MainWindow(QMainWindow):
             QTimer.singleShot(100, self.create_decorations)
     
     def init_views(self):
-        """初始化所有视图"""
-        self.login_view = LoginView(self)
-        self.register_view = RegisterView(self)
-        self.home_view = HomeView(self)
-        self.cart_view = CartView(self)
-        self.profile_view = UserProfileView(self)
-        self.admin_view = AdminView(self)
-        self.csgo_server_view = CSGOServerView(self)
-        
-        # 添加视图到堆叠部件
-        self.stacked_widget.addWidget(self.login_view)
-        self.stacked_widget.addWidget(self.register_view)
-        self.stacked_widget.addWidget(self.home_view)
-        self.stacked_widget.addWidget(self.cart_view)
-        self.stacked_widget.addWidget(self.profile_view)
-        self.stacked_widget.addWidget(self.admin_view)
-        self.stacked_widget.addWidget(self.csgo_server_view)
+        """初始化视图：只创建首先显示的登录页面，其他页面第一次访问时创建"""
+        self.login_view
+    
+    def create_view(self, lazy_view):
+        """导入页面模块、创建页面并加入堆叠部件，记录耗时"""
+        start = time.perf_counter()
+        module = importlib.import_module(lazy_view.module, __package__)
+        view = getattr(module, lazy_view.class_name)(self)
+        self.stacked_widget.addWidget(view)
+        setattr(self, lazy_view.name, view)
+        self.view_timings[lazy_view.name] = (time.perf_counter() - start) * 1000
+        return view
+    
+    def loaded_view(self, name):
+        """返回已经创建的页面，尚未创建时返回None（不会触发创建）"""
+        return self.__dict__.get(name)
     
     def show_login(self):
         """显示登录页面"""
@@ -158,9 +181,12 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentWidget(self.csgo_server_view)
 
     def login(self, username: str, password: str):
-        """用户登录"""
-        user = get_user_by_username(username)
-        if user and user.check_password(password):
+        """用户登录（在当前线程验证密码）"""
+        return self.complete_login(verify_user(username, password))
+    
+    def complete_login(self, user):
+        """密码验证完成后登录；user 为 None 表示用户名或密码错误"""
+        if user:
             # 检查用户是否被封禁
             if user.is_banned:
                 msg_box = QMessageBox(self)
@@ -275,8 +301,7 @@ class MainWindow(QMainWindow):
         toolbar_layout.addStretch()
         
         # 语言切换按钮
-        self.language_button = QPushButton()
-        self.update_language_button_text()
+        self.language_button = language_manager.bind(QPushButton(), 'switch_language_button')
         self.language_button.setFixedSize(120, 35)
         self.language_button.setStyleSheet("""
             QPushButton {
@@ -305,13 +330,6 @@ class MainWindow(QMainWindow):
         # 将工具栏添加到主布局的顶部
         self.main_layout.insertWidget(0, self.toolbar_frame)
     
-    def update_language_button_text(self):
-        """更新语言按钮文本"""
-        if language_manager.get_current_language() == 'zh':
-            self.language_button.setText('🌐 English')
-        else:
-            self.language_button.setText('🌐 中文')
-    
     def toggle_language(self):
         """切换语言"""
         new_language = language_manager.toggle_language()
@@ -319,29 +337,11 @@ class MainWindow(QMainWindow):
         self.language_changed.emit(new_language)
     
     def update_ui_language(self):
-        """更新整个UI的语言"""
-        # 更新窗口标题
-        self.setWindowTitle(language_manager.get_text('app_title'))
-        
-        # 更新语言按钮文本
-        self.update_language_button_text()
-        
-        # 更新所有视图的语言
-        all_views = [
-            self.login_view,
-            self.register_view,
-            self.home_view,
-            self.cart_view,
-            self.profile_view,
-            self.admin_view,
-            self.csgo_server_view
-        ]
-        
-        for view in all_views:
-            if hasattr(view, 'update_language'):
-                view.update_language()
-        
-        # 更新当前视图的语言
+        """切换语言后更新界面
+
+        绑定到 language_manager 的固定文本（窗口标题、按钮、标签）已经自动更新，
+        这里只让当前页面刷新动态内容；其他页面在下次显示时会重新加载。
+        """
         current_widget = self.stacked_widget.currentWidget()
         if hasattr(current_widget, 'update_language'):
             current_widget.update_language()
\ No newline at end of file
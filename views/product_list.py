@@ -0,0 +1,252 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import (Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize,
+                          QEvent, pyqtSignal)
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QIcon, QLinearGradient
+from database.db_operations import paginate_products, count_products, get_product_stocks, search_products
+from utils.workers import TaskRunner
+
+# 自定义数据角色
+ProductRole = Qt.UserRole + 1
+
+class ProductListModel(QAbstractListModel):
+    """商品列表模型
+
+    按页从数据库懒加载商品（canFetchMore/fetchMore），视图滚动到底部时才取下一页；
+    库存变化时只更新对应行，不重建整个列表。只显示上架的商品。
+    set_search() 之后改为按相关度分页加载搜索结果；搜索较慢，在后台线程执行，
+    新的搜索会使尚未返回的旧结果作废，每页加载完成后发出 search_loaded。
+    """
+    PAGE_SIZE = 100
+
+    # 一页搜索结果已加入列表
+    search_loaded = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._products = []
+        self._row_by_id = {}
+        self._next_cursor = None
+        self._exhausted = True
+        self._total = 0
+        self._search = None
+        self._fetching = False
+        self._tasks = TaskRunner(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._products)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._products):
+            return None
+        product = self._products[index.row()]
+        if role == Qt.DisplayRole:
+            return product.name
+        if role == Qt.ToolTipRole:
+            return product.description
+        if role == ProductRole:
+            return product
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._fetching:
+            return
+        if self._search:
+            query, category = self._search
+            self._fetching = True
+            self._tasks.submit("page", search_products, query, category=category,
+                               cursor=self._next_cursor, page_size=self.PAGE_SIZE,
+                               on_result=self._append_search_page, on_error=self._on_search_error,
+                               on_finished=self._on_fetch_finished)
+            return
+        self._append_page(paginate_products(cursor=self._next_cursor, page_size=self.PAGE_SIZE,
+                                            is_active=True))
+
+    def _append_search_page(self, page):
+        self._append_page(page)
+        self.search_loaded.emit()
+
+    def _on_search_error(self, error):
+        print(f"✗ 搜索商品失败：{error}")
+
+    def _on_fetch_finished(self):
+        self._fetching = False
+
+    def _append_page(self, page):
+        self._next_cursor = page.next_cursor
+        self._exhausted = not page.has_more
+        if not page.items:
+            return
+        first = len(self._products)
+        self.beginInsertRows(QModelIndex(), first, first + len(page.items) - 1)
+        for product in page.items:
+            self._row_by_id[product.id] = len(self._products)
+            self._products.append(product)
+        self.endInsertRows()
+
+    def reload(self):
+        """清空并重新加载第一页（同时作废正在进行的搜索）"""
+        self._tasks.cancel("page")
+        self._fetching = False
+        self.beginResetModel()
+        self._products = []
+        self._row_by_id = {}
+        self._next_cursor = None
+        self._exhausted = False
+        self.endResetModel()
+        self._total = count_products(is_active=True)
+        self.fetchMore()
+
+    def set_search(self, query, category=None):
+        """显示搜索结果；query 为空时恢复显示全部商品"""
+        self._search = (query, category) if query and query.strip() else None
+        self.reload()
+
+    def is_searching(self):
+        return self._search is not None
+
+    def refresh(self):
+        """刷新列表
+
+        商品总数变化（新增/删除商品）时重新加载，否则只同步已加载行的库存。
+        """
+        if not self._products or count_products(is_active=True) != self._total:
+            self.reload()
+        else:
+            self.refresh_stock()
+
+    def refresh_stock(self):
+        """同步已加载商品的库存，只对变化的行发出 dataChanged"""
+        stocks = get_product_stocks(self._row_by_id.keys())
+        for product_id, stock in stocks.items():
+            self.update_stock(product_id, stock)
+
+    def update_stock(self, product_id, stock):
+        """更新单个商品的库存显示"""
+        row = self._row_by_id.get(product_id)
+        if row is None:
+            return
+        product = self._products[row]
+        if product.stock == stock:
+            return
+        product.stock = stock
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [ProductRole])
+
+    def total_count(self):
+        """数据库中上架的商品总数"""
+        return self._total
+
+class ProductCardDelegate(QStyledItemDelegate):
+    """商品卡片委托
+
+    只为可见行绘制卡片，不为每个商品创建 QFrame/QLabel/QPushButton。
+    点击卡片右侧按钮区域时发出 add_to_cart_requested。
+    """
+    add_to_cart_requested = pyqtSignal(object)
+
+    CARD_HEIGHT = 150
+    MARGIN = 10
+    PADDING = 20
+    BUTTON_SIZE = QSize(140, 44)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.button_text = "加入购物车"
+        self.price_format = "价格: {price} 积分"
+        self.stock_format = "库存: {stock}"
+        self._cart_icon = QIcon("assets/icons/cart.ico")
+
+        self._title_font = QFont("Microsoft YaHei", 15, QFont.Bold)
+        self._desc_font = QFont("Microsoft YaHei", 10)
+        self._price_font = QFont("Microsoft YaHei", 13, QFont.Bold)
+        self._stock_font = QFont("Microsoft YaHei", 9)
+        self._button_font = QFont("Microsoft YaHei", 10, QFont.Bold)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.CARD_HEIGHT + self.MARGIN * 2)
+
+    def _card_rect(self, option):
+        return option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+    def _button_rect(self, option):
+        card = self._card_rect(option)
+        size = self.BUTTON_SIZE
+        return QRect(card.right() - self.PADDING - size.width(),
+                     card.center().y() - size.height() // 2,
+                     size.width(), size.height())
+
+    def paint(self, painter, option, index):
+        product = index.data(ProductRole)
+        if product is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 卡片背景
+        card = self._card_rect(option)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(card), 15, 15)
+        painter.fillPath(path, QColor(255, 255, 255, 255 if hovered else 250))
+        painter.setPen(QColor(102, 126, 234, 100) if hovered else QColor(230, 232, 240))
+        painter.drawPath(path)
+
+        # 文本区域
+        button = self._button_rect(option)
+        text_left = card.left() + self.PADDING
+        text_width = button.left() - self.PADDING - text_left
+        y = card.top() + self.PADDING
+
+        painter.setFont(self._title_font)
+        painter.setPen(QColor("#333333"))
+        metrics = QFontMetrics(self._title_font)
+        painter.drawText(QRect(text_left, y, text_width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(product.name or "", Qt.ElideRight, text_width))
+        y += metrics.height() + 6
+
+        painter.setFont(self._desc_font)
+        painter.setPen(QColor("#666666"))
+        metrics = QFontMetrics(self._desc_font)
+        painter.drawText(QRect(text_left, y, text_width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                         metrics.elidedText(product.description or "", Qt.ElideRight, text_width))
+        y += metrics.height() + 8
+
+        painter.setFont(self._price_font)
+        painter.setPen(QColor("#e74c3c"))
+        metrics = QFontMetrics(self._price_font)
+        painter.drawText(QRect(text_left, y, text_width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                         self.price_format.format(price=product.price))
+        y += metrics.height() + 4
+
+        painter.setFont(self._stock_font)
+        painter.setPen(QColor("#2196F3"))
+        metrics = QFontMetrics(self._stock_font)
+        painter.drawText(QRect(text_left, y, text_width, metrics.height()), Qt.AlignLeft | Qt.AlignVCenter,
+                         self.stock_format.format(stock=product.stock))
+
+        # 加入购物车按钮
+        gradient = QLinearGradient(button.topLeft(), button.bottomLeft())
+        gradient.setColorAt(0, QColor("#4CAF50"))
+        gradient.setColorAt(1, QColor("#45a049"))
+        button_path = QPainterPath()
+        button_path.addRoundedRect(QRectF(button), 8, 8)
+        painter.fillPath(button_path, gradient)
+        icon_rect = QRect(button.left() + 12, button.center().y() - 8, 16, 16)
+        self._cart_icon.paint(painter, icon_rect)
+        painter.setFont(self._button_font)
+        painter.setPen(QColor("white"))
+        painter.drawText(button.adjusted(28, 0, 0, 0), Qt.AlignCenter, self.button_text)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self._button_rect(option).contains(event.pos())):
+            self.add_to_cart_requested.emit(index.data(ProductRole))
+            return True
+        return super().editorEvent(event, model, option, index)
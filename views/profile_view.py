@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QScrollArea, QFrame, QMessageBox,
                              QLineEdit, QGridLayout, QFileDialog)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QFont, QIcon, QImage
 from database.db_operations import (get_user_by_id, update_user_info, 
                                   get_user_points_transactions, get_steam_binding, 
@@ -10,19 +10,22 @@ from database.db_init import SessionLocal
 from utils.password import hash_password
 from models.user import User
 from utils.steam_web import SteamWebLogin
-from utils.callback_server import start_callback_server, stop_callback_server, get_callback_params
-from utils.image_utils import qimage_to_pixmap
+from utils.callback_server import callback_server
 from resources.icons import get_app_icon, get_icon
 from utils.language_manager import language_manager
+from utils.workers import TaskRunner
 import webbrowser
-import os
-import shutil
 
 class ProfileView(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
         self.steam_web = SteamWebLogin()
+        self.tasks = TaskRunner(self)
+        # 当前Steam绑定流程的nonce，回调服务器按它把回调交给本页面
+        self.steam_nonce = None
+        self.steam_callbacks = callback_server()
+        self.steam_callbacks.received.connect(self.on_steam_callback)
         self.init_ui()
 
     def init_ui(self):
@@ -212,10 +215,8 @@ class ProfileView(QWidget):
     def load_avatar(self):
         if self.main_window.current_user is None:
             return
-        avatar_data = self.main_window.current_user.get_avatar()
-        if avatar_data:
-            image = QImage.fromData(avatar_data)
-            pixmap = qimage_to_pixmap(image, (200, 200))
+        pixmap = self.main_window.current_user.get_avatar_pixmap(200)
+        if pixmap is not None:
             self.avatar_label.setPixmap(pixmap)
         else:
             # 设置默认头像
@@ -236,21 +237,21 @@ class ProfileView(QWidget):
                 image = QImage(file_name)
                 if image.isNull():
                     raise Exception(language_manager.get_text('cannot_load_image'))
+                # 直接保存原始文件内容：JPEG 可以按 draft 模式缩小解码，同一文件重复上传也能识别
+                with open(file_name, "rb") as f:
+                    image_data = f.read()
                     
                 # 更新头像
-                self.main_window.current_user.set_avatar(image)
+                user = self.main_window.current_user
+                if not user.set_avatar(image_data):
+                    raise Exception(language_manager.get_text('save_avatar_failed'))
                 
                 # 保存到数据库
-                db = SessionLocal()
-                try:
-                    db.commit()
+                if update_user_avatar(user.id, user.avatar):
                     self.load_avatar()
                     QMessageBox.information(self, language_manager.get_text('success'), language_manager.get_text('avatar_update_success'))
-                except Exception as e:
-                    db.rollback()
-                    QMessageBox.warning(self, language_manager.get_text('error'), f"{language_manager.get_text('save_avatar_failed')}: {str(e)}")
-                finally:
-                    db.close()
+                else:
+                    QMessageBox.warning(self, language_manager.get_text('error'), language_manager.get_text('save_avatar_failed'))
                     
             except Exception as e:
                 QMessageBox.warning(self, language_manager.get_text('error'), f"{language_manager.get_text('update_avatar_failed')}: {str(e)}")
@@ -290,13 +291,15 @@ class ProfileView(QWidget):
             
     def load_points_history(self, user_id):
         """Load points history records"""
+        # 在后台线程获取积分记录，完成后再替换列表
+        self.tasks.submit("points_history", get_user_points_transactions, user_id,
+                          on_result=self._show_points_history)
+
+    def _show_points_history(self, transactions):
         # 清空现有记录
         for i in reversed(range(self.points_content_layout.count())): 
             self.points_content_layout.itemAt(i).widget().setParent(None)
             
-        # 获取积分记录
-        transactions = get_user_points_transactions(user_id)
-        
         # 显示记录
         for transaction in transactions:
             record = QFrame()
@@ -347,14 +350,16 @@ class ProfileView(QWidget):
     def handle_steam_bind(self):
         """Handle Steam binding"""
         try:
-            # 启动回调服务器
-            self.callback_server = start_callback_server()
-            if not self.callback_server:
+            # 放弃上一次未完成的绑定，开始新的登录流程
+            if self.steam_nonce:
+                self.steam_callbacks.end_flow(self.steam_nonce)
+            self.steam_nonce = self.steam_callbacks.begin_flow()
+            if not self.steam_nonce:
                 QMessageBox.warning(self, language_manager.get_text('error'), language_manager.get_text('callback_server_failed'))
                 return
             
             # 生成回调URL
-            return_url = "http://localhost:8000/steam/callback"
+            return_url = self.steam_callbacks.return_url(self.steam_nonce)
             
             # 获取Steam登录URL
             login_url = self.steam_web.get_login_url(return_url)
@@ -364,11 +369,6 @@ class ProfileView(QWidget):
             
             # 显示等待提示
             QMessageBox.information(self, language_manager.get_text('info'), language_manager.get_text('complete_steam_auth'))
-            
-            # 启动定时器检查回调
-            self.callback_timer = QTimer()
-            self.callback_timer.timeout.connect(self.check_steam_callback)
-            self.callback_timer.start(1000)  # 每秒检查一次
         except Exception as e:
             QMessageBox.warning(self, language_manager.get_text('error'), f"{language_manager.get_text('steam_bind_failed')}: {str(e)}")
     
@@ -388,19 +388,13 @@ class ProfileView(QWidget):
             else:
                 QMessageBox.warning(self, language_manager.get_text('error'), language_manager.get_text('unbind_failed'))
     
-    def check_steam_callback(self):
-        """Check Steam login callback"""
-        try:
-            params = get_callback_params()
-            if params:
-                # 停止定时器和服务器
-                self.callback_timer.stop()
-                stop_callback_server(self.callback_server)
-                
-                # 处理回调
-                self.handle_steam_callback(params)
-        except Exception as e:
-            print(f"Check Steam callback failed: {str(e)}")
+    def on_steam_callback(self, nonce: str, params: dict):
+        """Steam login callback arrived (GUI thread)"""
+        if nonce != self.steam_nonce:
+            return
+        self.steam_callbacks.end_flow(nonce)
+        self.steam_nonce = None
+        self.handle_steam_callback(params)
     
     def handle_steam_callback(self, params: dict):
         """Handle Steam login callback"""
@@ -473,9 +467,8 @@ class ProfileView(QWidget):
 
     def closeEvent(self, event):
         """Window close event"""
-        # 停止回调服务器和定时器
-        if self.callback_server:
-            stop_callback_server(self.callback_server)
-        if self.callback_timer:
-            self.callback_timer.stop()
+        # 结束未完成的Steam登录流程
+        if self.steam_nonce:
+            self.steam_callbacks.end_flow(self.steam_nonce)
+            self.steam_nonce = None
         event.accept()
\ No newline at end of file
@@ -6,14 +6,14 @@ from database.db_operations import create_user, bind_steam_account, verify_invit
 from utils.password import hash_password
 from utils.steam_api import SteamAPI
 from utils.steam_web import SteamWebLogin
-from utils.callback_server import start_callback_server, stop_callback_server, get_callback_params
+from utils.callback_server import callback_server
 
 import re
 import webbrowser
 from database.db_init import SessionLocal
 from models.user import User
 from resources.icons import get_app_icon, get_icon
-from utils.captcha_generator import CaptchaGenerator
+from utils.captcha_generator import CaptchaGenerator, CaptchaPool
 from utils.language_manager import language_manager
 
 class RegisterView(QWidget):
@@ -23,11 +23,16 @@ class RegisterView(QWidget):
         self.main_window = main_window
         self.steam_api = SteamAPI()
         self.steam_web = SteamWebLogin()
-        self.callback_server = None
-        self.callback_timer = None
+        # 当前Steam登录流程的nonce，回调服务器按它把回调交给本页面
+        self.steam_nonce = None
+        self.steam_callbacks = callback_server()
+        self.steam_callbacks.received.connect(self.on_steam_callback)
         
         # 自定义验证码
         self.captcha_generator = CaptchaGenerator()
+        # 后台预先生成验证码，刷新时直接取用
+        self.captcha_pool = CaptchaPool(self.captcha_generator, parent=self)
+        self.captcha_pool.fill()
         self.current_captcha_code = None
         self.captcha_verified = False
         
@@ -143,7 +148,7 @@ class RegisterView(QWidget):
     
     def refresh_captcha(self, event=None):
         """刷新验证码"""
-        self.current_captcha_code, pixmap = self.captcha_generator.generate_captcha()
+        self.current_captcha_code, pixmap = self.captcha_pool.take()
         self.captcha_image_label.setPixmap(pixmap)
         self.captcha_input.clear()
         self.captcha_verified = False
@@ -364,7 +369,7 @@ class RegisterView(QWidget):
         title_layout.addWidget(icon_label)
         
         # 标题
-        self.title = QLabel(language_manager.get_text('register'))
+        self.title = language_manager.bind(QLabel(), 'register')
         title_font = QFont("Microsoft YaHei", 24, QFont.Bold)
         self.title.setFont(title_font)
         self.title.setStyleSheet("color: #333; margin: 10px 0; background: #f8f9fa; padding: 10px; border-radius: 8px;")
@@ -379,10 +384,13 @@ class RegisterView(QWidget):
         fields_layout.setSpacing(15)
         
         # 创建输入字段
-        self.username_input = self._create_input_field(language_manager.get_text('username'), "user")
-        self.email_input = self._create_input_field(language_manager.get_text('email'), "mail")
-        self.password_input = self._create_input_field(language_manager.get_text('password'), "password", is_password=True)
-        self.invite_input = self._create_input_field(language_manager.get_text('invite_code_optional'), "invite")
+        self.username_input = self._create_input_field("", "user")
+        self.email_input = self._create_input_field("", "mail")
+        self.password_input = self._create_input_field("", "password", is_password=True)
+        self.invite_input = self._create_input_field("", "invite")
+        for container, key in ((self.username_input, 'username'), (self.email_input, 'email'),
+                               (self.password_input, 'password'), (self.invite_input, 'invite_code_optional')):
+            language_manager.bind(container.findChild(QLineEdit), key, 'setPlaceholderText')
         
         fields_layout.addWidget(self.username_input)
         fields_layout.addWidget(self.email_input)
@@ -419,45 +427,19 @@ class RegisterView(QWidget):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(15)
         
-        self.register_button = QPushButton(language_manager.get_text('confirm_register'))
+        self.register_button = language_manager.bind(QPushButton(), 'confirm_register')
         self.register_button.setObjectName("register_btn")
         self.register_button.setIcon(get_icon("checkmark"))
         self.register_button.clicked.connect(self.register)
         button_layout.addWidget(self.register_button)
         
-        self.back_button = QPushButton(language_manager.get_text('back_to_login'))
+        self.back_button = language_manager.bind(QPushButton(), 'back_to_login')
         self.back_button.setIcon(get_icon("back"))
         self.back_button.clicked.connect(self.main_window.show_login)
         button_layout.addWidget(self.back_button)
         
         layout.addLayout(button_layout)
     
-    def update_language(self):
-        """更新注册视图的语言"""
-        # 更新标题
-        self.title.setText(language_manager.get_text('register'))
-        
-        # 更新按钮文本
-        self.register_button.setText(language_manager.get_text('confirm_register'))
-        self.back_button.setText(language_manager.get_text('back_to_login'))
-        
-        # 更新输入框占位符
-        username_input = self.username_input.findChild(QLineEdit)
-        if username_input:
-            username_input.setPlaceholderText(language_manager.get_text('username'))
-            
-        email_input = self.email_input.findChild(QLineEdit)
-        if email_input:
-            email_input.setPlaceholderText(language_manager.get_text('email'))
-            
-        password_input = self.password_input.findChild(QLineEdit)
-        if password_input:
-            password_input.setPlaceholderText(language_manager.get_text('password'))
-            
-        invite_input = self.invite_input.findChild(QLineEdit)
-        if invite_input:
-            invite_input.setPlaceholderText(language_manager.get_text('invite_code_optional'))
-    
     def _create_input_field(self, placeholder, icon_name, is_password=False):
         """创建输入字段"""
         container = QFrame()
@@ -534,11 +516,16 @@ class RegisterView(QWidget):
     def handle_steam_login(self):
         """处理Steam登录"""
         try:
-            # 启动回调服务器
-            self.callback_server = start_callback_server()
+            # 放弃上一次未完成的登录，开始新的登录流程
+            if self.steam_nonce:
+                self.steam_callbacks.end_flow(self.steam_nonce)
+            self.steam_nonce = self.steam_callbacks.begin_flow()
+            if not self.steam_nonce:
+                self.show_message("错误", "无法启动Steam登录回调服务器", "error")
+                return
             
             # 生成回调URL
-            return_url = "http://localhost:8000/steam/callback"
+            return_url = self.steam_callbacks.return_url(self.steam_nonce)
             
             # 获取Steam登录URL
             login_url = self.steam_web.get_login_url(return_url)
@@ -548,27 +535,16 @@ class RegisterView(QWidget):
             
             # 显示等待提示
             QMessageBox.information(self, "提示", "请在浏览器中完成Steam登录授权")
-            
-            # 启动定时器检查回调
-            self.callback_timer = QTimer()
-            self.callback_timer.timeout.connect(self.check_steam_callback)
-            self.callback_timer.start(1000)  # 每秒检查一次
         except Exception as e:
             self.show_message("错误", f"Steam登录失败: {str(e)}", "error")
     
-    def check_steam_callback(self):
-        """检查Steam登录回调"""
-        try:
-            params = get_callback_params()
-            if params:
-                # 停止定时器和服务器
-                self.callback_timer.stop()
-                stop_callback_server(self.callback_server)
-                
-                # 处理回调
-                self.handle_steam_callback(params)
-        except Exception as e:
-            self.show_message("错误", f"检查Steam回调失败: {str(e)}", "error")
+    def on_steam_callback(self, nonce: str, params: dict):
+        """收到Steam登录回调（在GUI线程调用）"""
+        if nonce != self.steam_nonce:
+            return
+        self.steam_callbacks.end_flow(nonce)
+        self.steam_nonce = None
+        self.handle_steam_callback(params)
     
     def handle_steam_callback(self, params: dict):
         """处理Steam登录回调"""
@@ -638,10 +614,11 @@ class RegisterView(QWidget):
                 if self.steam_checkbox.isChecked() and hasattr(self, 'steam_info'):
                     bind_steam_account(user.id, self.steam_info['steam_id'], self.steam_info['name'])
                 
-                # 刷新后台管理界面
-                if hasattr(self.main_window, 'admin_view'):
-                    self.main_window.admin_view.load_users()
-                    self.main_window.admin_view.load_invite_codes()
+                # 刷新后台管理界面（尚未打开过时不需要刷新）
+                admin_view = self.main_window.loaded_view('admin_view')
+                if admin_view is not None:
+                    admin_view.load_users()
+                    admin_view.load_invite_codes()
                 
                 self.show_message("成功", "注册成功！")
                 self.main_window.show_login()
@@ -708,9 +685,8 @@ class RegisterView(QWidget):
     
     def closeEvent(self, event):
         """窗口关闭事件"""
-        # 停止回调服务器和定时器
-        if self.callback_server:
-            stop_callback_server(self.callback_server)
-        if self.callback_timer:
-            self.callback_timer.stop()
+        # 结束未完成的Steam登录流程
+        if self.steam_nonce:
+            self.steam_callbacks.end_flow(self.steam_nonce)
+            self.steam_nonce = None
         event.accept()
\ No newline at end of file
@@ -5,14 +5,19 @@ from PyQt5.QtCore import Qt
 from database.db_operations import (get_user_by_id, update_user_points, 
                                    get_user_transactions, bind_steam_account,
                                    get_steam_binding)
+from database.session import session_scope
 from utils.payment import PaymentConfig
 from utils.language_manager import language_manager
+from utils.workers import TaskRunner
+from utils.payment_flow import PaymentManager
 import requests
 
 class UserProfileView(QWidget):
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
+        self.tasks = TaskRunner(self)
+        self.payments = PaymentManager(self)
         self.init_ui()
     
     # 在init_ui方法开始处添加整体样式
@@ -98,7 +103,7 @@ class UserProfileView(QWidget):
         nav_layout.addStretch()
         
         # 添加个人中心标题
-        self.title_label = QLabel(language_manager.get_text('profile_center'))
+        self.title_label = language_manager.bind(QLabel(), 'personal_center')
         self.title_label.setStyleSheet("""
             QLabel {
                 font-size: 24px;
@@ -130,7 +135,7 @@ class UserProfileView(QWidget):
         info_layout.setSpacing(15)
         
         # 用户信息标题
-        self.info_title = QLabel(language_manager.get_text('user_info'))
+        self.info_title = language_manager.bind(QLabel(), 'user_info')
         self.info_title.setStyleSheet("""
             QLabel {
                 color: white;
@@ -201,7 +206,7 @@ class UserProfileView(QWidget):
         steam_layout.setSpacing(15)
         
         # Steam绑定标题
-        self.steam_title = QLabel(language_manager.get_text('steam_binding'))
+        self.steam_title = language_manager.bind(QLabel(), 'steam_account_binding')
         self.steam_title.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -217,8 +222,7 @@ class UserProfileView(QWidget):
         # Steam输入区域
         steam_input_layout = QHBoxLayout()
         
-        self.steam_id_input = QLineEdit()
-        self.steam_id_input.setPlaceholderText(language_manager.get_text('enter_steam_id'))
+        self.steam_id_input = language_manager.bind(QLineEdit(), 'enter_steam_id', 'setPlaceholderText')
         self.steam_id_input.setStyleSheet("""
             QLineEdit {
                 border: 2px solid #e0e0e0;
@@ -235,7 +239,7 @@ class UserProfileView(QWidget):
         """)
         steam_input_layout.addWidget(self.steam_id_input)
         
-        self.bind_button = QPushButton(language_manager.get_text('bind_steam'))
+        self.bind_button = language_manager.bind(QPushButton(), 'bind_steam')
         self.bind_button.setStyleSheet("""
             QPushButton {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
@@ -280,7 +284,7 @@ class UserProfileView(QWidget):
         recharge_layout.setSpacing(15)
         
         # 充值标题
-        self.recharge_title = QLabel(language_manager.get_text('points_recharge'))
+        self.recharge_title = language_manager.bind(QLabel(), 'points_recharge')
         self.recharge_title.setStyleSheet("""
             QLabel {
                 font-size: 20px;
@@ -321,7 +325,7 @@ class UserProfileView(QWidget):
         
         # 充值金额输入
         amount_layout = QHBoxLayout()
-        self.amount_label = QLabel(language_manager.get_text('recharge_amount'))
+        self.amount_label = language_manager.bind(QLabel(), 'recharge_amount')
         self.amount_label.setStyleSheet("""
             QLabel {
                 font-size: 15px;
@@ -333,8 +337,7 @@ class UserProfileView(QWidget):
         """)
         amount_layout.addWidget(self.amount_label)
         
-        self.amount_input = QLineEdit()
-        self.amount_input.setPlaceholderText(language_manager.get_text('enter_amount'))
+        self.amount_input = language_manager.bind(QLineEdit(), 'enter_amount_yuan', 'setPlaceholderText')
         self.amount_input.setStyleSheet("""
             QLineEdit {
                 border: 2px solid #e0e0e0;
@@ -370,7 +373,7 @@ class UserProfileView(QWidget):
         
         # 支付方式选择
         payment_layout = QHBoxLayout()
-        self.payment_label = QLabel(language_manager.get_text('payment_method'))
+        self.payment_label = language_manager.bind(QLabel(), 'payment_method')
         self.payment_label.setStyleSheet("""
             QLabel {
                 font-size: 15px;
@@ -414,7 +417,7 @@ class UserProfileView(QWidget):
         recharge_layout.addLayout(payment_layout)
         
         # 充值按钮
-        self.recharge_btn = QPushButton(language_manager.get_text('recharge_now'))
+        self.recharge_btn = language_manager.bind(QPushButton(), 'recharge_now')
         self.recharge_btn.setStyleSheet("""
             QPushButton {
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
@@ -460,7 +463,7 @@ class UserProfileView(QWidget):
         transactions_layout.setSpacing(15)
         
         # 交易记录标题
-        self.transactions_title = QLabel(language_manager.get_text('transaction_history'))
+        self.transactions_title = language_manager.bind(QLabel(), 'transaction_records')
         self.transactions_title.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -548,47 +551,63 @@ class UserProfileView(QWidget):
         self.load_user_data()
     
     def load_user_data(self):
-        """加载用户数据"""
+        """加载用户数据（在后台线程查询，完成后更新界面）"""
         if not self.main_window.current_user:
             return
-        user = get_user_by_id(self.main_window.current_user.id)
-        if user:
-            self.username_label.setText(language_manager.get_text('username_label').format(username=user.username))
-            
-            # 显示用户类型和显示名称
-            if hasattr(user, 'user_type') and user.user_type:
-                user_type_display = user.get_type_display() if hasattr(user, 'get_type_display') else str(user.user_type)
-                self.user_type_label.setText(language_manager.get_text('user_type_label').format(type=user_type_display))
-                
-                # 如果没有显示名称，自动生成一个
-                if not user.display_name:
-                    user.generate_display_name()
-                    # 这里需要更新数据库，但为了简化，我们只在界面显示
-                
-                display_name = user.display_name if user.display_name else f"{user_type_display} - {user.username}"
-                self.display_name_label.setText(language_manager.get_text('display_name_label').format(name=display_name))
-            else:
-                self.user_type_label.setText(language_manager.get_text('user_type_label').format(type=language_manager.get_text('normal_user')))
-                self.display_name_label.setText(language_manager.get_text('display_name_label').format(name=f"{language_manager.get_text('normal_user')} - {user.username}"))
-            
-            self.email_label.setText(language_manager.get_text('email_label').format(email=user.email))
-            self.points_label.setText(language_manager.get_text('points_balance').format(points=user.points))
-            
-            # 检查Steam绑定状态
-            steam_binding = get_steam_binding(user.id)
-            if steam_binding:
-                self.steam_status_label.setText(language_manager.get_text('steam_account').format(name=steam_binding.steam_name))
-            else:
-                self.steam_status_label.setText(language_manager.get_text('steam_not_bound'))
-            
-            # 加载交易记录
-            self.load_transactions()
+        self.tasks.submit("user_data", self._fetch_user_data, self.main_window.current_user.id,
+                          on_result=self._show_user_data)
+    
+    @staticmethod
+    def _fetch_user_data(user_id):
+        """后台线程：用户信息、Steam绑定和交易记录共用一个数据库会话"""
+        with session_scope():
+            user = get_user_by_id(user_id)
+            if not user:
+                return None
+            return user, get_steam_binding(user.id), get_user_transactions(user.id)
+    
+    def _show_user_data(self, data):
+        if data is None:
+            return
+        user, steam_binding, transactions = data
+        self.username_label.setText(language_manager.get_text('username_label').format(username=user.username))
+        
+        # 显示用户类型和显示名称
+        if hasattr(user, 'user_type') and user.user_type:
+            user_type_display = user.get_type_display() if hasattr(user, 'get_type_display') else str(user.user_type)
+            self.user_type_label.setText(language_manager.get_text('user_type_label').format(type=user_type_display))
+            
+            # 如果没有显示名称，自动生成一个
+            if not user.display_name:
+                user.generate_display_name()
+                # 这里需要更新数据库，但为了简化，我们只在界面显示
+            
+            display_name = user.display_name if user.display_name else f"{user_type_display} - {user.username}"
+            self.display_name_label.setText(language_manager.get_text('display_name_label').format(name=display_name))
+        else:
+            self.user_type_label.setText(language_manager.get_text('user_type_label').format(type=language_manager.get_text('normal_user')))
+            self.display_name_label.setText(language_manager.get_text('display_name_label').format(name=f"{language_manager.get_text('normal_user')} - {user.username}"))
+        
+        self.email_label.setText(language_manager.get_text('email_label').format(email=user.email))
+        self.points_label.setText(language_manager.get_text('points_balance').format(points=user.points))
+        
+        # 检查Steam绑定状态
+        if steam_binding:
+            self.steam_status_label.setText(language_manager.get_text('steam_account').format(name=steam_binding.steam_name))
+        else:
+            self.steam_status_label.setText(language_manager.get_text('steam_not_bound'))
+        
+        # 显示交易记录
+        self._show_transactions(transactions)
     
     def load_transactions(self):
         """加载积分交易记录"""
         if not self.main_window.current_user:
             return
-        transactions = get_user_transactions(self.main_window.current_user.id)
+        self.tasks.submit("transactions", get_user_transactions, self.main_window.current_user.id,
+                          on_result=self._show_transactions)
+    
+    def _show_transactions(self, transactions):
         self.transactions_table.setRowCount(len(transactions))
         
         for row, trans in enumerate(transactions):
@@ -688,126 +707,65 @@ class UserProfileView(QWidget):
                                        QMessageBox.Yes | QMessageBox.No)
             
             if reply == QMessageBox.Yes:
-                # 调用支付接口
-                payment_result = self.process_payment(amount, payment_method)
-                
-                if payment_result['success']:
-                    # 支付验证成功后才增加积分
-                    update_user_points(self.main_window.current_user.id, points)
-                    QMessageBox.information(self, language_manager.get_text('recharge_success'), 
-                                          language_manager.get_text('recharge_success_msg').format(
-                                              payment_id=payment_result['payment_id'],
-                                              points=points
-                                          ))
-                    self.amount_input.clear()
-                    self.load_user_data()
-                else:
-                    QMessageBox.warning(self, language_manager.get_text('recharge_failed'), payment_result['message'])
+                # 调用支付接口（异步进行，结果在 _on_payment_finished 中处理）
+                self.process_payment(amount, payment_method, points)
                 
         except ValueError as e:
             QMessageBox.warning(self, language_manager.get_text('input_error'), str(e))
         except Exception as e:
             QMessageBox.warning(self, language_manager.get_text('system_error'), language_manager.get_text('recharge_failed_msg').format(error=str(e)))
     
-    def process_payment(self, amount, payment_method):
-        """处理支付流程"""
-        try:
-            from utils.payment import PaymentAPI
-            import time
-            import uuid
-            
-            # 创建支付API实例
-            payment_api = PaymentAPI()
-            
-            # 生成订单ID
-            order_id = f"order_{int(time.time())}_{str(uuid.uuid4())[:8]}"
-            
-            # 显示支付处理对话框
-            progress = QProgressDialog(language_manager.get_text('creating_payment_order'), language_manager.get_text('cancel'), 0, 100, self)
-            progress.setWindowModality(Qt.WindowModal)
-            progress.setAutoClose(False)
-            progress.setAutoReset(False)
-            progress.show()
-            progress.setValue(10)
-            
-            # 1. 创建支付订单
-            payment_order = payment_api.create_payment(amount, order_id)
-            
-            if not payment_order:
-                progress.close()
-                return {'success': False, 'message': language_manager.get_text('create_order_failed'), 'payment_id': None}
-            
-            progress.setValue(30)
-            progress.setLabelText(language_manager.get_text('order_created_complete_payment'))
-            
-            # 2. 获取支付二维码或支付链接
-            payment_id = payment_order.get('payment_id')
-            qr_code_url = payment_order.get('qr_code_url')
-            
-            if qr_code_url:
-                # 显示二维码支付对话框
-                qr_dialog = self.show_qr_payment_dialog(qr_code_url, amount, payment_method)
-                if not qr_dialog:
-                    progress.close()
-                    return {'success': False, 'message': language_manager.get_text('user_cancelled_payment'), 'payment_id': payment_id}
-            
-            progress.setValue(50)
-            progress.setLabelText(language_manager.get_text('waiting_payment_complete'))
-            
-            # 3. 轮询检查支付状态
-            max_attempts = 60  # 最多等待5分钟
-            attempt = 0
-            
-            while attempt < max_attempts:
-                if progress.wasCanceled():
-                    progress.close()
-                    return {'success': False, 'message': language_manager.get_text('user_cancelled_payment'), 'payment_id': payment_id}
-                
-                # 检查支付状态
-                payment_status = payment_api.check_payment(payment_id)
-                
-                if payment_status:
-                    if payment_status.get('status') == 'success':
-                        progress.setValue(100)
-                        progress.setLabelText(language_manager.get_text('payment_success'))
-                        time.sleep(1)
-                        progress.close()
-                        return {
-                            'success': True,
-                            'payment_id': payment_id,
-                            'amount': amount,
-                            'method': payment_method,
-                            'message': language_manager.get_text('payment_success')
-                        }
-                    elif payment_status.get('status') == 'failed':
-                        progress.close()
-                        return {
-                            'success': False,
-                            'payment_id': payment_id,
-                            'message': payment_status.get('message', language_manager.get_text('payment_failed'))
-                        }
-                
-                # 等待5秒后再次检查
-                time.sleep(5)
-                attempt += 1
-                progress.setValue(50 + (attempt * 40 // max_attempts))
-            
-            # 超时处理
-            progress.close()
-            return {
-                'success': False,
-                'payment_id': payment_id,
-                'message': language_manager.get_text('payment_timeout')
-            }
-                
-        except Exception as e:
-            if 'progress' in locals():
-                progress.close()
-            print(f"{language_manager.get_text('payment_exception')}: {str(e)}")
-            return {'success': False, 'message': f"{language_manager.get_text('payment_exception')}: {str(e)}", 'payment_id': None}
+    def process_payment(self, amount, payment_method, points):
+        """启动支付流程
+        
+        创建订单、轮询支付状态和入账都在后台进行，进度对话框不阻塞界面，
+        可以同时进行多笔支付。支付确认后在后台给当前用户增加积分。
+        """
+        user_id = self.main_window.current_user.id
+        flow = self.payments.start(amount, payment_method,
+                                   settle=lambda result: update_user_points(user_id, points))
+        
+        # 显示支付进度对话框
+        progress = QProgressDialog(language_manager.get_text('creating_payment_order'), language_manager.get_text('cancel'), 0, 100, self)
+        progress.setWindowModality(Qt.NonModal)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(flow.cancel)
+        
+        def update_progress(value, message):
+            progress.setValue(value)
+            progress.setLabelText(language_manager.get_text(message))
+        
+        flow.progress.connect(update_progress)
+        flow.qr_ready.connect(lambda url: self.show_qr_payment_dialog(url, amount, payment_method, flow))
+        flow.finished.connect(lambda result: self._on_payment_finished(result, points, progress))
+        progress.show()
+        return flow
+    
+    def _on_payment_finished(self, result, points, progress):
+        progress.canceled.disconnect()
+        progress.close()
+        progress.deleteLater()
+        
+        if result['success']:
+            QMessageBox.information(self, language_manager.get_text('recharge_success'), 
+                                  language_manager.get_text('recharge_success_msg').format(
+                                      payment_id=result['payment_id'],
+                                      points=points
+                                  ))
+            self.amount_input.clear()
+            self.load_user_data()
+        else:
+            # message 是语言键；服务端或异常给出的 detail 是原文，只放在翻译后的说明后面
+            message = language_manager.get_text(result['message'])
+            if result['detail']:
+                message = language_manager.get_text('payment_failed_detail').format(
+                    message=message, detail=result['detail'])
+            QMessageBox.warning(self, language_manager.get_text('recharge_failed'), message)
     
-    def show_qr_payment_dialog(self, qr_code_url, amount, payment_method):
-        """显示二维码支付对话框"""
+    def show_qr_payment_dialog(self, qr_code_url, amount, payment_method, flow):
+        """显示二维码支付对话框（非模态，支付结束后自动关闭）"""
         try:
             from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
             from PyQt5.QtCore import Qt
@@ -820,7 +778,7 @@ class UserProfileView(QWidget):
             dialog = QDialog(self)
             dialog.setWindowTitle(language_manager.get_text('scan_payment'))
             dialog.setFixedSize(400, 500)
-            dialog.setWindowModality(Qt.ApplicationModal)
+            dialog.setAttribute(Qt.WA_DeleteOnClose)
             
             layout = QVBoxLayout(dialog)
             
@@ -932,41 +890,24 @@ class UserProfileView(QWidget):
             button_layout.addWidget(confirm_btn)
             layout.addLayout(button_layout)
             
-            # 显示对话框
-            result = dialog.exec_()
-            return result == QDialog.Accepted
+            # 显示对话框：已完成支付 -> 立即查询，取消或关闭 -> 取消支付
+            dialog.accepted.connect(flow.confirm_scanned)
+            dialog.rejected.connect(flow.cancel)
+            flow.finished.connect(dialog.close)
+            dialog.show()
+            return dialog
             
         except Exception as e:
             print(f"{language_manager.get_text('qr_dialog_exception')}: {str(e)}")
-            return False
+            return None
 
     def load_user_info(self):
         """加载用户信息（兼容主窗口调用）"""
         self.load_user_data()
     
     def update_language(self):
-        """更新界面语言"""
-        # 更新标题和标签文本
-        self.title_label.setText(language_manager.get_text('personal_center'))
-        
-        # 更新用户信息区域
-        self.info_title.setText(language_manager.get_text('user_info'))
-        
-        # 更新Steam绑定区域
-        self.steam_title.setText(language_manager.get_text('steam_account_binding'))
-        self.steam_id_input.setPlaceholderText(language_manager.get_text('enter_steam_id'))
-        self.bind_button.setText(language_manager.get_text('bind_steam'))
-        
-        # 更新积分充值区域
-        self.recharge_title.setText(language_manager.get_text('points_recharge'))
-        self.amount_label.setText(language_manager.get_text('recharge_amount'))
-        self.amount_input.setPlaceholderText(language_manager.get_text('enter_amount_yuan'))
+        """更新界面语言（固定文本已绑定到 language_manager，这里只更新动态内容）"""
         self.points_preview.setText(language_manager.get_text('will_get_points_0'))
-        self.payment_label.setText(language_manager.get_text('payment_method'))
-        self.recharge_btn.setText(language_manager.get_text('recharge_now'))
-        
-        # 更新交易记录区域
-        self.transactions_title.setText(language_manager.get_text('transaction_records'))
         
         # 更新表格表头
         headers = [